@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+
+from domain.value_objects.broadcast_shard import BroadcastRunProgress
+
+
+class BroadcastRunRepository(ABC):
+    """分散配信の実行状況（シャードごとの結果の集計）のリポジトリのインターフェース"""
+
+    @abstractmethod
+    def start_run(self, run_id: str, shard_count: int) -> None:
+        """配信の実行を登録"""
+
+    @abstractmethod
+    def record_shard_result(
+        self, run_id: str, shard_index: int, success_count: int, failure_count: int
+    ) -> BroadcastRunProgress:
+        """シャードの結果を加算し、加算後の集計を返す（同じシャードの2回目以降は加算しない）"""
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+from domain.value_objects.delivery_checkpoint import DeliveryCheckpoint
+
+
+class DeliveryLedger(ABC):
+    """配信日ごとの配信台帳のインターフェース
+
+    再実行された配信が、配信済みのユーザー・完了済みの地点グループを飛ばして再開するために使う。
+    record_* は実装側でまとめて書き込んでよい（flush で書き込みを確定する）。
+    """
+
+    @abstractmethod
+    def load(self, run_date: str) -> DeliveryCheckpoint:
+        """配信日の途中経過を取得"""
+
+    @abstractmethod
+    def record_delivered(self, run_date: str, user_ids: Iterable[str]) -> None:
+        """配信済みのユーザーを記録"""
+
+    @abstractmethod
+    def record_group_completed(self, run_date: str, group_key: str) -> None:
+        """地点グループの配信完了を記録"""
+
+    @abstractmethod
+    def flush(self) -> None:
+        """未書き込みの記録を書き込む"""
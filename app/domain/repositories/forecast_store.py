@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+
+from domain.value_objects.weather import Weather
+
+
+class ForecastStore(ABC):
+    """事前計算した実質天気の保存先のインターフェース
+
+    キーは配信グループ（取得単位と市区町村名）ごとの文字列。
+    """
+
+    @abstractmethod
+    def save(self, run_date: str, forecasts: Mapping[str, Weather]) -> None:
+        """配信日の実質天気を保存"""
+
+    @abstractmethod
+    def load(self, run_date: str) -> dict[str, Weather]:
+        """配信日の実質天気をすべて取得"""
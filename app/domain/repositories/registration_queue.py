@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+from domain.value_objects.region_registration import RegionRegistration
+
+
+class RegistrationQueue(ABC):
+    """Webhook で受け付けた地域設定の依頼をワーカーへ受け渡すキューのインターフェース"""
+
+    @abstractmethod
+    def send_registrations(self, registrations: list[RegionRegistration]) -> None:
+        """地域設定の依頼をキューに投入（同じユーザーの依頼は受け付けた順に処理される）"""
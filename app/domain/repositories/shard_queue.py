@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+from domain.value_objects.broadcast_shard import BroadcastShard
+
+
+class ShardQueue(ABC):
+    """分散配信のシャードをワーカーへ受け渡すキューのインターフェース"""
+
+    @abstractmethod
+    def send_shards(self, shards: list[BroadcastShard]) -> None:
+        """シャードをキューに投入"""
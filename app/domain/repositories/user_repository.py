@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Optional
 
 from domain.entities.user import User
+from domain.value_objects.location_group import LocationGroup
 
 
 class UserRepository(ABC):
@@ -18,3 +20,11 @@ class UserRepository(ABC):
     @abstractmethod
     def get_all_users(self) -> list[User]:
         """全ユーザーを取得"""
+
+    @abstractmethod
+    def iter_users(self) -> Iterator[User]:
+        """全ユーザーを逐次取得（全件をメモリに保持しない）"""
+
+    @abstractmethod
+    def iter_location_groups(self) -> Iterator[LocationGroup]:
+        """地点ごとにまとめたユーザーIDを逐次取得"""
@@ -1,22 +1,32 @@
-from datetime import datetime
+from array import array
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from zoneinfo import ZoneInfo
 
 from domain.value_objects.weather import Weather
+from domain.value_objects.weather_series import PopSeries, TemperatureSeries
+
+try:
+    import numpy as np
+except ImportError:  # numpy は任意。未インストール時は calculate_batch を Python で計算する
+    np = None
 
 JST = ZoneInfo("Asia/Tokyo")
 HOUR_START = 9
 HOUR_END = 23
+# 9:00〜23:00 に該当する気象庁の降水確率ブロック（06-12時, 12-18時, 18-24時）
+POP_BLOCK_HOURS = (6, 12, 18)
 
 
 class WeatherCalculator:
     """実質天気（9:00〜23:00 JST）を算出するドメインサービス"""
 
-    def calculate(self, hourly_data: list[dict], jma_pops: list[dict]) -> Weather:
+    def calculate(self, hourly_data: TemperatureSeries | list[dict], jma_pops: PopSeries | list[dict]) -> Weather:
         """気温データ(WeatherAPI)と降水確率データ(JMA)から実質天気を算出する
 
         Args:
-            hourly_data: WeatherAPI の hourly 配列。各要素は time(str), temp(float) を持つ。
-            jma_pops: 気象庁APIの降水確率。各要素は time(datetime), pop(int) を持つ。
+            hourly_data: WeatherAPI の1時間ごとの気温。list[dict]（time, temp）も受け付ける。
+            jma_pops: 気象庁APIの降水確率。list[dict]（time, pop）も受け付ける。
 
         Returns:
             Weather: 実質天気情報
@@ -24,12 +34,11 @@ class WeatherCalculator:
         Raises:
             ValueError: 対象時間帯のデータが存在しない場合
         """
+        hourly = _as_temperature_series(hourly_data)
+        pops = _as_pop_series(jma_pops)
+
         # 気温: 9:00〜23:00 JST のデータをフィルタ
-        filtered_temps = []
-        for entry in hourly_data:
-            dt = datetime.strptime(entry["time"], "%Y-%m-%d %H:%M")
-            if HOUR_START <= dt.hour < HOUR_END:
-                filtered_temps.append(entry["temp"])
+        filtered_temps = [temp for hour, temp in hourly if HOUR_START <= hour < HOUR_END]
 
         if not filtered_temps:
             raise ValueError("9:00〜23:00（JST）の気温データが存在しません")
@@ -39,17 +48,7 @@ class WeatherCalculator:
 
         # 降水確率: JMA 6時間ブロックから9:00〜23:00に該当するものの最大値
         # 06:00→06-12時, 12:00→12-18時, 18:00→18-24時
-        # 9:00〜23:00 に該当: 06:00, 12:00, 18:00 のブロック
-        relevant_pops = []
-        for pop_entry in jma_pops:
-            pop_time = pop_entry["time"]
-            if hasattr(pop_time, "hour"):
-                hour = pop_time.hour
-            else:
-                hour = pop_time.astimezone(JST).hour
-            # 06:00, 12:00, 18:00 のブロックが 9:00〜23:00 に該当
-            if hour in (6, 12, 18):
-                relevant_pops.append(pop_entry["pop"])
+        relevant_pops = [pop for hour, pop in pops if hour in POP_BLOCK_HOURS]
 
         if not relevant_pops:
             raise ValueError("9:00〜23:00（JST）の降水確率データが存在しません")
@@ -57,3 +56,152 @@ class WeatherCalculator:
         pop = max(relevant_pops)
 
         return Weather(max_temp=max_temp, min_temp=min_temp, pop=pop)
+
+    def calculate_batch(self, batch: "HourlyBatch") -> list[Weather | None]:
+        """複数地点の実質天気をまとめて算出する
+
+        地点ごとの対象時間帯の最高・最低気温と降水確率の最大値を、連結した列のまま一括で集計する
+        （numpy がある場合はベクトル演算）。結果は地点ごとに calculate と同一で、
+        calculate が ValueError となる地点は None になる。
+        """
+        if np is not None:
+            max_temps, min_temps = _extrema_numpy(
+                batch.temps, batch.hours, batch.temp_counts, lambda h: (h >= HOUR_START) & (h < HOUR_END)
+            )
+            max_pops, _ = _extrema_numpy(
+                batch.pops, batch.pop_hours, batch.pop_counts, lambda h: np.isin(h, POP_BLOCK_HOURS)
+            )
+        else:
+            max_temps, min_temps = _extrema(
+                batch.temps, batch.hours, batch.temp_counts, lambda h: HOUR_START <= h < HOUR_END
+            )
+            max_pops, _ = _extrema(batch.pops, batch.pop_hours, batch.pop_counts, lambda h: h in POP_BLOCK_HOURS)
+
+        results: list[Weather | None] = []
+        for max_temp, min_temp, pop in zip(max_temps, min_temps, max_pops, strict=True):
+            if max_temp is None or pop is None:
+                results.append(None)
+                continue
+            try:
+                # calculate と同じく round() で丸める（表示が "26" となるよう int にする）
+                results.append(Weather(max_temp=round(max_temp), min_temp=round(min_temp), pop=int(pop)))
+            except ValueError:
+                results.append(None)
+        return results
+
+
+def _as_temperature_series(hourly_data: TemperatureSeries | list[dict]) -> TemperatureSeries:
+    if isinstance(hourly_data, TemperatureSeries):
+        return hourly_data
+    return TemperatureSeries.from_entries(hourly_data)
+
+
+def _as_pop_series(jma_pops: PopSeries | list[dict]) -> PopSeries:
+    if isinstance(jma_pops, PopSeries):
+        return jma_pops
+    return PopSeries.from_entries(jma_pops)
+
+
+@dataclass(frozen=True)
+class HourlyBatch:
+    """WeatherCalculator.calculate_batch の入力（複数地点の系列を連結した列）
+
+    temps・hours は全地点の気温と JST の時を地点順に連結したもので、
+    各地点の要素数を temp_counts に持つ。降水確率（pops・pop_hours・pop_counts）も同様。
+    各列は array・list または numpy の配列（from_series は numpy があれば配列で作成する）。
+    """
+
+    temps: Sequence[float]
+    hours: Sequence[int]
+    temp_counts: Sequence[int]
+    pops: Sequence[int]
+    pop_hours: Sequence[int]
+    pop_counts: Sequence[int]
+
+    def __len__(self) -> int:
+        return len(self.temp_counts)
+
+    @classmethod
+    def from_series(
+        cls,
+        hourly_data: Sequence[TemperatureSeries | list[dict]],
+        jma_pops: Sequence[PopSeries | list[dict]],
+    ) -> "HourlyBatch":
+        """地点ごとの系列（calculate と同じ入力）を連結して作成
+
+        時刻を解釈できない hourly を含む地点は、calculate と同じく算出できない地点（要素なし）とする。
+        """
+        if len(hourly_data) != len(jma_pops):
+            raise ValueError("hourly_data と jma_pops の地点数が一致しません")
+
+        temps = array("d")
+        hours = array("b")
+        temp_counts: list[int] = []
+        for series in hourly_data:
+            try:
+                hourly = _as_temperature_series(series)
+            except ValueError:
+                temp_counts.append(0)
+                continue
+            temps.extend(hourly.temps)
+            hours.extend(hourly.hours)
+            temp_counts.append(len(hourly))
+
+        pops = array("h")
+        pop_hours = array("b")
+        pop_counts: list[int] = []
+        for series in jma_pops:
+            pop_series = _as_pop_series(series)
+            pops.extend(pop_series.pops)
+            pop_hours.extend(pop_series.hours)
+            pop_counts.append(len(pop_series))
+
+        if np is None:
+            return cls(temps, hours, temp_counts, pops, pop_hours, pop_counts)
+        # array の内容をコピーせずに numpy の配列として参照する
+        return cls(
+            temps=np.frombuffer(temps, dtype=np.float64),
+            hours=np.frombuffer(hours, dtype=np.int8),
+            temp_counts=np.asarray(temp_counts, dtype=np.intp),
+            pops=np.frombuffer(pops, dtype=np.int16),
+            pop_hours=np.frombuffer(pop_hours, dtype=np.int8),
+            pop_counts=np.asarray(pop_counts, dtype=np.intp),
+        )
+
+
+def _extrema_numpy(
+    values: Sequence, hours: Sequence[int], counts: Sequence[int], in_window: Callable
+) -> tuple[list, list]:
+    """地点ごとに in_window に該当する値の最大・最小をベクトル演算で求める（該当なしは None）"""
+    counts_array = np.asarray(counts, dtype=np.intp)
+    values_array = np.asarray(values, dtype=np.float64)
+    mask = in_window(np.asarray(hours, dtype=np.int64))
+    # 各地点の先頭位置。要素のない地点を除けば区間は連続するため reduceat で集計できる
+    starts = np.cumsum(counts_array) - counts_array
+    nonempty = counts_array > 0
+    present = np.zeros(len(counts_array), dtype=bool)
+    maxima = np.zeros(len(counts_array))
+    minima = np.zeros(len(counts_array))
+    if nonempty.any():
+        segment_starts = starts[nonempty]
+        present[nonempty] = np.add.reduceat(mask.astype(np.int64), segment_starts) > 0
+        maxima[nonempty] = np.maximum.reduceat(np.where(mask, values_array, -np.inf), segment_starts)
+        minima[nonempty] = np.minimum.reduceat(np.where(mask, values_array, np.inf), segment_starts)
+    flags = present.tolist()
+    return (
+        [v if p else None for v, p in zip(maxima.tolist(), flags, strict=True)],
+        [v if p else None for v, p in zip(minima.tolist(), flags, strict=True)],
+    )
+
+
+def _extrema(values: Sequence, hours: Sequence[int], counts: Sequence[int], in_window: Callable) -> tuple[list, list]:
+    """地点ごとに in_window に該当する値の最大・最小（該当なしは None）"""
+    maxima: list = []
+    minima: list = []
+    end = 0
+    for count in counts:
+        start, end = end, end + count
+        selected = [value for value, hour in zip(values[start:end], hours[start:end], strict=True) if in_window(hour)]
+        maxima.append(max(selected) if selected else None)
+        minima.append(min(selected) if selected else None)
+    return maxima, minima
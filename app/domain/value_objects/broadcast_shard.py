@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class BroadcastShard:
+    """分散配信で1ワーカーが担当する範囲（run_id の配信を count 個に分けたうちの index 番目）"""
+
+    run_id: str
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if not self.run_id:
+            raise ValueError("run_id は必須です")
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ValueError("index は0以上 count 未満である必要があります")
+
+
+@dataclass(frozen=True)
+class BroadcastRunProgress:
+    """分散配信1回分の集計（完了済みシャードの成功・失敗数の合計）"""
+
+    run_id: str
+    shard_count: int
+    completed_shards: int
+    success_count: int
+    failure_count: int
+
+    @property
+    def is_complete(self) -> bool:
+        return self.completed_shards >= self.shard_count
@@ -0,0 +1,9 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class DeliveryCheckpoint:
+    """1回の配信の途中経過（配信済みのユーザーIDと配信を完了した地点グループ）"""
+
+    delivered_user_ids: frozenset[str] = field(default_factory=frozenset)
+    completed_groups: frozenset[str] = field(default_factory=frozenset)
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+from domain.value_objects.location import Location
+
+
+@dataclass(frozen=True)
+class LocationGroup:
+    """同一地点に登録されたユーザーIDをまとめた値オブジェクト"""
+
+    location: Location
+    user_ids: tuple[str, ...]
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RegionRegistration:
+    """Webhook で受け付けた地域設定の依頼（ユーザーが送った地名と返信用トークン）"""
+
+    user_id: str
+    city_name: str
+    reply_token: str
+    # LINE の webhookEventId（再送されたイベントの重複排除に使う）
+    event_id: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.user_id:
+            raise ValueError("user_id は必須です")
@@ -0,0 +1,78 @@
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+def parse_hour(time_text: str) -> int:
+    """時刻の文字列（YYYY-MM-DD HH:MM）の時を得る（strptime と同じ結果を文字列の切り出しで得る）"""
+    if len(time_text) == 16 and time_text[10] == " " and time_text[13] == ":" and time_text[11:13].isdigit():
+        return int(time_text[11:13])
+    return datetime.strptime(time_text, "%Y-%m-%d %H:%M").hour
+
+
+@dataclass(frozen=True, slots=True)
+class TemperatureSeries:
+    """1地点の1時間ごとの気温
+
+    JST の時（hours）と気温（temps）の並列配列で持ち、要素ごとの dict や時刻文字列を持たない。
+    """
+
+    hours: array = field(default_factory=lambda: array("b"))
+    temps: array = field(default_factory=lambda: array("d"))
+
+    def __post_init__(self) -> None:
+        if len(self.hours) != len(self.temps):
+            raise ValueError("hours と temps の要素数が一致しません")
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def __iter__(self) -> Iterator[tuple[int, float]]:
+        return zip(self.hours, self.temps, strict=True)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[dict]) -> "TemperatureSeries":
+        """{"time": "YYYY-MM-DD HH:MM", "temp": float} 形式（hour があればそれを使う）から作成
+
+        Raises:
+            ValueError: 時刻を解釈できない場合
+        """
+        hours = array("b")
+        temps = array("d")
+        for entry in entries:
+            hour = entry.get("hour")
+            hours.append(parse_hour(entry["time"]) if hour is None else hour)
+            temps.append(entry["temp"])
+        return cls(hours, temps)
+
+
+@dataclass(frozen=True, slots=True)
+class PopSeries:
+    """1地域の6時間ごとの降水確率
+
+    各ブロックの開始時（JST の時, hours）と降水確率（pops）の並列配列。
+    """
+
+    hours: array = field(default_factory=lambda: array("b"))
+    pops: array = field(default_factory=lambda: array("h"))
+
+    def __post_init__(self) -> None:
+        if len(self.hours) != len(self.pops):
+            raise ValueError("hours と pops の要素数が一致しません")
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.hours, self.pops, strict=True)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[dict]) -> "PopSeries":
+        """{"time": datetime, "pop": int} 形式から作成"""
+        hours = array("b")
+        pops = array("h")
+        for entry in entries:
+            hours.append(entry["time"].hour)
+            pops.append(entry["pop"])
+        return cls(hours, pops)
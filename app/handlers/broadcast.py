@@ -1,59 +1,319 @@
+import asyncio
 import os
+import uuid
 from typing import Any
 
-import boto3
-
 from domain.services.weather_calculator import WeatherCalculator
+from domain.value_objects.broadcast_shard import BroadcastShard
+from handlers.container import Container
+from infrastructure.dynamodb.broadcast_run_repository import DynamoDBBroadcastRunRepository
+from infrastructure.dynamodb.delivery_ledger import DynamoDBDeliveryLedger
+from infrastructure.dynamodb.forecast_store import DynamoDBForecastStore
 from infrastructure.dynamodb.user_repository import DynamoDBUserRepository
+from infrastructure.http.async_client import create_async_client
 from infrastructure.jma.area_mapper import JmaAreaMapper
-from infrastructure.jma.client import JmaForecastClient
+from infrastructure.jma.area_snapshot import DEFAULT_BUNDLED_SNAPSHOT_PATH
+from infrastructure.jma.async_area_mapper import AsyncJmaAreaMapper
+from infrastructure.jma.async_client import AsyncJmaForecastClient
+from infrastructure.jma.client import JmaForecastClient, OfficePops
+from infrastructure.line.async_messaging_client import AsyncLineMessagingClient
+from infrastructure.line.delivery_scheduler import DEFAULT_MULTICAST_QPS, DeliveryScheduler
 from infrastructure.line.messaging_client import LineMessagingClient
+from infrastructure.secretsmanager.secrets_provider import get_secrets_provider
+from infrastructure.sqs.shard_queue import SqsShardQueue, decode_shard
+from infrastructure.weatherapi.async_client import AsyncWeatherApiClient
 from infrastructure.weatherapi.client import WeatherApiClient
-from usecases.broadcast_weather import BroadcastWeatherUseCase
+from usecases.async_broadcast_weather import DEFAULT_MAX_CONCURRENCY, AsyncBroadcastWeatherUseCase
+from usecases.broadcast_weather import DEFAULT_GRID_SIZE, BroadcastWeatherUseCase, DedupPolicy
+from usecases.prefetch_forecasts import PrefetchForecastsUseCase
+from usecases.sharded_broadcast import BroadcastShardUseCase, DispatchBroadcastShardsUseCase
+from utils.cache import TTLCache
 from utils.logger import get_logger, log_error, log_info
 
 logger = get_logger(__name__)
 
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_SCAN_SEGMENTS = 1
+DEFAULT_SHARD_COUNT = 8
+AREA_SNAPSHOT_PATH = "/tmp/jma_area_snapshot.json"
 
-def _get_secret(secret_name: str) -> str:
-    """Secrets Managerからシークレットを取得"""
-    client = boto3.client("secretsmanager")
-    response = client.get_secret_value(SecretId=secret_name)
-    return response["SecretString"]
+# 気象庁予報の office 単位キャッシュ。ウォームスタート間で共有し、TTL で鮮度を保つ
+_forecast_cache: TTLCache[str, OfficePops] = TTLCache(
+    maxsize=128, ttl=float(os.environ.get("JMA_FORECAST_CACHE_TTL_SECONDS", 600))
+)
 
 
-def handler(event: dict, context: Any) -> dict:
-    """天気配信Lambda関数エントリポイント"""
-    try:
-        log_info(logger, "天気配信Lambda起動")
+def _get_secrets(*secret_names: str) -> list[str]:
+    """複数のシークレットを1回の呼び出しでまとめて取得（ウォームスタート間でキャッシュする）"""
+    secrets = get_secrets_provider().get_many(secret_names)
+    return [secrets[name] for name in secret_names]
+
 
-        table_name = os.environ["TABLE_NAME"]
-        channel_access_token_name = os.environ["LINE_CHANNEL_ACCESS_TOKEN_NAME"]
-        weatherapi_api_key_name = os.environ["WEATHERAPI_API_KEY_NAME"]
+# 依存関係はウォームスタート間で再利用する（_get_secrets は呼び出し時に参照するためテストで差し替えられる）
+_container = Container(lambda *names: _get_secrets(*names))
 
-        channel_access_token = _get_secret(channel_access_token_name)
-        weatherapi_api_key = _get_secret(weatherapi_api_key_name)
 
-        user_repository = DynamoDBUserRepository(table_name)
-        weather_client = WeatherApiClient(weatherapi_api_key)
-        messaging_client = LineMessagingClient(channel_access_token)
-        weather_calculator = WeatherCalculator()
-        jma_client = JmaForecastClient()
-        jma_area_mapper = JmaAreaMapper()
+async def _execute_async(user_repository: DynamoDBUserRepository) -> int:
+    """非同期版ユースケースで配信し、気象庁予報の取得回数を返す
 
-        usecase = BroadcastWeatherUseCase(
+    AsyncClient はイベントループに紐づくため、クライアントとユースケースは実行ごとに生成する。
+    """
+    channel_access_token, weatherapi_api_key = _broadcast_secrets()
+    max_concurrency = _container.env_int("BROADCAST_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+    async with create_async_client(max_connections=max_concurrency) as http:
+        jma_client = AsyncJmaForecastClient(http, cache=_forecast_cache)
+        usecase = AsyncBroadcastWeatherUseCase(
             user_repository=user_repository,
-            weather_client=weather_client,
-            messaging_client=messaging_client,
-            weather_calculator=weather_calculator,
+            weather_client=AsyncWeatherApiClient(weatherapi_api_key, http, lean=_lean_weatherapi_fetch()),
+            messaging_client=AsyncLineMessagingClient(channel_access_token, http),
+            weather_calculator=WeatherCalculator(),
             jma_client=jma_client,
-            jma_area_mapper=jma_area_mapper,
+            jma_area_mapper=AsyncJmaAreaMapper(
+                http,
+                snapshot_path=AREA_SNAPSHOT_PATH,
+                bundled_snapshot_path=DEFAULT_BUNDLED_SNAPSHOT_PATH,
+            ),
+            max_concurrency=max_concurrency,
+            dedup_policy=_dedup_policy(),
+            grid_size=_grid_size(),
         )
-        usecase.execute()
+        await usecase.execute()
+    return jma_client.fetch_count
+
+
+def _broadcast_secrets() -> list[str]:
+    """配信に使う LINE のアクセストークンと WeatherAPI のキーを1回の呼び出しでまとめて取得"""
+    return _container.secrets(
+        _container.require_env("LINE_CHANNEL_ACCESS_TOKEN_NAME"), _container.require_env("WEATHERAPI_API_KEY_NAME")
+    )
+
+
+def _lean_weatherapi_fetch() -> bool:
+    """WEATHERAPI_LEAN_FETCH=true なら WeatherAPI を最小のレスポンスで取得し、受信しながら気温だけを読む"""
+    return _container.env("WEATHERAPI_LEAN_FETCH") == "true"
+
+
+def _dedup_policy() -> DedupPolicy:
+    return DedupPolicy(_container.env("BROADCAST_DEDUP_POLICY", DedupPolicy.EXACT))
+
+
+def _grid_size() -> float:
+    return _container.env_float("BROADCAST_GRID_SIZE", DEFAULT_GRID_SIZE)
+
+
+def _max_workers() -> int:
+    return _container.env_int("BROADCAST_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+
+
+def _jma_client() -> JmaForecastClient:
+    return _container.get("jma_client", lambda: JmaForecastClient(cache=_forecast_cache))
+
+
+def _jma_area_mapper() -> JmaAreaMapper:
+    """地域コードの索引は読み込んだ後もウォームスタート間で再利用する"""
+    return _container.get(
+        "jma_area_mapper",
+        lambda: JmaAreaMapper(snapshot_path=AREA_SNAPSHOT_PATH, bundled_snapshot_path=DEFAULT_BUNDLED_SNAPSHOT_PATH),
+    )
+
+
+def _weather_client() -> WeatherApiClient:
+    def create() -> WeatherApiClient:
+        (weatherapi_api_key,) = _container.secrets(_container.require_env("WEATHERAPI_API_KEY_NAME"))
+        return WeatherApiClient(weatherapi_api_key, lean=_lean_weatherapi_fetch())
+
+    return _container.get("weather_client", create)
+
+
+def _messaging_client() -> LineMessagingClient:
+    def create() -> LineMessagingClient:
+        (channel_access_token,) = _container.secrets(_container.require_env("LINE_CHANNEL_ACCESS_TOKEN_NAME"))
+        # 全ワーカーの multicast を共有のスケジューラーで LINE のレート上限未満に抑える
+        multicast_qps = _container.env_float("LINE_MULTICAST_QPS", DEFAULT_MULTICAST_QPS)
+        return LineMessagingClient(channel_access_token, scheduler=DeliveryScheduler(qps=multicast_qps))
+
+    return _container.get("messaging_client", create)
+
+
+def _create_usecase(shard: BroadcastShard | None = None) -> BroadcastWeatherUseCase:
+    """環境変数の設定で同期版の配信ユースケースを組み立てる"""
+    # 配信台帳があれば、同じ日の再実行は配信済みのユーザーを飛ばして再開する
+    ledger_table_name = _container.env("DELIVERY_LEDGER_TABLE_NAME")
+    # 事前計算テーブルがあれば、prefetch_handler が計算済みの天気を読み込んで配信する
+    forecast_table_name = _container.env("FORECAST_TABLE_NAME")
+
+    user_repository = _user_repository(shard)
+    return BroadcastWeatherUseCase(
+        user_repository=user_repository,
+        weather_client=_weather_client(),
+        messaging_client=_messaging_client(),
+        weather_calculator=WeatherCalculator(),
+        jma_client=_jma_client(),
+        jma_area_mapper=_jma_area_mapper(),
+        max_workers=_max_workers(),
+        # 地点テーブルが設定されていれば地点インデックスから地点単位で読み込む
+        use_location_index=user_repository.locations_table is not None,
+        dedup_policy=_dedup_policy(),
+        grid_size=_grid_size(),
+        delivery_ledger=DynamoDBDeliveryLedger(ledger_table_name) if ledger_table_name else None,
+        forecast_store=DynamoDBForecastStore(forecast_table_name) if forecast_table_name else None,
+    )
+
+
+def _broadcast_usecase(shard: BroadcastShard | None = None) -> BroadcastWeatherUseCase:
+    """配信ユースケースを取得（シャードごとに1回だけ組み立てる）"""
+    key = f"broadcast_usecase:{shard.index}/{shard.count}" if shard else "broadcast_usecase"
+    return _container.get(key, lambda: _create_usecase(shard))
+
+
+def _user_repository(shard: BroadcastShard | None = None) -> DynamoDBUserRepository:
+    """ユーザーリポジトリを取得（シャード指定時はシャード内のユーザーのみ読み込む）"""
+
+    def create() -> DynamoDBUserRepository:
+        return DynamoDBUserRepository(
+            _container.require_env("TABLE_NAME"),
+            total_segments=_container.env_int("USERS_SCAN_SEGMENTS", DEFAULT_SCAN_SEGMENTS),
+            locations_table_name=_container.env("LOCATIONS_TABLE_NAME"),
+            shard_index=shard.index if shard else 0,
+            shard_count=shard.count if shard else 1,
+        )
+
+    key = f"user_repository:{shard.index}/{shard.count}" if shard else "user_repository"
+    return _container.get(key, create)
 
-        log_info(logger, "天気配信Lambda正常終了")
+
+def _run_repository() -> DynamoDBBroadcastRunRepository:
+    return _container.get(
+        "run_repository",
+        lambda: DynamoDBBroadcastRunRepository(_container.require_env("BROADCAST_RUNS_TABLE_NAME")),
+    )
+
+
+def _dispatch_shards(event: dict, queue_url: str) -> None:
+    """コーディネーターとして配信をシャードに分け、ワーカー用のキューへ投入"""
+    # EventBridge のイベントIDを実行IDとする（手動実行などでイベントIDがない場合は採番）
+    run_id = event.get("id") or str(uuid.uuid4())
+    usecase = _container.get(
+        "dispatch_usecase",
+        lambda: DispatchBroadcastShardsUseCase(
+            shard_queue=SqsShardQueue(queue_url),
+            run_repository=_run_repository(),
+            shard_count=_container.env_int("BROADCAST_SHARD_COUNT", DEFAULT_SHARD_COUNT),
+        ),
+    )
+    usecase.execute(run_id)
+
+
+def handler(event: dict, context: Any) -> dict:
+    """天気配信Lambda関数エントリポイント
+
+    BROADCAST_SHARD_QUEUE_URL が設定されている場合はコーディネーターとして動作し、
+    配信はキュー経由で worker_handler が行う。
+    """
+    try:
+        log_info(logger, "天気配信Lambda起動")
+        _container.refresh()
+
+        shard_queue_url = _container.env("BROADCAST_SHARD_QUEUE_URL")
+        if shard_queue_url:
+            _dispatch_shards(event, shard_queue_url)
+            log_info(logger, "天気配信Lambda正常終了")
+            return {"statusCode": 200, "body": "OK"}
+
+        _broadcast_secrets()
+        if _container.env("BROADCAST_ASYNC") == "true":
+            # 非同期版は地点インデックスに未対応のため、ユーザーテーブルから読み込む
+            jma_fetch_count = asyncio.run(_execute_async(_user_repository()))
+        else:
+            usecase = _broadcast_usecase()
+            # 気象庁予報クライアントは再利用するため、取得回数は今回の実行分の差分を記録する
+            jma_client = _jma_client()
+            fetch_count = jma_client.fetch_count
+            usecase.execute()
+            jma_fetch_count = jma_client.fetch_count - fetch_count
+
+        log_info(
+            logger,
+            "天気配信Lambda正常終了",
+            jma_forecast_fetch_count=jma_fetch_count,
+            jma_forecast_cache_hits=_forecast_cache.hits,
+        )
         return {"statusCode": 200, "body": "OK"}
 
     except Exception as e:
         log_error(logger, "天気配信Lambda異常終了", error=str(e))
         return {"statusCode": 500, "body": "Internal Server Error"}
+
+
+def worker_handler(event: dict, context: Any) -> dict:
+    """分散配信ワーカーLambda関数エントリポイント（SQS イベント）
+
+    メッセージ1件が1シャード。処理に失敗したメッセージは batchItemFailures で返す。
+    """
+    log_info(logger, "分散配信ワーカーLambda起動", records=len(event.get("Records", [])))
+    failures: list[dict] = []
+    try:
+        _container.refresh()
+        _broadcast_secrets()
+        usecase = _container.get(
+            "shard_usecase",
+            lambda: BroadcastShardUseCase(broadcast_factory=_broadcast_usecase, run_repository=_run_repository()),
+        )
+    except Exception as e:
+        log_error(logger, "分散配信ワーカーLambda異常終了", error=str(e))
+        return {"batchItemFailures": [{"itemIdentifier": r["messageId"]} for r in event.get("Records", [])]}
+
+    for record in event.get("Records", []):
+        try:
+            usecase.execute(decode_shard(record["body"]))
+        except Exception as e:
+            log_error(logger, "シャード配信失敗", error=str(e), message_id=record["messageId"])
+            failures.append({"itemIdentifier": record["messageId"]})
+
+    log_info(logger, "分散配信ワーカーLambda終了", failed_records=len(failures))
+    return {"batchItemFailures": failures}
+
+
+def _create_prefetch_usecase() -> PrefetchForecastsUseCase:
+    """環境変数の設定で天気の事前計算ユースケースを組み立てる"""
+    user_repository = _user_repository()
+    return PrefetchForecastsUseCase(
+        user_repository=user_repository,
+        weather_client=_weather_client(),
+        weather_calculator=WeatherCalculator(),
+        jma_client=_jma_client(),
+        jma_area_mapper=_jma_area_mapper(),
+        forecast_store=DynamoDBForecastStore(_container.require_env("FORECAST_TABLE_NAME")),
+        max_workers=_max_workers(),
+        use_location_index=user_repository.locations_table is not None,
+        dedup_policy=_dedup_policy(),
+        grid_size=_grid_size(),
+    )
+
+
+def prefetch_handler(event: dict, context: Any) -> dict:
+    """天気事前計算Lambda関数エントリポイント
+
+    配信前に全地点の実質天気を算出して FORECAST_TABLE_NAME のテーブルへ保存する。
+    配信（handler・worker_handler）は保存済みの天気を読み込み、天気の取得を待たずに配信する。
+    """
+    try:
+        log_info(logger, "天気事前計算Lambda起動")
+        _container.refresh()
+
+        usecase = _container.get("prefetch_usecase", _create_prefetch_usecase)
+        jma_client = _jma_client()
+        fetch_count = jma_client.fetch_count
+        forecasts = usecase.execute()
+
+        log_info(
+            logger,
+            "天気事前計算Lambda正常終了",
+            forecasts=forecasts,
+            jma_forecast_fetch_count=jma_client.fetch_count - fetch_count,
+        )
+        return {"statusCode": 200, "body": "OK"}
+
+    except Exception as e:
+        log_error(logger, "天気事前計算Lambda異常終了", error=str(e))
+        return {"statusCode": 500, "body": "Internal Server Error"}
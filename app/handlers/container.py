@@ -0,0 +1,141 @@
+import os
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any, TypeVar, cast, overload
+
+from utils.logger import get_logger, log_info
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class Container:
+    """ハンドラーの依存関係（クライアント・リポジトリ・ユースケース）をプロセス内で1回だけ組み立てる
+
+    ハンドラーのモジュールスコープに置き、boto3 リソース・HTTP クライアント・地域コードの索引などを
+    Lambda のウォームスタート間で再利用する。依存関係は get で初回の利用時に組み立てる。
+
+    組み立てに使った環境変数（env）とシークレット（secrets）を記録し、refresh で変更を検出すると
+    該当する依存関係を破棄する（次回の get で組み立て直す）。シークレットを使った依存関係と、
+    それを使って組み立てた依存関係は invalidate_secrets で、すべての依存関係は
+    invalidate_config で明示的に破棄することもできる。
+
+    Args:
+        get_secrets: シークレット名を受け取り、値を同じ順序で返す関数
+        environ: 環境変数（テスト用に差し替え可能）
+    """
+
+    def __init__(
+        self,
+        get_secrets: Callable[..., list[str]],
+        environ: Mapping[str, str] = os.environ,
+    ) -> None:
+        self._get_secrets = get_secrets
+        self._environ = environ
+        self._lock = threading.RLock()
+        self._instances: dict[str, Any] = {}
+        self._secret_dependent: set[str] = set()
+        # 組み立て中の依存関係のキー（入れ子で組み立てる依存関係にシークレットの利用を伝える）
+        self._building: list[str] = []
+        self._config_used: dict[str, str | None] = {}
+        self._secrets_used: dict[str, str] = {}
+
+    def get(self, key: str, factory: Callable[[], T]) -> T:
+        """key の依存関係を取得（未生成なら factory で組み立てて保持する）"""
+        with self._lock:
+            if key in self._instances:
+                if key in self._secret_dependent:
+                    self._secret_dependent.update(self._building)
+                return cast(T, self._instances[key])
+            self._building.append(key)
+            try:
+                instance = factory()
+            finally:
+                self._building.pop()
+            self._instances[key] = instance
+            return instance
+
+    @overload
+    def env(self, name: str) -> str | None: ...
+
+    @overload
+    def env(self, name: str, default: str) -> str: ...
+
+    def env(self, name: str, default: str | None = None) -> str | None:
+        """環境変数を取得し、変更の検出用に記録する"""
+        with self._lock:
+            value = self._environ.get(name)
+            self._config_used[name] = value
+            return default if value is None else value
+
+    def env_int(self, name: str, default: int) -> int:
+        """整数の環境変数を取得し、変更の検出用に記録する
+
+        Raises:
+            ValueError: 整数として解釈できない場合
+        """
+        value = self.env(name)
+        return default if value is None else int(value)
+
+    def env_float(self, name: str, default: float) -> float:
+        """数値の環境変数を取得し、変更の検出用に記録する
+
+        Raises:
+            ValueError: 数値として解釈できない場合
+        """
+        value = self.env(name)
+        return default if value is None else float(value)
+
+    def require_env(self, name: str) -> str:
+        """必須の環境変数を取得し、変更の検出用に記録する
+
+        Raises:
+            KeyError: 環境変数が設定されていない場合
+        """
+        value = self.env(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def secrets(self, *names: str) -> list[str]:
+        """シークレットを取得（refresh 以降に取得済みのものは再取得しない）"""
+        with self._lock:
+            self._secret_dependent.update(self._building)
+            missing = [name for name in names if name not in self._secrets_used]
+            if missing:
+                self._secrets_used.update(zip(missing, self._get_secrets(*missing), strict=True))
+            return [self._secrets_used[name] for name in names]
+
+    def refresh(self) -> None:
+        """ハンドラーの呼び出しごとに呼び、環境変数・シークレットの変更を依存関係に反映する"""
+        with self._lock:
+            changed = [name for name, value in self._config_used.items() if self._environ.get(name) != value]
+            if changed:
+                log_info(logger, "設定の変更を検出", names=changed)
+                self.invalidate_config()
+                return
+            if not self._secrets_used:
+                return
+            names = list(self._secrets_used)
+            current = dict(zip(names, self._get_secrets(*names), strict=True))
+            if current != self._secrets_used:
+                log_info(logger, "シークレットの変更を検出")
+                self.invalidate_secrets()
+                self._secrets_used = current
+
+    def invalidate_secrets(self) -> None:
+        """シークレットを使って組み立てた依存関係を破棄"""
+        with self._lock:
+            for key in self._secret_dependent:
+                self._instances.pop(key, None)
+            self._secret_dependent.clear()
+            self._secrets_used.clear()
+
+    def invalidate_config(self) -> None:
+        """すべての依存関係を破棄"""
+        with self._lock:
+            self._instances.clear()
+            self._secret_dependent.clear()
+            self._config_used.clear()
+            self._secrets_used.clear()
@@ -1,21 +1,39 @@
+"""LINE Webhook Lambda
+
+コールドスタートを短くするため、モジュールの読み込み時には標準ライブラリと軽量なモジュールのみを読み込む。
+boto3・requests を使うインフラ層とユースケースは、署名検証を通過したメッセージイベントを処理するときに
+初めて読み込む（署名検証に失敗したリクエストやメッセージのないイベントでは読み込まない）。
+"""
+
+from __future__ import annotations
+
 import base64
 import hashlib
 import hmac
 import json
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import boto3
-
-from infrastructure.dynamodb.user_repository import DynamoDBUserRepository
-from infrastructure.line.messaging_client import LineMessagingClient
-from infrastructure.gsi.geocoding_client import GsiGeocodingClient
-from usecases.register_region import RegisterRegionUseCase
+from domain.value_objects.region_registration import RegionRegistration
+from handlers.container import Container
+from infrastructure.secretsmanager.secrets_provider import get_secrets_provider
+from utils.cache import TTLCache
 from utils.logger import get_logger, log_error, log_info
 
+if TYPE_CHECKING:
+    from domain.repositories.registration_queue import RegistrationQueue
+    from infrastructure.gsi.geocoding_cache import GeocodingOutcome
+    from usecases.register_region import RegisterRegionUseCase
+
 logger = get_logger(__name__)
 
 CONFIRM_COMMANDS = ("設定確認", "確認", "設定")
 
+# 1回の Webhook（またはワーカーの1バッチ）で並行して処理するユーザー数
+DEFAULT_REGISTRATION_MAX_WORKERS = 8
+
+# 住所検索結果のメモリキャッシュ。ウォームスタート間で共有する
+_geocoding_cache: TTLCache[str, GeocodingOutcome] = TTLCache(maxsize=1024, ttl=24 * 60 * 60)
+
 
 def verify_signature(body: str, signature: str, channel_secret: str) -> bool:
     """LINE Webhookの署名検証"""
@@ -28,70 +46,180 @@ def verify_signature(body: str, signature: str, channel_secret: str) -> bool:
     return hmac.compare_digest(signature, expected_signature)
 
 
-def _get_secret(secret_name: str) -> str:
-    """Secrets Managerからシークレットを取得"""
-    client = boto3.client("secretsmanager")
-    response = client.get_secret_value(SecretId=secret_name)
-    return response["SecretString"]
+def _get_secrets(*secret_names: str) -> list[str]:
+    """複数のシークレットを1回の呼び出しでまとめて取得（ウォームスタート間でキャッシュする）"""
+    secrets = get_secrets_provider().get_many(secret_names)
+    return [secrets[name] for name in secret_names]
+
+
+def _refresh_secret(secret_name: str) -> str:
+    """ローテーションされた可能性があるシークレットを取得し直す"""
+    return get_secrets_provider().refresh(secret_name)
 
 
-def _handle_message_event(
-    event: dict,
-    register_region_usecase: RegisterRegionUseCase,
-) -> None:
-    """メッセージイベントを処理"""
+# 依存関係はウォームスタート間で再利用する（_get_secrets は呼び出し時に参照するためテストで差し替えられる）
+_container = Container(lambda *names: _get_secrets(*names))
+
+
+def _create_register_region_usecase() -> RegisterRegionUseCase:
+    """環境変数の設定で住所登録ユースケースを組み立てる（boto3・requests はここで読み込む）"""
+    from infrastructure.dynamodb.geocoding_cache_store import DynamoDBGeocodingCacheStore
+    from infrastructure.dynamodb.user_repository import DynamoDBUserRepository
+    from infrastructure.gsi.geocoding_client import GsiGeocodingClient
+    from infrastructure.line.messaging_client import LineMessagingClient
+    from usecases.register_region import RegisterRegionUseCase
+
+    (channel_access_token,) = _container.secrets(_container.require_env("LINE_CHANNEL_ACCESS_TOKEN_NAME"))
+    user_repository = DynamoDBUserRepository(
+        _container.require_env("TABLE_NAME"), locations_table_name=_container.env("LOCATIONS_TABLE_NAME")
+    )
+    geocoding_cache_table_name = _container.env("GEOCODING_CACHE_TABLE_NAME")
+    geocoding_client = GsiGeocodingClient(
+        cache=_geocoding_cache,
+        cache_store=DynamoDBGeocodingCacheStore(geocoding_cache_table_name) if geocoding_cache_table_name else None,
+    )
+    messaging_client = LineMessagingClient(channel_access_token)
+    return RegisterRegionUseCase(
+        user_repository,
+        geocoding_client,
+        messaging_client,
+        max_workers=_container.env_int("REGISTRATION_MAX_WORKERS", DEFAULT_REGISTRATION_MAX_WORKERS),
+    )
+
+
+def _registration_queue(queue_url: str) -> RegistrationQueue:
+    from infrastructure.sqs.registration_queue import SqsRegistrationQueue
+
+    return _container.get("registration_queue", lambda: SqsRegistrationQueue(queue_url))
+
+
+def _to_registration(event: dict) -> RegionRegistration | None:
+    """メッセージイベントを地域設定の依頼に変換（テキスト以外・設定確認のコマンドは None）"""
     message = event.get("message", {})
     if message.get("type") != "text":
-        return
+        return None
 
     user_id = event["source"]["userId"]
     text = message["text"].strip()
-    reply_token = event["replyToken"]
 
     if text in CONFIRM_COMMANDS:
-        return
+        return None
 
     log_info(logger, "メッセージ受信", user_id=user_id, text=text)
-    register_region_usecase.execute(user_id, text, reply_token)
+    return RegionRegistration(
+        user_id=user_id,
+        city_name=text,
+        reply_token=event["replyToken"],
+        event_id=event.get("webhookEventId", ""),
+    )
+
+
+def _register(registrations: list[RegionRegistration]) -> None:
+    """地域設定の依頼を処理（ユーザーごとの順序を保ち、異なるユーザーの依頼は並行実行する）
+
+    その場で処理する場合は再試行しないため、失敗した依頼にはエラーを返信する。
+    """
+    register_region_usecase = _container.get("register_region_usecase", _create_register_region_usecase)
+    for index in register_region_usecase.execute_all(registrations):
+        register_region_usecase.reply_error(registrations[index].user_id, registrations[index].reply_token)
 
 
 def handler(event: dict, context: Any) -> dict:
-    """Lambda関数エントリポイント"""
-    import os
+    """Lambda関数エントリポイント
 
+    WEBHOOK_EVENT_QUEUE_URL が設定されている場合は、署名を検証して地域設定の依頼をキューに投入し、
+    処理を待たずに応答する（地域設定は registration_worker_handler が行う）。
+    """
     try:
+        _container.refresh()
+
         body = event.get("body", "")
         headers = event.get("headers", {})
         signature = headers.get("x-line-signature") or headers.get("X-Line-Signature", "")
 
-        channel_secret_name = os.environ["LINE_CHANNEL_SECRET_NAME"]
-        channel_access_token_name = os.environ["LINE_CHANNEL_ACCESS_TOKEN_NAME"]
-        table_name = os.environ["TABLE_NAME"]
-
-        channel_secret = _get_secret(channel_secret_name)
+        channel_secret_name = _container.require_env("LINE_CHANNEL_SECRET_NAME")
+        # アクセストークンも同じ呼び出しでまとめて取得しておく
+        channel_secret, _ = _container.secrets(
+            channel_secret_name, _container.require_env("LINE_CHANNEL_ACCESS_TOKEN_NAME")
+        )
 
         if not verify_signature(body, signature, channel_secret):
-            log_error(logger, "署名検証失敗")
-            return {"statusCode": 401, "body": "Unauthorized"}
-
-        channel_access_token = _get_secret(channel_access_token_name)
-
-        user_repository = DynamoDBUserRepository(table_name)
-        geocoding_client = GsiGeocodingClient()
-        messaging_client = LineMessagingClient(channel_access_token)
-        register_region_usecase = RegisterRegionUseCase(
-            user_repository, geocoding_client, messaging_client
-        )
+            # チャネルシークレットのローテーション直後はキャッシュが古いため、取得し直して再検証する
+            refreshed_secret = _refresh_secret(channel_secret_name)
+            if refreshed_secret == channel_secret or not verify_signature(body, signature, refreshed_secret):
+                log_error(logger, "署名検証失敗")
+                return {"statusCode": 401, "body": "Unauthorized"}
+            _container.invalidate_secrets()
 
         body_json = json.loads(body)
-        events = body_json.get("events", [])
-
-        for evt in events:
-            if evt.get("type") == "message":
-                _handle_message_event(evt, register_region_usecase)
-
+        registrations = [
+            registration
+            for evt in body_json.get("events", [])
+            if evt.get("type") == "message" and (registration := _to_registration(evt)) is not None
+        ]
+
+        if registrations:
+            queue_url = _container.env("WEBHOOK_EVENT_QUEUE_URL")
+            if queue_url:
+                _registration_queue(queue_url).send_registrations(registrations)
+                log_info(logger, "地域設定の依頼をキューに投入", registrations=len(registrations))
+            else:
+                _register(registrations)
+
+        log_info(
+            logger,
+            "住所検索キャッシュ",
+            hits=_geocoding_cache.hits,
+            misses=_geocoding_cache.misses,
+            size=len(_geocoding_cache),
+        )
         return {"statusCode": 200, "body": "OK"}
 
     except Exception as e:
         log_error(logger, "Webhook処理エラー", error=str(e))
         return {"statusCode": 500, "body": "Internal Server Error"}
+
+
+def registration_worker_handler(event: dict, context: Any) -> dict:
+    """地域設定ワーカーLambda関数エントリポイント（SQS イベント）
+
+    メッセージ1件が地域設定の依頼1件。解釈できないメッセージと、住所検索・DynamoDB・LINE の障害で
+    処理に失敗した依頼は batchItemFailures で返し、SQS の再試行（上限を超えたら DLQ）に任せる。
+    FIFO キューでは、失敗したメッセージより後の同じメッセージグループ（userId）のメッセージも
+    処理せずに返し、同じユーザーの依頼の順序を保つ。
+    """
+    from infrastructure.sqs.registration_queue import decode_registration
+
+    records = event.get("Records", [])
+    log_info(logger, "地域設定ワーカーLambda起動", records=len(records))
+    try:
+        _container.refresh()
+        register_region_usecase = _container.get("register_region_usecase", _create_register_region_usecase)
+    except Exception as e:
+        log_error(logger, "地域設定ワーカーLambda異常終了", error=str(e))
+        return {"batchItemFailures": [{"itemIdentifier": r["messageId"]} for r in records]}
+
+    failed_ids: list[str] = []
+    failed_groups: set[str] = set()
+    message_ids: list[str] = []
+    registrations: list[RegionRegistration] = []
+    for record in records:
+        group_id = record.get("attributes", {}).get("MessageGroupId")
+        try:
+            if group_id is not None and group_id in failed_groups:
+                raise ValueError("同じメッセージグループの先行するメッセージが失敗しました")
+            registrations.append(decode_registration(record["body"]))
+            message_ids.append(record["messageId"])
+        except ValueError as e:
+            log_error(logger, "地域設定の依頼の処理失敗", error=str(e), message_id=record["messageId"])
+            failed_ids.append(record["messageId"])
+            if group_id is not None:
+                failed_groups.add(group_id)
+
+    # ユーザーごとの順序を保ち、異なるユーザーの依頼は並行実行する
+    failed_ids.extend(message_ids[index] for index in register_region_usecase.execute_all(registrations))
+    failed = set(failed_ids)
+    failures = [{"itemIdentifier": r["messageId"]} for r in records if r["messageId"] in failed]
+
+    log_info(logger, "地域設定ワーカーLambda終了", failed_records=len(failures))
+    return {"batchItemFailures": failures}
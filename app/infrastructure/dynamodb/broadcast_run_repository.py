@@ -0,0 +1,87 @@
+import time
+from collections.abc import Callable
+
+import boto3
+from botocore.exceptions import ClientError
+
+from domain.repositories.broadcast_run_repository import BroadcastRunRepository
+from domain.value_objects.broadcast_shard import BroadcastRunProgress
+from utils.retry import retry
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+class DynamoDBBroadcastRunRepository(BroadcastRunRepository):
+    """分散配信の実行状況を DynamoDB の1アイテム（runId 単位）に集計する
+
+    完了したシャード番号を数値セット（completedShards）に記録し、同じシャードの結果は
+    条件付き更新で1回だけ加算する（キューの重複配信で二重に数えない）。
+    expiresAt は DynamoDB TTL の属性として使用する。
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.dynamodb = boto3.resource("dynamodb")
+        self.table = self.dynamodb.Table(table_name)
+        self.ttl_seconds = ttl_seconds
+        self._timer = timer
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def start_run(self, run_id: str, shard_count: int) -> None:
+        """配信の実行を登録（集計値は0から開始。登録済みの実行はそのまま残す）"""
+        try:
+            self.table.put_item(
+                Item={
+                    "runId": run_id,
+                    "shardCount": shard_count,
+                    "successCount": 0,
+                    "failureCount": 0,
+                    "expiresAt": int(self._timer()) + self.ttl_seconds,
+                },
+                # コーディネーターが再実行されても、集計済みの結果を消さない
+                ConditionExpression="attribute_not_exists(runId)",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+    @retry(max_attempts=3, backoff=[1, 2, 4], giveup=(ValueError,))
+    def record_shard_result(
+        self, run_id: str, shard_index: int, success_count: int, failure_count: int
+    ) -> BroadcastRunProgress:
+        """シャードの結果を加算し、加算後の集計を返す（記録済みのシャードは加算しない）"""
+        try:
+            response = self.table.update_item(
+                Key={"runId": run_id},
+                UpdateExpression="ADD successCount :success, failureCount :failure, completedShards :shards",
+                ConditionExpression="attribute_exists(runId) AND NOT contains(completedShards, :shard)",
+                ExpressionAttributeValues={
+                    ":success": success_count,
+                    ":failure": failure_count,
+                    ":shards": {shard_index},
+                    ":shard": shard_index,
+                },
+                ReturnValues="ALL_NEW",
+            )
+            item = response["Attributes"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            item = self.table.get_item(Key={"runId": run_id}, ConsistentRead=True).get("Item")
+            if item is None:
+                raise ValueError(f"配信の実行が登録されていません: {run_id}") from e
+        return self._to_progress(item)
+
+    @staticmethod
+    def _to_progress(item: dict) -> BroadcastRunProgress:
+        return BroadcastRunProgress(
+            run_id=item["runId"],
+            shard_count=int(item["shardCount"]),
+            completed_shards=len(item.get("completedShards", ())),
+            success_count=int(item["successCount"]),
+            failure_count=int(item["failureCount"]),
+        )
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+from domain.repositories.delivery_ledger import DeliveryLedger
+from domain.value_objects.delivery_checkpoint import DeliveryCheckpoint
+from utils.retry import retry
+
+# 配信台帳は再実行の判定にのみ使うため、翌日以降は TTL で削除する
+DEFAULT_TTL_SECONDS = 2 * 24 * 60 * 60
+
+# 書き込みをまとめる件数。BatchWriteItem（25件/リクエスト）の単位でまとめて書き込む
+DEFAULT_FLUSH_SIZE = 500
+
+USER_PREFIX = "user#"
+GROUP_PREFIX = "group#"
+
+
+class DynamoDBDeliveryLedger(DeliveryLedger):
+    """DynamoDB 実装の配信台帳
+
+    runDate（パーティションキー）と entryKey（"user#<userId>" または "group#<地点>"）の1テーブル。
+    記録はメモリ上に flush_size 件たまるまで保持し、BatchWriteItem でまとめて書き込む。
+    書き込み前に中断した分は再実行時に再送される（地点インデックスからの配信では、
+    宛先が同じチャンクの X-Line-Retry-Key により LINE 側で重複しない）。
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        flush_size: int = DEFAULT_FLUSH_SIZE,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.dynamodb = boto3.resource("dynamodb")
+        self.table = self.dynamodb.Table(table_name)
+        self.flush_size = flush_size
+        self.ttl_seconds = ttl_seconds
+        self._timer = timer
+        self._pending: list[dict] = []
+        self._lock = threading.Lock()
+        self.write_count = 0
+
+    def load(self, run_date: str) -> DeliveryCheckpoint:
+        """配信日の記録をすべて読み込む"""
+        delivered: set[str] = set()
+        groups: set[str] = set()
+        query_kwargs: dict = {
+            "KeyConditionExpression": Key("runDate").eq(run_date),
+            "ProjectionExpression": "entryKey",
+        }
+        while True:
+            response = self._query_page(**query_kwargs)
+            for item in response.get("Items", []):
+                entry_key: str = item["entryKey"]
+                if entry_key.startswith(USER_PREFIX):
+                    delivered.add(entry_key.removeprefix(USER_PREFIX))
+                elif entry_key.startswith(GROUP_PREFIX):
+                    groups.add(entry_key.removeprefix(GROUP_PREFIX))
+
+            if "LastEvaluatedKey" not in response:
+                break
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return DeliveryCheckpoint(delivered_user_ids=frozenset(delivered), completed_groups=frozenset(groups))
+
+    def record_delivered(self, run_date: str, user_ids: Iterable[str]) -> None:
+        self._add([self._item(run_date, USER_PREFIX + user_id) for user_id in user_ids])
+
+    def record_group_completed(self, run_date: str, group_key: str) -> None:
+        self._add([self._item(run_date, GROUP_PREFIX + group_key)])
+
+    def flush(self) -> None:
+        with self._lock:
+            items, self._pending = self._pending, []
+        if items:
+            self._write_items(items)
+
+    def _add(self, items: list[dict]) -> None:
+        with self._lock:
+            self._pending.extend(items)
+            if len(self._pending) < self.flush_size:
+                return
+            items, self._pending = self._pending, []
+        self._write_items(items)
+
+    def _item(self, run_date: str, entry_key: str) -> dict:
+        return {"runDate": run_date, "entryKey": entry_key, "expiresAt": int(self._timer()) + self.ttl_seconds}
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _write_items(self, items: list[dict]) -> None:
+        """BatchWriteItem でまとめて書き込む（未処理分の再送は batch_writer が行う）"""
+        with self.table.batch_writer(overwrite_by_pkeys=["runDate", "entryKey"]) as batch:
+            for item in items:
+                batch.put_item(Item=item)
+        self.write_count += len(items)
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _query_page(self, **query_kwargs: Any) -> dict:
+        """Queryを1ページ実行"""
+        return self.table.query(**query_kwargs)
@@ -0,0 +1,75 @@
+import time
+from collections.abc import Callable, Mapping
+from decimal import Decimal
+from typing import Any
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+from domain.repositories.forecast_store import ForecastStore
+from domain.value_objects.weather import Weather
+from utils.retry import retry
+
+# 事前計算した天気は当日の配信にのみ使うため、翌日以降は TTL で削除する
+DEFAULT_TTL_SECONDS = 2 * 24 * 60 * 60
+
+
+class DynamoDBForecastStore(ForecastStore):
+    """DynamoDB 実装の事前計算済み天気の保存先
+
+    runDate（パーティションキー）と forecastKey（ソートキー）の1テーブルで、
+    1配信日分を Query でまとめて読み込む。
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.dynamodb = boto3.resource("dynamodb")
+        self.table = self.dynamodb.Table(table_name)
+        self.ttl_seconds = ttl_seconds
+        self._timer = timer
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def save(self, run_date: str, forecasts: Mapping[str, Weather]) -> None:
+        """BatchWriteItem でまとめて書き込む（未処理分の再送は batch_writer が行う）"""
+        expires_at = int(self._timer()) + self.ttl_seconds
+        with self.table.batch_writer(overwrite_by_pkeys=["runDate", "forecastKey"]) as batch:
+            for key, weather in forecasts.items():
+                batch.put_item(
+                    Item={
+                        "runDate": run_date,
+                        "forecastKey": key,
+                        "maxTemp": Decimal(str(weather.max_temp)),
+                        "minTemp": Decimal(str(weather.min_temp)),
+                        "pop": weather.pop,
+                        "expiresAt": expires_at,
+                    }
+                )
+
+    def load(self, run_date: str) -> dict[str, Weather]:
+        forecasts: dict[str, Weather] = {}
+        query_kwargs: dict = {
+            "KeyConditionExpression": Key("runDate").eq(run_date),
+            "ProjectionExpression": "forecastKey, maxTemp, minTemp, pop",
+        }
+        while True:
+            response = self._query_page(**query_kwargs)
+            for item in response.get("Items", []):
+                forecasts[item["forecastKey"]] = Weather(
+                    max_temp=float(item["maxTemp"]),
+                    min_temp=float(item["minTemp"]),
+                    pop=int(item["pop"]),
+                )
+
+            if "LastEvaluatedKey" not in response:
+                break
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return forecasts
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _query_page(self, **query_kwargs: Any) -> dict:
+        """Queryを1ページ実行"""
+        return self.table.query(**query_kwargs)
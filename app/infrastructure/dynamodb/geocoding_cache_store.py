@@ -0,0 +1,58 @@
+import time
+from collections.abc import Callable
+from decimal import Decimal
+
+import boto3
+
+from infrastructure.gsi.geocoding_cache import GeocodingOutcome
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+class DynamoDBGeocodingCacheStore:
+    """住所検索結果を DynamoDB に保存する2段目のキャッシュ
+
+    コールドスタートした Webhook Lambda 間で結果を共有する。
+    expiresAt は DynamoDB TTL の属性として使用し、読み込み時にも期限を確認する。
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.dynamodb = boto3.resource("dynamodb")
+        self.table = self.dynamodb.Table(table_name)
+        self.ttl_seconds = ttl_seconds
+        self._timer = timer
+
+    def get(self, query: str) -> GeocodingOutcome | None:
+        """検索文字列に対応する結果を取得（未登録・期限切れは None）"""
+        response = self.table.get_item(Key={"query": query})
+        item = response.get("Item")
+        if item is None or int(item.get("expiresAt", 0)) <= self._timer():
+            return None
+        return GeocodingOutcome(
+            status=item["status"],
+            latitude=float(item.get("lat", 0)),
+            longitude=float(item.get("lon", 0)),
+            city_name=item.get("cityName", ""),
+            message=item.get("message", ""),
+            candidates=list(item.get("candidates", [])),
+        )
+
+    def put(self, query: str, outcome: GeocodingOutcome) -> None:
+        """検索結果を保存"""
+        self.table.put_item(
+            Item={
+                "query": query,
+                "status": outcome.status,
+                "lat": Decimal(str(outcome.latitude)),
+                "lon": Decimal(str(outcome.longitude)),
+                "cityName": outcome.city_name,
+                "message": outcome.message,
+                "candidates": outcome.candidates,
+                "expiresAt": int(self._timer()) + self.ttl_seconds,
+            }
+        )
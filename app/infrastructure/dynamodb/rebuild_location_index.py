@@ -0,0 +1,26 @@
+"""地点インデックス（Users テーブルの locationKey と地点テーブル）の再構築
+
+地点インデックス導入前に登録されたユーザーを配信対象に含めるため、導入時に一度実行する。
+
+    python -m infrastructure.dynamodb.rebuild_location_index <users_table> <locations_table>
+"""
+
+import sys
+
+from infrastructure.dynamodb.user_repository import DynamoDBUserRepository
+
+
+def main(argv: list[str]) -> int:
+    """既存ユーザーから地点インデックスを再構築する"""
+    if len(argv) != 3:
+        print(__doc__, file=sys.stderr)
+        return 2
+
+    repository = DynamoDBUserRepository(argv[1], locations_table_name=argv[2])
+    location_count = repository.rebuild_location_index()
+    print(f"{location_count} locations -> {argv[2]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -1,34 +1,170 @@
+import queue
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 
 import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 
 from domain.entities.user import User
 from domain.repositories.user_repository import UserRepository
 from domain.value_objects.location import Location
+from domain.value_objects.location_group import LocationGroup
+from utils.logger import get_logger, log_error
 from utils.retry import retry
 
+logger = get_logger(__name__)
+
+_SEGMENT_DONE = object()
+
+LOCATION_INDEX_NAME = "LocationIndex"
+
+
+def location_key(latitude: float, longitude: float) -> str:
+    """地点インデックスのキー（配信時のグルーピングと同じく緯度経度の完全一致）"""
+    return f"{latitude}#{longitude}"
+
 
 class DynamoDBUserRepository(UserRepository):
-    """DynamoDB実装のUserRepository"""
+    """DynamoDB実装のUserRepository
+
+    total_segments が2以上の場合、iter_users は Scan を TotalSegments 個のセグメントに
+    分割し、スレッドプールで並列に読み込む（並び順はセグメント間で不定）。
 
-    def __init__(self, table_name: str) -> None:
+    locations_table_name を指定すると、保存時に地点テーブル（地点ごとの緯度経度・市区町村名・
+    ユーザー数）を更新する。ユーザーは GSI（LocationIndex: locationKey → userId）で
+    地点ごとに引けるため、iter_location_groups は全件 Scan なしで地点単位に読み込める。
+
+    shard_count が2以上の場合、iter_users・iter_location_groups は全体を shard_count 個に
+    分けたうちの shard_index 番目だけを読み込む（複数 Lambda での分散配信用）。
+    ユーザーテーブルは shard_count * total_segments 個のセグメントに分け、各シャードが
+    連続する total_segments 個のセグメントを並列に読み込む。
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        total_segments: int = 1,
+        locations_table_name: str | None = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+    ) -> None:
+        if total_segments < 1:
+            raise ValueError("total_segments は1以上である必要があります")
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError("shard_index は0以上 shard_count 未満である必要があります")
         self.dynamodb = boto3.resource("dynamodb")
         self.table = self.dynamodb.Table(table_name)
+        self.table_name = table_name
+        self.total_segments = total_segments
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.locations_table_name = locations_table_name
+        self.locations_table = self.dynamodb.Table(locations_table_name) if locations_table_name else None
 
     @retry(max_attempts=3, backoff=[1, 2, 4])
     def save(self, user: User) -> None:
-        """ユーザーを保存（上書き）"""
+        """ユーザーを保存（上書き）
+
+        地点テーブルを使う場合、ユーザーの保存と地点ごとのユーザー数の付け替えを1つの
+        TransactWriteItems で書き込む。失敗した試行は何も書き込まないため、リトライ時は
+        保存済みの地点を読み直して同じ判定をやり直す。
+        """
         item = {
             "userId": user.user_id,
             "lat": Decimal(str(user.location.latitude)),
             "lon": Decimal(str(user.location.longitude)),
             "cityName": user.location.city_name,
+            "locationKey": location_key(user.location.latitude, user.location.longitude),
             "createdAt": user.created_at.isoformat(),
             "updatedAt": user.updated_at.isoformat(),
         }
-        self.table.put_item(Item=item)
+        if self.locations_table is None:
+            self.table.put_item(Item=item)
+            return
+
+        old_key = self._find_location_key(user.user_id)
+        # 読み込み後に他の保存で地点が変わっていた場合は書き込まず、リトライで読み直す
+        if old_key == item["locationKey"]:
+            self.table.put_item(
+                Item=item,
+                ConditionExpression="locationKey = :old",
+                ExpressionAttributeValues={":old": old_key},
+            )
+            return
+
+        # 地点が変わった場合のみ地点テーブルのユーザー数を付け替える
+        if old_key is None:
+            condition: dict = {"ConditionExpression": "attribute_not_exists(locationKey)"}
+        else:
+            condition = {
+                "ConditionExpression": "locationKey = :old",
+                "ExpressionAttributeValues": {":old": old_key},
+            }
+        transact_items: list[dict] = [
+            {
+                "Put": {
+                    "TableName": self.table_name,
+                    "Item": item,
+                    **condition,
+                }
+            },
+            self._location_count_update(item["locationKey"], 1, user.location),
+        ]
+        if old_key:
+            transact_items.append(self._location_count_update(old_key, -1))
+        # リソースの低レベルクライアントも型変換は自動で行われる
+        self.table.meta.client.transact_write_items(TransactItems=transact_items)
+        if old_key:
+            self._delete_location_if_empty(old_key)
+
+    def _find_location_key(self, user_id: str) -> str | None:
+        """保存済みのユーザーの locationKey を取得（未登録・地点インデックス導入前のユーザーは None）"""
+        response = self.table.get_item(
+            Key={"userId": user_id},
+            ProjectionExpression="locationKey",
+            ConsistentRead=True,
+        )
+        return response.get("Item", {}).get("locationKey")
+
+    def _location_count_update(self, key: str, delta: int, location: Location | None = None) -> dict:
+        """地点テーブルのユーザー数を増減する TransactWriteItems の要素（増やす場合は地点情報も更新）"""
+        update: dict = {
+            "TableName": self.locations_table_name,
+            "Key": {"locationKey": key},
+            "UpdateExpression": "ADD userCount :delta",
+            "ExpressionAttributeValues": {":delta": delta},
+        }
+        if location is not None:
+            update["UpdateExpression"] += " SET lat = :lat, lon = :lon, cityName = :city"
+            update["ExpressionAttributeValues"].update(
+                {
+                    ":lat": Decimal(str(location.latitude)),
+                    ":lon": Decimal(str(location.longitude)),
+                    ":city": location.city_name,
+                }
+            )
+        return {"Update": update}
+
+    def _delete_location_if_empty(self, key: str) -> None:
+        """ユーザー数が0以下になった地点を地点テーブルから削除
+
+        削除に失敗しても iter_location_groups は空の地点を読み飛ばすため、保存は失敗させない。
+        """
+        try:
+            self._require_locations_table().delete_item(
+                Key={"locationKey": key},
+                ConditionExpression="userCount <= :zero",
+                ExpressionAttributeValues={":zero": 0},
+            )
+        except ClientError as e:
+            # 削除までの間に他のユーザーが登録した地点は残す
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                log_error(logger, "空の地点の削除失敗", location_key=key, error=str(e))
 
     def find_by_id(self, user_id: str) -> Optional[User]:
         """ユーザーIDでユーザーを取得"""
@@ -37,18 +173,204 @@ class DynamoDBUserRepository(UserRepository):
             return None
         return self._to_entity(response["Item"])
 
-    @retry(max_attempts=3, backoff=[1, 2, 4])
     def get_all_users(self) -> list[User]:
         """全ユーザーを取得（Scan操作）"""
-        items: list[dict] = []
-        response = self.table.scan()
-        items.extend(response.get("Items", []))
+        return list(self.iter_users())
+
+    def iter_users(self) -> Iterator[User]:
+        """全ユーザー（シャード指定時はシャード内のユーザー）をScanのページ単位で逐次取得"""
+        if self.total_segments > 1 or self.shard_count > 1:
+            yield from self._iter_users_parallel()
+            return
+
+        scan_kwargs: dict = {}
+        while True:
+            response = self._scan_page(**scan_kwargs)
+            for item in response.get("Items", []):
+                yield self._to_entity(item)
+
+            if "LastEvaluatedKey" not in response:
+                return
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _scan_page(self, **scan_kwargs: Any) -> dict:
+        """Scanを1ページ実行（ページ単位でリトライする）"""
+        return self.table.scan(**scan_kwargs)
+
+    def _iter_users_parallel(self) -> Iterator[User]:
+        """セグメント並列Scan。読み込んだページは上限付きキューで受け渡す"""
+        first_segment = self.shard_index * self.total_segments
+        segments = range(first_segment, first_segment + self.total_segments)
+        pages: queue.Queue[Any] = queue.Queue(maxsize=self.total_segments * 2)
+        stop = threading.Event()
+
+        def put(value: Any) -> bool:
+            # 呼び出し側が読み込みを中断した場合に備え、停止要求を確認しながら待つ
+            while not stop.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def scan_segment(segment: int) -> None:
+            try:
+                for items in self._iter_segment_pages(segment):
+                    if not put(items):
+                        return
+                put(_SEGMENT_DONE)
+            except Exception as e:
+                put(e)
+
+        with ThreadPoolExecutor(max_workers=self.total_segments) as executor:
+            for segment in segments:
+                executor.submit(scan_segment, segment)
+            try:
+                finished = 0
+                while finished < self.total_segments:
+                    page = pages.get()
+                    if page is _SEGMENT_DONE:
+                        finished += 1
+                    elif isinstance(page, Exception):
+                        raise page
+                    else:
+                        for item in page:
+                            yield self._to_entity(item)
+            finally:
+                stop.set()
+
+    def _iter_segment_pages(self, segment: int) -> Iterator[list[dict]]:
+        """1セグメント分のScanをページ単位で返す
+
+        リソース（Table）はスレッドセーフではないため、その低レベルクライアントを使う。
+        型変換はリソースと同じく自動で行われる。
+        """
+        scan_kwargs: dict = {
+            "TableName": self.table_name,
+            "Segment": segment,
+            "TotalSegments": self.total_segments * self.shard_count,
+        }
+        while True:
+            response = self._scan_segment_page(**scan_kwargs)
+            yield response.get("Items", [])
+
+            if "LastEvaluatedKey" not in response:
+                return
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _scan_segment_page(self, **scan_kwargs: Any) -> dict:
+        """セグメントのScanを1ページ実行（失敗したセグメントのページのみリトライする）"""
+        return self.table.meta.client.scan(**scan_kwargs)
+
+    def _require_locations_table(self) -> Any:
+        if self.locations_table is None:
+            raise ValueError("locations_table_name が設定されていません")
+        return self.locations_table
+
+    def iter_location_groups(self) -> Iterator[LocationGroup]:
+        """地点テーブルを走査し、地点ごとのユーザーIDを LocationIndex から取得
+
+        シャード指定時は地点テーブルの Scan セグメント単位でシャードに分ける。
+        """
+        self._require_locations_table()
+        scan_kwargs: dict = {}
+        if self.shard_count > 1:
+            scan_kwargs.update(Segment=self.shard_index, TotalSegments=self.shard_count)
+        while True:
+            response = self._scan_locations_page(**scan_kwargs)
+            for item in response.get("Items", []):
+                # ユーザーのいなくなった地点は LocationIndex を問い合わせずに読み飛ばす
+                if "lat" not in item or item.get("userCount", 0) <= 0:
+                    continue
+                # 0件かどうかは GSI の結果でも確認する（削除と登録が競合した場合の保険）
+                user_ids = tuple(self._iter_location_user_ids(item["locationKey"]))
+                if not user_ids:
+                    continue
+                location = Location(
+                    city_name=item["cityName"],
+                    latitude=float(item["lat"]),
+                    longitude=float(item["lon"]),
+                )
+                yield LocationGroup(location=location, user_ids=user_ids)
+
+            if "LastEvaluatedKey" not in response:
+                return
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _iter_location_user_ids(self, key: str) -> Iterator[str]:
+        """1地点に登録されたユーザーIDを LocationIndex から取得"""
+        query_kwargs: dict = {
+            "IndexName": LOCATION_INDEX_NAME,
+            "KeyConditionExpression": Key("locationKey").eq(key),
+        }
+        while True:
+            response = self._query_page(**query_kwargs)
+            for item in response.get("Items", []):
+                yield item["userId"]
+
+            if "LastEvaluatedKey" not in response:
+                return
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _scan_locations_page(self, **scan_kwargs: Any) -> dict:
+        """地点テーブルのScanを1ページ実行"""
+        return self._require_locations_table().scan(**scan_kwargs)
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _query_page(self, **query_kwargs: Any) -> dict:
+        """ユーザーテーブルのQueryを1ページ実行"""
+        return self.table.query(**query_kwargs)
+
+    def rebuild_location_index(self) -> int:
+        """既存ユーザーから locationKey と地点テーブルを再構築し、地点数を返す
+
+        地点インデックス導入前に登録されたユーザーの移行用。
+        """
+        locations_table = self._require_locations_table()
+
+        locations: dict[str, dict] = {}
+        scan_kwargs: dict = {}
+        while True:
+            response = self._scan_page(**scan_kwargs)
+            for item in response.get("Items", []):
+                key = location_key(float(item["lat"]), float(item["lon"]))
+                if item.get("locationKey") != key:
+                    self.table.update_item(
+                        Key={"userId": item["userId"]},
+                        UpdateExpression="SET locationKey = :key",
+                        ExpressionAttributeValues={":key": key},
+                    )
+                entry = locations.setdefault(
+                    key,
+                    {"locationKey": key, "lat": item["lat"], "lon": item["lon"], "cityName": item["cityName"]},
+                )
+                entry["userCount"] = entry.get("userCount", 0) + 1
+
+            if "LastEvaluatedKey" not in response:
+                break
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
-        while "LastEvaluatedKey" in response:
-            response = self.table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-            items.extend(response.get("Items", []))
+        stale_keys = []
+        scan_kwargs = {}
+        while True:
+            response = self._scan_locations_page(**scan_kwargs)
+            stale_keys.extend(
+                item["locationKey"] for item in response.get("Items", []) if item["locationKey"] not in locations
+            )
+            if "LastEvaluatedKey" not in response:
+                break
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
-        return [self._to_entity(item) for item in items]
+        with locations_table.batch_writer() as batch:
+            for entry in locations.values():
+                batch.put_item(Item=entry)
+            for key in stale_keys:
+                batch.delete_item(Key={"locationKey": key})
+        return len(locations)
 
     @staticmethod
     def _to_entity(item: dict) -> User:
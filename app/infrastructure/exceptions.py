@@ -18,6 +18,21 @@ class MessagingException(Exception):
     """LINE Messaging APIのエラー"""
 
 
+class LineRateLimitException(MessagingException):
+    """LINE Messaging API のレート制限（429 Too Many Requests）
+
+    retry_after には Retry-After ヘッダーの秒数を保持する（ヘッダーがない場合は None）。
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueException(Exception):
+    """メッセージキュー操作のエラー"""
+
+
 class RepositoryException(Exception):
     """データベース操作のエラー"""
 
@@ -28,3 +43,7 @@ class WeatherAPIException(Exception):
 
 class JMAAPIException(Exception):
     """気象庁APIのエラー"""
+
+
+class SecretsException(Exception):
+    """Secrets Manager からのシークレット取得のエラー"""
@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+
+from infrastructure.exceptions import (
+    GeocodingAmbiguousException,
+    GeocodingAPIException,
+    GeocodingNotFoundException,
+)
+from infrastructure.gsi.geocoding_cache import GeocodingOutcome
+from infrastructure.gsi.geocoding_client import GeocodingCacheStore, GsiGeocodingClient, select_candidate
+from utils.cache import TTLCache
+from utils.logger import get_logger, log_error
+from utils.retry import async_retry
+
+logger = get_logger(__name__)
+
+
+class AsyncGsiGeocodingClient:
+    """国土地理院 住所検索API非同期クライアント
+
+    キャッシュの扱いは GsiGeocodingClient と同じ。cache_store は同期 API のため
+    スレッドで呼び出し、イベントループを止めない。
+    """
+
+    BASE_URL = GsiGeocodingClient.BASE_URL
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        cache: TTLCache[str, GeocodingOutcome] | None = None,
+        cache_store: GeocodingCacheStore | None = None,
+    ) -> None:
+        self.client = client
+        self.cache = cache
+        self.cache_store = cache_store
+
+    async def get_coordinates(self, city_name: str) -> tuple[float, float, str]:
+        """市区町村名から緯度経度を取得
+
+        Returns:
+            (latitude, longitude, city_name_ja)
+
+        Raises:
+            GeocodingNotFoundException: 地名が見つからない
+            GeocodingAmbiguousException: 複数の候補がある
+            GeocodingAPIException: APIエラー
+        """
+        if self.cache is None and self.cache_store is None:
+            return await self._search(city_name)
+        return (await self._get_outcome(city_name)).resolve()
+
+    async def _get_outcome(self, city_name: str) -> GeocodingOutcome:
+        """キャッシュ（メモリ → 2段目）を参照し、なければAPIを呼び出す"""
+        if self.cache is not None:
+            outcome = self.cache.get(city_name)
+            if outcome is not None:
+                return outcome
+
+        outcome = await self._get_from_store(city_name)
+        if outcome is None:
+            try:
+                outcome = GeocodingOutcome.found(await self._search(city_name))
+            except (GeocodingNotFoundException, GeocodingAmbiguousException) as e:
+                outcome = GeocodingOutcome.from_exception(e)
+            await self._put_to_store(city_name, outcome)
+
+        if self.cache is not None:
+            self.cache.set(city_name, outcome)
+        return outcome
+
+    async def _get_from_store(self, city_name: str) -> GeocodingOutcome | None:
+        if self.cache_store is None:
+            return None
+        try:
+            return await asyncio.to_thread(self.cache_store.get, city_name)
+        except Exception as e:
+            log_error(logger, "住所検索キャッシュ参照失敗", city_name=city_name, error=str(e))
+            return None
+
+    async def _put_to_store(self, city_name: str, outcome: GeocodingOutcome) -> None:
+        if self.cache_store is None:
+            return
+        try:
+            await asyncio.to_thread(self.cache_store.put, city_name, outcome)
+        except Exception as e:
+            log_error(logger, "住所検索キャッシュ保存失敗", city_name=city_name, error=str(e))
+
+    @async_retry(max_attempts=3, backoff=[1, 2, 4], giveup=(GeocodingNotFoundException, GeocodingAmbiguousException))
+    async def _search(self, city_name: str) -> tuple[float, float, str]:
+        """住所検索APIを呼び出して候補を絞り込む"""
+        try:
+            response = await self.client.get(self.BASE_URL, params={"q": city_name})
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise GeocodingAPIException(f"GSI API HTTPエラー: {e}") from e
+        except httpx.HTTPError as e:
+            raise GeocodingAPIException(f"GSI API通信エラー: {e}") from e
+
+        return select_candidate(city_name, response.json())
@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+
+from infrastructure.exceptions import GeocodingAmbiguousException, GeocodingNotFoundException
+
+FOUND = "found"
+NOT_FOUND = "not_found"
+AMBIGUOUS = "ambiguous"
+
+
+@dataclass(frozen=True)
+class GeocodingOutcome:
+    """住所検索の結果（成功・該当なし・複数候補）をキャッシュするための値"""
+
+    status: str
+    latitude: float = 0.0
+    longitude: float = 0.0
+    city_name: str = ""
+    message: str = ""
+    candidates: list[str] = field(default_factory=list)
+
+    @classmethod
+    def found(cls, result: tuple[float, float, str]) -> "GeocodingOutcome":
+        lat, lon, city_name = result
+        return cls(status=FOUND, latitude=lat, longitude=lon, city_name=city_name)
+
+    @classmethod
+    def from_exception(cls, error: GeocodingNotFoundException | GeocodingAmbiguousException) -> "GeocodingOutcome":
+        if isinstance(error, GeocodingAmbiguousException):
+            return cls(status=AMBIGUOUS, message=str(error), candidates=list(error.candidates))
+        return cls(status=NOT_FOUND, message=str(error))
+
+    def resolve(self) -> tuple[float, float, str]:
+        """キャッシュした結果を get_coordinates と同じ形で返す（失敗結果は例外を再送出）"""
+        if self.status == AMBIGUOUS:
+            raise GeocodingAmbiguousException(self.message, candidates=list(self.candidates))
+        if self.status == NOT_FOUND:
+            raise GeocodingNotFoundException(self.message)
+        return (self.latitude, self.longitude, self.city_name)
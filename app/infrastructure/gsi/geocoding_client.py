@@ -1,4 +1,5 @@
 import re
+from typing import Protocol
 
 import requests
 
@@ -7,17 +8,89 @@ from infrastructure.exceptions import (
     GeocodingAPIException,
     GeocodingNotFoundException,
 )
+from infrastructure.gsi.geocoding_cache import GeocodingOutcome
+from infrastructure.http.session import get_shared_session
+from utils.cache import TTLCache
+from utils.logger import get_logger, log_error
 from utils.retry import retry
 
+logger = get_logger(__name__)
+
 CITY_PATTERN = re.compile(r"^.+[都道府県].+[市区町村郡]")
 
 
+def select_candidate(city_name: str, features: list[dict]) -> tuple[float, float, str]:
+    """住所検索APIの結果から市区町村を1件に絞り込む
+
+    Raises:
+        GeocodingNotFoundException: 地名が見つからない
+        GeocodingAmbiguousException: 複数の候補がある
+    """
+    candidates = []
+    for feature in features:
+        title = feature.get("properties", {}).get("title", "")
+        if CITY_PATTERN.match(title):
+            coords = feature["geometry"]["coordinates"]
+            candidates.append((coords[1], coords[0], title))
+
+    if len(candidates) == 0:
+        raise GeocodingNotFoundException(f"地名が見つかりません: {city_name}")
+
+    if len(candidates) == 1:
+        return candidates[0]
+
+    # 複数候補 - 末尾が市区町村で終わらないものを除外
+    filtered = [c for c in candidates if c[2].endswith(("市", "区", "町", "村"))]
+    if len(filtered) > 0:
+        candidates = filtered
+
+    # 重複タイトルを除去して再チェック
+    seen = set()
+    unique = []
+    for c in candidates:
+        if c[2] not in seen:
+            seen.add(c[2])
+            unique.append(c)
+
+    if len(unique) == 1:
+        return unique[0]
+
+    raise GeocodingAmbiguousException(
+        f"複数の候補があります: {city_name}",
+        candidates=[c[2] for c in unique],
+    )
+
+
+class GeocodingCacheStore(Protocol):
+    """プロセス間で共有する2段目のキャッシュ（DynamoDB等）"""
+
+    def get(self, query: str) -> GeocodingOutcome | None: ...
+
+    def put(self, query: str, outcome: GeocodingOutcome) -> None: ...
+
+
 class GsiGeocodingClient:
-    """国土地理院 住所検索APIクライアント"""
+    """国土地理院 住所検索APIクライアント
+
+    cache を渡すと、成功結果に加えて「該当なし」「複数候補」の結果もキャッシュする
+    （APIエラーはキャッシュしない）。cache_store を渡すと、メモリキャッシュの
+    ミス時に参照する2段目のキャッシュとして使用する。
+    """
 
     BASE_URL = "https://msearch.gsi.go.jp/address-search/AddressSearch"
 
-    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        cache: TTLCache[str, GeocodingOutcome] | None = None,
+        cache_store: GeocodingCacheStore | None = None,
+    ) -> None:
+        self.session = session or get_shared_session()
+        self.cache = cache
+        self.cache_store = cache_store
+        self.store_hits = 0
+        self.store_misses = 0
+
     def get_coordinates(self, city_name: str) -> tuple[float, float, str]:
         """市区町村名から緯度経度を取得
 
@@ -29,48 +102,62 @@ class GsiGeocodingClient:
             GeocodingAmbiguousException: 複数の候補がある
             GeocodingAPIException: APIエラー
         """
+        if self.cache is None and self.cache_store is None:
+            return self._search(city_name)
+        return self._get_outcome(city_name).resolve()
+
+    def _get_outcome(self, city_name: str) -> GeocodingOutcome:
+        """キャッシュ（メモリ → 2段目）を参照し、なければAPIを呼び出す"""
+        if self.cache is not None:
+            outcome = self.cache.get(city_name)
+            if outcome is not None:
+                return outcome
+
+        outcome = self._get_from_store(city_name)
+        if outcome is None:
+            try:
+                outcome = GeocodingOutcome.found(self._search(city_name))
+            except (GeocodingNotFoundException, GeocodingAmbiguousException) as e:
+                outcome = GeocodingOutcome.from_exception(e)
+            self._put_to_store(city_name, outcome)
+
+        if self.cache is not None:
+            self.cache.set(city_name, outcome)
+        return outcome
+
+    def _get_from_store(self, city_name: str) -> GeocodingOutcome | None:
+        if self.cache_store is None:
+            return None
+        try:
+            outcome = self.cache_store.get(city_name)
+        except Exception as e:
+            log_error(logger, "住所検索キャッシュ参照失敗", city_name=city_name, error=str(e))
+            return None
+        if outcome is None:
+            self.store_misses += 1
+        else:
+            self.store_hits += 1
+        return outcome
+
+    def _put_to_store(self, city_name: str, outcome: GeocodingOutcome) -> None:
+        if self.cache_store is None:
+            return
+        try:
+            self.cache_store.put(city_name, outcome)
+        except Exception as e:
+            log_error(logger, "住所検索キャッシュ保存失敗", city_name=city_name, error=str(e))
+
+    @retry(max_attempts=3, backoff=[1, 2, 4], giveup=(GeocodingNotFoundException, GeocodingAmbiguousException))
+    def _search(self, city_name: str) -> tuple[float, float, str]:
+        """住所検索APIを呼び出して候補を絞り込む"""
         params = {"q": city_name}
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = self.session.get(self.BASE_URL, params=params, timeout=10)
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             raise GeocodingAPIException(f"GSI API HTTPエラー: {e}") from e
         except requests.exceptions.RequestException as e:
             raise GeocodingAPIException(f"GSI API通信エラー: {e}") from e
 
-        features = response.json()
-
-        candidates = []
-        for feature in features:
-            title = feature.get("properties", {}).get("title", "")
-            if CITY_PATTERN.match(title):
-                coords = feature["geometry"]["coordinates"]
-                candidates.append((coords[1], coords[0], title))
-
-        if len(candidates) == 0:
-            raise GeocodingNotFoundException(f"地名が見つかりません: {city_name}")
-
-        if len(candidates) == 1:
-            return candidates[0]
-
-        # 複数候補 - 末尾が市区町村で終わらないものを除外
-        filtered = [c for c in candidates if c[2].endswith(("市", "区", "町", "村"))]
-        if len(filtered) > 0:
-            candidates = filtered
-
-        # 重複タイトルを除去して再チェック
-        seen = set()
-        unique = []
-        for c in candidates:
-            if c[2] not in seen:
-                seen.add(c[2])
-                unique.append(c)
-
-        if len(unique) == 1:
-            return unique[0]
-
-        raise GeocodingAmbiguousException(
-            f"複数の候補があります: {city_name}",
-            candidates=[c[2] for c in unique],
-        )
+        return select_candidate(city_name, response.json())
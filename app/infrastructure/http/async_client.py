@@ -0,0 +1,27 @@
+import httpx
+
+# 1プロセスで同時に張るコネクション数の上限と、保持する Keep-Alive コネクション数
+DEFAULT_MAX_CONNECTIONS = 1000
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 100
+DEFAULT_TIMEOUT = 10.0
+
+
+def create_async_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """非同期クライアント群で共有する HTTP クライアントを生成
+
+    httpx.AsyncClient は生成したイベントループに紐づくため、requests のセッションと
+    異なりモジュールスコープでは共有しない。asyncio.run の単位で生成・破棄すること。
+
+    Usage:
+        async with create_async_client() as http:
+            client = AsyncWeatherApiClient(api_key, http)
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
@@ -0,0 +1,61 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ホストごとのコネクションプール数と、1ホストあたりの保持コネクション数
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 16
+
+_shared_session: requests.Session | None = None
+_shared_session_lock = threading.Lock()
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+) -> requests.Session:
+    """Keep-Alive コネクションプールを持つ HTTP セッションを生成
+
+    Args:
+        pool_connections: プールを保持するホスト数
+        pool_maxsize: 1ホストあたりに保持するコネクション数
+        pool_block: プールが枯渇した場合に空きを待つかどうか
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """プロセス内で共有する HTTP セッションを取得
+
+    モジュールスコープに保持するため、Lambda のウォームスタート間でも
+    コネクションが再利用される。プールサイズは環境変数
+    HTTP_POOL_CONNECTIONS / HTTP_POOL_MAXSIZE で変更できる。
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session(
+                pool_connections=int(os.environ.get("HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS)),
+                pool_maxsize=int(os.environ.get("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)),
+            )
+        return _shared_session
+
+
+def close_shared_session() -> None:
+    """共有セッションを破棄（次回の get_shared_session で再生成される）"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
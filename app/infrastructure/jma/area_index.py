@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AreaEntry:
+    """class20（市区町村）1件分の解決済みエリア情報"""
+
+    name: str
+    class20_code: str
+    office_code: str | None
+    class10_code: str | None
+
+
+class AreaIndex:
+    """area.json の class20s を市区町村名で引けるようにしたインデックス
+
+    find_codes の従来の線形探索（class20s を先頭から走査し、名前の完全一致
+    または city_name の末尾一致で最初に見つかったエントリを採用）と同じ結果を、
+    city_name の各サフィックスを辞書で引くことで O(len(city_name)) で返す。
+    """
+
+    def __init__(self, entries: list[AreaEntry]) -> None:
+        self.entries = entries
+        # 名前 → (class20s 内の出現順, エントリ)。同名は最初の出現のみ保持する
+        self._by_name: dict[str, tuple[int, AreaEntry]] = {}
+        for position, entry in enumerate(entries):
+            self._by_name.setdefault(entry.name, (position, entry))
+
+    @classmethod
+    def from_area_data(cls, area_data: dict) -> "AreaIndex":
+        """area.json の内容からインデックスを構築"""
+        class15s = area_data.get("class15s", {})
+        class10s = area_data.get("class10s", {})
+        offices = area_data.get("offices", {})
+
+        entries = []
+        for code, info in area_data.get("class20s", {}).items():
+            office_code, class10_code = cls._resolve(info.get("parent"), class15s, class10s, offices)
+            entries.append(
+                AreaEntry(
+                    name=info.get("name", ""),
+                    class20_code=code,
+                    office_code=office_code,
+                    class10_code=class10_code,
+                )
+            )
+        return cls(entries)
+
+    @staticmethod
+    def _resolve(parent: str | None, class15s: dict, class10s: dict, offices: dict) -> tuple[str | None, str | None]:
+        """class20 の parent から class15s → class10s → offices を辿る"""
+        if parent is None:
+            return None, None
+        current_code = parent
+
+        # class15s にある場合、その parent を取得
+        if current_code in class15s:
+            current_code = class15s[current_code].get("parent", current_code)
+
+        # class10s にある場合、class10_code として記録し、parent で office を取得
+        if current_code in class10s:
+            office_code = class10s[current_code].get("parent", "")
+            if office_code in offices:
+                return office_code, current_code
+        return None, None
+
+    def lookup(self, city_name: str) -> AreaEntry | None:
+        """市区町村名に一致するエントリを返す（該当なしは None）
+
+        「神奈川県川崎市」のように県名付きの場合、末尾の市区町村名でもマッチさせる。
+        """
+        best: tuple[int, AreaEntry] | None = None
+        for start in range(len(city_name) + 1):
+            found = self._by_name.get(city_name[start:])
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found
+        return best[1] if best is not None else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -1,30 +1,132 @@
+import threading
+import time
+from collections.abc import Callable
+
 import requests
 
 from infrastructure.exceptions import JMAAPIException
+from infrastructure.http.session import get_shared_session
+from infrastructure.jma.area_index import AreaIndex
+from infrastructure.jma.area_snapshot import AreaSnapshot, load_snapshot, save_snapshot
+from utils.logger import get_logger, log_error, log_info
 from utils.retry import retry
 
+logger = get_logger(__name__)
+
 AREA_JSON_URL = "https://www.jma.go.jp/bosai/common/const/area.json"
 
+# area.json は市町村合併等でしか変わらないため、1日経過したら条件付きGETで確認する
+DEFAULT_SNAPSHOT_MAX_AGE = 24 * 60 * 60
 
-class JmaAreaMapper:
-    """市区町村名から気象庁のoffice_codeとclass10_codeを取得するマッパー"""
 
-    def __init__(self) -> None:
-        self._area_data: dict | None = None
+class JmaAreaMapper:
+    """市区町村名から気象庁のoffice_codeとclass10_codeを取得するマッパー
+
+    snapshot_path（例: /tmp 配下）と bundled_snapshot_path（デプロイパッケージ同梱）を
+    指定すると、インデックス済みスナップショットから起動し、area.json の取得・解析を
+    省略する。スナップショットが max_age を超えて古い場合のみ、ETag / Last-Modified を
+    使った条件付きGETで更新を確認する。
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        snapshot_path: str | None = None,
+        bundled_snapshot_path: str | None = None,
+        max_age: float = DEFAULT_SNAPSHOT_MAX_AGE,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.session = session or get_shared_session()
+        self.snapshot_path = snapshot_path
+        self.bundled_snapshot_path = bundled_snapshot_path
+        self.max_age = max_age
+        self._timer = timer
+        self._index: AreaIndex | None = None
+        self._lock = threading.Lock()
 
     @retry(max_attempts=3, backoff=[1, 2, 4])
-    def _fetch_area_data(self) -> dict:
+    def _fetch_area_data(self, headers: dict[str, str] | None = None) -> requests.Response:
         try:
-            response = requests.get(AREA_JSON_URL, timeout=10)
+            response = self.session.get(AREA_JSON_URL, headers=headers or {}, timeout=10)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             raise JMAAPIException(f"気象庁area.json取得エラー: {e}") from e
-        return response.json()
+        return response
+
+    def download_snapshot(self) -> AreaSnapshot:
+        """area.json を取得してスナップショットを生成"""
+        response = self._fetch_area_data()
+        return self._to_snapshot(response)
+
+    def _to_snapshot(self, response: requests.Response) -> AreaSnapshot:
+        return AreaSnapshot(
+            index=AreaIndex.from_area_data(response.json()),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=self._timer(),
+        )
 
-    def _get_area_data(self) -> dict:
-        if self._area_data is None:
-            self._area_data = self._fetch_area_data()
-        return self._area_data
+    def _refresh_snapshot(self, snapshot: AreaSnapshot) -> AreaSnapshot:
+        """条件付きGETでスナップショットを更新（未変更なら取得時刻のみ更新）"""
+        response = self._fetch_area_data(self._conditional_headers(snapshot))
+        return self._apply_refresh(snapshot, response)
+
+    @staticmethod
+    def _conditional_headers(snapshot: AreaSnapshot) -> dict[str, str]:
+        headers = {}
+        if snapshot.etag:
+            headers["If-None-Match"] = snapshot.etag
+        if snapshot.last_modified:
+            headers["If-Modified-Since"] = snapshot.last_modified
+        return headers
+
+    def _apply_refresh(self, snapshot: AreaSnapshot, response: requests.Response) -> AreaSnapshot:
+        if response.status_code == 304:
+            log_info(logger, "気象庁area.jsonは未更新")
+            snapshot.fetched_at = self._timer()
+            return snapshot
+        log_info(logger, "気象庁area.jsonを更新")
+        return self._to_snapshot(response)
+
+    def _load_local_snapshot(self) -> AreaSnapshot | None:
+        """/tmp と同梱のスナップショットのうち新しい方を返す"""
+        snapshots = [
+            snapshot
+            for path in (self.snapshot_path, self.bundled_snapshot_path)
+            if path and (snapshot := load_snapshot(path)) is not None
+        ]
+        return max(snapshots, key=lambda s: s.fetched_at, default=None)
+
+    def _load_index(self) -> AreaIndex:
+        snapshot = self._load_local_snapshot()
+        if snapshot is None:
+            snapshot = self.download_snapshot()
+        elif snapshot.is_stale(self.max_age, now=self._timer()):
+            try:
+                snapshot = self._refresh_snapshot(snapshot)
+            except JMAAPIException as e:
+                # 更新確認に失敗しても、手元のスナップショットで処理を継続する
+                log_error(logger, "気象庁area.json更新確認失敗", error=str(e))
+                return snapshot.index
+        else:
+            return snapshot.index
+
+        self._save_local_snapshot(snapshot)
+        return snapshot.index
+
+    def _save_local_snapshot(self, snapshot: AreaSnapshot) -> None:
+        if self.snapshot_path:
+            try:
+                save_snapshot(snapshot, self.snapshot_path)
+            except OSError as e:
+                log_error(logger, "area.jsonスナップショット保存失敗", error=str(e))
+
+    def _get_index(self) -> AreaIndex:
+        # 並行実行時に area.json を重複取得しないようロックする
+        with self._lock:
+            if self._index is None:
+                self._index = self._load_index()
+            return self._index
 
     def find_codes(self, city_name: str) -> tuple[str, str]:
         """市区町村名からoffice_codeとclass10_codeを返す
@@ -38,38 +140,27 @@ class JmaAreaMapper:
         Raises:
             JMAAPIException: 該当する地域が見つからない場合
         """
-        area_data = self._get_area_data()
-        class20s = area_data.get("class20s", {})
-        class15s = area_data.get("class15s", {})
-        class10s = area_data.get("class10s", {})
-        offices = area_data.get("offices", {})
-
-        # class20s から city_name に一致するエントリを検索
-        # 「神奈川県川崎市」のように県名付きの場合、末尾の市区町村名でもマッチさせる
-        target_parent = None
-        for code, info in class20s.items():
-            name = info.get("name", "")
-            if name == city_name or city_name.endswith(name):
-                target_parent = info.get("parent")
-                break
-
-        if target_parent is None:
-            raise JMAAPIException(f"気象庁エリア情報に '{city_name}' が見つかりません")
+        entry = self._get_index().lookup(city_name)
 
-        # class15s → class10s → offices を辿る
-        current_code = target_parent
-
-        # class15s にある場合、その parent を取得
-        if current_code in class15s:
-            current_code = class15s[current_code].get("parent", current_code)
+        if entry is None:
+            raise JMAAPIException(f"気象庁エリア情報に '{city_name}' が見つかりません")
 
-        # class10s にある場合、class10_code として記録し、parent で office を取得
-        if current_code in class10s:
-            class10_code = current_code
-            office_code = class10s[current_code].get("parent", "")
-            if office_code in offices:
-                return (office_code, class10_code)
+        if entry.office_code is not None and entry.class10_code is not None:
+            return (entry.office_code, entry.class10_code)
 
         raise JMAAPIException(
             f"'{city_name}' のoffice_code/class10_codeを特定できません"
         )
+
+    def find_class20_code(self, city_name: str) -> str:
+        """市区町村名から class20（市区町村単位の細分区域）コードを返す
+
+        Raises:
+            JMAAPIException: 該当する地域が見つからない場合
+        """
+        entry = self._get_index().lookup(city_name)
+
+        if entry is None:
+            raise JMAAPIException(f"気象庁エリア情報に '{city_name}' が見つかりません")
+
+        return entry.class20_code
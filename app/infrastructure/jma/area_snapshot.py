@@ -0,0 +1,101 @@
+"""インデックス済み area.json スナップショットの保存・読み込み
+
+デプロイパッケージへの同梱用スナップショットは以下で生成する。
+
+    python -m infrastructure.jma.area_snapshot infrastructure/jma/data/area_snapshot.json
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from infrastructure.jma.area_index import AreaEntry, AreaIndex
+
+SNAPSHOT_VERSION = 1
+DEFAULT_BUNDLED_SNAPSHOT_PATH = str(Path(__file__).parent / "data" / "area_snapshot.json")
+
+
+@dataclass
+class AreaSnapshot:
+    """area.json から構築したインデックスと、条件付きGET用の検証子"""
+
+    index: AreaIndex
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+    def is_stale(self, max_age: float, now: float | None = None) -> bool:
+        """取得から max_age 秒以上経過しているか"""
+        return (time.time() if now is None else now) - self.fetched_at >= max_age
+
+
+def save_snapshot(snapshot: AreaSnapshot, path: str) -> None:
+    """スナップショットを保存（一時ファイル経由で置き換える）"""
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "etag": snapshot.etag,
+        "lastModified": snapshot.last_modified,
+        "fetchedAt": snapshot.fetched_at,
+        "entries": [[e.name, e.class20_code, e.office_code, e.class10_code] for e in snapshot.index.entries],
+    }
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_snapshot(path: str) -> AreaSnapshot | None:
+    """スナップショットを読み込む（存在しない・壊れている・形式が古い場合は None）"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    try:
+        entries = [
+            AreaEntry(name=name, class20_code=code, office_code=office, class10_code=class10)
+            for name, code, office, class10 in data["entries"]
+        ]
+    except (KeyError, TypeError, ValueError):
+        return None
+    return AreaSnapshot(
+        index=AreaIndex(entries),
+        etag=data.get("etag"),
+        last_modified=data.get("lastModified"),
+        fetched_at=float(data.get("fetchedAt", 0.0)),
+    )
+
+
+def main(argv: list[str]) -> int:
+    """area.json を取得して同梱用スナップショットを書き出す
+
+    取得に失敗した場合は例外、市区町村が1件もない場合は終了コード1で終了し、
+    スナップショットのない（または空の）デプロイパッケージを作らせない。
+    """
+    from infrastructure.jma.area_mapper import JmaAreaMapper
+
+    path = argv[1] if len(argv) > 1 else DEFAULT_BUNDLED_SNAPSHOT_PATH
+    snapshot = JmaAreaMapper().download_snapshot()
+    if len(snapshot.index) == 0:
+        print("area.json に市区町村がありません", file=sys.stderr)
+        return 1
+    save_snapshot(snapshot, path)
+    print(f"{len(snapshot.index)} entries -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
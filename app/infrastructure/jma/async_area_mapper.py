@@ -0,0 +1,80 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+import httpx
+
+from infrastructure.exceptions import JMAAPIException
+from infrastructure.jma.area_index import AreaIndex
+from infrastructure.jma.area_mapper import AREA_JSON_URL, DEFAULT_SNAPSHOT_MAX_AGE, JmaAreaMapper
+from infrastructure.jma.area_snapshot import AreaSnapshot
+from utils.logger import get_logger, log_error
+from utils.retry import async_retry
+
+logger = get_logger(__name__)
+
+
+class AsyncJmaAreaMapper(JmaAreaMapper):
+    """area.json を非同期に取得する JmaAreaMapper
+
+    スナップショットの扱いは JmaAreaMapper と同じ。load() を await してインデックスを
+    読み込んだ後は、find_codes / find_class20_code はメモリ上の検索のみで応答する。
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        snapshot_path: str | None = None,
+        bundled_snapshot_path: str | None = None,
+        max_age: float = DEFAULT_SNAPSHOT_MAX_AGE,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(
+            snapshot_path=snapshot_path,
+            bundled_snapshot_path=bundled_snapshot_path,
+            max_age=max_age,
+            timer=timer,
+        )
+        self.client = client
+        self._load_lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """インデックスを読み込む（読み込み済みなら何もしない）"""
+        async with self._load_lock:
+            if self._index is None:
+                index = await self._load_index_async()
+                with self._lock:
+                    self._index = index
+
+    async def download_snapshot_async(self) -> AreaSnapshot:
+        """area.json を取得してスナップショットを生成"""
+        return self._to_snapshot(await self._fetch_area_data_async())
+
+    @async_retry(max_attempts=3, backoff=[1, 2, 4])
+    async def _fetch_area_data_async(self, headers: dict[str, str] | None = None) -> httpx.Response:
+        try:
+            response = await self.client.get(AREA_JSON_URL, headers=headers or {})
+            # httpx は 3xx でも例外にするため、条件付きGETの 304 は除外する
+            if response.status_code != 304:
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise JMAAPIException(f"気象庁area.json取得エラー: {e}") from e
+        return response
+
+    async def _load_index_async(self) -> AreaIndex:
+        snapshot = self._load_local_snapshot()
+        if snapshot is None:
+            snapshot = await self.download_snapshot_async()
+        elif snapshot.is_stale(self.max_age, now=self._timer()):
+            try:
+                response = await self._fetch_area_data_async(self._conditional_headers(snapshot))
+            except JMAAPIException as e:
+                # 更新確認に失敗しても、手元のスナップショットで処理を継続する
+                log_error(logger, "気象庁area.json更新確認失敗", error=str(e))
+                return snapshot.index
+            snapshot = self._apply_refresh(snapshot, response)
+        else:
+            return snapshot.index
+
+        self._save_local_snapshot(snapshot)
+        return snapshot.index
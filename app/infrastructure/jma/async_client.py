@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+
+from domain.value_objects.weather_series import PopSeries
+from infrastructure.exceptions import JMAAPIException
+from infrastructure.jma.client import DEFAULT_FORECAST_CACHE_SIZE, FORECAST_URL, OfficePops, find_pops, index_pops
+from utils.cache import TTLCache
+from utils.retry import async_retry
+
+
+class AsyncJmaForecastClient:
+    """気象庁天気予報API非同期クライアント（降水確率取得用）
+
+    JmaForecastClient と同じく office_code 単位でキャッシュする。同じ office への
+    同時リクエストは1回の取得にまとめる。
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        cache: TTLCache[str, OfficePops] | None = None,
+    ) -> None:
+        self.client = client
+        self.cache: TTLCache[str, OfficePops] = (
+            cache if cache is not None else TTLCache(maxsize=DEFAULT_FORECAST_CACHE_SIZE)
+        )
+        self._fetch_count = 0
+        self._office_locks: dict[str, asyncio.Lock] = {}
+
+    @property
+    def fetch_count(self) -> int:
+        """forecast JSON を実際に取得した回数"""
+        return self._fetch_count
+
+    async def get_pops(self, office_code: str, class10_code: str) -> PopSeries:
+        """指定エリアの降水確率を取得
+
+        Raises:
+            JMAAPIException: API呼び出しエラーまたはデータが見つからない場合
+        """
+        return find_pops(await self._get_forecast(office_code), class10_code)
+
+    async def _get_forecast(self, office_code: str) -> OfficePops:
+        """office 単位の降水確率をキャッシュ経由で取得"""
+        data = self.cache.get(office_code)
+        if data is not None:
+            return data
+
+        office_lock = self._office_locks.setdefault(office_code, asyncio.Lock())
+        async with office_lock:
+            data = self.cache.get(office_code)
+            if data is None:
+                data = index_pops(await self._fetch_forecast(office_code))
+                self.cache.set(office_code, data)
+        return data
+
+    @async_retry(max_attempts=3, backoff=[1, 2, 4])
+    async def _fetch_forecast(self, office_code: str) -> list[dict]:
+        try:
+            response = await self.client.get(FORECAST_URL.format(office_code=office_code))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise JMAAPIException(f"気象庁予報API呼び出しエラー: {e}") from e
+
+        self._fetch_count += 1
+        return response.json()
@@ -1,18 +1,95 @@
+import threading
+from array import array
 from datetime import datetime
 
 import requests
 
+from domain.value_objects.weather_series import PopSeries
 from infrastructure.exceptions import JMAAPIException
+from infrastructure.http.session import get_shared_session
+from utils.cache import TTLCache
 from utils.retry import retry
 
 FORECAST_URL = "https://www.jma.go.jp/bosai/forecast/data/forecast/{office_code}.json"
 
+# 1回の配信で参照され得る office の数（府県予報区 + 地方の分割区）を上回る件数
+DEFAULT_FORECAST_CACHE_SIZE = 128
+
+
+# office の予報データから作成した class10 コードごとの降水確率
+OfficePops = dict[str, PopSeries]
+
+
+def index_pops(data: list[dict]) -> OfficePops:
+    """office の予報データから class10 コードごとの降水確率を作成
+
+    timeDefines は予報ごとに1回だけ解釈して時だけを持ち、同じ office の全エリアで共有する。
+    同じエリアが複数の予報に含まれる場合は最初の予報を使う。
+    """
+    index: OfficePops = {}
+    # timeSeries[1] が降水確率のデータ
+    for forecast in data:
+        time_series_list = forecast.get("timeSeries", [])
+        if len(time_series_list) < 2:
+            continue
+
+        pop_series = time_series_list[1]
+        hours = [datetime.fromisoformat(time_str).hour for time_str in pop_series.get("timeDefines", [])]
+        for area in pop_series.get("areas", []):
+            area_code = area.get("area", {}).get("code", "")
+            if area_code in index:
+                continue
+            pairs = [(hour, int(pop)) for hour, pop in zip(hours, area.get("pops", []), strict=False) if pop != ""]
+            index[area_code] = PopSeries(
+                hours=array("b", [hour for hour, _ in pairs]),
+                pops=array("h", [pop for _, pop in pairs]),
+            )
+    return index
+
+
+def find_pops(office_pops: OfficePops, class10_code: str) -> PopSeries:
+    """office の降水確率から該当エリアの分を取り出す（読み取り専用として office 内で共有する）"""
+    pops = office_pops.get(class10_code)
+    if pops is None:
+        raise JMAAPIException(
+            f"気象庁予報データにclass10_code '{class10_code}' のデータが見つかりません"
+        )
+    return pops
+
+
+def extract_pops(data: list[dict], class10_code: str) -> PopSeries:
+    """レスポンスから該当エリアの降水確率を抽出"""
+    return find_pops(index_pops(data), class10_code)
+
 
 class JmaForecastClient:
-    """気象庁天気予報APIクライアント（降水確率取得用）"""
+    """気象庁天気予報APIクライアント（降水確率取得用）
 
-    @retry(max_attempts=3, backoff=[1, 2, 4])
-    def get_pops(self, office_code: str, class10_code: str) -> list[dict]:
+    forecast/{office_code}.json は office 単位のため、取得結果を class10 ごとの降水確率に
+    変換して office_code をキーにキャッシュし、同じ office に属する class10 エリアの
+    問い合わせはメモリから応答する（時刻の解釈は office ごとに1回）。
+    cache を渡さない場合はインスタンス単位（1回の配信単位）のキャッシュとなる。
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        cache: TTLCache[str, OfficePops] | None = None,
+    ) -> None:
+        self.session = session or get_shared_session()
+        self.cache: TTLCache[str, OfficePops] = (
+            cache if cache is not None else TTLCache(maxsize=DEFAULT_FORECAST_CACHE_SIZE)
+        )
+        self._fetch_count = 0
+        self._lock = threading.Lock()
+        self._office_locks: dict[str, threading.Lock] = {}
+
+    @property
+    def fetch_count(self) -> int:
+        """forecast JSON を実際に取得した回数"""
+        return self._fetch_count
+
+    def get_pops(self, office_code: str, class10_code: str) -> PopSeries:
         """指定エリアの降水確率を取得
 
         Args:
@@ -20,46 +97,39 @@ class JmaForecastClient:
             class10_code: class10コード（例: "140010"）
 
         Returns:
-            [{"time": datetime, "pop": int}, ...] 形式のリスト
+            6時間ごとの降水確率（各ブロックの開始時と降水確率）
 
         Raises:
             JMAAPIException: API呼び出しエラーまたはデータが見つからない場合
         """
+        return find_pops(self._get_forecast(office_code), class10_code)
+
+    def _get_forecast(self, office_code: str) -> OfficePops:
+        """office 単位の降水確率をキャッシュ経由で取得"""
+        data = self.cache.get(office_code)
+        if data is not None:
+            return data
+
+        # 同じ office を複数スレッドから同時に取得しないよう office ごとにロックする
+        with self._lock:
+            office_lock = self._office_locks.setdefault(office_code, threading.Lock())
+        with office_lock:
+            data = self.cache.get(office_code)
+            if data is None:
+                data = index_pops(self._fetch_forecast(office_code))
+                self.cache.set(office_code, data)
+        return data
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _fetch_forecast(self, office_code: str) -> list[dict]:
         url = FORECAST_URL.format(office_code=office_code)
 
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             raise JMAAPIException(f"気象庁予報API呼び出しエラー: {e}") from e
 
-        data = response.json()
-        return self._extract_pops(data, class10_code)
-
-    def _extract_pops(self, data: list[dict], class10_code: str) -> list[dict]:
-        """レスポンスから該当エリアの降水確率を抽出"""
-        # timeSeries[1] が降水確率のデータ
-        for forecast in data:
-            time_series_list = forecast.get("timeSeries", [])
-            if len(time_series_list) < 2:
-                continue
-
-            pop_series = time_series_list[1]
-            time_defines = pop_series.get("timeDefines", [])
-            areas = pop_series.get("areas", [])
-
-            # 該当エリアを検索
-            for area in areas:
-                area_code = area.get("area", {}).get("code", "")
-                if area_code == class10_code:
-                    pops = area.get("pops", [])
-                    result = []
-                    for i, time_str in enumerate(time_defines):
-                        if i < len(pops) and pops[i] != "":
-                            dt = datetime.fromisoformat(time_str)
-                            result.append({"time": dt, "pop": int(pops[i])})
-                    return result
-
-        raise JMAAPIException(
-            f"気象庁予報データにclass10_code '{class10_code}' のデータが見つかりません"
-        )
+        with self._lock:
+            self._fetch_count += 1
+        return response.json()
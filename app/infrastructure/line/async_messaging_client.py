@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+
+from infrastructure.exceptions import MessagingException
+from infrastructure.line.messaging_client import MULTICAST_MAX_RECIPIENTS, LineMessagingClient
+from utils.logger import get_logger, log_error
+from utils.retry import async_retry
+
+logger = get_logger(__name__)
+
+
+class AsyncLineMessagingClient:
+    """LINE Messaging API非同期クライアント"""
+
+    BASE_URL = LineMessagingClient.BASE_URL
+
+    def __init__(self, channel_access_token: str, client: httpx.AsyncClient) -> None:
+        self.channel_access_token = channel_access_token
+        self.client = client
+
+    async def reply_message(self, reply_token: str, text: str) -> None:
+        """返信メッセージを送信
+
+        Raises:
+            MessagingException: メッセージ送信エラー
+        """
+        data = {
+            "replyToken": reply_token,
+            "messages": [{"type": "text", "text": text}],
+        }
+        await self._post("reply", data, "LINE Reply Message送信エラー")
+
+    async def push_message(self, user_id: str, message: str) -> None:
+        """Push Messageを送信
+
+        Raises:
+            MessagingException: メッセージ送信エラー
+        """
+        data = {
+            "to": user_id,
+            "messages": [{"type": "text", "text": message}],
+        }
+        await self._post("push", data, "LINE Push Message送信エラー")
+
+    async def multicast_message(self, user_ids: list[str], message: str) -> list[str]:
+        """同一メッセージを複数ユーザーへ送信（Multicast Message）
+
+        宛先は MULTICAST_MAX_RECIPIENTS 件ごとに分割し、並行して送信する。
+        送信に失敗したチャンクは、そのチャンクに含まれる全ユーザーを失敗として扱う。
+
+        Returns:
+            送信に失敗したユーザーIDのリスト
+        """
+        chunks = [
+            user_ids[start : start + MULTICAST_MAX_RECIPIENTS]
+            for start in range(0, len(user_ids), MULTICAST_MAX_RECIPIENTS)
+        ]
+        results = await asyncio.gather(
+            *(self._send_multicast(chunk, message) for chunk in chunks), return_exceptions=True
+        )
+
+        failed_user_ids: list[str] = []
+        for chunk, result in zip(chunks, results, strict=True):
+            if isinstance(result, MessagingException):
+                log_error(logger, "Multicast Message送信失敗", error=str(result), recipients=len(chunk))
+                failed_user_ids.extend(chunk)
+            elif isinstance(result, BaseException):
+                raise result
+        return failed_user_ids
+
+    async def _send_multicast(self, user_ids: list[str], message: str) -> None:
+        """Multicast Messageを1リクエスト送信"""
+        data = {
+            "to": user_ids,
+            "messages": [{"type": "text", "text": message}],
+        }
+        await self._post("multicast", data, "LINE Multicast Message送信エラー")
+
+    @async_retry(max_attempts=3, backoff=[1, 2, 4])
+    async def _post(self, endpoint: str, data: dict, error_message: str) -> None:
+        headers = {"Authorization": f"Bearer {self.channel_access_token}"}
+
+        try:
+            response = await self.client.post(f"{self.BASE_URL}/{endpoint}", headers=headers, json=data)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise MessagingException(f"{error_message}: {e}") from e
@@ -0,0 +1,98 @@
+import heapq
+import random
+import time
+from collections.abc import Callable
+
+from infrastructure.exceptions import LineRateLimitException, MessagingException
+from utils.logger import get_logger, log_error, log_info
+from utils.rate_limiter import TokenBucket
+
+logger = get_logger(__name__)
+
+# LINE Messaging API の multicast のレート上限（200 req/s）を下回る既定の送信レート
+DEFAULT_MULTICAST_QPS = 180.0
+
+# 429 に Retry-After ヘッダーがない場合に送信を止める秒数
+DEFAULT_RATE_LIMIT_PAUSE = 1.0
+
+
+class DeliveryScheduler:
+    """トークンバケットで送信レートを制御する配信スケジューラー
+
+    全リクエストは共有のトークンバケットを通すため、複数スレッドから使っても
+    全体の送信レートは qps 以下に保たれる。
+
+    - 429 を受けた場合は Retry-After（なければ DEFAULT_RATE_LIMIT_PAUSE）の間、
+      バケット全体の払い出しを止めてから再送する。
+    - その他の送信エラーはジッター付きバックオフ後に再送するが、待機中も
+      他のチャンクの送信は続ける（1チャンクの失敗で配信全体を止めない）。
+
+    Args:
+        qps: 1秒あたりの最大リクエスト数
+        max_attempts: 1チャンクあたりの最大送信回数（429 を含む）
+        backoff: 送信エラー時の再送待ち秒数（試行回数ごと）
+        jitter: 再送待ちに加えるランダムな時間の最大倍率
+        timer: 現在時刻を返す関数（テスト用に差し替え可能）
+        sleep: 待機関数（テスト用に差し替え可能）
+    """
+
+    def __init__(
+        self,
+        qps: float = DEFAULT_MULTICAST_QPS,
+        max_attempts: int = 3,
+        backoff: list[int] | None = None,
+        jitter: float = 0.5,
+        timer: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts は1以上である必要があります")
+        self.max_attempts = max_attempts
+        self.backoff = backoff if backoff is not None else [1, 2, 4]
+        self.jitter = jitter
+        self.bucket = TokenBucket(qps, timer=timer, sleep=sleep)
+        self._timer = timer
+        self._sleep = sleep
+        self.rate_limited_count = 0
+
+    def run(self, chunks: list[list[str]], send: Callable[[list[str]], None]) -> list[str]:
+        """チャンクごとに send を呼び出して配信
+
+        Returns:
+            最大送信回数を超えて失敗したチャンクに含まれるユーザーIDのリスト
+        """
+        # (送信可能になる時刻, 投入順, 試行回数, チャンク)
+        queue = [(0.0, seq, 0, chunk) for seq, chunk in enumerate(chunks)]
+        seq = len(queue)
+        failed_user_ids: list[str] = []
+
+        while queue:
+            not_before, _, attempt, chunk = heapq.heappop(queue)
+            delay = not_before - self._timer()
+            if delay > 0:
+                self._sleep(delay)
+
+            self.bucket.acquire()
+            try:
+                send(chunk)
+                continue
+            except LineRateLimitException as e:
+                self.rate_limited_count += 1
+                pause = e.retry_after if e.retry_after is not None else DEFAULT_RATE_LIMIT_PAUSE
+                self.bucket.pause(pause)
+                log_info(logger, "レート制限のため送信を一時停止", pause_seconds=pause, recipients=len(chunk))
+                retry_at = 0.0
+                error: MessagingException = e
+            except MessagingException as e:
+                base = self.backoff[min(attempt, len(self.backoff) - 1)]
+                retry_at = self._timer() + base + random.uniform(0, base * self.jitter)
+                error = e
+
+            if attempt + 1 >= self.max_attempts:
+                log_error(logger, "Multicast Message送信失敗", error=str(error), recipients=len(chunk))
+                failed_user_ids.extend(chunk)
+            else:
+                heapq.heappush(queue, (retry_at, seq, attempt + 1, chunk))
+                seq += 1
+
+        return failed_user_ids
@@ -1,16 +1,58 @@
+import uuid
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
 import requests
 
-from infrastructure.exceptions import MessagingException
+from infrastructure.exceptions import LineRateLimitException, MessagingException
+from infrastructure.http.session import get_shared_session
+from infrastructure.line.delivery_scheduler import DeliveryScheduler
+from utils.logger import get_logger, log_error, log_info
 from utils.retry import retry
 
+logger = get_logger(__name__)
+
+# Multicast Message の1リクエストあたりの最大宛先数
+MULTICAST_MAX_RECIPIENTS = 500
+
+# X-Line-Retry-Key を宛先から決定的に生成するための名前空間
+RETRY_KEY_NAMESPACE = uuid.UUID("8c0b7a0e-4f3c-5b7e-9a51-2f1d6c3e8b44")
+
+
+def make_retry_key(seed: str, user_ids: list[str]) -> str:
+    """seed と宛先が同じリクエストに同じ X-Line-Retry-Key（UUID）を割り当てる（宛先の並び順によらない）"""
+    return str(uuid.uuid5(RETRY_KEY_NAMESPACE, "\n".join([seed, *sorted(user_ids)])))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After ヘッダー（秒数または HTTP-date）を待機秒数に変換。解釈できない場合は None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
 
 class LineMessagingClient:
     """LINE Messaging APIクライアント"""
 
     BASE_URL = "https://api.line.me/v2/bot/message"
 
-    def __init__(self, channel_access_token: str) -> None:
+    def __init__(
+        self,
+        channel_access_token: str,
+        session: requests.Session | None = None,
+        scheduler: DeliveryScheduler | None = None,
+    ) -> None:
         self.channel_access_token = channel_access_token
+        self.session = session or get_shared_session()
+        self.scheduler = scheduler
 
     @retry(max_attempts=3, backoff=[1, 2, 4])
     def reply_message(self, reply_token: str, text: str) -> None:
@@ -30,30 +72,128 @@ class LineMessagingClient:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=10)
+            response = self.session.post(url, headers=headers, json=data, timeout=10)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             raise MessagingException(f"LINE Reply Message送信エラー: {e}") from e
 
     @retry(max_attempts=3, backoff=[1, 2, 4])
-    def push_message(self, user_id: str, message: str) -> None:
+    def push_message(self, user_id: str, message: str, retry_key: str | None = None) -> None:
         """Push Messageを送信
 
+        retry_key を指定すると X-Line-Retry-Key として送信する。同じキーのリクエストが
+        受理済みの場合（409）は送信済みとして扱う。
+
         Raises:
             MessagingException: メッセージ送信エラー
         """
         url = f"{self.BASE_URL}/push"
-        headers = {
-            "Authorization": f"Bearer {self.channel_access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = self._headers(retry_key)
         data = {
             "to": user_id,
             "messages": [{"type": "text", "text": message}],
         }
 
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=10)
+            response = self.session.post(url, headers=headers, json=data, timeout=10)
+            if self._already_accepted(response, retry_key):
+                return
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             raise MessagingException(f"LINE Push Message送信エラー: {e}") from e
+
+    def multicast_message(self, user_ids: list[str], message: str, retry_key_seed: str | None = None) -> list[str]:
+        """同一メッセージを複数ユーザーへ送信（Multicast Message）
+
+        宛先は MULTICAST_MAX_RECIPIENTS 件ごとに分割して送信する。
+        送信に失敗したチャンクは、そのチャンクに含まれる全ユーザーを失敗として扱う。
+        scheduler が設定されている場合は、送信レートと再送をスケジューラーに任せる。
+        retry_key_seed を指定すると、チャンクごとに seed と宛先から X-Line-Retry-Key を生成する
+        （同じ seed・同じ宛先のチャンクは、受理済みであれば LINE 側で重複送信されない。
+        再実行で重複させないには、呼び出し側が同じ宛先のチャンクを再現する必要がある）。
+
+        Returns:
+            送信に失敗したユーザーIDのリスト
+        """
+        chunks = [
+            user_ids[start : start + MULTICAST_MAX_RECIPIENTS]
+            for start in range(0, len(user_ids), MULTICAST_MAX_RECIPIENTS)
+        ]
+
+        def retry_key(chunk: list[str]) -> str | None:
+            return make_retry_key(retry_key_seed, chunk) if retry_key_seed is not None else None
+
+        if self.scheduler is not None:
+            return self.scheduler.run(chunks, lambda chunk: self.send_multicast(chunk, message, retry_key(chunk)))
+
+        failed_user_ids: list[str] = []
+        for chunk in chunks:
+            try:
+                self._send_multicast(chunk, message, retry_key(chunk))
+            except MessagingException as e:
+                log_error(logger, "Multicast Message送信失敗", error=str(e), recipients=len(chunk))
+                failed_user_ids.extend(chunk)
+        return failed_user_ids
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _send_multicast(self, user_ids: list[str], message: str, retry_key: str | None = None) -> None:
+        """Multicast Messageを1リクエスト送信（失敗時はリトライ）
+
+        Raises:
+            MessagingException: メッセージ送信エラー
+        """
+        self.send_multicast(user_ids, message, retry_key)
+
+    def send_multicast(self, user_ids: list[str], message: str, retry_key: str | None = None) -> None:
+        """Multicast Messageを1リクエスト送信（リトライなし）
+
+        retry_key のリクエストが受理済みの場合（409）は送信済みとして扱う。
+
+        Raises:
+            LineRateLimitException: レート制限（429）
+            MessagingException: メッセージ送信エラー
+        """
+        url = f"{self.BASE_URL}/multicast"
+        headers = self._headers(retry_key)
+        data = {
+            "to": user_ids,
+            "messages": [{"type": "text", "text": message}],
+        }
+
+        try:
+            response = self.session.post(url, headers=headers, json=data, timeout=10)
+        except requests.exceptions.RequestException as e:
+            raise MessagingException(f"LINE Multicast Message送信エラー: {e}") from e
+        if self._already_accepted(response, retry_key):
+            return
+        if response.status_code == 429:
+            raise LineRateLimitException(
+                "LINE Multicast Message送信エラー: 429 Too Many Requests",
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+        try:
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise MessagingException(f"LINE Multicast Message送信エラー: {e}") from e
+
+    def _headers(self, retry_key: str | None = None) -> dict[str, str]:
+        headers = {
+            "Authorization": f"Bearer {self.channel_access_token}",
+            "Content-Type": "application/json",
+        }
+        if retry_key is not None:
+            headers["X-Line-Retry-Key"] = retry_key
+        return headers
+
+    @staticmethod
+    def _already_accepted(response: requests.Response, retry_key: str | None) -> bool:
+        """同じ X-Line-Retry-Key のリクエストが受理済み（409）かどうか"""
+        if retry_key is None or response.status_code != 409:
+            return False
+        log_info(
+            logger,
+            "送信済みのリクエストのため再送をスキップ",
+            retry_key=retry_key,
+            accepted_request_id=response.headers.get("X-Line-Accepted-Request-Id"),
+        )
+        return True
@@ -0,0 +1,79 @@
+import http.client
+import json
+import os
+import threading
+from urllib.parse import quote
+
+from infrastructure.exceptions import SecretsException
+
+# AWS Parameters and Secrets Lambda Extension の既定のポート
+DEFAULT_EXTENSION_HTTP_PORT = 2773
+
+
+class SecretsExtensionClient:
+    """AWS Parameters and Secrets Lambda Extension からシークレットを取得するクライアント
+
+    Lambda 内の localhost で待ち受ける拡張機能へ標準ライブラリの http.client で問い合わせるため、
+    boto3 を読み込まずにシークレットを取得できる（コールドスタートの短縮用）。
+    SecretsProvider の client として、boto3 の Secrets Manager クライアントの代わりに使う。
+
+    Args:
+        port: 拡張機能の HTTP ポート
+        host: 拡張機能のホスト
+        token: 認証用のトークン（省略時は環境変数 AWS_SESSION_TOKEN）
+        timeout: タイムアウト（秒）
+    """
+
+    def __init__(
+        self,
+        port: int = DEFAULT_EXTENSION_HTTP_PORT,
+        host: str = "localhost",
+        token: str | None = None,
+        timeout: float = 5,
+    ) -> None:
+        self.port = port
+        self.host = host
+        self.token = token
+        self.timeout = timeout
+        self._connection: http.client.HTTPConnection | None = None
+        self._lock = threading.Lock()
+
+    def get_secret_value(self, SecretId: str) -> dict:  # noqa: N803
+        """GetSecretValue と同じ形式でシークレットを取得
+
+        Raises:
+            SecretsException: 取得に失敗した場合
+        """
+        status, body = self._get(f"/secretsmanager/get?secretId={quote(SecretId, safe='')}")
+        if status != 200:
+            raise SecretsException(f"シークレットを取得できません: {SecretId} (HTTP {status}: {body[:200]!r})")
+        return json.loads(body)
+
+    def batch_get_secret_value(self, SecretIdList: list[str], NextToken: str | None = None) -> dict:  # noqa: N803
+        """BatchGetSecretValue と同じ形式でシークレットを取得（拡張機能には一括取得がないため1件ずつ取得する）"""
+        values: list[dict] = []
+        errors: list[dict] = []
+        for secret_id in SecretIdList:
+            try:
+                values.append(self.get_secret_value(SecretId=secret_id))
+            except SecretsException as e:
+                errors.append({"SecretId": secret_id, "ErrorCode": "ExtensionError", "Message": str(e)})
+        return {"SecretValues": values, "Errors": errors}
+
+    def _get(self, path: str) -> tuple[int, bytes]:
+        headers = {"X-Aws-Parameters-Secrets-Token": self.token or os.environ.get("AWS_SESSION_TOKEN", "")}
+        with self._lock:
+            # 拡張機能との接続は Keep-Alive で再利用し、切断されていた場合は1回だけ接続し直す
+            error: Exception | None = None
+            for _ in range(2):
+                if self._connection is None:
+                    self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                try:
+                    self._connection.request("GET", path, headers=headers)
+                    response = self._connection.getresponse()
+                    return response.status, response.read()
+                except (OSError, http.client.HTTPException) as e:
+                    self._connection.close()
+                    self._connection = None
+                    error = e
+        raise SecretsException(f"シークレット拡張機能への接続に失敗しました: {error}") from error
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from infrastructure.exceptions import SecretsException
+from infrastructure.secretsmanager.extension_client import SecretsExtensionClient
+from utils.cache import TTLCache
+
+# 取得したシークレットを再利用する秒数（ローテーション後もこの時間内に新しい値へ切り替わる）
+DEFAULT_TTL_SECONDS = 300
+# refresh で Secrets Manager から取得し直す最短の間隔（不正な署名のリクエストが続いても呼び出し回数を抑える）
+DEFAULT_MIN_REFRESH_INTERVAL_SECONDS = 30
+# BatchGetSecretValue の1リクエストで指定できるシークレット数の上限
+BATCH_GET_MAX_SECRETS = 20
+
+_shared_provider: "SecretsProvider | None" = None
+_shared_provider_lock = threading.Lock()
+
+
+class SecretsProvider:
+    """Secrets Manager のシークレットを TTL 付きでキャッシュして取得する
+
+    boto3 クライアントは初回の取得時に1回だけ生成する（boto3 もその時点で読み込む）。
+    複数のシークレットは BatchGetSecretValue でまとめて取得する（キャッシュにないもののみ）。
+
+    Args:
+        ttl: キャッシュの有効期限（秒）
+        min_refresh_interval: refresh で取得し直す最短の間隔（秒）
+        client: Secrets Manager クライアント（省略時は初回の取得時に生成）
+        timer: 現在時刻を返す関数（テスト用に差し替え可能）
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL_SECONDS,
+        client: Any = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._client_lock = threading.Lock()
+        self._cache: TTLCache[str, str] = TTLCache(maxsize=32, ttl=ttl, timer=timer)
+        self._min_refresh_interval = min_refresh_interval
+        self._refreshed_at: dict[str, float] = {}
+        self._timer = timer
+        self.fetch_count = 0
+
+    @property
+    def client(self) -> Any:
+        with self._client_lock:
+            if self._client is None:
+                import boto3
+
+                self._client = boto3.client("secretsmanager")
+            return self._client
+
+    def get(self, secret_id: str) -> str:
+        """シークレットを取得（キャッシュが有効ならキャッシュから）
+
+        Raises:
+            SecretsException: 取得に失敗した場合
+        """
+        return self.get_many([secret_id])[secret_id]
+
+    def get_many(self, secret_ids: Iterable[str]) -> dict[str, str]:
+        """複数のシークレットを取得。キャッシュにないものは1回の呼び出しでまとめて取得する
+
+        Raises:
+            SecretsException: いずれかの取得に失敗した場合
+        """
+        secrets: dict[str, str] = {}
+        missing: list[str] = []
+        for secret_id in dict.fromkeys(secret_ids):
+            value = self._cache.get(secret_id)
+            if value is None:
+                missing.append(secret_id)
+            else:
+                secrets[secret_id] = value
+        if missing:
+            fetched = self._fetch(missing)
+            for secret_id, value in fetched.items():
+                self._cache.set(secret_id, value)
+            secrets.update(fetched)
+        return secrets
+
+    def refresh(self, secret_id: str) -> str:
+        """ローテーションされた可能性がある場合に、キャッシュを使わずに取得し直す
+
+        前回の refresh から min_refresh_interval 秒以内の場合は取得し直さず、キャッシュの値を返す。
+
+        Raises:
+            SecretsException: 取得に失敗した場合
+        """
+        now = self._timer()
+        refreshed_at = self._refreshed_at.get(secret_id)
+        if refreshed_at is not None and now - refreshed_at < self._min_refresh_interval:
+            return self.get(secret_id)
+        self._refreshed_at[secret_id] = now
+        value = self._fetch([secret_id])[secret_id]
+        self._cache.set(secret_id, value)
+        return value
+
+    def clear(self) -> None:
+        """キャッシュを破棄"""
+        self._cache.clear()
+        self._refreshed_at.clear()
+
+    def _fetch(self, secret_ids: list[str]) -> dict[str, str]:
+        """Secrets Manager から取得（1件は GetSecretValue、複数件は BatchGetSecretValue）"""
+        try:
+            if len(secret_ids) == 1:
+                self.fetch_count += 1
+                response = self.client.get_secret_value(SecretId=secret_ids[0])
+                return {secret_ids[0]: response["SecretString"]}
+
+            secrets: dict[str, str] = {}
+            for start in range(0, len(secret_ids), BATCH_GET_MAX_SECRETS):
+                secrets.update(self._batch_get(secret_ids[start : start + BATCH_GET_MAX_SECRETS]))
+            return secrets
+        except _aws_errors() as e:
+            raise SecretsException(f"シークレットの取得に失敗しました: {e}") from e
+
+    def _batch_get(self, secret_ids: list[str]) -> dict[str, str]:
+        values: dict[str, str] = {}
+        errors: list[dict] = []
+        kwargs: dict = {"SecretIdList": secret_ids}
+        while True:
+            self.fetch_count += 1
+            response = self.client.batch_get_secret_value(**kwargs)
+            for value in response.get("SecretValues", []):
+                # SecretId には名前と ARN のどちらも指定できるため、両方で引けるようにする
+                values[value["Name"]] = value["SecretString"]
+                values[value["ARN"]] = value["SecretString"]
+            errors.extend(response.get("Errors", []))
+            if not response.get("NextToken"):
+                break
+            kwargs["NextToken"] = response["NextToken"]
+
+        missing = [secret_id for secret_id in secret_ids if secret_id not in values]
+        if missing:
+            messages = ", ".join(f"{error.get('SecretId')}: {error.get('ErrorCode')}" for error in errors)
+            raise SecretsException(f"シークレットを取得できません: {', '.join(missing)} ({messages})")
+        return {secret_id: values[secret_id] for secret_id in secret_ids}
+
+
+def _aws_errors() -> tuple[type[Exception], ...]:
+    """boto3 クライアントの例外（except 節は例外の発生時にのみ評価されるため、botocore はその時点で読み込む）"""
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    return BotoCoreError, ClientError
+
+
+def get_secrets_provider() -> SecretsProvider:
+    """プロセス内で共有する SecretsProvider を取得
+
+    モジュールスコープに保持するため、Lambda のウォームスタート間でもキャッシュと
+    boto3 クライアントが再利用される。TTL は環境変数 SECRETS_CACHE_TTL_SECONDS で変更できる。
+    環境変数 PARAMETERS_SECRETS_EXTENSION_HTTP_PORT が設定されている場合は、boto3 の代わりに
+    AWS Parameters and Secrets Lambda Extension から取得する。
+    """
+    global _shared_provider
+    with _shared_provider_lock:
+        if _shared_provider is None:
+            extension_port = os.environ.get("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT")
+            _shared_provider = SecretsProvider(
+                ttl=float(os.environ.get("SECRETS_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                client=SecretsExtensionClient(port=int(extension_port)) if extension_port else None,
+            )
+        return _shared_provider
+
+
+def reset_secrets_provider() -> None:
+    """共有の SecretsProvider を破棄（次回の get_secrets_provider で再生成される）"""
+    global _shared_provider
+    with _shared_provider_lock:
+        _shared_provider = None
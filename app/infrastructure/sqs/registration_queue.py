@@ -0,0 +1,109 @@
+import json
+from collections import deque
+
+import boto3
+
+from domain.repositories.registration_queue import RegistrationQueue
+from domain.value_objects.region_registration import RegionRegistration
+from infrastructure.exceptions import QueueException
+from infrastructure.sqs.shard_queue import SEND_BATCH_MAX_MESSAGES, SEND_MAX_ATTEMPTS
+from utils.retry import retry
+
+
+def encode_registration(registration: RegionRegistration) -> str:
+    """地域設定の依頼をキューのメッセージ本文（JSON）に変換"""
+    return json.dumps(
+        {
+            "userId": registration.user_id,
+            "cityName": registration.city_name,
+            "replyToken": registration.reply_token,
+            "eventId": registration.event_id,
+        },
+        ensure_ascii=False,
+    )
+
+
+def decode_registration(body: str) -> RegionRegistration:
+    """キューのメッセージ本文（JSON）を地域設定の依頼に変換
+
+    Raises:
+        ValueError: 本文が地域設定の依頼として解釈できない場合
+    """
+    try:
+        data = json.loads(body)
+        return RegionRegistration(
+            user_id=data["userId"],
+            city_name=data["cityName"],
+            reply_token=data["replyToken"],
+            event_id=data.get("eventId", ""),
+        )
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"地域設定のメッセージを解釈できません: {body}") from e
+
+
+class SqsRegistrationQueue(RegistrationQueue):
+    """SQS 実装の RegistrationQueue
+
+    FIFO キュー（URL が .fifo で終わる）の場合は userId をメッセージグループとし、
+    同じユーザーの依頼を受け付けた順に処理させる。webhookEventId を重複排除IDとして、
+    LINE から再送されたイベントを二重に処理させない。
+    """
+
+    def __init__(self, queue_url: str) -> None:
+        self.sqs = boto3.client("sqs")
+        self.queue_url = queue_url
+        self.fifo = queue_url.endswith(".fifo")
+
+    def send_registrations(self, registrations: list[RegionRegistration]) -> None:
+        """依頼を SEND_BATCH_MAX_MESSAGES 件ずつ送信（一部が失敗した場合は失敗したもののみ再送する）
+
+        Raises:
+            QueueException: 再送しても送信できないメッセージがある場合
+        """
+        for start in range(0, len(registrations), SEND_BATCH_MAX_MESSAGES):
+            pending = list(enumerate(registrations[start : start + SEND_BATCH_MAX_MESSAGES]))
+            for _ in range(SEND_MAX_ATTEMPTS):
+                pending = self._send_batch(pending)
+                if not pending:
+                    break
+            else:
+                failed = [registration.user_id for _, registration in pending]
+                raise QueueException(f"地域設定の依頼の送信に失敗しました: {failed}")
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _send_batch(self, registrations: list[tuple[int, RegionRegistration]]) -> list[tuple[int, RegionRegistration]]:
+        """SendMessageBatch を1リクエスト送信し、送信に失敗した依頼を返す"""
+        response = self.sqs.send_message_batch(
+            QueueUrl=self.queue_url,
+            Entries=[self._entry(index, registration) for index, registration in registrations],
+        )
+        failed_ids = {entry["Id"] for entry in response.get("Failed", [])}
+        return [(index, registration) for index, registration in registrations if str(index) in failed_ids]
+
+    def _entry(self, index: int, registration: RegionRegistration) -> dict:
+        entry = {"Id": str(index), "MessageBody": encode_registration(registration)}
+        if self.fifo:
+            entry["MessageGroupId"] = registration.user_id
+            if registration.event_id:
+                entry["MessageDeduplicationId"] = registration.event_id
+        return entry
+
+
+class InMemoryRegistrationQueue(RegistrationQueue):
+    """プロセス内で完結する RegistrationQueue（ローカル実行・テスト用の SQS の代替）
+
+    SQS と同じくメッセージ本文（JSON）で保持し、receive で取り出す。
+    """
+
+    def __init__(self) -> None:
+        self._messages: deque[str] = deque()
+
+    def send_registrations(self, registrations: list[RegionRegistration]) -> None:
+        self._messages.extend(encode_registration(registration) for registration in registrations)
+
+    def receive(self, max_messages: int = SEND_BATCH_MAX_MESSAGES) -> list[str]:
+        """メッセージ本文を最大 max_messages 件取り出す（SQS の ReceiveMessage と同じく一度に複数件）"""
+        return [self._messages.popleft() for _ in range(min(max_messages, len(self._messages)))]
+
+    def __len__(self) -> int:
+        return len(self._messages)
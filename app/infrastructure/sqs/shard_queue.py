@@ -0,0 +1,89 @@
+import json
+from collections import deque
+
+import boto3
+
+from domain.repositories.shard_queue import ShardQueue
+from domain.value_objects.broadcast_shard import BroadcastShard
+from infrastructure.exceptions import QueueException
+from utils.retry import retry
+
+# SendMessageBatch の1リクエストあたりの最大メッセージ数
+SEND_BATCH_MAX_MESSAGES = 10
+
+# 一部のメッセージが失敗したバッチを送り直す最大回数
+SEND_MAX_ATTEMPTS = 3
+
+
+def encode_shard(shard: BroadcastShard) -> str:
+    """シャードをキューのメッセージ本文（JSON）に変換"""
+    return json.dumps({"runId": shard.run_id, "index": shard.index, "count": shard.count})
+
+
+def decode_shard(body: str) -> BroadcastShard:
+    """キューのメッセージ本文（JSON）をシャードに変換
+
+    Raises:
+        ValueError: 本文がシャードとして解釈できない場合
+    """
+    try:
+        data = json.loads(body)
+        return BroadcastShard(run_id=data["runId"], index=int(data["index"]), count=int(data["count"]))
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"シャードのメッセージを解釈できません: {body}") from e
+
+
+class SqsShardQueue(ShardQueue):
+    """SQS 実装の ShardQueue"""
+
+    def __init__(self, queue_url: str) -> None:
+        self.sqs = boto3.client("sqs")
+        self.queue_url = queue_url
+
+    def send_shards(self, shards: list[BroadcastShard]) -> None:
+        """シャードを SEND_BATCH_MAX_MESSAGES 件ずつ送信
+
+        一部のメッセージだけ失敗した場合は、失敗したメッセージのみ再送する
+        （成功済みのシャードを二重に配信させない）。
+
+        Raises:
+            QueueException: 再送しても送信できないメッセージがある場合
+        """
+        for start in range(0, len(shards), SEND_BATCH_MAX_MESSAGES):
+            pending = shards[start : start + SEND_BATCH_MAX_MESSAGES]
+            for _ in range(SEND_MAX_ATTEMPTS):
+                pending = self._send_batch(pending)
+                if not pending:
+                    break
+            else:
+                raise QueueException(f"シャードの送信に失敗しました: {[shard.index for shard in pending]}")
+
+    @retry(max_attempts=3, backoff=[1, 2, 4])
+    def _send_batch(self, shards: list[BroadcastShard]) -> list[BroadcastShard]:
+        """SendMessageBatch を1リクエスト送信し、送信に失敗したシャードを返す"""
+        response = self.sqs.send_message_batch(
+            QueueUrl=self.queue_url,
+            Entries=[{"Id": str(shard.index), "MessageBody": encode_shard(shard)} for shard in shards],
+        )
+        failed_ids = {entry["Id"] for entry in response.get("Failed", [])}
+        return [shard for shard in shards if str(shard.index) in failed_ids]
+
+
+class InMemoryShardQueue(ShardQueue):
+    """プロセス内で完結する ShardQueue（ローカル実行・テスト用の SQS の代替）
+
+    SQS と同じくメッセージ本文（JSON）で保持し、receive で取り出す。
+    """
+
+    def __init__(self) -> None:
+        self._messages: deque[str] = deque()
+
+    def send_shards(self, shards: list[BroadcastShard]) -> None:
+        self._messages.extend(encode_shard(shard) for shard in shards)
+
+    def receive(self) -> str | None:
+        """メッセージ本文を1件取り出す（空の場合は None）"""
+        return self._messages.popleft() if self._messages else None
+
+    def __len__(self) -> int:
+        return len(self._messages)
@@ -0,0 +1,60 @@
+import httpx
+
+from domain.value_objects.weather_series import TemperatureSeries
+from infrastructure.exceptions import WeatherAPIException
+from infrastructure.weatherapi.client import (
+    HourlyTemperatureScanner,
+    WeatherApiClient,
+    forecast_params,
+    lean_forecast_params,
+    parse_hourly_weather,
+)
+from utils.retry import async_retry
+
+
+class AsyncWeatherApiClient:
+    """WeatherAPI (weatherapi.com) Forecast API 非同期クライアント"""
+
+    BASE_URL = WeatherApiClient.BASE_URL
+
+    def __init__(self, api_key: str, client: httpx.AsyncClient, lean: bool = False) -> None:
+        """
+        Args:
+            lean: True の場合は最小のレスポンスを要求し、受信しながら気温だけを読む（WeatherApiClient と同じ）
+        """
+        self.api_key = api_key
+        self.client = client
+        self.lean = lean
+
+    @async_retry(max_attempts=3, backoff=[1, 2, 4])
+    async def get_hourly_weather(self, lat: float, lon: float) -> TemperatureSeries:
+        """指定した緯度経度の1時間ごとの天気情報を取得
+
+        Raises:
+            WeatherAPIException: API呼び出しエラー
+        """
+        if self.lean:
+            return await self._get_hourly_weather_lean(lat, lon)
+
+        try:
+            response = await self.client.get(self.BASE_URL, params=forecast_params(self.api_key, lat, lon))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise WeatherAPIException(f"WeatherAPI 呼び出しエラー: {e}") from e
+
+        return parse_hourly_weather(response.json())
+
+    async def _get_hourly_weather_lean(self, lat: float, lon: float) -> TemperatureSeries:
+        """最小のレスポンスを要求し、受信しながら気温だけを読む"""
+        scanner = HourlyTemperatureScanner()
+        try:
+            params = lean_forecast_params(self.api_key, lat, lon)
+            async with self.client.stream("GET", self.BASE_URL, params=params) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    scanner.feed(chunk)
+            return scanner.result()
+        except httpx.HTTPError as e:
+            raise WeatherAPIException(f"WeatherAPI 呼び出しエラー: {e}") from e
+        except ValueError as e:
+            raise WeatherAPIException(f"WeatherAPI レスポンス解釈エラー: {e}") from e
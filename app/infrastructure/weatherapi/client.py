@@ -1,19 +1,163 @@
+import re
+from array import array
+
 import requests
 
+from domain.value_objects.weather_series import TemperatureSeries, parse_hour
 from infrastructure.exceptions import WeatherAPIException
+from infrastructure.http.session import get_shared_session
 from utils.retry import retry
 
 
+def forecast_params(api_key: str, lat: float, lon: float) -> dict:
+    """Forecast API のクエリパラメータ"""
+    return {
+        "key": api_key,
+        "q": f"{lat},{lon}",
+        "days": 1,
+        "lang": "ja",
+        "aqi": "no",
+        "alerts": "no",
+    }
+
+
+def lean_forecast_params(api_key: str, lat: float, lon: float) -> dict:
+    """最小のレスポンスになる Forecast API のクエリパラメータ
+
+    Forecast API はフィールドを選べないため、当日分（days=1）のみとし、
+    使わない天気の説明文の翻訳（lang）と大気質・警報（aqi・alerts）を付けない。
+    """
+    return {
+        "key": api_key,
+        "q": f"{lat},{lon}",
+        "days": 1,
+        "aqi": "no",
+        "alerts": "no",
+    }
+
+
+# 逐次読み込み（lean）時に受信データを読む単位
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# JST（UTC+9）の時を time_epoch から求めるためのオフセット秒
+JST_OFFSET_SECONDS = 9 * 60 * 60
+
+
+def parse_hourly_weather(data: dict) -> TemperatureSeries:
+    """Forecast API のレスポンスから当日の1時間ごとの気温を取り出す
+
+    JST の時と気温の配列にし、算出時に時刻文字列を解釈し直さなくてよいようにする。
+    """
+    today = data.get("forecast", {}).get("forecastday", [])
+    if not today:
+        return TemperatureSeries()
+
+    hours = today[0].get("hour", [])
+    return TemperatureSeries(
+        hours=array("b", [_jst_hour(hour) for hour in hours]),
+        temps=array("d", [hour["temp_c"] for hour in hours]),
+    )
+
+
+def _jst_hour(hour: dict) -> int:
+    """time_epoch（UTC の UNIX 時刻）から JST の時を求める。ない場合は時刻文字列から切り出す"""
+    epoch = hour.get("time_epoch")
+    if isinstance(epoch, int):
+        return (epoch + JST_OFFSET_SECONDS) // 3600 % 24
+    return parse_hour(hour["time"])
+
+
+# forecastday 以降で読むキーと数値（forecastday の値は配列のため数値なし）
+_HOURLY_TOKEN = re.compile(rb'"(forecastday|date_epoch|time_epoch|temp_c)"\s*:\s*(-?[0-9][0-9.eE+-]*)?')
+
+
+class HourlyTemperatureScanner:
+    """Forecast API のレスポンスを受信した順に読み、当日の hour の time_epoch と temp_c だけを取り出す
+
+    JSON 全体を dict に変換せず、必要なキーと数値だけを正規表現で読む。
+    受信済みのデータのうち最後の "," までを読み、残りは次の受信分とつなげて読む
+    （キーと数値は "," を含まないため、途中で途切れたものを読むことはない）。
+    hour の各要素は time_epoch が temp_c より前にある（API のレスポンスの順序）ことを前提とし、
+    2日目（2つ目の date_epoch）以降は読まない。結果は parse_hourly_weather と同じになる。
+    """
+
+    def __init__(self) -> None:
+        self._rest = b""
+        self._in_forecast = False
+        self._days = 0
+        self._done = False
+        self._hour: int | None = None
+        self._hours = array("b")
+        self._temps = array("d")
+
+    def feed(self, chunk: bytes) -> None:
+        """受信したデータを読む
+
+        Raises:
+            ValueError: hour の time_epoch と temp_c の対応が取れない場合
+        """
+        if self._done:
+            return
+        data = self._rest + chunk
+        end = data.rfind(b",") + 1
+        self._rest = data[end:]
+        self._scan(data, end)
+
+    def result(self) -> TemperatureSeries:
+        """読み終えた1時間ごとの気温
+
+        Raises:
+            ValueError: time_epoch に対応する temp_c がない場合
+        """
+        self._scan(self._rest, len(self._rest))
+        self._rest = b""
+        if self._hour is not None:
+            raise ValueError("time_epoch に対応する temp_c がありません")
+        return TemperatureSeries(self._hours, self._temps)
+
+    def _scan(self, data: bytes, end: int) -> None:
+        for match in _HOURLY_TOKEN.finditer(data, 0, end):
+            if self._done:
+                return
+            key, value = match.groups()
+            if key == b"forecastday":
+                self._in_forecast = True
+            elif not self._in_forecast:
+                # forecastday より前（current）の temp_c は読まない
+                continue
+            elif value is None:
+                raise ValueError(f"{key.decode()} が数値ではありません")
+            elif key == b"date_epoch":
+                self._days += 1
+                self._done = self._days > 1
+            elif key == b"time_epoch":
+                if self._hour is not None:
+                    raise ValueError("time_epoch に対応する temp_c がありません")
+                self._hour = (int(value) + JST_OFFSET_SECONDS) // 3600 % 24
+            else:
+                if self._hour is None:
+                    raise ValueError("temp_c に対応する time_epoch がありません")
+                self._hours.append(self._hour)
+                self._temps.append(float(value))
+                self._hour = None
+
+
 class WeatherApiClient:
     """WeatherAPI (weatherapi.com) Forecast API クライアント"""
 
     BASE_URL = "https://api.weatherapi.com/v1/forecast.json"
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, session: requests.Session | None = None, lean: bool = False) -> None:
+        """
+        Args:
+            lean: True の場合は最小のレスポンスを要求し、受信しながら気温だけを読む
+        """
         self.api_key = api_key
+        self.session = session or get_shared_session()
+        self.lean = lean
 
     @retry(max_attempts=3, backoff=[1, 2, 4])
-    def get_hourly_weather(self, lat: float, lon: float) -> list[dict]:
+    def get_hourly_weather(self, lat: float, lon: float) -> TemperatureSeries:
         """指定した緯度経度の1時間ごとの天気情報を取得
 
         Args:
@@ -21,29 +165,39 @@ class WeatherApiClient:
             lon: 経度
 
         Returns:
-            天気データのリスト（各要素: time, temp）
+            1時間ごとの気温（JST の時と気温）
 
         Raises:
             WeatherAPIException: API呼び出しエラー
         """
-        params = {
-            "key": self.api_key,
-            "q": f"{lat},{lon}",
-            "days": 1,
-            "lang": "ja",
-            "aqi": "no",
-            "alerts": "no",
-        }
+        if self.lean:
+            return self._get_hourly_weather_lean(lat, lon)
+
+        params = forecast_params(self.api_key, lat, lon)
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = self.session.get(self.BASE_URL, params=params, timeout=10)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             raise WeatherAPIException(f"WeatherAPI 呼び出しエラー: {e}") from e
 
-        data = response.json()
-        today = data.get("forecast", {}).get("forecastday", [])
-        if not today:
-            return []
+        return parse_hourly_weather(response.json())
 
-        return [{"time": hour["time"], "temp": hour["temp_c"]} for hour in today[0].get("hour", [])]
+    def _get_hourly_weather_lean(self, lat: float, lon: float) -> TemperatureSeries:
+        """最小のレスポンスを要求し、受信しながら気温だけを読む"""
+        scanner = HourlyTemperatureScanner()
+        try:
+            response = self.session.get(
+                self.BASE_URL, params=lean_forecast_params(self.api_key, lat, lon), timeout=10, stream=True
+            )
+            try:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    scanner.feed(chunk)
+            finally:
+                response.close()
+            return scanner.result()
+        except requests.exceptions.RequestException as e:
+            raise WeatherAPIException(f"WeatherAPI 呼び出しエラー: {e}") from e
+        except ValueError as e:
+            raise WeatherAPIException(f"WeatherAPI レスポンス解釈エラー: {e}") from e
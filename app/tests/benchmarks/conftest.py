@@ -0,0 +1,13 @@
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """tests/benchmarks 配下のテストに benchmark マーカーを付ける（既定の pytest 実行からは除外される）"""
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(pytest.mark.benchmark)
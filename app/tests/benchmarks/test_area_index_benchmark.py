@@ -0,0 +1,98 @@
+"""JmaAreaMapper.find_codes: 線形探索とインデックス参照の比較
+
+全国の class20（約1,900件）相当の合成データで、全市区町村名を解決する時間と、
+解決までに走査した class20 のエントリ数を計測する。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import time
+
+from infrastructure.jma.area_index import AreaIndex
+
+CLASS20_COUNT = 1900
+SUFFIXES = ("市", "区", "町", "村")
+
+
+class _CountingDict(dict):
+    """values・items で走査されたエントリ数を数える dict"""
+
+    visited = 0
+
+    def values(self):
+        for value in super().values():
+            self.visited += 1
+            yield value
+
+    def items(self):
+        for item in super().items():
+            self.visited += 1
+            yield item
+
+
+def _make_area_data() -> dict:
+    offices, class10s, class15s, class20s = {}, {}, {}, {}
+    for i in range(CLASS20_COUNT):
+        office_code = f"{(i % 47 + 1):02d}0000"
+        class10_code = f"{(i % 47 + 1):02d}00{i % 3 + 1}0"
+        class15_code = f"{class10_code[:5]}{i % 5 + 1}"
+        offices[office_code] = {"name": f"県{office_code}"}
+        class10s[class10_code] = {"name": f"地方{class10_code}", "parent": office_code}
+        class15s[class15_code] = {"name": f"地域{class15_code}", "parent": class10_code}
+        class20s[f"{i:07d}"] = {"name": f"市区町村{i}{SUFFIXES[i % 4]}", "parent": class15_code}
+    return {"offices": offices, "class10s": class10s, "class15s": class15s, "class20s": _CountingDict(class20s)}
+
+
+def _legacy_find_codes(area_data: dict, city_name: str) -> tuple[str, str] | None:
+    """インデックス導入前の find_codes（線形探索）"""
+    class15s, class10s, offices = area_data["class15s"], area_data["class10s"], area_data["offices"]
+    target_parent = None
+    for info in area_data["class20s"].values():
+        name = info.get("name", "")
+        if name == city_name or city_name.endswith(name):
+            target_parent = info.get("parent")
+            break
+    if target_parent is None:
+        return None
+    current_code = target_parent
+    if current_code in class15s:
+        current_code = class15s[current_code].get("parent", current_code)
+    if current_code in class10s:
+        office_code = class10s[current_code].get("parent", "")
+        if office_code in offices:
+            return (office_code, current_code)
+    return None
+
+
+def test_index_matches_linear_scan_without_rescanning():
+    area_data = _make_area_data()
+    class20s = area_data["class20s"]
+    city_names = [f"都道府県{info['name']}" for info in dict.values(class20s)]
+
+    start = time.perf_counter()
+    legacy = [_legacy_find_codes(area_data, name) for name in city_names]
+    legacy_seconds = time.perf_counter() - start
+    legacy_visited, class20s.visited = class20s.visited, 0
+
+    start = time.perf_counter()
+    index = AreaIndex.from_area_data(area_data)
+    build_seconds = time.perf_counter() - start
+    build_visited, class20s.visited = class20s.visited, 0
+
+    start = time.perf_counter()
+    entries = [index.lookup(name) for name in city_names]
+    indexed_seconds = time.perf_counter() - start
+
+    indexed = [(e.office_code, e.class10_code) if e and e.office_code else None for e in entries]
+    assert indexed == legacy
+
+    print(
+        f"\n[area index] {len(city_names)} lookups "
+        f"linear: {legacy_seconds * 1000:.1f} ms ({legacy_visited} entries visited) | "
+        f"index: build {build_seconds * 1000:.1f} ms ({build_visited} entries visited) "
+        f"+ lookups {indexed_seconds * 1000:.1f} ms ({class20s.visited} entries visited) "
+        f"({legacy_seconds / indexed_seconds:.0f}x)"
+    )
+    # 線形探索は名前ごとに先頭から走査し、インデックスは構築時の1回のみ走査する
+    assert legacy_visited == sum(range(1, CLASS20_COUNT + 1))
+    assert build_visited == CLASS20_COUNT
+    assert class20s.visited == 0
@@ -0,0 +1,120 @@
+"""実質天気の算出段階: 時刻の都度解釈と解釈済みの時刻の比較（cProfile）
+
+5,000地点（WeatherAPI の hourly 24件と、20 office に属する class10 エリアの降水確率）について、
+降水確率の抽出と実質天気の算出を行う。旧実装は hourly の各要素を strptime で、
+降水確率の timeDefines をエリアの問い合わせごとに fromisoformat で解釈していた。
+cProfile で日時の解釈の呼び出し回数（検証する）と全体の時間（表示のみ）を比較する。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import cProfile
+import pstats
+import random
+from datetime import datetime
+
+from domain.services.weather_calculator import HOUR_END, HOUR_START, WeatherCalculator
+from domain.value_objects.weather import Weather
+from infrastructure.jma.client import find_pops, index_pops
+from infrastructure.weatherapi.client import parse_hourly_weather
+
+LOCATION_COUNT = 5_000
+OFFICE_COUNT = 20
+AREAS_PER_OFFICE = 4
+# 2026-02-03 00:00 JST
+DAY_START_EPOCH = 1_770_044_400
+
+
+def _make_office(rng: random.Random, office: int) -> list[dict]:
+    time_defines = [f"2026-02-0{d}T{h:02d}:00:00+09:00" for d in (3, 4) for h in (0, 6, 12, 18)]
+    areas = [
+        {"area": {"code": f"{office:02d}00{a}0"}, "pops": [str(rng.choice(range(0, 101, 10))) for _ in time_defines]}
+        for a in range(AREAS_PER_OFFICE)
+    ]
+    return [{"timeSeries": [{}, {"timeDefines": time_defines, "areas": areas}]}]
+
+
+def _make_weatherapi_response(rng: random.Random) -> dict:
+    hours = [
+        {
+            "time": f"2026-02-03 {h:02d}:00",
+            "time_epoch": DAY_START_EPOCH + h * 3600,
+            "temp_c": round(rng.uniform(-5, 35), 1),
+        }
+        for h in range(24)
+    ]
+    return {"forecast": {"forecastday": [{"hour": hours}]}}
+
+
+def _legacy_extract_pops(data: list[dict], class10_code: str) -> list[dict]:
+    """変更前の extract_pops（該当エリアの timeDefines を問い合わせごとに解釈）"""
+    for forecast in data:
+        pop_series = forecast["timeSeries"][1]
+        for area in pop_series["areas"]:
+            if area["area"]["code"] == class10_code:
+                pops = area["pops"]
+                return [
+                    {"time": datetime.fromisoformat(t), "pop": int(pops[i])}
+                    for i, t in enumerate(pop_series["timeDefines"])
+                    if i < len(pops) and pops[i] != ""
+                ]
+    raise LookupError(class10_code)
+
+
+def _legacy_calculate(hourly_data: list[dict], jma_pops: list[dict]) -> Weather:
+    """変更前の calculate（hourly の各要素を strptime で解釈）"""
+    temps = [
+        e["temp"] for e in hourly_data if HOUR_START <= datetime.strptime(e["time"], "%Y-%m-%d %H:%M").hour < HOUR_END
+    ]
+    pop = max(p["pop"] for p in jma_pops if p["time"].hour in (6, 12, 18))
+    return Weather(max_temp=round(max(temps)), min_temp=round(min(temps)), pop=pop)
+
+
+def _profile(func) -> tuple[list, pstats.Stats]:
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func)
+    return result, pstats.Stats(profiler)
+
+
+def _calls(stats: pstats.Stats, name: str) -> int:
+    """組み込みメソッド（datetime.strptime など）の呼び出し回数"""
+    return sum(nc for (_, _, func), (_, nc, _, _, _) in stats.stats.items() if func == f"<built-in method {name}>")
+
+
+def test_compute_stage_without_repeated_datetime_parsing():
+    rng = random.Random(0)
+    offices = [_make_office(rng, office) for office in range(OFFICE_COUNT)]
+    responses = [_make_weatherapi_response(rng) for _ in range(LOCATION_COUNT)]
+    areas = [(i % OFFICE_COUNT, f"{i % OFFICE_COUNT:02d}00{i % AREAS_PER_OFFICE}0") for i in range(LOCATION_COUNT)]
+    calculator = WeatherCalculator()
+
+    def legacy() -> list[Weather]:
+        results = []
+        for response, (office, class10_code) in zip(responses, areas, strict=True):
+            hourly = [{"time": h["time"], "temp": h["temp_c"]} for h in response["forecast"]["forecastday"][0]["hour"]]
+            results.append(_legacy_calculate(hourly, _legacy_extract_pops(offices[office], class10_code)))
+        return results
+
+    def current() -> list[Weather]:
+        # office ごとの降水確率はキャッシュ（JmaForecastClient.cache）と同じく office 単位で1回作成する
+        office_pops = [index_pops(data) for data in offices]
+        return [
+            calculator.calculate(parse_hourly_weather(response), find_pops(office_pops[office], class10_code))
+            for response, (office, class10_code) in zip(responses, areas, strict=True)
+        ]
+
+    legacy_results, legacy_stats = _profile(legacy)
+    current_results, current_stats = _profile(current)
+
+    assert current_results == legacy_results
+    assert _calls(legacy_stats, "strptime") == LOCATION_COUNT * 24
+    assert _calls(current_stats, "strptime") == 0
+    assert _calls(current_stats, "fromisoformat") == OFFICE_COUNT * 8
+
+    print(
+        f"\n[compute stage] {LOCATION_COUNT} locations "
+        f"legacy: {legacy_stats.total_tt * 1000:.0f} ms "
+        f"(strptime {_calls(legacy_stats, 'strptime')}, fromisoformat {_calls(legacy_stats, 'fromisoformat')}) | "
+        f"current: {current_stats.total_tt * 1000:.0f} ms "
+        f"(strptime {_calls(current_stats, 'strptime')}, fromisoformat {_calls(current_stats, 'fromisoformat')}) "
+        f"({legacy_stats.total_tt / current_stats.total_tt:.1f}x)"
+    )
@@ -0,0 +1,52 @@
+"""共有セッション（Keep-Alive）有無での1呼び出しあたりのレイテンシ比較
+
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import time
+
+import requests
+
+from infrastructure.http.session import create_session
+from infrastructure.weatherapi.client import WeatherApiClient
+from tests.stub_server import StubResponse, StubServer
+
+CALLS = 200
+
+WEATHER_RESPONSE = {"forecast": {"forecastday": [{"hour": [{"time": "2026-02-03 09:00", "temp_c": 8.5}]}]}}
+
+
+def _measure(client: WeatherApiClient) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        client.get_hourly_weather(35.6619, 139.7041)
+    return (time.perf_counter() - start) / CALLS * 1000
+
+
+class _PerCallSession:
+    """呼び出しごとに新しいコネクションを張る（モジュールレベル requests.get 相当）"""
+
+    def get(self, *args, **kwargs):
+        with requests.Session() as session:
+            return session.get(*args, **kwargs)
+
+
+def test_pooled_session_reuses_connections():
+    with StubServer(lambda req: StubResponse(body=WEATHER_RESPONSE)) as server:
+        WeatherApiClient.BASE_URL, original_url = f"{server.url}/v1/forecast.json", WeatherApiClient.BASE_URL
+        try:
+            per_call_ms = _measure(WeatherApiClient(api_key="key", session=_PerCallSession()))
+            per_call_connections = server.connection_count
+
+            pooled_ms = _measure(WeatherApiClient(api_key="key", session=create_session()))
+            pooled_connections = server.connection_count - per_call_connections
+        finally:
+            WeatherApiClient.BASE_URL = original_url
+
+    print(
+        f"\n[http session] calls={CALLS} "
+        f"per-call: {per_call_ms:.3f} ms/call, {per_call_connections} connections | "
+        f"pooled: {pooled_ms:.3f} ms/call, {pooled_connections} connections"
+    )
+    assert per_call_connections == CALLS
+    assert pooled_connections == 1
@@ -0,0 +1,89 @@
+"""LINE のレート制限（429）を返すスタブに対する multicast 配信のスループット比較
+
+配信スケジューラーなし（@retry のみ）とあり（トークンバケット）で、
+LINE_BENCH_RECIPIENTS 人（既定 100,000 人 = 200 リクエスト）への配信完了時間・
+429 の発生回数・配信失敗数を比較する。スタブは LINE_BENCH_LIMIT_QPS 件/秒を
+超えるリクエストに Retry-After 付きの 429 を返す。
+
+`pytest -m benchmark tests/benchmarks/test_line_rate_limit_benchmark.py -s` で計測結果を表示する。
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from infrastructure.http.session import create_session
+from infrastructure.line.delivery_scheduler import DeliveryScheduler
+from infrastructure.line.messaging_client import MULTICAST_MAX_RECIPIENTS, LineMessagingClient
+from tests.stub_server import StubRequest, StubResponse, StubServer
+
+RECIPIENTS = int(os.environ.get("LINE_BENCH_RECIPIENTS", 100_000))
+LIMIT_QPS = int(os.environ.get("LINE_BENCH_LIMIT_QPS", 100))
+# 配信ユースケースの BROADCAST_MAX_WORKERS 相当の並行数
+WORKERS = 8
+
+
+class _RateLimitingResponder:
+    """LIMIT_QPS 件/秒で補充されるトークン（上限 LIMIT_QPS / 10 件）を超えたリクエストに 429 を返す"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._capacity = LIMIT_QPS / 10
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self.rate_limited = 0
+
+    def __call__(self, request: StubRequest) -> StubResponse:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * LIMIT_QPS)
+            self._updated = now
+            if self._tokens < 1:
+                self.rate_limited += 1
+                return StubResponse(
+                    status=429,
+                    body={"message": "The API rate limit has been exceeded. Try again later."},
+                    headers={"Retry-After": "1"},
+                )
+            self._tokens -= 1
+        return StubResponse(body={})
+
+
+def _broadcast(client: LineMessagingClient) -> tuple[float, int]:
+    """WORKERS 並行で全宛先に配信し、(経過秒数, 失敗ユーザー数) を返す"""
+    user_ids = [f"U{i:07d}" for i in range(RECIPIENTS)]
+    groups = [user_ids[i : i + MULTICAST_MAX_RECIPIENTS] for i in range(0, RECIPIENTS, MULTICAST_MAX_RECIPIENTS)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        failed = sum(len(f) for f in executor.map(lambda group: client.multicast_message(group, "テスト"), groups))
+    return time.perf_counter() - start, failed
+
+
+def _run(scheduler: DeliveryScheduler | None) -> tuple[float, int, int]:
+    limiter = _RateLimitingResponder()
+    with StubServer(limiter) as server:
+        LineMessagingClient.BASE_URL, original_url = f"{server.url}/v2/bot/message", LineMessagingClient.BASE_URL
+        try:
+            client = LineMessagingClient("token", session=create_session(), scheduler=scheduler)
+            elapsed, failed = _broadcast(client)
+        finally:
+            LineMessagingClient.BASE_URL = original_url
+    return elapsed, failed, limiter.rate_limited
+
+
+def test_scheduler_keeps_under_rate_limit():
+    requests_total = -(-RECIPIENTS // MULTICAST_MAX_RECIPIENTS)
+    retry_elapsed, retry_failed, retry_429 = _run(None)
+    scheduled_elapsed, scheduled_failed, scheduled_429 = _run(DeliveryScheduler(qps=LIMIT_QPS * 0.9))
+
+    print(
+        f"\n[line rate limit] recipients={RECIPIENTS} requests={requests_total} limit={LIMIT_QPS} req/s "
+        f"workers={WORKERS}\n"
+        f"  retry only: {retry_elapsed:.2f} s, 429={retry_429}, failed recipients={retry_failed}, "
+        f"{(RECIPIENTS - retry_failed) / retry_elapsed:,.0f} recipients/s\n"
+        f"  scheduler : {scheduled_elapsed:.2f} s, 429={scheduled_429}, failed recipients={scheduled_failed}, "
+        f"{(RECIPIENTS - scheduled_failed) / scheduled_elapsed:,.0f} recipients/s"
+    )
+    assert scheduled_failed == 0
+    assert scheduled_429 <= retry_429
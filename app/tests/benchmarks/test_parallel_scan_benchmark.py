@@ -0,0 +1,81 @@
+"""DynamoDBUserRepository: 逐次 Scan とセグメント並列 Scan の比較（moto 使用）
+
+BENCH_DYNAMODB_ITEMS で件数を指定できる（例: BENCH_DYNAMODB_ITEMS=100000）。
+moto はネットワーク往復がないため、BENCH_SCAN_PAGE_LATENCY_MS で1ページあたりの往復遅延を加える。
+moto の応答生成は同一プロセス内で GIL を取り合うため、並列化で短縮されるのは往復遅延の部分のみ
+（実 DynamoDB ではサーバー側の処理もパーティション単位で並列になる）。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import os
+import time
+
+import pytest
+
+moto = pytest.importorskip("moto")
+
+import boto3  # noqa: E402
+
+from infrastructure.dynamodb.user_repository import DynamoDBUserRepository  # noqa: E402
+
+ITEMS = int(os.environ.get("BENCH_DYNAMODB_ITEMS", 5_000))
+PAGE_LATENCY = float(os.environ.get("BENCH_SCAN_PAGE_LATENCY_MS", 100)) / 1000
+PAGE_LIMIT = 250
+TABLE_NAME = "bench-users"
+
+
+@pytest.fixture
+def users_table(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-northeast-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        table = boto3.resource("dynamodb").create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[{"AttributeName": "userId", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "userId", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        with table.batch_writer() as batch:
+            for i in range(ITEMS):
+                n = i % 2_000
+                batch.put_item(
+                    Item={
+                        "userId": f"U{i:032d}",
+                        "lat": str(30 + n * 0.001),
+                        "lon": str(135 + n * 0.001),
+                        "cityName": f"市{n}",
+                        "createdAt": "2026-01-31T00:00:00+00:00",
+                        "updatedAt": "2026-01-31T00:00:00+00:00",
+                    }
+                )
+        yield
+
+
+def _scan(total_segments: int) -> tuple[int, float, int]:
+    repo = DynamoDBUserRepository(TABLE_NAME, total_segments=total_segments)
+    client = repo.table.meta.client
+    pages = 0
+
+    def limit_and_delay(params, **kwargs):
+        # 実 DynamoDB の 1MB ページ相当に分割し、ページごとの往復遅延を再現する
+        nonlocal pages
+        pages += 1
+        params.setdefault("Limit", PAGE_LIMIT)
+        time.sleep(PAGE_LATENCY)
+
+    client.meta.events.register("provide-client-params.dynamodb.Scan", limit_and_delay)
+
+    start = time.perf_counter()
+    count = sum(1 for _ in repo.iter_users())
+    return count, time.perf_counter() - start, pages
+
+
+def test_parallel_scan_benchmark(users_table):
+    results = {segments: _scan(segments) for segments in (1, 4, 8)}
+
+    print(f"\n[parallel scan] items={ITEMS} page_limit={PAGE_LIMIT} page_latency={PAGE_LATENCY * 1000:.0f}ms")
+    for segments, (count, elapsed, pages) in results.items():
+        print(f"  segments={segments}: {elapsed:.2f}s pages={pages} ({count / elapsed:,.0f} items/s)")
+
+    assert all(count == ITEMS for count, _, _ in results.values())
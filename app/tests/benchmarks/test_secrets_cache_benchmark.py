@@ -0,0 +1,114 @@
+"""Webhook: 呼び出しごとのシークレット取得と SecretsProvider（キャッシュ + まとめて取得）の比較
+
+ローカルの Secrets Manager 相当のスタブサーバー（1リクエストあたり LATENCY_SECONDS の遅延）に
+boto3 を向け、ウォームスタートの Webhook（イベントなし・署名検証あり）の p50/p99 レイテンシを計測する。
+従来は呼び出しごとに boto3 クライアントを生成し、シークレットを1件ずつ取得していた。
+レイテンシは表示のみとし、Secrets Manager へのリクエスト数を検証する。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import statistics
+import time
+from unittest.mock import patch
+
+import boto3
+import pytest
+
+import handlers.webhook as webhook_module
+from infrastructure.secretsmanager.secrets_provider import reset_secrets_provider
+from tests.stub_server import StubRequest, StubResponse, StubServer
+
+INVOCATIONS = 100
+LATENCY_SECONDS = 0.01
+SECRETS = {"line-channel-secret": "test-secret", "line-channel-access-token": "test-token"}
+
+
+def _secret_value(name: str) -> dict:
+    return {
+        "Name": name,
+        "ARN": f"arn:aws:secretsmanager:ap-northeast-1:123456789012:secret:{name}",
+        "SecretString": SECRETS[name],
+    }
+
+
+def _secrets_manager(request: StubRequest) -> StubResponse:
+    """GetSecretValue / BatchGetSecretValue のみの Secrets Manager"""
+    time.sleep(LATENCY_SECONDS)
+    body = json.loads(request.body)
+    if request.headers["X-Amz-Target"] == "secretsmanager.BatchGetSecretValue":
+        return StubResponse(body={"SecretValues": [_secret_value(name) for name in body["SecretIdList"]], "Errors": []})
+    return StubResponse(body=_secret_value(body["SecretId"]))
+
+
+def _legacy_get_secrets(*secret_names: str) -> list[str]:
+    """変更前の取得（呼び出しごとにクライアントを生成し、1件ずつ取得）"""
+    values = []
+    for secret_name in secret_names:
+        client = boto3.client("secretsmanager")
+        values.append(client.get_secret_value(SecretId=secret_name)["SecretString"])
+    return values
+
+
+def _event() -> dict:
+    body = json.dumps({"events": []})
+    digest = hmac.new(SECRETS["line-channel-secret"].encode(), body.encode(), hashlib.sha256).digest()
+    return {"body": body, "headers": {"x-line-signature": base64.b64encode(digest).decode()}}
+
+
+def _latencies_ms(server: StubServer) -> tuple[list[float], int]:
+    event = _event()
+    start_count = server.request_count
+    latencies = []
+    for _ in range(INVOCATIONS):
+        start = time.perf_counter()
+        result = webhook_module.handler(event, None)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert result["statusCode"] == 200
+    return latencies, server.request_count - start_count
+
+
+def _percentiles(latencies: list[float]) -> tuple[float, float]:
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49], cuts[98]
+
+
+@pytest.fixture
+def secrets_manager(monkeypatch):
+    with StubServer(_secrets_manager) as server:
+        monkeypatch.setenv("AWS_ENDPOINT_URL_SECRETS_MANAGER", server.url)
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-northeast-1")
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setenv("LINE_CHANNEL_SECRET_NAME", "line-channel-secret")
+        monkeypatch.setenv("LINE_CHANNEL_ACCESS_TOKEN_NAME", "line-channel-access-token")
+        monkeypatch.setenv("TABLE_NAME", "users")
+        reset_secrets_provider()
+        webhook_module._container.invalidate_config()
+        yield server
+        reset_secrets_provider()
+        webhook_module._container.invalidate_config()
+
+
+@patch("usecases.register_region.RegisterRegionUseCase")
+@patch("infrastructure.line.messaging_client.LineMessagingClient")
+@patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient")
+@patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository")
+def test_webhook_latency_with_secrets_provider(mock_repo, mock_geo, mock_line, mock_usecase, secrets_manager):
+    with patch.object(webhook_module, "_get_secrets", _legacy_get_secrets):
+        legacy, legacy_requests = _latencies_ms(secrets_manager)
+    cached, cached_requests = _latencies_ms(secrets_manager)
+
+    legacy_p50, legacy_p99 = _percentiles(legacy)
+    cached_p50, cached_p99 = _percentiles(cached)
+    print(
+        f"\n[webhook secrets] {INVOCATIONS} invocations, Secrets Manager latency {LATENCY_SECONDS * 1000:.0f} ms "
+        f"per call: {legacy_p50:.1f} ms p50 / {legacy_p99:.1f} ms p99 ({legacy_requests} requests) | "
+        f"SecretsProvider: {cached_p50:.2f} ms p50 / {cached_p99:.1f} ms p99 ({cached_requests} requests)"
+    )
+    # まとめて取得した1回のみ（以降はキャッシュ）
+    assert cached_requests == 1
+    assert legacy_requests == INVOCATIONS * 2
@@ -0,0 +1,104 @@
+"""時間別の気温・降水確率: dict のリストと配列ベースの系列のメモリ比較
+
+50,000地点分の時間別気温（WeatherAPI の hourly 24件）と降水確率（8ブロック, エリアごとに共有）を
+同時に保持したときのメモリを tracemalloc で計測する。
+旧実装は1時間ごとに {"time", "temp", "hour"} の dict を、降水確率は {"time": datetime, "pop"} の dict を持っていた。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import random
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+
+from infrastructure.jma.client import find_pops, index_pops
+from infrastructure.weatherapi.client import parse_hourly_weather
+from tests.benchmarks.test_compute_stage_benchmark import DAY_START_EPOCH, _make_office
+
+LOCATION_COUNT = 50_000
+OFFICE_COUNT = 20
+AREAS_PER_OFFICE = 4
+
+
+def _legacy_parse_hourly_weather(data: dict) -> list[dict]:
+    """変更前の parse_hourly_weather（1時間ごとの dict）"""
+    return [
+        {"time": hour["time"], "temp": hour["temp_c"], "hour": int(hour["time"][11:13])}
+        for day in data["forecast"]["forecastday"]
+        for hour in day["hour"]
+    ]
+
+
+def _legacy_extract_pops(data: list[dict], class10_code: str) -> list[dict]:
+    """変更前の extract_pops（ブロックごとの dict）"""
+    pop_series = data[0]["timeSeries"][1]
+    for area in pop_series["areas"]:
+        if area["area"]["code"] == class10_code:
+            return [
+                {"time": datetime.fromisoformat(t), "pop": int(pop)}
+                for t, pop in zip(pop_series["timeDefines"], area["pops"], strict=True)
+                if pop != ""
+            ]
+    raise LookupError(class10_code)
+
+
+def _held_bytes(build: Callable[[], list]) -> tuple[int, list]:
+    """build が返す（全地点分を保持した）結果のメモリ。入力の JSON は計測後も保持されない"""
+    tracemalloc.start()
+    try:
+        held = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, held
+
+
+def _make_response(temps: list[float], location: int) -> dict:
+    """WeatherAPI の応答（時刻の文字列は JSON の解析結果と同じく地点ごとに別のオブジェクト）"""
+    hours = [
+        {
+            "time": f"2026-02-03 {h:02d}:00",
+            "time_epoch": DAY_START_EPOCH + h * 3600,
+            "temp_c": temps[(location + h) % len(temps)],
+        }
+        for h in range(24)
+    ]
+    return {"forecast": {"forecastday": [{"hour": hours}]}}
+
+
+def test_series_memory_per_location():
+    rng = random.Random(0)
+    offices = [_make_office(rng, office) for office in range(OFFICE_COUNT)]
+    codes = [[f"{office:02d}00{a}0" for a in range(AREAS_PER_OFFICE)] for office in range(OFFICE_COUNT)]
+    areas = [(i % OFFICE_COUNT, i % AREAS_PER_OFFICE) for i in range(LOCATION_COUNT)]
+    temps = [round(rng.uniform(-5, 35), 1) for _ in range(997)]
+
+    # 降水確率は office のキャッシュと同じく、エリアごとの結果を全地点で共有する
+    def legacy() -> list:
+        office_pops = [{code: _legacy_extract_pops(data, code) for code in codes[o]} for o, data in enumerate(offices)]
+        return [
+            (_legacy_parse_hourly_weather(_make_response(temps, i)), office_pops[office][codes[office][area]])
+            for i, (office, area) in enumerate(areas)
+        ]
+
+    def current() -> list:
+        office_pops = [index_pops(data) for data in offices]
+        return [
+            (parse_hourly_weather(_make_response(temps, i)), find_pops(office_pops[office], codes[office][area]))
+            for i, (office, area) in enumerate(areas)
+        ]
+
+    legacy_bytes, legacy_held = _held_bytes(legacy)
+    current_bytes, current_held = _held_bytes(current)
+
+    for (legacy_hourly, legacy_pops), (hourly, pops) in zip(legacy_held, current_held, strict=True):
+        assert list(hourly) == [(entry["hour"], entry["temp"]) for entry in legacy_hourly]
+        assert list(pops) == [(entry["time"].hour, entry["pop"]) for entry in legacy_pops]
+
+    print(
+        f"\n[series memory] {LOCATION_COUNT} locations "
+        f"list[dict]: {legacy_bytes / 1024**2:.1f} MiB ({legacy_bytes / LOCATION_COUNT:.0f} B/location) | "
+        f"series: {current_bytes / 1024**2:.1f} MiB ({current_bytes / LOCATION_COUNT:.0f} B/location) "
+        f"({legacy_bytes / current_bytes:.1f}x)"
+    )
+    assert current_bytes * 3 < legacy_bytes
@@ -0,0 +1,120 @@
+"""BroadcastWeatherUseCase: 全件取得とストリーミング配信のピークメモリ比較
+
+BENCH_USERS 人と、その2倍の人数でピークメモリを計測し、ストリーミング配信のピークがユーザー数に
+よらず一定（保留するユーザー数の上限 max_pending_users で決まる）であることを検証する。
+BENCH_USERS でユーザー数を指定できる（例: BENCH_USERS=1000000）。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import os
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Iterator
+from unittest.mock import MagicMock
+
+from domain.entities.user import User
+from domain.repositories.user_repository import UserRepository
+from domain.value_objects.location import Location
+from domain.value_objects.weather import Weather
+from usecases.broadcast_weather import BroadcastResult, BroadcastWeatherUseCase
+
+USERS = int(os.environ.get("BENCH_USERS", 100_000))
+LOCATIONS = 2_000
+MAX_PENDING_USERS = 10_000
+
+
+def _iter_users(count: int) -> Iterator[User]:
+    """ユーザーを逐次生成する（DynamoDB Scan のページ読み込み相当）"""
+    for i in range(count):
+        n = i % LOCATIONS
+        location = Location(city_name=f"市{n}", latitude=30 + n * 0.001, longitude=135 + n * 0.001)
+        yield User(user_id=f"U{i:032d}", location=location)
+
+
+def _user_repository(count: int) -> MagicMock:
+    repository = MagicMock(spec=UserRepository)
+    repository.iter_users.side_effect = lambda: _iter_users(count)
+    repository.get_all_users.side_effect = lambda: list(_iter_users(count))
+    return repository
+
+
+class _StubWeatherClient:
+    def get_hourly_weather(self, lat: float, lon: float) -> list[dict]:
+        return []
+
+
+class _StubAreaMapper:
+    def find_codes(self, city_name: str) -> tuple[str, str]:
+        return ("130000", "130010")
+
+
+class _StubJmaClient:
+    def get_pops(self, office_code: str, class10_code: str) -> list[dict]:
+        return []
+
+
+class _StubCalculator:
+    def calculate(self, hourly_data: list[dict], jma_pops: list[dict]) -> Weather:
+        return Weather(max_temp=25, min_temp=18, pop=50)
+
+
+class _CountingMessagingClient:
+    def __init__(self) -> None:
+        self.delivered = 0
+
+    def multicast_message(self, user_ids: list[str], message: str) -> list[str]:
+        self.delivered += len(user_ids)
+        return []
+
+
+def _materialized_peak(repository: UserRepository) -> int:
+    """従来の全件取得 + グルーピングで保持されるメモリ"""
+    tracemalloc.start()
+    users = repository.get_all_users()
+    groups: dict[tuple[float, float], list[User]] = defaultdict(list)
+    for user in users:
+        groups[(user.location.latitude, user.location.longitude)].append(user)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def _streaming_peak(count: int) -> tuple[int, float]:
+    """ストリーミング配信のピークメモリと処理時間"""
+    messaging = _CountingMessagingClient()
+    usecase = BroadcastWeatherUseCase(
+        user_repository=_user_repository(count),
+        weather_client=_StubWeatherClient(),
+        messaging_client=messaging,
+        weather_calculator=_StubCalculator(),
+        jma_client=_StubJmaClient(),
+        jma_area_mapper=_StubAreaMapper(),
+        max_pending_users=MAX_PENDING_USERS,
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = usecase.execute()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert result == BroadcastResult(success_count=count, failure_count=0)
+    assert messaging.delivered == count
+    return peak, elapsed
+
+
+def test_streaming_broadcast_runs_in_bounded_memory():
+    materialized_peak = _materialized_peak(_user_repository(USERS))
+    streaming_peak, elapsed = _streaming_peak(USERS)
+    doubled_peak, doubled_elapsed = _streaming_peak(USERS * 2)
+
+    print(
+        f"\n[streaming] users={USERS} locations={LOCATIONS} "
+        f"materialized peak: {materialized_peak / 2**20:.1f} MiB | "
+        f"streaming peak: {streaming_peak / 2**20:.1f} MiB ({elapsed:.1f} s) | "
+        f"users={USERS * 2} streaming peak: {doubled_peak / 2**20:.1f} MiB ({doubled_elapsed:.1f} s)"
+    )
+    # ユーザー数を2倍にしてもピークはほぼ変わらない（全件取得ならユーザー数に比例して増える）
+    assert doubled_peak < streaming_peak * 1.2
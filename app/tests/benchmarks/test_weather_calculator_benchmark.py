@@ -0,0 +1,70 @@
+"""WeatherCalculator: 地点ごとの calculate と calculate_batch の比較
+
+1万地点分（WeatherAPI の48時間分の hourly と気象庁の降水確率）の実質天気を算出する時間を計測する。
+hourly は parse_hourly_weather と同じく解釈済みの時（hour）を持つ。calculate_batch の時間は
+列（HourlyBatch）にまとめた後の集計のみで、dict の系列から列への変換時間は別に表示する。
+時間は表示のみとし、cProfile で数えた Python の関数呼び出し回数が calculate より少ないことを検証する。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import cProfile
+import pstats
+import random
+import time
+from datetime import datetime, timedelta
+
+from domain.services.weather_calculator import JST, HourlyBatch, WeatherCalculator
+
+LOCATION_COUNT = 10_000
+HOURS = 48
+
+
+def _make_locations() -> tuple[list[list[dict]], list[list[dict]]]:
+    rng = random.Random(0)
+    start = datetime(2026, 2, 2, 0, 0)
+    times = [start + timedelta(hours=h) for h in range(HOURS)]
+    pop_times = [datetime(2026, 2, 2, h, 0, tzinfo=JST) for h in (0, 6, 12, 18)]
+    hourly_data = [
+        [{"time": t.strftime("%Y-%m-%d %H:%M"), "temp": round(rng.uniform(-5, 35), 1), "hour": t.hour} for t in times]
+        for _ in range(LOCATION_COUNT)
+    ]
+    jma_pops = [[{"time": t, "pop": rng.choice(range(0, 101, 10))} for t in pop_times] for _ in range(LOCATION_COUNT)]
+    return hourly_data, jma_pops
+
+
+def _function_calls(func) -> int:
+    """func の実行中の関数呼び出し回数（cProfile）"""
+    profiler = cProfile.Profile()
+    profiler.runcall(func)
+    return pstats.Stats(profiler).total_calls
+
+
+def test_batch_matches_scalar_with_fewer_calls():
+    hourly_data, jma_pops = _make_locations()
+    calculator = WeatherCalculator()
+
+    start = time.perf_counter()
+    scalar = [calculator.calculate(h, p) for h, p in zip(hourly_data, jma_pops, strict=True)]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = HourlyBatch.from_series(hourly_data, jma_pops)
+    convert_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculator.calculate_batch(columns)
+    batch_seconds = time.perf_counter() - start
+
+    assert batch == scalar
+    scalar_calls = _function_calls(
+        lambda: [calculator.calculate(h, p) for h, p in zip(hourly_data, jma_pops, strict=True)]
+    )
+    batch_calls = _function_calls(lambda: calculator.calculate_batch(columns))
+
+    print(
+        f"\n[weather calculator] {LOCATION_COUNT} locations x {HOURS} hours "
+        f"calculate: {scalar_seconds * 1000:.0f} ms ({scalar_calls} calls) | "
+        f"calculate_batch: {batch_seconds * 1000:.0f} ms ({batch_calls} calls) "
+        f"({scalar_seconds / batch_seconds:.1f}x) + from_series: {convert_seconds * 1000:.0f} ms"
+    )
+    assert batch_calls < scalar_calls
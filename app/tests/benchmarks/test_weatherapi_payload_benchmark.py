@@ -0,0 +1,58 @@
+"""WeatherAPI: 全体のデコードと lean（最小のレスポンス + 逐次読み込み）の比較
+
+fixtures/ の Forecast API のレスポンス（東京 1日分。lang=ja の通常の取得と lean_forecast_params の取得）について、
+1地点あたりの転送量（非圧縮・gzip）と、気温を取り出すまでの解釈時間を比較する。
+転送量は決定的なため検証し、解釈時間は表示のみとする。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import gzip
+import json
+import time
+from pathlib import Path
+
+from infrastructure.weatherapi.client import STREAM_CHUNK_SIZE, HourlyTemperatureScanner, parse_hourly_weather
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ITERATIONS = 2_000
+
+
+def _per_location_seconds(parse, body: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        parse(body)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def _full(body: bytes):
+    return parse_hourly_weather(json.loads(body))
+
+
+def _lean(body: bytes):
+    scanner = HourlyTemperatureScanner()
+    for i in range(0, len(body), STREAM_CHUNK_SIZE):
+        scanner.feed(body[i : i + STREAM_CHUNK_SIZE])
+    return scanner.result()
+
+
+def test_lean_payload_and_parse_time():
+    full_body = (FIXTURES / "weatherapi_forecast_ja.json").read_bytes()
+    lean_body = (FIXTURES / "weatherapi_forecast_lean.json").read_bytes()
+
+    assert _lean(lean_body) == _full(full_body)
+    assert len(_lean(lean_body)) == 24
+
+    full_gzip = len(gzip.compress(full_body))
+    lean_gzip = len(gzip.compress(lean_body))
+    full_seconds = _per_location_seconds(_full, full_body)
+    lean_seconds = _per_location_seconds(_lean, lean_body)
+
+    print(
+        f"\n[weatherapi payload] per location "
+        f"full: {len(full_body)} B (gzip {full_gzip} B), "
+        f"parse {full_seconds * 1e6:.0f} us | "
+        f"lean: {len(lean_body)} B (gzip {lean_gzip} B), "
+        f"parse {lean_seconds * 1e6:.0f} us ({full_seconds / lean_seconds:.1f}x)"
+    )
+    assert len(lean_body) < len(full_body)
+    assert lean_gzip < full_gzip
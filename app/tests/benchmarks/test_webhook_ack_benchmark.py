@@ -0,0 +1,145 @@
+"""Webhook: その場での地域設定と、キューへの投入のみで応答する場合の応答時間の比較
+
+住所検索・DynamoDB・LINE の返信を遅延付きのスタブに置き換え、1件のメッセージを含む Webhook の
+応答時間（p50）を計測する。キューにはローカルの InMemoryRegistrationQueue を使い、投入された依頼を
+registration_worker_handler が SQS と同じく最大10件ずつ処理するときのスループットも計測する。
+時間は表示のみとし、キューに投入する応答では遅延付きのスタブを呼ばないことを検証する。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import statistics
+import time
+from unittest.mock import patch
+
+import pytest
+
+import handlers.webhook as webhook_module
+from infrastructure.sqs.registration_queue import InMemoryRegistrationQueue
+
+INVOCATIONS = 20
+BATCH_SIZE = 10
+GEOCODE_LATENCY_SECONDS = 0.05
+DYNAMODB_LATENCY_SECONDS = 0.005
+REPLY_LATENCY_SECONDS = 0.02
+SECRETS = {"secret-name": "test-secret", "token-name": "test-token"}
+
+
+class _SlowGeocodingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_coordinates(self, city_name: str) -> tuple[float, float, str]:
+        self.calls += 1
+        time.sleep(GEOCODE_LATENCY_SECONDS)
+        return 35.6619, 139.7041, city_name
+
+
+class _SlowUserRepository:
+    def __init__(self) -> None:
+        self.saved: list[str] = []
+
+    def find_by_id(self, user_id: str) -> None:
+        time.sleep(DYNAMODB_LATENCY_SECONDS)
+        return None
+
+    def save(self, user) -> None:
+        time.sleep(DYNAMODB_LATENCY_SECONDS)
+        self.saved.append(user.user_id)
+
+
+class _SlowMessagingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def reply_message(self, reply_token: str, text: str) -> None:
+        self.calls += 1
+        time.sleep(REPLY_LATENCY_SECONDS)
+
+
+def _event(i: int) -> dict:
+    body = json.dumps(
+        {
+            "events": [
+                {
+                    "type": "message",
+                    "webhookEventId": f"event-{i}",
+                    "replyToken": f"reply-{i}",
+                    "source": {"userId": f"U{i}"},
+                    "message": {"type": "text", "text": "渋谷区"},
+                }
+            ]
+        }
+    )
+    digest = hmac.new(SECRETS["secret-name"].encode(), body.encode(), hashlib.sha256).digest()
+    return {"body": body, "headers": {"x-line-signature": base64.b64encode(digest).decode()}}
+
+
+def _ack_latencies_ms() -> list[float]:
+    latencies = []
+    for i in range(INVOCATIONS):
+        event = _event(i)
+        start = time.perf_counter()
+        result = webhook_module.handler(event, None)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert result["statusCode"] == 200
+    return latencies
+
+
+@pytest.fixture
+def slow_clients(monkeypatch):
+    monkeypatch.setenv("LINE_CHANNEL_SECRET_NAME", "secret-name")
+    monkeypatch.setenv("LINE_CHANNEL_ACCESS_TOKEN_NAME", "token-name")
+    monkeypatch.setenv("TABLE_NAME", "users")
+    monkeypatch.delenv("WEBHOOK_EVENT_QUEUE_URL", raising=False)
+    monkeypatch.delenv("GEOCODING_CACHE_TABLE_NAME", raising=False)
+    repository = _SlowUserRepository()
+    geocoding = _SlowGeocodingClient()
+    messaging = _SlowMessagingClient()
+    with (
+        patch.object(webhook_module, "_get_secrets", lambda *names: [SECRETS[name] for name in names]),
+        patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository", return_value=repository),
+        patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient", return_value=geocoding),
+        patch("infrastructure.line.messaging_client.LineMessagingClient", return_value=messaging),
+    ):
+        webhook_module._container.invalidate_config()
+        yield repository, geocoding, messaging
+        webhook_module._container.invalidate_config()
+
+
+def _slow_calls(slow_clients) -> int:
+    """遅延付きのスタブ（住所検索・DynamoDB の保存・LINE の返信）の呼び出し回数の合計"""
+    repository, geocoding, messaging = slow_clients
+    return len(repository.saved) + geocoding.calls + messaging.calls
+
+
+def test_ack_latency_and_worker_throughput(slow_clients, monkeypatch):
+    inline = _ack_latencies_ms()
+    inline_calls = _slow_calls(slow_clients)
+    assert inline_calls == INVOCATIONS * 3
+
+    queue = InMemoryRegistrationQueue()
+    monkeypatch.setenv("WEBHOOK_EVENT_QUEUE_URL", "https://sqs.example/registrations.fifo")
+    with patch("infrastructure.sqs.registration_queue.SqsRegistrationQueue", return_value=queue):
+        queued = _ack_latencies_ms()
+    assert len(queue) == INVOCATIONS
+    # キューに投入するだけの応答では、遅い外部サービスを1回も呼ばない
+    assert _slow_calls(slow_clients) == inline_calls
+
+    start = time.perf_counter()
+    while len(queue):
+        records = [{"messageId": str(i), "body": body} for i, body in enumerate(queue.receive(BATCH_SIZE))]
+        assert webhook_module.registration_worker_handler({"Records": records}, None) == {"batchItemFailures": []}
+    worker_seconds = time.perf_counter() - start
+    assert _slow_calls(slow_clients) == inline_calls * 2
+
+    inline_p50 = statistics.median(inline)
+    queued_p50 = statistics.median(queued)
+    print(
+        f"\n[webhook ack] {INVOCATIONS} invocations: inline {inline_p50:.1f} ms p50 | "
+        f"enqueue {queued_p50:.2f} ms p50 ({inline_p50 / queued_p50:.0f}x) | "
+        f"worker {INVOCATIONS / worker_seconds:.1f} registrations/s (batch {BATCH_SIZE})"
+    )
@@ -0,0 +1,132 @@
+"""Webhook: 複数イベントを含む1回の Webhook の逐次処理と並行処理の比較
+
+50件のメッセージイベント（25ユーザー × 2件）を含む Webhook を、遅延付きのスタブ（住所検索・DynamoDB・
+LINE の返信）に対してその場で処理し、REGISTRATION_MAX_WORKERS=1（従来の逐次処理）と並行処理の
+処理時間を比較する（表示のみ）。同時に処理中の住所検索の最大数と、同じユーザーの2件が
+受け付けた順に保存されることを検証する。
+`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import handlers.webhook as webhook_module
+
+USERS = 25
+EVENTS_PER_USER = 2
+MAX_WORKERS = 8
+GEOCODE_LATENCY_SECONDS = 0.02
+DYNAMODB_LATENCY_SECONDS = 0.002
+REPLY_LATENCY_SECONDS = 0.005
+SECRETS = {"secret-name": "test-secret", "token-name": "test-token"}
+CITIES = ("渋谷区", "新宿区")
+
+
+class _SlowGeocodingClient:
+    """同時に処理中の住所検索の最大数（peak）を記録するスタブ"""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_coordinates(self, city_name: str) -> tuple[float, float, str]:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            # 1件目ほど遅くし、同じユーザーの2件目が先に終わらないことを確かめる
+            time.sleep(GEOCODE_LATENCY_SECONDS * (2 if city_name == CITIES[0] else 1))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return 35.6619, 139.7041, city_name
+
+
+class _SlowUserRepository:
+    def __init__(self) -> None:
+        self.saved: list[tuple[str, str]] = []
+
+    def find_by_id(self, user_id: str) -> None:
+        time.sleep(DYNAMODB_LATENCY_SECONDS)
+        return None
+
+    def save(self, user) -> None:
+        time.sleep(DYNAMODB_LATENCY_SECONDS)
+        self.saved.append((user.user_id, user.location.city_name))
+
+
+class _SlowMessagingClient:
+    def reply_message(self, reply_token: str, text: str) -> None:
+        time.sleep(REPLY_LATENCY_SECONDS)
+
+
+def _event() -> dict:
+    events = [
+        {
+            "type": "message",
+            "replyToken": f"reply-{user}-{n}",
+            "source": {"userId": f"U{user}"},
+            "message": {"type": "text", "text": CITIES[n]},
+        }
+        for n in range(EVENTS_PER_USER)
+        for user in range(USERS)
+    ]
+    body = json.dumps({"events": events})
+    digest = hmac.new(SECRETS["secret-name"].encode(), body.encode(), hashlib.sha256).digest()
+    return {"body": body, "headers": {"x-line-signature": base64.b64encode(digest).decode()}}
+
+
+def _elapsed_seconds(monkeypatch, max_workers: int) -> tuple[float, int, list[tuple[str, str]]]:
+    monkeypatch.setenv("REGISTRATION_MAX_WORKERS", str(max_workers))
+    repository = _SlowUserRepository()
+    geocoding = _SlowGeocodingClient()
+    with (
+        patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository", return_value=repository),
+        patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient", return_value=geocoding),
+        patch("infrastructure.line.messaging_client.LineMessagingClient", return_value=_SlowMessagingClient()),
+    ):
+        webhook_module._container.invalidate_config()
+        event = _event()
+        start = time.perf_counter()
+        result = webhook_module.handler(event, None)
+        elapsed = time.perf_counter() - start
+    assert result["statusCode"] == 200
+    return elapsed, geocoding.peak, repository.saved
+
+
+@pytest.fixture
+def webhook_env(monkeypatch):
+    monkeypatch.setenv("LINE_CHANNEL_SECRET_NAME", "secret-name")
+    monkeypatch.setenv("LINE_CHANNEL_ACCESS_TOKEN_NAME", "token-name")
+    monkeypatch.setenv("TABLE_NAME", "users")
+    monkeypatch.delenv("WEBHOOK_EVENT_QUEUE_URL", raising=False)
+    monkeypatch.delenv("GEOCODING_CACHE_TABLE_NAME", raising=False)
+    with patch.object(webhook_module, "_get_secrets", lambda *names: [SECRETS[name] for name in names]):
+        yield monkeypatch
+    webhook_module._container.invalidate_config()
+
+
+def test_parallel_event_processing(webhook_env):
+    serial_seconds, serial_peak, serial_saved = _elapsed_seconds(webhook_env, max_workers=1)
+    parallel_seconds, parallel_peak, parallel_saved = _elapsed_seconds(webhook_env, max_workers=MAX_WORKERS)
+
+    print(
+        f"\n[webhook events] {USERS * EVENTS_PER_USER} events from {USERS} users: "
+        f"serial {serial_seconds * 1000:.0f} ms | {MAX_WORKERS} workers {parallel_seconds * 1000:.0f} ms "
+        f"({serial_seconds / parallel_seconds:.1f}x, peak {parallel_peak} in flight)"
+    )
+    assert len(serial_saved) == len(parallel_saved) == USERS * EVENTS_PER_USER
+    # 同じユーザーの依頼は受け付けた順に保存される
+    for user in range(USERS):
+        assert [city for user_id, city in parallel_saved if user_id == f"U{user}"] == list(CITIES)
+    # 逐次処理では重ならず、並行処理ではワーカー数を上限に複数ユーザーの住所検索が重なる
+    assert serial_peak == 1
+    assert 1 < parallel_peak <= MAX_WORKERS
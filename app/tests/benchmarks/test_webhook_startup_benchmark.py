@@ -0,0 +1,94 @@
+"""Webhook: コールドスタート時のモジュール読み込み時間（`python -X importtime`）
+
+新しいプロセスで handlers.webhook を読み込み、読み込み時間（cumulative）と読み込まれたモジュールを計測する。
+boto3・requests を読み込んでいた変更前の下限として、`import boto3, requests` の読み込み時間を表示し、
+読み込まれたモジュールにそれらが含まれないことを検証する。
+また、シークレット拡張機能のスタブに向けて署名検証に失敗するリクエストを処理し、boto3・requests を
+読み込まずに 401 を返すことを確認する。`pytest -m benchmark tests/benchmarks -s` で計測結果を表示する。
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from tests.stub_server import StubRequest, StubResponse, StubServer
+
+APP_DIR = Path(__file__).resolve().parents[2]
+RUNS = 5
+# 署名検証までに読み込んではいけないモジュール
+HEAVY_MODULES = ("boto3", "botocore", "requests", "urllib3")
+
+
+def _import_profile(statement: str) -> tuple[float, set[str]]:
+    """新しいプロセスで statement を実行し、トップレベルの読み込み時間（ms）の合計と読み込まれたモジュールを返す"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    modules: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        modules.add(name.strip())
+        # 字下げのないものがトップレベルの import
+        if not name.startswith("  ") and name.strip() != "site":
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def _median_ms(statement: str) -> tuple[float, set[str]]:
+    profiles = [_import_profile(statement) for _ in range(RUNS)]
+    return statistics.median(ms for ms, _ in profiles), profiles[-1][1]
+
+
+def _extension(request: StubRequest) -> StubResponse:
+    """AWS Parameters and Secrets Lambda Extension のスタブ"""
+    secret_id = parse_qs(urlsplit(request.path).query)["secretId"][0]
+    return StubResponse(body={"Name": secret_id, "ARN": f"arn:{secret_id}", "SecretString": f"value-{secret_id}"})
+
+
+def test_webhook_import_time():
+    webhook_ms, modules = _median_ms("import handlers.webhook")
+    legacy_ms, _ = _median_ms("import boto3, requests")
+
+    print(
+        f"\n[webhook startup] import handlers.webhook: {webhook_ms:.1f} ms (median of {RUNS}) | "
+        f"import boto3, requests: {legacy_ms:.1f} ms"
+    )
+    assert not modules & set(HEAVY_MODULES)
+
+
+def test_signature_failure_skips_heavy_imports():
+    statement = (
+        "import json, sys\n"
+        "import handlers.webhook as webhook\n"
+        "result = webhook.handler({'body': '{}', 'headers': {'x-line-signature': 'invalid'}}, None)\n"
+        f"print(json.dumps([result['statusCode'], [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))\n"
+    )
+    with StubServer(_extension) as server:
+        env = {
+            **os.environ,
+            "PARAMETERS_SECRETS_EXTENSION_HTTP_PORT": server.url.rsplit(":", 1)[1],
+            "AWS_SESSION_TOKEN": "session-token",
+            "LINE_CHANNEL_SECRET_NAME": "line-channel-secret",
+            "LINE_CHANNEL_ACCESS_TOKEN_NAME": "line-channel-access-token",
+            "TABLE_NAME": "users",
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", statement], cwd=APP_DIR, env=env, capture_output=True, text=True, check=True
+        )
+
+    status, heavy_modules = json.loads(result.stdout.splitlines()[-1])
+    assert status == 401
+    assert heavy_modules == []
+    # チャネルシークレットとアクセストークンを1件ずつ取得し、検証失敗後に取得し直す
+    assert [request.headers["X-Aws-Parameters-Secrets-Token"] for request in server.requests] == ["session-token"] * 3
@@ -1,9 +1,14 @@
+import random
+from array import array
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 import pytest
 
-from domain.services.weather_calculator import WeatherCalculator
+import domain.services.weather_calculator as weather_calculator_module
+from domain.services.weather_calculator import HourlyBatch, WeatherCalculator
+from domain.value_objects.weather import Weather
+from domain.value_objects.weather_series import PopSeries, TemperatureSeries
 
 JST = ZoneInfo("Asia/Tokyo")
 
@@ -110,6 +115,16 @@ class TestWeatherCalculator:
         assert weather.max_temp == 25
         assert weather.min_temp == 18
 
+    def test_uses_parsed_hour_when_present(self):
+        hourly_data = [
+            {"time": "2026-02-02 05:00", "temp": 30.0, "hour": 14},
+            {"time": "2026-02-02 14:00", "temp": 10.0, "hour": 5},
+        ]
+        jma_pops = [_make_jma_pop(12, 30)]
+        weather = self.calculator.calculate(hourly_data, jma_pops)
+        assert weather.max_temp == 30
+        assert weather.min_temp == 30
+
     def test_pop_is_max_of_relevant_blocks(self):
         hourly_data = [_make_hourly_entry(12, 20.0)]
         jma_pops = [
@@ -119,3 +134,94 @@ class TestWeatherCalculator:
         ]
         weather = self.calculator.calculate(hourly_data, jma_pops)
         assert weather.pop == 80
+
+    def test_calculate_series(self):
+        hourly = TemperatureSeries(array("b", [8, 9, 12, 22, 23]), array("d", [5.0, 18.0, 25.5, 19.0, 30.0]))
+        pops = PopSeries(array("b", [0, 6, 12, 18]), array("h", [90, 10, 30, 70]))
+        weather = self.calculator.calculate(hourly, pops)
+        assert weather == Weather(max_temp=26, min_temp=18, pop=70)
+
+
+def _random_location(rng: random.Random) -> tuple[list[dict], list[dict]]:
+    """丸めの境界（x.5）や対象時間帯外のみのデータを含むランダムな1地点分"""
+    hours = rng.sample(range(24), rng.randint(0, 24))
+    hourly_data = [_make_hourly_entry(h, rng.choice([rng.uniform(-10, 35), rng.randint(-10, 35) + 0.5])) for h in hours]
+    pop_hours = rng.sample([0, 6, 12, 18], rng.randint(0, 4))
+    jma_pops = [_make_jma_pop(h, rng.choice(range(0, 101, 10))) for h in pop_hours]
+    return hourly_data, jma_pops
+
+
+class TestWeatherCalculatorBatch:
+    def setup_method(self):
+        self.calculator = WeatherCalculator()
+
+    def _scalar(self, hourly_data: list[dict], jma_pops: list[dict]):
+        try:
+            return self.calculator.calculate(hourly_data, jma_pops)
+        except ValueError:
+            return None
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_matches_scalar_calculation(self, monkeypatch, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(weather_calculator_module, "np", None)
+        rng = random.Random(17)
+        locations = [_random_location(rng) for _ in range(500)]
+
+        batch = HourlyBatch.from_series([h for h, _ in locations], [p for _, p in locations])
+        results = self.calculator.calculate_batch(batch)
+
+        expected = [self._scalar(h, p) for h, p in locations]
+        assert results == expected
+        # メッセージの表示（"26" と "26.0"）も一致するよう型まで揃える
+        assert [type(w.max_temp) for w in results if w] == [type(w.max_temp) for w in expected if w]
+        assert any(w is None for w in results)
+
+    def test_round_half_to_even(self):
+        hourly_data = [[_make_hourly_entry(10, 24.5), _make_hourly_entry(12, 25.5)]]
+        jma_pops = [[_make_jma_pop(12, 30)]]
+
+        (weather,) = self.calculator.calculate_batch(HourlyBatch.from_series(hourly_data, jma_pops))
+
+        assert (weather.max_temp, weather.min_temp) == (26, 24)
+
+    def test_unparseable_time(self):
+        hourly_data = [[{"time": "2026-02-02 9:00", "temp": 20.0}], [{"time": "broken", "temp": 20.0}]]
+        jma_pops = [[_make_jma_pop(12, 30)], [_make_jma_pop(12, 30)]]
+
+        results = self.calculator.calculate_batch(HourlyBatch.from_series(hourly_data, jma_pops))
+
+        assert results[0] == self.calculator.calculate(hourly_data[0], jma_pops[0])
+        assert results[1] is None
+
+    def test_numpy_columns(self):
+        np = pytest.importorskip("numpy")
+        batch = HourlyBatch(
+            temps=np.array([5.0, 18.4, 25.6, 30.0]),
+            hours=np.array([8, 9, 22, 23]),
+            temp_counts=np.array([4, 0]),
+            pops=np.array([10, 70, 90]),
+            pop_hours=np.array([12, 18, 0]),
+            pop_counts=np.array([3, 0]),
+        )
+
+        results = self.calculator.calculate_batch(batch)
+
+        assert results == [Weather(max_temp=26, min_temp=18, pop=70), None]
+
+    def test_series_input(self):
+        hourly_data = [TemperatureSeries(array("b", [9, 12]), array("d", [18.0, 25.5])), TemperatureSeries()]
+        jma_pops = [PopSeries(array("b", [12]), array("h", [30])), PopSeries(array("b", [12]), array("h", [30]))]
+
+        results = self.calculator.calculate_batch(HourlyBatch.from_series(hourly_data, jma_pops))
+
+        assert results == [Weather(max_temp=26, min_temp=18, pop=30), None]
+
+    def test_empty(self):
+        assert self.calculator.calculate_batch(HourlyBatch.from_series([], [])) == []
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            HourlyBatch.from_series([[]], [])
@@ -0,0 +1,56 @@
+from array import array
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from domain.value_objects.weather_series import PopSeries, TemperatureSeries, parse_hour
+
+JST = ZoneInfo("Asia/Tokyo")
+
+
+class TestParseHour:
+    def test_parse_hour(self):
+        assert parse_hour("2026-02-03 09:00") == 9
+
+    def test_fallback_to_strptime(self):
+        assert parse_hour("2026-02-03 9:00") == 9
+
+    def test_unparseable(self):
+        with pytest.raises(ValueError):
+            parse_hour("broken")
+
+
+class TestTemperatureSeries:
+    def test_iterates_hour_and_temp(self):
+        series = TemperatureSeries(array("b", [9, 10]), array("d", [8.5, 9.0]))
+        assert len(series) == 2
+        assert list(series) == [(9, 8.5), (10, 9.0)]
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError, match="要素数"):
+            TemperatureSeries(array("b", [9]), array("d", []))
+
+    def test_from_entries(self):
+        series = TemperatureSeries.from_entries(
+            [{"time": "2026-02-03 09:00", "temp": 8.5}, {"time": "2026-02-03 05:00", "temp": 9.0, "hour": 14}]
+        )
+        assert list(series) == [(9, 8.5), (14, 9.0)]
+
+    def test_no_instance_dict(self):
+        assert not hasattr(TemperatureSeries(), "__dict__")
+
+
+class TestPopSeries:
+    def test_from_entries(self):
+        series = PopSeries.from_entries(
+            [
+                {"time": datetime(2026, 2, 3, 6, 0, tzinfo=JST), "pop": 20},
+                {"time": datetime(2026, 2, 3, 12, 0, tzinfo=JST), "pop": 100},
+            ]
+        )
+        assert series == PopSeries(array("b", [6, 12]), array("h", [20, 100]))
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError, match="要素数"):
+            PopSeries(array("b", []), array("h", [10]))
@@ -0,0 +1,13 @@
+import pytest
+
+from handlers import broadcast, webhook
+
+
+@pytest.fixture(autouse=True)
+def reset_containers():
+    """ハンドラーの依存関係はモジュールスコープで再利用されるため、テストごとに破棄する"""
+    broadcast._container.invalidate_config()
+    webhook._container.invalidate_config()
+    yield
+    broadcast._container.invalidate_config()
+    webhook._container.invalidate_config()
@@ -1,6 +1,9 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
-from handlers.broadcast import handler
+from domain.value_objects.broadcast_shard import BroadcastRunProgress, BroadcastShard
+from handlers.broadcast import handler, prefetch_handler, worker_handler
+from infrastructure.sqs.shard_queue import encode_shard
+from usecases.broadcast_weather import BroadcastResult
 
 
 class TestBroadcastHandler:
@@ -9,7 +12,7 @@ class TestBroadcastHandler:
     @patch("handlers.broadcast.LineMessagingClient")
     @patch("handlers.broadcast.WeatherApiClient")
     @patch("handlers.broadcast.DynamoDBUserRepository")
-    @patch("handlers.broadcast._get_secret")
+    @patch("handlers.broadcast._get_secrets")
     @patch.dict("os.environ", {
         "TABLE_NAME": "test-table",
         "LINE_CHANNEL_ACCESS_TOKEN_NAME": "test-token-name",
@@ -24,7 +27,7 @@ class TestBroadcastHandler:
         mock_calculator,
         mock_usecase_class,
     ):
-        mock_get_secret.side_effect = ["test-access-token", "test-api-key"]
+        mock_get_secret.return_value = ["test-access-token", "test-api-key"]
         mock_usecase = MagicMock()
         mock_usecase_class.return_value = mock_usecase
 
@@ -38,7 +41,7 @@ class TestBroadcastHandler:
     @patch("handlers.broadcast.LineMessagingClient")
     @patch("handlers.broadcast.WeatherApiClient")
     @patch("handlers.broadcast.DynamoDBUserRepository")
-    @patch("handlers.broadcast._get_secret")
+    @patch("handlers.broadcast._get_secrets")
     @patch.dict("os.environ", {
         "TABLE_NAME": "test-table",
         "LINE_CHANNEL_ACCESS_TOKEN_NAME": "test-token-name",
@@ -53,7 +56,7 @@ class TestBroadcastHandler:
         mock_calculator,
         mock_usecase_class,
     ):
-        mock_get_secret.side_effect = ["test-access-token", "test-api-key"]
+        mock_get_secret.return_value = ["test-access-token", "test-api-key"]
         mock_usecase = MagicMock()
         mock_usecase.execute.side_effect = RuntimeError("unexpected error")
         mock_usecase_class.return_value = mock_usecase
@@ -61,3 +64,297 @@ class TestBroadcastHandler:
         result = handler({}, None)
 
         assert result["statusCode"] == 500
+
+    @patch("handlers.broadcast.BroadcastWeatherUseCase")
+    @patch("handlers.broadcast.JmaAreaMapper")
+    @patch("handlers.broadcast.JmaForecastClient")
+    @patch("handlers.broadcast.LineMessagingClient")
+    @patch("handlers.broadcast.WeatherApiClient")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "LINE_CHANNEL_ACCESS_TOKEN_NAME": "test-token-name",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+    })
+    def test_warm_invocation_reuses_dependencies(
+        self,
+        mock_get_secret,
+        mock_dynamo_repo,
+        mock_weather_client,
+        mock_line_client,
+        mock_jma_client,
+        mock_area_mapper,
+        mock_usecase_class,
+    ):
+        mock_get_secret.return_value = ["test-access-token", "test-api-key"]
+        mock_jma_client.return_value.fetch_count = 0
+
+        assert handler({}, None)["statusCode"] == 200
+        assert handler({}, None)["statusCode"] == 200
+
+        # 2回目の呼び出しではクライアントもユースケースも生成しない
+        for constructor in (
+            mock_dynamo_repo, mock_weather_client, mock_line_client, mock_jma_client, mock_area_mapper,
+            mock_usecase_class,
+        ):
+            constructor.assert_called_once()
+        assert mock_usecase_class.return_value.execute.call_count == 2
+
+    @patch("handlers.broadcast.LineMessagingClient")
+    @patch("handlers.broadcast.WeatherApiClient")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast.BroadcastWeatherUseCase")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "LINE_CHANNEL_ACCESS_TOKEN_NAME": "test-token-name",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+    })
+    def test_rotated_secret_rebuilds_clients(
+        self,
+        mock_get_secret,
+        mock_usecase_class,
+        mock_dynamo_repo,
+        mock_weather_client,
+        mock_line_client,
+    ):
+        mock_get_secret.return_value = ["test-access-token", "test-api-key"]
+        handler({}, None)
+        mock_get_secret.return_value = ["rotated-access-token", "test-api-key"]
+
+        assert handler({}, None)["statusCode"] == 200
+
+        mock_line_client.assert_called_with("rotated-access-token", scheduler=ANY)
+        assert mock_usecase_class.call_count == 2
+        # シークレットを使わない依存関係は再利用する
+        mock_dynamo_repo.assert_called_once()
+
+    @patch("handlers.broadcast.AsyncBroadcastWeatherUseCase")
+    @patch("handlers.broadcast.BroadcastWeatherUseCase")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "LINE_CHANNEL_ACCESS_TOKEN_NAME": "test-token-name",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+        "BROADCAST_ASYNC": "true",
+    })
+    def test_handler_async(
+        self,
+        mock_get_secret,
+        mock_dynamo_repo,
+        mock_usecase_class,
+        mock_async_usecase_class,
+    ):
+        mock_get_secret.return_value = ["test-access-token", "test-api-key"]
+        mock_async_usecase = MagicMock()
+        mock_async_usecase.execute = AsyncMock()
+        mock_async_usecase_class.return_value = mock_async_usecase
+
+        result = handler({}, None)
+
+        assert result["statusCode"] == 200
+        mock_async_usecase.execute.assert_awaited_once()
+        mock_usecase_class.assert_not_called()
+
+    @patch("handlers.broadcast.DynamoDBBroadcastRunRepository")
+    @patch("handlers.broadcast.SqsShardQueue")
+    @patch("handlers.broadcast.BroadcastWeatherUseCase")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "BROADCAST_SHARD_QUEUE_URL": "https://sqs.example/shards",
+        "BROADCAST_RUNS_TABLE_NAME": "test-runs",
+        "BROADCAST_SHARD_COUNT": "4",
+    })
+    def test_handler_dispatches_shards(
+        self,
+        mock_get_secret,
+        mock_usecase_class,
+        mock_queue_class,
+        mock_run_repo_class,
+    ):
+        result = handler({"id": "event-1"}, None)
+
+        assert result["statusCode"] == 200
+        mock_run_repo_class.return_value.start_run.assert_called_once_with("event-1", 4)
+        shards = mock_queue_class.return_value.send_shards.call_args.args[0]
+        assert [shard.index for shard in shards] == [0, 1, 2, 3]
+        mock_usecase_class.assert_not_called()
+        mock_get_secret.assert_not_called()
+
+
+class TestBroadcastWorkerHandler:
+    @patch("handlers.broadcast.DynamoDBBroadcastRunRepository")
+    @patch("handlers.broadcast.BroadcastWeatherUseCase")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "LINE_CHANNEL_ACCESS_TOKEN_NAME": "test-token-name",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+        "BROADCAST_RUNS_TABLE_NAME": "test-runs",
+    })
+    def test_worker_handler_runs_shards(
+        self,
+        mock_get_secret,
+        mock_dynamo_repo,
+        mock_usecase_class,
+        mock_run_repo_class,
+    ):
+        mock_get_secret.return_value = ["test-access-token", "test-api-key"]
+        mock_usecase_class.return_value.execute.return_value = BroadcastResult(success_count=3)
+        mock_run_repo_class.return_value.record_shard_result.return_value = BroadcastRunProgress("run-1", 4, 1, 3, 0)
+        event = {
+            "Records": [
+                {"messageId": "m1", "body": encode_shard(BroadcastShard("run-1", 1, 4))},
+                {"messageId": "m2", "body": "broken"},
+            ]
+        }
+
+        result = worker_handler(event, None)
+
+        assert result == {"batchItemFailures": [{"itemIdentifier": "m2"}]}
+        assert mock_dynamo_repo.call_args.kwargs["shard_index"] == 1
+        assert mock_dynamo_repo.call_args.kwargs["shard_count"] == 4
+        mock_run_repo_class.return_value.record_shard_result.assert_called_once_with("run-1", 1, 3, 0)
+
+    @patch("handlers.broadcast.DynamoDBBroadcastRunRepository")
+    @patch("handlers.broadcast.BroadcastWeatherUseCase")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "LINE_CHANNEL_ACCESS_TOKEN_NAME": "test-token-name",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+        "BROADCAST_RUNS_TABLE_NAME": "test-runs",
+    })
+    def test_worker_reuses_shard_usecase(
+        self,
+        mock_get_secret,
+        mock_dynamo_repo,
+        mock_usecase_class,
+        mock_run_repo_class,
+    ):
+        mock_get_secret.return_value = ["test-access-token", "test-api-key"]
+        mock_usecase_class.return_value.execute.return_value = BroadcastResult(success_count=1)
+        mock_run_repo_class.return_value.record_shard_result.return_value = BroadcastRunProgress("run-1", 4, 1, 1, 0)
+
+        for run_id in ("run-1", "run-2"):
+            event = {"Records": [{"messageId": run_id, "body": encode_shard(BroadcastShard(run_id, 1, 4))}]}
+            assert worker_handler(event, None) == {"batchItemFailures": []}
+
+        # 同じシャード番号の配信は実行IDが変わっても同じユースケースで行う
+        mock_dynamo_repo.assert_called_once()
+        mock_usecase_class.assert_called_once()
+        mock_run_repo_class.assert_called_once_with("test-runs")
+        assert mock_usecase_class.return_value.execute.call_count == 2
+
+
+class TestPrefetchHandler:
+    @patch("handlers.broadcast.DynamoDBForecastStore")
+    @patch("handlers.broadcast.PrefetchForecastsUseCase")
+    @patch("handlers.broadcast.WeatherApiClient")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+        "FORECAST_TABLE_NAME": "test-forecasts",
+    })
+    def test_prefetch_handler_success(
+        self,
+        mock_get_secret,
+        mock_dynamo_repo,
+        mock_weather_client,
+        mock_usecase_class,
+        mock_store_class,
+    ):
+        mock_get_secret.return_value = ["test-api-key"]
+        mock_usecase_class.return_value.execute.return_value = 10
+
+        result = prefetch_handler({}, None)
+
+        assert result["statusCode"] == 200
+        # 事前計算では LINE のアクセストークンを取得しない
+        mock_get_secret.assert_called_once_with("test-key-name")
+        mock_store_class.assert_called_once_with("test-forecasts")
+        mock_usecase_class.return_value.execute.assert_called_once()
+
+    @patch("handlers.broadcast.DynamoDBForecastStore")
+    @patch("handlers.broadcast.PrefetchForecastsUseCase")
+    @patch("handlers.broadcast.WeatherApiClient")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+        "FORECAST_TABLE_NAME": "test-forecasts",
+        "WEATHERAPI_LEAN_FETCH": "true",
+    })
+    def test_prefetch_handler_lean_fetch(
+        self,
+        mock_get_secret,
+        mock_dynamo_repo,
+        mock_weather_client,
+        mock_usecase_class,
+        mock_store_class,
+    ):
+        mock_get_secret.return_value = ["test-api-key"]
+        mock_usecase_class.return_value.execute.return_value = 10
+
+        result = prefetch_handler({}, None)
+
+        assert result["statusCode"] == 200
+        mock_weather_client.assert_called_once_with("test-api-key", lean=True)
+
+    @patch("handlers.broadcast.PrefetchForecastsUseCase")
+    @patch("handlers.broadcast.WeatherApiClient")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+        "FORECAST_TABLE_NAME": "test-forecasts",
+    })
+    def test_prefetch_handler_error(
+        self,
+        mock_get_secret,
+        mock_dynamo_repo,
+        mock_weather_client,
+        mock_usecase_class,
+    ):
+        mock_get_secret.return_value = ["test-api-key"]
+        mock_usecase_class.return_value.execute.side_effect = RuntimeError("unexpected error")
+
+        result = prefetch_handler({}, None)
+
+        assert result["statusCode"] == 500
+
+    @patch("handlers.broadcast.DynamoDBForecastStore")
+    @patch("handlers.broadcast.BroadcastWeatherUseCase")
+    @patch("handlers.broadcast.LineMessagingClient")
+    @patch("handlers.broadcast.WeatherApiClient")
+    @patch("handlers.broadcast.DynamoDBUserRepository")
+    @patch("handlers.broadcast._get_secrets")
+    @patch.dict("os.environ", {
+        "TABLE_NAME": "test-table",
+        "LINE_CHANNEL_ACCESS_TOKEN_NAME": "test-token-name",
+        "WEATHERAPI_API_KEY_NAME": "test-key-name",
+        "FORECAST_TABLE_NAME": "test-forecasts",
+    })
+    def test_broadcast_reads_precomputed_forecasts(
+        self,
+        mock_get_secret,
+        mock_dynamo_repo,
+        mock_weather_client,
+        mock_line_client,
+        mock_usecase_class,
+        mock_store_class,
+    ):
+        mock_get_secret.return_value = ["test-access-token", "test-api-key"]
+
+        result = handler({}, None)
+
+        assert result["statusCode"] == 200
+        assert mock_usecase_class.call_args.kwargs["forecast_store"] is mock_store_class.return_value
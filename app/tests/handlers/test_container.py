@@ -0,0 +1,117 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from handlers.container import Container
+
+
+class TestContainer:
+    def setup_method(self):
+        self.environ = {"TABLE_NAME": "users", "TOKEN_NAME": "token"}
+        self.secrets = {"token": "token-v1", "api-key": "key-v1"}
+        self.get_secrets = MagicMock(side_effect=lambda *names: [self.secrets[name] for name in names])
+        self.container = Container(self.get_secrets, environ=self.environ)
+
+    def _client(self) -> object:
+        def create() -> tuple[str, str]:
+            (token,) = self.container.secrets(self.container.require_env("TOKEN_NAME"))
+            return ("client", token)
+
+        return self.container.get("client", create)
+
+    def _repository(self) -> object:
+        return self.container.get("repository", lambda: ("repository", self.container.require_env("TABLE_NAME")))
+
+    def _usecase(self) -> object:
+        return self.container.get("usecase", lambda: ("usecase", self._client(), self._repository()))
+
+    def test_get_builds_once(self):
+        factory = MagicMock(return_value=object())
+
+        first = self.container.get("client", factory)
+        second = self.container.get("client", factory)
+
+        assert first is second
+        factory.assert_called_once()
+
+    def test_require_env_missing(self):
+        with pytest.raises(KeyError):
+            self.container.require_env("MISSING")
+
+    def test_env_default(self):
+        assert self.container.env("MISSING", "default") == "default"
+
+    def test_env_int_and_float(self):
+        self.environ.update({"MAX_WORKERS": "4", "QPS": "2.5"})
+
+        assert self.container.env_int("MAX_WORKERS", 8) == 4
+        assert self.container.env_float("QPS", 10.0) == 2.5
+        assert self.container.env_int("MISSING", 8) == 8
+        assert self.container.env_float("MISSING", 10.0) == 10.0
+
+    def test_env_int_change_rebuilds_all(self):
+        self.environ["MAX_WORKERS"] = "4"
+        self.container.get("usecase", lambda: self.container.env_int("MAX_WORKERS", 8))
+
+        self.environ["MAX_WORKERS"] = "2"
+        self.container.refresh()
+
+        assert self.container.get("usecase", lambda: self.container.env_int("MAX_WORKERS", 8)) == 2
+
+    def test_secrets_are_read_once_per_refresh(self):
+        self.container.secrets("token", "api-key")
+        self.container.secrets("token")
+
+        self.get_secrets.assert_called_once_with("token", "api-key")
+
+    def test_refresh_without_changes_keeps_instances(self):
+        usecase = self._usecase()
+
+        self.container.refresh()
+
+        assert self._usecase() is usecase
+
+    def test_rotated_secret_rebuilds_dependents_only(self):
+        usecase = self._usecase()
+        repository = self._repository()
+        self.secrets["token"] = "token-v2"
+
+        self.container.refresh()
+
+        assert self._repository() is repository
+        assert self._usecase() is not usecase
+        assert self._client() == ("client", "token-v2")
+
+    def test_changed_env_rebuilds_all(self):
+        repository = self._repository()
+        self.environ["TABLE_NAME"] = "users-v2"
+
+        self.container.refresh()
+
+        assert self._repository() is not repository
+        assert self._repository() == ("repository", "users-v2")
+
+    def test_unread_env_change_keeps_instances(self):
+        repository = self._repository()
+        self.environ["UNRELATED"] = "value"
+
+        self.container.refresh()
+
+        assert self._repository() is repository
+
+    def test_invalidate_secrets(self):
+        usecase = self._usecase()
+        repository = self._repository()
+
+        self.container.invalidate_secrets()
+
+        assert self._usecase() is not usecase
+        assert self._repository() is repository
+        assert self.get_secrets.call_count == 2
+
+    def test_invalidate_config(self):
+        repository = self._repository()
+
+        self.container.invalidate_config()
+
+        assert self._repository() is not repository
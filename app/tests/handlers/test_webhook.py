@@ -4,7 +4,9 @@ import hmac
 import json
 from unittest.mock import MagicMock, patch
 
-from handlers.webhook import handler, verify_signature
+from domain.value_objects.region_registration import RegionRegistration
+from handlers.webhook import handler, registration_worker_handler, verify_signature
+from infrastructure.sqs.registration_queue import encode_registration
 
 
 class TestVerifySignature:
@@ -34,11 +36,11 @@ class TestWebhookHandler:
             "headers": {"x-line-signature": signature},
         }
 
-    @patch("handlers.webhook._get_secret")
-    @patch("handlers.webhook.RegisterRegionUseCase")
-    @patch("handlers.webhook.LineMessagingClient")
-    @patch("handlers.webhook.GsiGeocodingClient")
-    @patch("handlers.webhook.DynamoDBUserRepository")
+    @patch("handlers.webhook._get_secrets")
+    @patch("usecases.register_region.RegisterRegionUseCase")
+    @patch("infrastructure.line.messaging_client.LineMessagingClient")
+    @patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient")
+    @patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository")
     @patch.dict(
         "os.environ",
         {
@@ -48,10 +50,7 @@ class TestWebhookHandler:
         },
     )
     def test_message_event(self, mock_repo, mock_geo, mock_line, mock_usecase_cls, mock_secret):
-        mock_secret.side_effect = lambda name: {
-            "secret-name": "test-secret",
-            "token-name": "test-token",
-        }[name]
+        mock_secret.return_value = ["test-secret", "test-token"]
 
         body = {
             "events": [
@@ -68,11 +67,18 @@ class TestWebhookHandler:
         result = handler(event, None)
 
         assert result["statusCode"] == 200
-        mock_usecase_cls.return_value.execute.assert_called_once_with(
-            "U1234", "渋谷区", "reply-token"
+        mock_usecase_cls.return_value.execute_all.assert_called_once_with(
+            [RegionRegistration("U1234", "渋谷区", "reply-token")]
         )
+        # チャネルシークレットとアクセストークンは1回の呼び出しでまとめて取得する
+        mock_secret.assert_called_once_with("secret-name", "token-name")
+        mock_line.assert_called_once_with("test-token")
 
-    @patch("handlers.webhook._get_secret")
+    @patch("handlers.webhook._get_secrets")
+    @patch("usecases.register_region.RegisterRegionUseCase")
+    @patch("infrastructure.line.messaging_client.LineMessagingClient")
+    @patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient")
+    @patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository")
     @patch.dict(
         "os.environ",
         {
@@ -81,8 +87,94 @@ class TestWebhookHandler:
             "TABLE_NAME": "test-table",
         },
     )
-    def test_invalid_signature_returns_401(self, mock_secret):
-        mock_secret.return_value = "test-secret"
+    def test_failed_registration_replies_error(self, mock_repo, mock_geo, mock_line, mock_usecase_cls, mock_secret):
+        mock_secret.return_value = ["test-secret", "test-token"]
+        mock_usecase_cls.return_value.execute_all.return_value = [1]
+        body = {
+            "events": [
+                {
+                    "type": "message",
+                    "replyToken": f"reply-{user_id}",
+                    "source": {"userId": user_id},
+                    "message": {"type": "text", "text": "渋谷区"},
+                }
+                for user_id in ("U1", "U2")
+            ]
+        }
+
+        result = handler(self._make_event(body), None)
+
+        # その場で処理する場合は再試行しないため、失敗した依頼にエラーを返信する
+        assert result["statusCode"] == 200
+        mock_usecase_cls.return_value.reply_error.assert_called_once_with("U2", "reply-U2")
+
+    @patch("handlers.webhook._get_secrets")
+    @patch("usecases.register_region.RegisterRegionUseCase")
+    @patch("infrastructure.line.messaging_client.LineMessagingClient")
+    @patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient")
+    @patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository")
+    @patch.dict(
+        "os.environ",
+        {
+            "LINE_CHANNEL_SECRET_NAME": "secret-name",
+            "LINE_CHANNEL_ACCESS_TOKEN_NAME": "token-name",
+            "TABLE_NAME": "test-table",
+        },
+    )
+    def test_warm_invocation_reuses_dependencies(self, mock_repo, mock_geo, mock_line, mock_usecase_cls, mock_secret):
+        mock_secret.return_value = ["test-secret", "test-token"]
+        event = self._make_event(
+            {
+                "events": [
+                    {
+                        "type": "message",
+                        "replyToken": "reply-token",
+                        "source": {"userId": "U1234"},
+                        "message": {"type": "text", "text": "渋谷区"},
+                    }
+                ]
+            }
+        )
+
+        assert handler(event, None)["statusCode"] == 200
+        assert handler(event, None)["statusCode"] == 200
+
+        # 2回目の呼び出しではクライアントもユースケースも生成しない
+        for constructor in (mock_repo, mock_geo, mock_line, mock_usecase_cls):
+            constructor.assert_called_once()
+        assert mock_usecase_cls.return_value.execute_all.call_count == 2
+
+    @patch("handlers.webhook._get_secrets")
+    @patch("usecases.register_region.RegisterRegionUseCase")
+    @patch.dict(
+        "os.environ",
+        {
+            "LINE_CHANNEL_SECRET_NAME": "secret-name",
+            "LINE_CHANNEL_ACCESS_TOKEN_NAME": "token-name",
+            "TABLE_NAME": "test-table",
+        },
+    )
+    def test_events_without_messages_skip_dependencies(self, mock_usecase_cls, mock_secret):
+        mock_secret.return_value = ["test-secret", "test-token"]
+        event = self._make_event({"events": [{"type": "follow", "source": {"userId": "U1234"}}]})
+
+        assert handler(event, None)["statusCode"] == 200
+
+        mock_usecase_cls.assert_not_called()
+
+    @patch("handlers.webhook._refresh_secret")
+    @patch("handlers.webhook._get_secrets")
+    @patch.dict(
+        "os.environ",
+        {
+            "LINE_CHANNEL_SECRET_NAME": "secret-name",
+            "LINE_CHANNEL_ACCESS_TOKEN_NAME": "token-name",
+            "TABLE_NAME": "test-table",
+        },
+    )
+    def test_invalid_signature_returns_401(self, mock_secrets, mock_refresh):
+        mock_secrets.return_value = ["test-secret", "test-token"]
+        mock_refresh.return_value = "test-secret"
         event = {
             "body": '{"events":[]}',
             "headers": {"x-line-signature": "invalid-signature"},
@@ -91,3 +183,150 @@ class TestWebhookHandler:
         result = handler(event, None)
 
         assert result["statusCode"] == 401
+        mock_refresh.assert_called_once_with("secret-name")
+
+    @patch("handlers.webhook._refresh_secret")
+    @patch("handlers.webhook._get_secrets")
+    @patch("usecases.register_region.RegisterRegionUseCase")
+    @patch("infrastructure.line.messaging_client.LineMessagingClient")
+    @patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient")
+    @patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository")
+    @patch.dict(
+        "os.environ",
+        {
+            "LINE_CHANNEL_SECRET_NAME": "secret-name",
+            "LINE_CHANNEL_ACCESS_TOKEN_NAME": "token-name",
+            "TABLE_NAME": "test-table",
+        },
+    )
+    def test_rotated_channel_secret_is_refetched(
+        self, mock_repo, mock_geo, mock_line, mock_usecase_cls, mock_secrets, mock_refresh
+    ):
+        # キャッシュにはローテーション前のシークレットが残っている
+        secrets = {"secret-name": "old-secret", "token-name": "test-token"}
+        mock_secrets.side_effect = lambda *names: [secrets[name] for name in names]
+        mock_refresh.return_value = "test-secret"
+
+        result = handler(self._make_event({"events": []}), None)
+
+        assert result["statusCode"] == 200
+        mock_refresh.assert_called_once_with("secret-name")
+
+    @patch("handlers.webhook._get_secrets")
+    @patch("infrastructure.sqs.registration_queue.SqsRegistrationQueue")
+    @patch("usecases.register_region.RegisterRegionUseCase")
+    @patch.dict(
+        "os.environ",
+        {
+            "LINE_CHANNEL_SECRET_NAME": "secret-name",
+            "LINE_CHANNEL_ACCESS_TOKEN_NAME": "token-name",
+            "TABLE_NAME": "test-table",
+            "WEBHOOK_EVENT_QUEUE_URL": "https://sqs.example/registrations.fifo",
+        },
+    )
+    def test_enqueues_registrations(self, mock_usecase_cls, mock_queue_cls, mock_secret):
+        mock_secret.return_value = ["test-secret", "test-token"]
+        body = {
+            "events": [
+                {
+                    "type": "message",
+                    "webhookEventId": "event-1",
+                    "replyToken": "reply-token",
+                    "source": {"userId": "U1234"},
+                    "message": {"type": "text", "text": " 渋谷区 "},
+                },
+                {
+                    "type": "message",
+                    "replyToken": "reply-token-2",
+                    "source": {"userId": "U1234"},
+                    "message": {"type": "text", "text": "設定確認"},
+                },
+            ]
+        }
+
+        result = handler(self._make_event(body), None)
+
+        assert result["statusCode"] == 200
+        mock_queue_cls.assert_called_once_with("https://sqs.example/registrations.fifo")
+        mock_queue_cls.return_value.send_registrations.assert_called_once_with(
+            [RegionRegistration("U1234", "渋谷区", "reply-token", "event-1")]
+        )
+        # 地域設定はワーカーで行う
+        mock_usecase_cls.assert_not_called()
+
+
+class TestRegistrationWorkerHandler:
+    def _record(self, message_id: str, body: str, group_id: str | None = None) -> dict:
+        record = {"messageId": message_id, "body": body}
+        if group_id is not None:
+            record["attributes"] = {"MessageGroupId": group_id}
+        return record
+
+    @patch("handlers.webhook._get_secrets")
+    @patch("usecases.register_region.RegisterRegionUseCase")
+    @patch("infrastructure.line.messaging_client.LineMessagingClient")
+    @patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient")
+    @patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository")
+    @patch.dict("os.environ", {"LINE_CHANNEL_ACCESS_TOKEN_NAME": "token-name", "TABLE_NAME": "test-table"})
+    def test_processes_batch(self, mock_repo, mock_geo, mock_line, mock_usecase_cls, mock_secret):
+        mock_secret.return_value = ["test-token"]
+        # 処理した依頼のうち2件目（U3）が失敗する
+        mock_usecase_cls.return_value.execute_all.return_value = [1]
+        event = {
+            "Records": [
+                self._record("m1", encode_registration(RegionRegistration("U1", "渋谷区", "r1")), "U1"),
+                self._record("m2", "broken", "U2"),
+                self._record("m3", encode_registration(RegionRegistration("U2", "新宿区", "r3")), "U2"),
+                self._record("m4", encode_registration(RegionRegistration("U3", "横浜市", "r4")), "U3"),
+            ]
+        }
+
+        result = registration_worker_handler(event, None)
+
+        # 解釈できないメッセージと、その後の同じユーザーのメッセージは処理せずに返す
+        assert result == {
+            "batchItemFailures": [{"itemIdentifier": "m2"}, {"itemIdentifier": "m3"}, {"itemIdentifier": "m4"}]
+        }
+        mock_usecase_cls.return_value.execute_all.assert_called_once_with(
+            [RegionRegistration("U1", "渋谷区", "r1"), RegionRegistration("U3", "横浜市", "r4")]
+        )
+        mock_line.assert_called_once_with("test-token")
+
+    @patch("handlers.webhook._get_secrets")
+    @patch("infrastructure.line.messaging_client.LineMessagingClient")
+    @patch("infrastructure.gsi.geocoding_client.GsiGeocodingClient")
+    @patch("infrastructure.dynamodb.user_repository.DynamoDBUserRepository")
+    @patch.dict("os.environ", {"LINE_CHANNEL_ACCESS_TOKEN_NAME": "token-name", "TABLE_NAME": "test-table"})
+    def test_processing_error_is_returned_for_retry(self, mock_repo, mock_geo, mock_line, mock_secret):
+        mock_secret.return_value = ["test-token"]
+        mock_geo.return_value.get_coordinates.side_effect = lambda city_name: (35.0, 139.0, city_name)
+        mock_repo.return_value.find_by_id.return_value = None
+
+        def save(user):
+            if user.user_id == "U1":
+                raise RuntimeError("DynamoDB error")
+
+        mock_repo.return_value.save.side_effect = save
+        event = {
+            "Records": [
+                self._record("m1", encode_registration(RegionRegistration("U1", "渋谷区", "r1")), "U1"),
+                self._record("m2", encode_registration(RegionRegistration("U2", "新宿区", "r2")), "U2"),
+            ]
+        }
+
+        result = registration_worker_handler(event, None)
+
+        # DynamoDB への保存に失敗した依頼は、エラーを返信せずに SQS の再試行に任せる
+        assert result == {"batchItemFailures": [{"itemIdentifier": "m1"}]}
+        mock_line.return_value.reply_message.assert_called_once()
+        assert mock_line.return_value.reply_message.call_args.args[0] == "r2"
+
+    @patch("handlers.webhook._get_secrets")
+    @patch.dict("os.environ", {"LINE_CHANNEL_ACCESS_TOKEN_NAME": "token-name"})
+    def test_setup_error_fails_all_records(self, mock_secret):
+        mock_secret.side_effect = RuntimeError("secrets unavailable")
+        event = {"Records": [self._record("m1", "{}"), self._record("m2", "{}")]}
+
+        result = registration_worker_handler(event, None)
+
+        assert result == {"batchItemFailures": [{"itemIdentifier": "m1"}, {"itemIdentifier": "m2"}]}
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from infrastructure.exceptions import (
+    GeocodingAmbiguousException,
+    GeocodingAPIException,
+    GeocodingNotFoundException,
+)
+from infrastructure.gsi.async_geocoding_client import AsyncGsiGeocodingClient
+from infrastructure.gsi.geocoding_cache import GeocodingOutcome
+from infrastructure.http.async_client import create_async_client
+from tests.infrastructure.test_geocoding_client import FUCHU_FEATURES, SHIBUYA_FEATURES
+from tests.stub_server import StubResponse, StubServer
+from utils.cache import TTLCache
+
+
+def _get_coordinates(server: StubServer, *city_names: str, **kwargs) -> list:
+    """city_names を順に問い合わせ、結果（例外を含む）のリストを返す"""
+
+    async def run() -> list:
+        async with create_async_client() as http:
+            client = AsyncGsiGeocodingClient(client=http, **kwargs)
+            results = []
+            for city_name in city_names:
+                try:
+                    results.append(await client.get_coordinates(city_name))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    with patch.object(AsyncGsiGeocodingClient, "BASE_URL", f"{server.url}/address-search/AddressSearch"):
+        return asyncio.run(run())
+
+
+class TestAsyncGsiGeocodingClient:
+    def test_get_coordinates_success(self):
+        with StubServer(lambda req: StubResponse(body=SHIBUYA_FEATURES)) as server:
+            [result] = _get_coordinates(server, "渋谷区")
+
+        assert result == (35.6619, 139.7041, "東京都渋谷区")
+        assert server.requests[0].path.startswith("/address-search/AddressSearch?q=")
+
+    def test_get_coordinates_not_found(self):
+        with StubServer(lambda req: StubResponse(body=[])) as server:
+            [result] = _get_coordinates(server, "あああ")
+
+        assert isinstance(result, GeocodingNotFoundException)
+        assert server.request_count == 1
+
+    def test_get_coordinates_ambiguous(self):
+        with StubServer(lambda req: StubResponse(body=FUCHU_FEATURES)) as server:
+            [result] = _get_coordinates(server, "府中市")
+
+        assert isinstance(result, GeocodingAmbiguousException)
+        assert result.candidates == ["東京都府中市", "広島県府中市"]
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_get_coordinates_http_error(self, mock_sleep):
+        with StubServer(lambda req: StubResponse(status=500)) as server:
+            [result] = _get_coordinates(server, "渋谷区")
+
+        assert isinstance(result, GeocodingAPIException)
+        assert server.request_count == 3
+
+
+class TestAsyncGsiGeocodingClientCache:
+    def test_success_cached(self):
+        cache = TTLCache(maxsize=16, ttl=3600)
+        with StubServer(lambda req: StubResponse(body=SHIBUYA_FEATURES)) as server:
+            first, second = _get_coordinates(server, "渋谷区", "渋谷区", cache=cache)
+
+        assert first == second == (35.6619, 139.7041, "東京都渋谷区")
+        assert server.request_count == 1
+
+    def test_not_found_cached(self):
+        with StubServer(lambda req: StubResponse(body=[])) as server:
+            results = _get_coordinates(server, "あああ", "あああ", cache=TTLCache(maxsize=16))
+
+        assert all(isinstance(result, GeocodingNotFoundException) for result in results)
+        assert server.request_count == 1
+
+    def test_store_hit_skips_api(self):
+        store = MagicMock()
+        store.get.return_value = GeocodingOutcome.found((35.6619, 139.7041, "東京都渋谷区"))
+        with StubServer() as server:
+            [result] = _get_coordinates(server, "渋谷区", cache_store=store)
+
+        assert result == (35.6619, 139.7041, "東京都渋谷区")
+        assert server.request_count == 0
+
+    def test_store_miss_writes_back(self):
+        store = MagicMock()
+        store.get.return_value = None
+        with StubServer(lambda req: StubResponse(body=FUCHU_FEATURES)) as server:
+            _get_coordinates(server, "府中市", cache_store=store)
+
+        outcome = store.put.call_args.args[1]
+        assert outcome.status == "ambiguous"
+
+    def test_store_error_falls_back_to_api(self):
+        store = MagicMock()
+        store.get.side_effect = RuntimeError("throttled")
+        store.put.side_effect = RuntimeError("throttled")
+        with StubServer(lambda req: StubResponse(body=SHIBUYA_FEATURES)) as server:
+            [result] = _get_coordinates(server, "渋谷区", cache_store=store)
+
+        assert result[2] == "東京都渋谷区"
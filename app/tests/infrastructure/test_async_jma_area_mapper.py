@@ -0,0 +1,91 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from infrastructure.exceptions import JMAAPIException
+from infrastructure.http.async_client import create_async_client
+from infrastructure.jma.area_snapshot import load_snapshot, save_snapshot
+from infrastructure.jma.async_area_mapper import AsyncJmaAreaMapper
+from tests.infrastructure.test_jma_area_mapper import SAMPLE_AREA_DATA
+from tests.infrastructure.test_jma_area_snapshot import DAY, NOW, _snapshot
+from tests.stub_server import StubResponse, StubServer
+
+
+def _area_json(request) -> StubResponse:
+    if request.headers.get("If-None-Match") == '"v1"':
+        return StubResponse(status=304, body=b"")
+    return StubResponse(body=SAMPLE_AREA_DATA, headers={"ETag": '"v2"'})
+
+
+def _run(server: StubServer, tmp_path, scenario, now: float = NOW):
+    async def run():
+        async with create_async_client() as http:
+            mapper = AsyncJmaAreaMapper(
+                client=http,
+                snapshot_path=str(tmp_path / "tmp" / "area_snapshot.json"),
+                bundled_snapshot_path=str(tmp_path / "bundled" / "area_snapshot.json"),
+                timer=lambda: now,
+            )
+            return await scenario(mapper)
+
+    with patch("infrastructure.jma.async_area_mapper.AREA_JSON_URL", f"{server.url}/area.json"):
+        return asyncio.run(run())
+
+
+async def _load_and_find(mapper: AsyncJmaAreaMapper, city_name: str = "川崎市") -> tuple[str, str]:
+    await mapper.load()
+    return mapper.find_codes(city_name)
+
+
+class TestAsyncJmaAreaMapper:
+    def test_find_codes_after_load(self, tmp_path):
+        with StubServer(_area_json) as server:
+            codes = _run(server, tmp_path, _load_and_find)
+
+        assert codes == ("140000", "140010")
+        assert server.request_count == 1
+        assert load_snapshot(str(tmp_path / "tmp" / "area_snapshot.json")) is not None
+
+    def test_concurrent_load_fetches_once(self, tmp_path):
+        async def scenario(mapper: AsyncJmaAreaMapper):
+            await asyncio.gather(*(mapper.load() for _ in range(10)))
+            return mapper.find_class20_code("渋谷区")
+
+        with StubServer(_area_json) as server:
+            assert _run(server, tmp_path, scenario) == "1310100"
+
+        assert server.request_count == 1
+
+    def test_fresh_snapshot_skips_network(self, tmp_path):
+        save_snapshot(_snapshot(NOW - 60), str(tmp_path / "bundled" / "area_snapshot.json"))
+
+        with StubServer(_area_json) as server:
+            assert _run(server, tmp_path, _load_and_find) == ("140000", "140010")
+
+        assert server.request_count == 0
+
+    def test_stale_snapshot_not_modified(self, tmp_path):
+        save_snapshot(_snapshot(NOW - 2 * DAY), str(tmp_path / "bundled" / "area_snapshot.json"))
+
+        with StubServer(_area_json) as server:
+            _run(server, tmp_path, _load_and_find)
+
+        assert server.requests[0].headers["If-Modified-Since"] == "Mon, 02 Feb 2026 00:00:00 GMT"
+        refreshed = load_snapshot(str(tmp_path / "tmp" / "area_snapshot.json"))
+        assert refreshed is not None
+        assert (refreshed.etag, refreshed.fetched_at) == ('"v1"', NOW)
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_stale_snapshot_survives_refresh_failure(self, mock_sleep, tmp_path):
+        save_snapshot(_snapshot(NOW - 2 * DAY), str(tmp_path / "bundled" / "area_snapshot.json"))
+
+        with StubServer(lambda req: StubResponse(status=503)) as server:
+            assert _run(server, tmp_path, lambda mapper: _load_and_find(mapper, "渋谷区")) == ("130000", "130010")
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_no_snapshot_and_fetch_error_raises(self, mock_sleep, tmp_path):
+        with StubServer(lambda req: StubResponse(status=500)) as server, pytest.raises(JMAAPIException):
+            _run(server, tmp_path, _load_and_find)
+
+        assert server.request_count == 3
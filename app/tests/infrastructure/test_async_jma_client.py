@@ -0,0 +1,67 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from infrastructure.exceptions import JMAAPIException
+from infrastructure.http.async_client import create_async_client
+from infrastructure.jma.async_client import AsyncJmaForecastClient
+from infrastructure.jma.client import OfficePops
+from tests.infrastructure.test_jma_client import SAMPLE_FORECAST_RESPONSE
+from tests.stub_server import StubResponse, StubServer
+from utils.cache import TTLCache
+
+
+def _run(server: StubServer, scenario, cache: TTLCache | None = None):
+    async def run():
+        async with create_async_client() as http:
+            return await scenario(AsyncJmaForecastClient(client=http, cache=cache))
+
+    with patch("infrastructure.jma.async_client.FORECAST_URL", f"{server.url}/forecast/{{office_code}}.json"):
+        return asyncio.run(run())
+
+
+class TestAsyncJmaForecastClient:
+    def test_get_pops_success(self):
+        with StubServer(lambda req: StubResponse(body=SAMPLE_FORECAST_RESPONSE)) as server:
+            result = _run(server, lambda client: client.get_pops("140000", "140010"))
+
+        assert list(result.pops) == [10, 20, 30, 40]
+        assert list(result.hours) == [0, 6, 12, 18]
+        assert server.requests[0].path == "/forecast/140000.json"
+
+    def test_get_pops_area_not_found(self):
+        with (
+            StubServer(lambda req: StubResponse(body=SAMPLE_FORECAST_RESPONSE)) as server,
+            pytest.raises(JMAAPIException, match="999999"),
+        ):
+            _run(server, lambda client: client.get_pops("140000", "999999"))
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_get_pops_http_error(self, mock_sleep):
+        with StubServer(lambda req: StubResponse(status=500)) as server, pytest.raises(JMAAPIException):
+            _run(server, lambda client: client.get_pops("140000", "140010"))
+
+        assert server.request_count == 3
+
+
+class TestAsyncJmaForecastClientCache:
+    def test_concurrent_requests_fetch_office_once(self):
+        async def scenario(client: AsyncJmaForecastClient):
+            results = await asyncio.gather(*(client.get_pops("140000", code) for code in ["140010", "140020"] * 10))
+            return results, client.fetch_count
+
+        with StubServer(lambda req: StubResponse(body=SAMPLE_FORECAST_RESPONSE)) as server:
+            results, fetch_count = _run(server, scenario)
+
+        assert server.request_count == 1
+        assert fetch_count == 1
+        assert results[1].pops[0] == 50
+
+    def test_shared_cache_survives_new_client(self):
+        cache: TTLCache[str, OfficePops] = TTLCache(maxsize=8)
+        with StubServer(lambda req: StubResponse(body=SAMPLE_FORECAST_RESPONSE)) as server:
+            _run(server, lambda client: client.get_pops("140000", "140010"), cache=cache)
+            _run(server, lambda client: client.get_pops("140000", "140020"), cache=cache)
+
+        assert server.request_count == 1
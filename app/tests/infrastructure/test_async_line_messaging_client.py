@@ -0,0 +1,66 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from infrastructure.exceptions import MessagingException
+from infrastructure.http.async_client import create_async_client
+from infrastructure.line.async_messaging_client import AsyncLineMessagingClient
+from tests.stub_server import StubResponse, StubServer
+
+
+def _run(server: StubServer, scenario):
+    async def run():
+        async with create_async_client() as http:
+            return await scenario(AsyncLineMessagingClient(channel_access_token="test-token", client=http))
+
+    with patch.object(AsyncLineMessagingClient, "BASE_URL", f"{server.url}/v2/bot/message"):
+        return asyncio.run(run())
+
+
+class TestAsyncLineMessagingClient:
+    def test_reply_message_success(self):
+        with StubServer() as server:
+            _run(server, lambda client: client.reply_message("reply-token", "こんにちは"))
+
+        request = server.requests[0]
+        assert request.path == "/v2/bot/message/reply"
+        assert request.headers["Authorization"] == "Bearer test-token"
+        assert json.loads(request.body) == {
+            "replyToken": "reply-token",
+            "messages": [{"type": "text", "text": "こんにちは"}],
+        }
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_reply_message_http_error(self, mock_sleep):
+        with StubServer(lambda req: StubResponse(status=400)) as server, pytest.raises(MessagingException):
+            _run(server, lambda client: client.reply_message("reply-token", "こんにちは"))
+
+    def test_push_message_success(self):
+        with StubServer() as server:
+            _run(server, lambda client: client.push_message("U1", "おはよう"))
+
+        assert server.requests[0].path == "/v2/bot/message/push"
+        assert json.loads(server.requests[0].body)["to"] == "U1"
+
+    def test_multicast_splits_recipients(self):
+        user_ids = [f"U{i}" for i in range(1201)]
+        with StubServer() as server:
+            failed = _run(server, lambda client: client.multicast_message(user_ids, "おはよう"))
+
+        assert failed == []
+        sizes = sorted(len(json.loads(request.body)["to"]) for request in server.requests)
+        assert sizes == [201, 500, 500]
+        assert {request.path for request in server.requests} == {"/v2/bot/message/multicast"}
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_multicast_failed_chunk_returned(self, mock_sleep):
+        def responder(request):
+            return StubResponse(status=500) if "U0" in json.loads(request.body)["to"] else StubResponse()
+
+        user_ids = [f"U{i}" for i in range(600)]
+        with StubServer(responder) as server:
+            failed = _run(server, lambda client: client.multicast_message(user_ids, "おはよう"))
+
+        assert failed == user_ids[:500]
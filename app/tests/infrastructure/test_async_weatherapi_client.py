@@ -0,0 +1,94 @@
+import asyncio
+import json
+from array import array
+from unittest.mock import AsyncMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from domain.value_objects.weather_series import TemperatureSeries
+from infrastructure.exceptions import WeatherAPIException
+from infrastructure.http.async_client import create_async_client
+from infrastructure.weatherapi.async_client import AsyncWeatherApiClient
+from infrastructure.weatherapi.client import parse_hourly_weather
+from tests.infrastructure.test_weatherapi_client import _forecast_body
+from tests.stub_server import StubResponse, StubServer
+
+SAMPLE_RESPONSE = {
+    "forecast": {
+        "forecastday": [
+            {
+                "hour": [
+                    {"time": "2026-02-03 09:00", "temp_c": 8.5},
+                    {"time": "2026-02-03 10:00", "temp_c": 9.0},
+                ]
+            }
+        ]
+    }
+}
+
+
+def _get_hourly_weather(server: StubServer, lat: float, lon: float) -> TemperatureSeries:
+    async def run() -> TemperatureSeries:
+        async with create_async_client() as http:
+            client = AsyncWeatherApiClient(api_key="test-api-key", client=http)
+            return await client.get_hourly_weather(lat, lon)
+
+    with patch.object(AsyncWeatherApiClient, "BASE_URL", f"{server.url}/v1/forecast.json"):
+        return asyncio.run(run())
+
+
+class TestAsyncWeatherApiClient:
+    def test_get_hourly_weather_success(self):
+        with StubServer(lambda req: StubResponse(body=SAMPLE_RESPONSE)) as server:
+            result = _get_hourly_weather(server, 35.6619, 139.7041)
+
+        assert result == TemperatureSeries(array("b", [9, 10]), array("d", [8.5, 9.0]))
+        query = parse_qs(urlparse(server.requests[0].path).query)
+        assert query["q"] == ["35.6619,139.7041"]
+        assert query["key"] == ["test-api-key"]
+
+    def test_get_hourly_weather_empty_forecast(self):
+        with StubServer(lambda req: StubResponse(body={"forecast": {"forecastday": []}})) as server:
+            assert _get_hourly_weather(server, 35.6619, 139.7041) == TemperatureSeries()
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_get_hourly_weather_http_error(self, mock_sleep):
+        with (
+            StubServer(lambda req: StubResponse(status=500, body={"error": "boom"})) as server,
+            pytest.raises(WeatherAPIException),
+        ):
+            _get_hourly_weather(server, 35.6619, 139.7041)
+
+        assert server.request_count == 3
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_get_hourly_weather_retries_then_succeeds(self, mock_sleep):
+        responses = iter([StubResponse(status=503), StubResponse(body=SAMPLE_RESPONSE)])
+        with StubServer(lambda req: next(responses)) as server:
+            result = _get_hourly_weather(server, 35.6619, 139.7041)
+
+        assert len(result) == 2
+        mock_sleep.assert_awaited_once()
+
+
+class TestAsyncWeatherApiClientLean:
+    def test_streams_minimal_response(self):
+        body = _forecast_body()
+
+        async def run() -> TemperatureSeries:
+            async with create_async_client() as http:
+                return await AsyncWeatherApiClient(api_key="test-api-key", client=http, lean=True).get_hourly_weather(
+                    35.6619, 139.7041
+                )
+
+        with (
+            StubServer(lambda req: StubResponse(body=body)) as server,
+            patch.object(AsyncWeatherApiClient, "BASE_URL", f"{server.url}/v1/forecast.json"),
+        ):
+            result = asyncio.run(run())
+
+        assert result == parse_hourly_weather(json.loads(body))
+        query = parse_qs(urlparse(server.requests[0].path).query)
+        assert "lang" not in query
+        assert query["days"] == ["1"]
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from domain.value_objects.broadcast_shard import BroadcastRunProgress
+from infrastructure.dynamodb.broadcast_run_repository import DynamoDBBroadcastRunRepository
+
+NOW = 1_770_000_000
+
+
+def _conditional_check_failed() -> ClientError:
+    return ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}}, "UpdateItem")
+
+
+class TestDynamoDBBroadcastRunRepository:
+    @patch("infrastructure.dynamodb.broadcast_run_repository.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_table = MagicMock()
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = self.mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+        self.repo = DynamoDBBroadcastRunRepository(table_name="test-runs", ttl_seconds=3600, timer=lambda: NOW)
+
+    def test_start_run(self):
+        self.repo.start_run("run-1", 8)
+
+        item = self.mock_table.put_item.call_args.kwargs["Item"]
+        assert item == {
+            "runId": "run-1",
+            "shardCount": 8,
+            "successCount": 0,
+            "failureCount": 0,
+            "expiresAt": NOW + 3600,
+        }
+
+    def test_record_shard_result(self):
+        self.mock_table.update_item.return_value = {
+            "Attributes": {
+                "runId": "run-1",
+                "shardCount": 8,
+                "successCount": 15,
+                "failureCount": 1,
+                "completedShards": {0, 3},
+            }
+        }
+
+        progress = self.repo.record_shard_result("run-1", 3, 10, 1)
+
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        assert kwargs["Key"] == {"runId": "run-1"}
+        assert kwargs["ExpressionAttributeValues"] == {":success": 10, ":failure": 1, ":shards": {3}, ":shard": 3}
+        assert "NOT contains(completedShards, :shard)" in kwargs["ConditionExpression"]
+        assert progress == BroadcastRunProgress("run-1", 8, 2, 15, 1)
+
+    def test_record_same_shard_twice_returns_current_progress(self):
+        self.mock_table.update_item.side_effect = _conditional_check_failed()
+        self.mock_table.get_item.return_value = {
+            "Item": {"runId": "run-1", "shardCount": 2, "successCount": 5, "failureCount": 0, "completedShards": {0}}
+        }
+
+        progress = self.repo.record_shard_result("run-1", 0, 5, 0)
+
+        assert progress == BroadcastRunProgress("run-1", 2, 1, 5, 0)
+        self.mock_table.update_item.assert_called_once()
+
+    def test_record_unknown_run_raises(self):
+        self.mock_table.update_item.side_effect = _conditional_check_failed()
+        self.mock_table.get_item.return_value = {}
+
+        with pytest.raises(ValueError, match="run-9"):
+            self.repo.record_shard_result("run-9", 0, 1, 0)
+
+    def test_start_run_keeps_existing_run(self):
+        self.mock_table.put_item.side_effect = _conditional_check_failed()
+
+        self.repo.start_run("run-1", 8)
+
+        assert self.mock_table.put_item.call_args.kwargs["ConditionExpression"] == "attribute_not_exists(runId)"
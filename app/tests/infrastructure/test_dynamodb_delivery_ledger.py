@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+from domain.value_objects.delivery_checkpoint import DeliveryCheckpoint
+from infrastructure.dynamodb.delivery_ledger import DynamoDBDeliveryLedger
+
+NOW = 1_770_000_000
+
+
+class TestDynamoDBDeliveryLedger:
+    @patch("infrastructure.dynamodb.delivery_ledger.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_table = MagicMock()
+        self.mock_batch = self.mock_table.batch_writer.return_value.__enter__.return_value
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = self.mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+        self.ledger = DynamoDBDeliveryLedger(table_name="test-ledger", flush_size=3, ttl_seconds=60, timer=lambda: NOW)
+
+    def _written(self) -> list[dict]:
+        return [call.kwargs["Item"] for call in self.mock_batch.put_item.call_args_list]
+
+    def test_load_paginates_and_splits_entries(self):
+        self.mock_table.query.side_effect = [
+            {"Items": [{"entryKey": "user#U1"}, {"entryKey": "group#35.6619#139.7041"}], "LastEvaluatedKey": {"k": 1}},
+            {"Items": [{"entryKey": "user#U2"}]},
+        ]
+
+        checkpoint = self.ledger.load("2026-02-03")
+
+        assert checkpoint == DeliveryCheckpoint(
+            delivered_user_ids=frozenset({"U1", "U2"}),
+            completed_groups=frozenset({"35.6619#139.7041"}),
+        )
+        assert self.mock_table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"k": 1}
+
+    def test_records_are_buffered_until_flush_size(self):
+        self.ledger.record_delivered("2026-02-03", ["U1", "U2"])
+        assert self.mock_batch.put_item.call_count == 0
+
+        self.ledger.record_group_completed("2026-02-03", "35.6619#139.7041")
+
+        assert self._written() == [
+            {"runDate": "2026-02-03", "entryKey": "user#U1", "expiresAt": NOW + 60},
+            {"runDate": "2026-02-03", "entryKey": "user#U2", "expiresAt": NOW + 60},
+            {"runDate": "2026-02-03", "entryKey": "group#35.6619#139.7041", "expiresAt": NOW + 60},
+        ]
+        assert self.ledger.write_count == 3
+
+    def test_flush_writes_remaining_records(self):
+        self.ledger.record_delivered("2026-02-03", ["U1"])
+
+        self.ledger.flush()
+        self.ledger.flush()
+
+        assert [item["entryKey"] for item in self._written()] == ["user#U1"]
+        self.mock_table.batch_writer.assert_called_once_with(overwrite_by_pkeys=["runDate", "entryKey"])
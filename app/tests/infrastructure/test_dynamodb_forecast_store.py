@@ -0,0 +1,55 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from domain.value_objects.weather import Weather
+from infrastructure.dynamodb.forecast_store import DynamoDBForecastStore
+
+NOW = 1_770_000_000
+
+
+class TestDynamoDBForecastStore:
+    @patch("infrastructure.dynamodb.forecast_store.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_table = MagicMock()
+        self.mock_batch = self.mock_table.batch_writer.return_value.__enter__.return_value
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = self.mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+        self.store = DynamoDBForecastStore(table_name="test-forecasts", ttl_seconds=60, timer=lambda: NOW)
+
+    def test_save(self):
+        self.store.save("2026-02-03", {"35.66,139.7#渋谷区": Weather(max_temp=25.3, min_temp=18.0, pop=40)})
+
+        self.mock_table.batch_writer.assert_called_once_with(overwrite_by_pkeys=["runDate", "forecastKey"])
+        self.mock_batch.put_item.assert_called_once_with(
+            Item={
+                "runDate": "2026-02-03",
+                "forecastKey": "35.66,139.7#渋谷区",
+                "maxTemp": Decimal("25.3"),
+                "minTemp": Decimal("18.0"),
+                "pop": 40,
+                "expiresAt": NOW + 60,
+            }
+        )
+
+    def test_load_paginates(self):
+        self.mock_table.query.side_effect = [
+            {
+                "Items": [{"forecastKey": "a#渋谷区", "maxTemp": Decimal("25.3"), "minTemp": Decimal("18"), "pop": 40}],
+                "LastEvaluatedKey": {"k": 1},
+            },
+            {"Items": [{"forecastKey": "b#新宿区", "maxTemp": Decimal("20"), "minTemp": Decimal("10.5"), "pop": 0}]},
+        ]
+
+        forecasts = self.store.load("2026-02-03")
+
+        assert forecasts == {
+            "a#渋谷区": Weather(max_temp=25.3, min_temp=18.0, pop=40),
+            "b#新宿区": Weather(max_temp=20.0, min_temp=10.5, pop=0),
+        }
+        assert self.mock_table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"k": 1}
+
+    def test_load_empty(self):
+        self.mock_table.query.return_value = {"Items": []}
+
+        assert self.store.load("2026-02-03") == {}
@@ -0,0 +1,59 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from infrastructure.dynamodb.geocoding_cache_store import DynamoDBGeocodingCacheStore
+from infrastructure.gsi.geocoding_cache import GeocodingOutcome
+
+NOW = 1_770_000_000
+
+
+class TestDynamoDBGeocodingCacheStore:
+    @patch("infrastructure.dynamodb.geocoding_cache_store.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_table = MagicMock()
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = self.mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+        self.store = DynamoDBGeocodingCacheStore(table_name="test-cache", ttl_seconds=3600, timer=lambda: NOW)
+
+    def test_put_found(self):
+        self.store.put("渋谷区", GeocodingOutcome.found((35.6619, 139.7041, "東京都渋谷区")))
+
+        item = self.mock_table.put_item.call_args.kwargs["Item"]
+        assert item["query"] == "渋谷区"
+        assert item["status"] == "found"
+        assert item["lat"] == Decimal("35.6619")
+        assert item["cityName"] == "東京都渋谷区"
+        assert item["expiresAt"] == NOW + 3600
+
+    def test_get_ambiguous(self):
+        self.mock_table.get_item.return_value = {
+            "Item": {
+                "query": "府中市",
+                "status": "ambiguous",
+                "lat": Decimal("0"),
+                "lon": Decimal("0"),
+                "cityName": "",
+                "message": "複数の候補があります: 府中市",
+                "candidates": ["東京都府中市", "広島県府中市"],
+                "expiresAt": Decimal(NOW + 1),
+            }
+        }
+
+        outcome = self.store.get("府中市")
+
+        assert outcome is not None
+        assert outcome.status == "ambiguous"
+        assert outcome.candidates == ["東京都府中市", "広島県府中市"]
+
+    def test_get_expired_returns_none(self):
+        self.mock_table.get_item.return_value = {
+            "Item": {"query": "渋谷区", "status": "found", "expiresAt": Decimal(NOW)}
+        }
+
+        assert self.store.get("渋谷区") is None
+
+    def test_get_missing_returns_none(self):
+        self.mock_table.get_item.return_value = {}
+
+        assert self.store.get("渋谷区") is None
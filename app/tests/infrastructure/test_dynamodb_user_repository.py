@@ -1,7 +1,12 @@
+import threading
+import time
 from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
+import pytest
+from botocore.exceptions import ClientError
+
 from domain.entities.user import User
 from domain.value_objects.location import Location
 from infrastructure.dynamodb.user_repository import DynamoDBUserRepository
@@ -55,3 +60,465 @@ class TestDynamoDBUserRepository:
         user = self.repo.find_by_id("U9999")
 
         assert user is None
+
+    def test_iter_users_paginates(self):
+        def _item(user_id: str) -> dict:
+            return {
+                "userId": user_id,
+                "lat": Decimal("35.6619"),
+                "lon": Decimal("139.7041"),
+                "cityName": "渋谷区",
+                "createdAt": "2026-01-31T00:00:00+00:00",
+                "updatedAt": "2026-01-31T00:00:00+00:00",
+            }
+
+        self.mock_table.scan.side_effect = [
+            {"Items": [_item("U1"), _item("U2")], "LastEvaluatedKey": {"userId": "U2"}},
+            {"Items": [_item("U3")]},
+        ]
+
+        users = self.repo.iter_users()
+
+        assert next(users).user_id == "U1"
+        assert self.mock_table.scan.call_count == 1
+        assert [user.user_id for user in users] == ["U2", "U3"]
+        assert self.mock_table.scan.call_args_list[1].kwargs == {"ExclusiveStartKey": {"userId": "U2"}}
+
+    @patch("utils.retry.time.sleep")
+    def test_iter_users_retries_failed_page_only(self, mock_sleep):
+        self.mock_table.scan.side_effect = [
+            {"Items": [], "LastEvaluatedKey": {"userId": "U2"}},
+            RuntimeError("ProvisionedThroughputExceededException"),
+            {"Items": []},
+        ]
+
+        assert list(self.repo.iter_users()) == []
+
+        assert self.mock_table.scan.call_count == 3
+        assert self.mock_table.scan.call_args_list[2].kwargs == {"ExclusiveStartKey": {"userId": "U2"}}
+
+    def test_get_all_users(self):
+        self.mock_table.scan.return_value = {
+            "Items": [
+                {
+                    "userId": "U1",
+                    "lat": Decimal("35.6619"),
+                    "lon": Decimal("139.7041"),
+                    "cityName": "渋谷区",
+                    "createdAt": "2026-01-31T00:00:00+00:00",
+                    "updatedAt": "2026-01-31T00:00:00+00:00",
+                }
+            ]
+        }
+
+        users = self.repo.get_all_users()
+
+        assert [user.user_id for user in users] == ["U1"]
+
+
+class TestDynamoDBUserRepositoryParallelScan:
+    @patch("infrastructure.dynamodb.user_repository.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_table = MagicMock()
+        self.mock_client = self.mock_table.meta.client
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = self.mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+        self.repo = DynamoDBUserRepository(table_name="test-table", total_segments=3)
+
+    @staticmethod
+    def _item(user_id: str) -> dict:
+        return {
+            "userId": user_id,
+            "lat": Decimal("35.6619"),
+            "lon": Decimal("139.7041"),
+            "cityName": "渋谷区",
+            "createdAt": "2026-01-31T00:00:00+00:00",
+            "updatedAt": "2026-01-31T00:00:00+00:00",
+        }
+
+    def test_invalid_total_segments(self):
+        with pytest.raises(ValueError):
+            DynamoDBUserRepository(table_name="test-table", total_segments=0)
+
+    def test_iter_users_merges_all_segments(self):
+        pages = {
+            (0, None): {"Items": [self._item("U1")], "LastEvaluatedKey": {"userId": "U1"}},
+            (0, "U1"): {"Items": [self._item("U2")]},
+            (1, None): {"Items": []},
+            (2, None): {"Items": [self._item("U3"), self._item("U4")]},
+        }
+
+        def scan(**kwargs):
+            start = kwargs.get("ExclusiveStartKey", {}).get("userId")
+            return pages[(kwargs["Segment"], start)]
+
+        self.mock_client.scan.side_effect = scan
+
+        users = list(self.repo.iter_users())
+
+        assert sorted(user.user_id for user in users) == ["U1", "U2", "U3", "U4"]
+        assert users[0].location.latitude == 35.6619
+        assert self.mock_client.scan.call_count == 4
+        assert {call.kwargs["TotalSegments"] for call in self.mock_client.scan.call_args_list} == {3}
+        assert {call.kwargs["TableName"] for call in self.mock_client.scan.call_args_list} == {"test-table"}
+        self.mock_table.scan.assert_not_called()
+
+    @patch("utils.retry.time.sleep")
+    def test_iter_users_retries_failed_segment_page_only(self, mock_sleep):
+        attempts: dict[int, int] = {}
+        lock = threading.Lock()
+
+        def scan(**kwargs):
+            segment = kwargs["Segment"]
+            with lock:
+                attempts[segment] = attempts.get(segment, 0) + 1
+                attempt = attempts[segment]
+            if segment == 1 and attempt == 1:
+                raise RuntimeError("ProvisionedThroughputExceededException")
+            return {"Items": [self._item(f"U{segment}")]}
+
+        self.mock_client.scan.side_effect = scan
+
+        users = list(self.repo.iter_users())
+
+        assert sorted(user.user_id for user in users) == ["U0", "U1", "U2"]
+        assert attempts == {0: 1, 1: 2, 2: 1}
+
+    @patch("utils.retry.time.sleep")
+    def test_iter_users_raises_segment_error(self, mock_sleep):
+        def scan(**kwargs):
+            if kwargs["Segment"] == 2:
+                raise RuntimeError("AccessDenied")
+            return {"Items": []}
+
+        self.mock_client.scan.side_effect = scan
+
+        with pytest.raises(RuntimeError, match="AccessDenied"):
+            list(self.repo.iter_users())
+
+    def test_iter_users_stops_workers_when_closed(self):
+        def scan(**kwargs):
+            return {"Items": [self._item("U1")], "LastEvaluatedKey": {"userId": "U1"}}
+
+        self.mock_client.scan.side_effect = scan
+
+        users = self.repo.iter_users()
+        assert next(users).user_id == "U1"
+        # 無限にページが続くセグメントでも、読み込み中断でワーカーが終了すること
+        users.close()
+
+        calls = self.mock_client.scan.call_count
+        time.sleep(0.3)
+        assert self.mock_client.scan.call_count == calls
+
+
+class TestDynamoDBUserRepositoryShard:
+    @patch("infrastructure.dynamodb.user_repository.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_table = MagicMock()
+        self.mock_client = self.mock_table.meta.client
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = self.mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+        self.mock_boto3 = mock_boto3
+
+    def _repo(self, **kwargs) -> DynamoDBUserRepository:
+        with patch("infrastructure.dynamodb.user_repository.boto3", self.mock_boto3):
+            return DynamoDBUserRepository(table_name="test-table", **kwargs)
+
+    def test_invalid_shard_index(self):
+        with pytest.raises(ValueError, match="shard_index"):
+            self._repo(shard_index=4, shard_count=4)
+
+    def test_iter_users_scans_only_shard_segments(self):
+        self.mock_client.scan.return_value = {"Items": []}
+
+        list(self._repo(total_segments=2, shard_index=1, shard_count=3).iter_users())
+
+        calls = self.mock_client.scan.call_args_list
+        assert sorted(call.kwargs["Segment"] for call in calls) == [2, 3]
+        assert {call.kwargs["TotalSegments"] for call in calls} == {6}
+
+    def test_iter_users_single_segment_shard(self):
+        self.mock_client.scan.return_value = {"Items": []}
+
+        list(self._repo(shard_index=2, shard_count=4).iter_users())
+
+        assert self.mock_client.scan.call_args.kwargs["Segment"] == 2
+        assert self.mock_client.scan.call_args.kwargs["TotalSegments"] == 4
+        self.mock_table.scan.assert_not_called()
+
+    def test_iter_location_groups_scans_shard_segment(self):
+        self.mock_table.scan.return_value = {"Items": []}
+
+        list(self._repo(locations_table_name="test-locations", shard_index=1, shard_count=4).iter_location_groups())
+
+        assert self.mock_table.scan.call_args.kwargs == {"Segment": 1, "TotalSegments": 4}
+
+
+class TestDynamoDBUserRepositoryLocationIndex:
+    @patch("infrastructure.dynamodb.user_repository.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_table = MagicMock()
+        self.mock_locations_table = MagicMock()
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.side_effect = lambda name: {
+            "test-table": self.mock_table,
+            "test-locations": self.mock_locations_table,
+        }[name]
+        mock_boto3.resource.return_value = mock_dynamodb
+        self.repo = DynamoDBUserRepository(table_name="test-table", locations_table_name="test-locations")
+
+    @staticmethod
+    def _user(lat: float, lon: float) -> User:
+        location = Location(city_name="渋谷区", latitude=lat, longitude=lon)
+        return User(user_id="U1234", location=location)
+
+    def _transact_items(self) -> list[dict]:
+        self.mock_table.meta.client.transact_write_items.assert_called_once()
+        return self.mock_table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+
+    def test_save_new_user_increments_location(self):
+        self.mock_table.get_item.return_value = {}
+
+        self.repo.save(self._user(35.6619, 139.7041))
+
+        put, update = self._transact_items()
+        assert put["Put"]["TableName"] == "test-table"
+        assert put["Put"]["Item"]["locationKey"] == "35.6619#139.7041"
+        assert put["Put"]["ConditionExpression"] == "attribute_not_exists(locationKey)"
+        assert update["Update"]["TableName"] == "test-locations"
+        assert update["Update"]["Key"] == {"locationKey": "35.6619#139.7041"}
+        assert update["Update"]["ExpressionAttributeValues"][":delta"] == 1
+        assert update["Update"]["ExpressionAttributeValues"][":city"] == "渋谷区"
+        self.mock_table.put_item.assert_not_called()
+        self.mock_locations_table.delete_item.assert_not_called()
+
+    def test_save_same_location_does_not_touch_locations(self):
+        self.mock_table.get_item.return_value = {"Item": {"locationKey": "35.6619#139.7041"}}
+
+        self.repo.save(self._user(35.6619, 139.7041))
+
+        kwargs = self.mock_table.put_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "locationKey = :old"
+        self.mock_table.meta.client.transact_write_items.assert_not_called()
+        self.mock_locations_table.update_item.assert_not_called()
+
+    def test_save_moved_user_moves_count(self):
+        self.mock_table.get_item.return_value = {"Item": {"locationKey": "34.6937#135.5023"}}
+
+        self.repo.save(self._user(35.6619, 139.7041))
+
+        put, *updates = self._transact_items()
+        assert put["Put"]["ExpressionAttributeValues"] == {":old": "34.6937#135.5023"}
+        assert [
+            (u["Update"]["Key"]["locationKey"], u["Update"]["ExpressionAttributeValues"][":delta"]) for u in updates
+        ] == [("35.6619#139.7041", 1), ("34.6937#135.5023", -1)]
+        # 元の地点はユーザー数が0以下の場合のみ削除する
+        kwargs = self.mock_locations_table.delete_item.call_args.kwargs
+        assert kwargs["Key"] == {"locationKey": "34.6937#135.5023"}
+        assert kwargs["ConditionExpression"] == "userCount <= :zero"
+
+    def test_save_keeps_location_with_remaining_users(self):
+        self.mock_table.get_item.return_value = {"Item": {"locationKey": "34.6937#135.5023"}}
+        self.mock_locations_table.delete_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "DeleteItem"
+        )
+
+        self.repo.save(self._user(35.6619, 139.7041))
+
+        self.mock_locations_table.delete_item.assert_called_once()
+
+    @patch("utils.retry.time.sleep")
+    def test_save_retries_whole_transaction(self, mock_sleep):
+        self.mock_table.get_item.return_value = {}
+        self.mock_table.meta.client.transact_write_items.side_effect = [
+            ClientError({"Error": {"Code": "TransactionCanceledException"}}, "TransactWriteItems"),
+            {},
+        ]
+
+        self.repo.save(self._user(35.6619, 139.7041))
+
+        # 失敗した試行は何も書き込まないため、リトライでも地点のユーザー数を付け替える
+        calls = self.mock_table.meta.client.transact_write_items.call_args_list
+        assert len(calls) == 2
+        assert calls[0].kwargs == calls[1].kwargs
+        assert self.mock_table.get_item.call_count == 2
+
+    def test_save_without_locations_table_keeps_single_put(self):
+        with patch("infrastructure.dynamodb.user_repository.boto3"):
+            repo = DynamoDBUserRepository(table_name="test-table")
+        repo.save(self._user(35.6619, 139.7041))
+
+        kwargs = repo.table.put_item.call_args.kwargs
+        assert "ReturnValues" not in kwargs
+        assert kwargs["Item"]["locationKey"] == "35.6619#139.7041"
+
+    def test_iter_location_groups(self):
+        self.mock_locations_table.scan.side_effect = [
+            {
+                "Items": [
+                    {
+                        "locationKey": "35.6619#139.7041",
+                        "lat": Decimal("35.6619"),
+                        "lon": Decimal("139.7041"),
+                        "cityName": "渋谷区",
+                        "userCount": Decimal("3"),
+                    }
+                ],
+                "LastEvaluatedKey": {"locationKey": "35.6619#139.7041"},
+            },
+            {
+                "Items": [
+                    {
+                        "locationKey": "34.6937#135.5023",
+                        "lat": Decimal("34.6937"),
+                        "lon": Decimal("135.5023"),
+                        "cityName": "大阪市",
+                        "userCount": Decimal("0"),
+                    }
+                ]
+            },
+        ]
+
+        def query(**kwargs):
+            if "ExclusiveStartKey" in kwargs:
+                return {"Items": [{"userId": "U3"}]}
+            if kwargs["KeyConditionExpression"].get_expression()["values"][1] == "34.6937#135.5023":
+                return {"Items": []}
+            return {"Items": [{"userId": "U1"}, {"userId": "U2"}], "LastEvaluatedKey": {"userId": "U2"}}
+
+        self.mock_table.query.side_effect = query
+
+        groups = list(self.repo.iter_location_groups())
+
+        assert len(groups) == 1
+        assert groups[0].location == Location(city_name="渋谷区", latitude=35.6619, longitude=139.7041)
+        assert groups[0].user_ids == ("U1", "U2", "U3")
+        assert {c.kwargs["IndexName"] for c in self.mock_table.query.call_args_list} == {"LocationIndex"}
+        # ユーザー数が0の地点は LocationIndex を問い合わせない
+        assert self.mock_table.query.call_count == 2
+        self.mock_table.scan.assert_not_called()
+
+    def test_iter_location_groups_requires_locations_table(self):
+        with patch("infrastructure.dynamodb.user_repository.boto3"):
+            repo = DynamoDBUserRepository(table_name="test-table")
+
+        with pytest.raises(ValueError):
+            list(repo.iter_location_groups())
+
+    def test_rebuild_location_index(self):
+        self.mock_table.scan.return_value = {
+            "Items": [
+                {"userId": "U1", "lat": Decimal("35.6619"), "lon": Decimal("139.7041"), "cityName": "渋谷区"},
+                {
+                    "userId": "U2",
+                    "lat": Decimal("35.6619"),
+                    "lon": Decimal("139.7041"),
+                    "cityName": "渋谷区",
+                    "locationKey": "35.6619#139.7041",
+                },
+            ]
+        }
+        self.mock_locations_table.scan.return_value = {"Items": [{"locationKey": "1.0#2.0"}]}
+        batch = self.mock_locations_table.batch_writer.return_value.__enter__.return_value
+
+        assert self.repo.rebuild_location_index() == 1
+
+        self.mock_table.update_item.assert_called_once()
+        assert self.mock_table.update_item.call_args.kwargs["Key"] == {"userId": "U1"}
+        batch.put_item.assert_called_once_with(
+            Item={
+                "locationKey": "35.6619#139.7041",
+                "lat": Decimal("35.6619"),
+                "lon": Decimal("139.7041"),
+                "cityName": "渋谷区",
+                "userCount": 2,
+            }
+        )
+        batch.delete_item.assert_called_once_with(Key={"locationKey": "1.0#2.0"})
+
+
+class TestDynamoDBUserRepositoryLocationIndexMoto:
+    """moto の DynamoDB に対する地点テーブルの整合性"""
+
+    @pytest.fixture(autouse=True)
+    def tables(self, monkeypatch):
+        moto = pytest.importorskip("moto")
+        import boto3
+
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-northeast-1")
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        with moto.mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            dynamodb.create_table(
+                TableName="users",
+                KeySchema=[{"AttributeName": "userId", "KeyType": "HASH"}],
+                AttributeDefinitions=[
+                    {"AttributeName": "userId", "AttributeType": "S"},
+                    {"AttributeName": "locationKey", "AttributeType": "S"},
+                ],
+                GlobalSecondaryIndexes=[
+                    {
+                        "IndexName": "LocationIndex",
+                        "KeySchema": [
+                            {"AttributeName": "locationKey", "KeyType": "HASH"},
+                            {"AttributeName": "userId", "KeyType": "RANGE"},
+                        ],
+                        "Projection": {"ProjectionType": "KEYS_ONLY"},
+                    }
+                ],
+                BillingMode="PAY_PER_REQUEST",
+            )
+            dynamodb.create_table(
+                TableName="locations",
+                KeySchema=[{"AttributeName": "locationKey", "KeyType": "HASH"}],
+                AttributeDefinitions=[{"AttributeName": "locationKey", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST",
+            )
+            self.repo = DynamoDBUserRepository(table_name="users", locations_table_name="locations")
+            self.locations_table = dynamodb.Table("locations")
+            yield
+
+    @staticmethod
+    def _user(user_id: str, city_name: str, lat: float, lon: float) -> User:
+        return User(user_id=user_id, location=Location(city_name=city_name, latitude=lat, longitude=lon))
+
+    def _location_counts(self) -> dict[str, int]:
+        return {item["locationKey"]: int(item["userCount"]) for item in self.locations_table.scan()["Items"]}
+
+    @patch("utils.retry.time.sleep")
+    def test_save_retries_after_failed_location_update(self, mock_sleep):
+        failures = []
+
+        def fail_once(**kwargs):
+            if not failures:
+                failures.append(kwargs)
+                raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "TransactWriteItems")
+
+        events = self.repo.table.meta.client.meta.events
+        events.register("before-call.dynamodb.TransactWriteItems", fail_once)
+
+        self.repo.save(self._user("U1", "渋谷区", 35.6619, 139.7041))
+
+        assert len(failures) == 1
+        assert self._location_counts() == {"35.6619#139.7041": 1}
+        groups = list(self.repo.iter_location_groups())
+        assert [(g.location.city_name, g.user_ids) for g in groups] == [("渋谷区", ("U1",))]
+
+    def test_save_moved_user_deletes_empty_location(self):
+        self.repo.save(self._user("U1", "渋谷区", 35.6619, 139.7041))
+        self.repo.save(self._user("U2", "大阪市", 34.6937, 135.5023))
+        self.repo.save(self._user("U3", "大阪市", 34.6937, 135.5023))
+
+        self.repo.save(self._user("U1", "大阪市", 34.6937, 135.5023))
+        self.repo.save(self._user("U2", "渋谷区", 35.6619, 139.7041))
+        self.repo.save(self._user("U2", "渋谷区", 35.6619, 139.7041))
+
+        assert self._location_counts() == {"34.6937#135.5023": 2, "35.6619#139.7041": 1}
+        self.repo.save(self._user("U2", "大阪市", 34.6937, 135.5023))
+        assert self._location_counts() == {"34.6937#135.5023": 3}
+        groups = list(self.repo.iter_location_groups())
+        assert [(g.location.city_name, sorted(g.user_ids)) for g in groups] == [("大阪市", ["U1", "U2", "U3"])]
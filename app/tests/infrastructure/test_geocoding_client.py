@@ -7,15 +7,17 @@ from infrastructure.exceptions import (
     GeocodingAPIException,
     GeocodingNotFoundException,
 )
+from infrastructure.gsi.geocoding_cache import GeocodingOutcome
 from infrastructure.gsi.geocoding_client import GsiGeocodingClient
+from utils.cache import TTLCache
 
 
 class TestGsiGeocodingClient:
     def setup_method(self):
-        self.client = GsiGeocodingClient()
+        self.session = MagicMock()
+        self.client = GsiGeocodingClient(session=self.session)
 
-    @patch("infrastructure.gsi.geocoding_client.requests.get")
-    def test_get_coordinates_success(self, mock_get):
+    def test_get_coordinates_success(self):
         mock_response = MagicMock()
         mock_response.json.return_value = [
             {
@@ -24,27 +26,25 @@ class TestGsiGeocodingClient:
             }
         ]
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         lat, lon, name = self.client.get_coordinates("渋谷区")
 
         assert lat == 35.6619
         assert lon == 139.7041
         assert name == "東京都渋谷区"
-        mock_get.assert_called_once()
+        self.session.get.assert_called_once()
 
-    @patch("infrastructure.gsi.geocoding_client.requests.get")
-    def test_get_coordinates_not_found(self, mock_get):
+    def test_get_coordinates_not_found(self):
         mock_response = MagicMock()
         mock_response.json.return_value = []
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         with pytest.raises(GeocodingNotFoundException):
             self.client.get_coordinates("あああ")
 
-    @patch("infrastructure.gsi.geocoding_client.requests.get")
-    def test_get_coordinates_no_city_match(self, mock_get):
+    def test_get_coordinates_no_city_match(self):
         mock_response = MagicMock()
         mock_response.json.return_value = [
             {
@@ -53,13 +53,12 @@ class TestGsiGeocodingClient:
             }
         ]
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         with pytest.raises(GeocodingNotFoundException):
             self.client.get_coordinates("渋谷駅")
 
-    @patch("infrastructure.gsi.geocoding_client.requests.get")
-    def test_get_coordinates_ambiguous(self, mock_get):
+    def test_get_coordinates_ambiguous(self):
         mock_response = MagicMock()
         mock_response.json.return_value = [
             {
@@ -72,7 +71,7 @@ class TestGsiGeocodingClient:
             },
         ]
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         with pytest.raises(GeocodingAmbiguousException) as exc_info:
             self.client.get_coordinates("府中市")
@@ -80,8 +79,7 @@ class TestGsiGeocodingClient:
         assert "東京都府中市" in exc_info.value.candidates
         assert "広島県府中市" in exc_info.value.candidates
 
-    @patch("infrastructure.gsi.geocoding_client.requests.get")
-    def test_get_coordinates_duplicate_titles_resolved(self, mock_get):
+    def test_get_coordinates_duplicate_titles_resolved(self):
         mock_response = MagicMock()
         mock_response.json.return_value = [
             {
@@ -94,14 +92,13 @@ class TestGsiGeocodingClient:
             },
         ]
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         lat, lon, name = self.client.get_coordinates("神奈川県川崎市")
 
         assert name == "神奈川県川崎市"
 
-    @patch("infrastructure.gsi.geocoding_client.requests.get")
-    def test_get_coordinates_filters_non_city_suffix(self, mock_get):
+    def test_get_coordinates_filters_non_city_suffix(self):
         """末尾が市区町村でない候補が除外され、1件に絞られるケース"""
         mock_response = MagicMock()
         mock_response.json.return_value = [
@@ -115,28 +112,144 @@ class TestGsiGeocodingClient:
             },
         ]
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         lat, lon, name = self.client.get_coordinates("川崎")
 
         assert name == "神奈川県川崎市"
 
-    @patch("infrastructure.gsi.geocoding_client.requests.get")
-    def test_get_coordinates_http_error(self, mock_get):
+    def test_get_coordinates_http_error(self):
         import requests
 
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("500")
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         with pytest.raises(GeocodingAPIException):
             self.client.get_coordinates("渋谷区")
 
-    @patch("infrastructure.gsi.geocoding_client.requests.get")
-    def test_get_coordinates_request_exception(self, mock_get):
+    def test_get_coordinates_request_exception(self):
         import requests
 
-        mock_get.side_effect = requests.exceptions.ConnectionError("timeout")
+        self.session.get.side_effect = requests.exceptions.ConnectionError("timeout")
 
         with pytest.raises(GeocodingAPIException):
             self.client.get_coordinates("渋谷区")
+
+
+SHIBUYA_FEATURES = [
+    {
+        "geometry": {"coordinates": [139.7041, 35.6619]},
+        "properties": {"title": "東京都渋谷区"},
+    }
+]
+
+FUCHU_FEATURES = [
+    {
+        "geometry": {"coordinates": [139.4804, 35.6762]},
+        "properties": {"title": "東京都府中市"},
+    },
+    {
+        "geometry": {"coordinates": [133.2361, 34.5679]},
+        "properties": {"title": "広島県府中市"},
+    },
+]
+
+
+class TestGsiGeocodingClientCache:
+    def setup_method(self):
+        self.session = MagicMock()
+        self.cache = TTLCache(maxsize=16, ttl=3600)
+        self.client = GsiGeocodingClient(session=self.session, cache=self.cache)
+
+    def _respond(self, features: list[dict]) -> None:
+        mock_response = MagicMock()
+        mock_response.json.return_value = features
+        mock_response.raise_for_status.return_value = None
+        self.session.get.return_value = mock_response
+
+    def test_success_cached(self):
+        self._respond(SHIBUYA_FEATURES)
+
+        first = self.client.get_coordinates("渋谷区")
+        second = self.client.get_coordinates("渋谷区")
+
+        assert first == second == (35.6619, 139.7041, "東京都渋谷区")
+        self.session.get.assert_called_once()
+        assert (self.cache.hits, self.cache.misses) == (1, 1)
+
+    def test_not_found_cached(self):
+        self._respond([])
+
+        for _ in range(2):
+            with pytest.raises(GeocodingNotFoundException, match="あああ"):
+                self.client.get_coordinates("あああ")
+
+        self.session.get.assert_called_once()
+
+    def test_ambiguous_cached_with_candidates(self):
+        self._respond(FUCHU_FEATURES)
+
+        for _ in range(2):
+            with pytest.raises(GeocodingAmbiguousException) as exc_info:
+                self.client.get_coordinates("府中市")
+            assert exc_info.value.candidates == ["東京都府中市", "広島県府中市"]
+
+        self.session.get.assert_called_once()
+
+    @patch("utils.retry.time.sleep")
+    def test_api_error_not_cached(self, mock_sleep):
+        import requests
+
+        self.session.get.side_effect = requests.exceptions.ConnectionError("timeout")
+        with pytest.raises(GeocodingAPIException):
+            self.client.get_coordinates("渋谷区")
+
+        self.session.get.side_effect = None
+        self._respond(SHIBUYA_FEATURES)
+
+        assert self.client.get_coordinates("渋谷区")[2] == "東京都渋谷区"
+        assert len(self.cache) == 1
+
+    def test_not_found_not_retried(self):
+        self._respond([])
+
+        with pytest.raises(GeocodingNotFoundException):
+            self.client.get_coordinates("あああ")
+
+        self.session.get.assert_called_once()
+
+    def test_store_hit_skips_api(self):
+        store = MagicMock()
+        store.get.return_value = GeocodingOutcome.found((35.6619, 139.7041, "東京都渋谷区"))
+        client = GsiGeocodingClient(session=self.session, cache=self.cache, cache_store=store)
+
+        assert client.get_coordinates("渋谷区") == (35.6619, 139.7041, "東京都渋谷区")
+        assert client.get_coordinates("渋谷区") == (35.6619, 139.7041, "東京都渋谷区")
+
+        self.session.get.assert_not_called()
+        store.get.assert_called_once_with("渋谷区")
+        assert client.store_hits == 1
+
+    def test_store_miss_writes_back(self):
+        self._respond(FUCHU_FEATURES)
+        store = MagicMock()
+        store.get.return_value = None
+        client = GsiGeocodingClient(session=self.session, cache_store=store)
+
+        with pytest.raises(GeocodingAmbiguousException):
+            client.get_coordinates("府中市")
+
+        outcome = store.put.call_args.args[1]
+        assert outcome.status == "ambiguous"
+        assert outcome.candidates == ["東京都府中市", "広島県府中市"]
+        assert client.store_misses == 1
+
+    def test_store_error_falls_back_to_api(self):
+        self._respond(SHIBUYA_FEATURES)
+        store = MagicMock()
+        store.get.side_effect = RuntimeError("throttled")
+        store.put.side_effect = RuntimeError("throttled")
+        client = GsiGeocodingClient(session=self.session, cache_store=store)
+
+        assert client.get_coordinates("渋谷区")[2] == "東京都渋谷区"
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+import requests
+
+from infrastructure.gsi.geocoding_client import GsiGeocodingClient
+from infrastructure.http import session as http_session
+from infrastructure.http.session import close_shared_session, create_session, get_shared_session
+from infrastructure.jma.area_mapper import JmaAreaMapper
+from infrastructure.jma.client import JmaForecastClient
+from infrastructure.line.messaging_client import LineMessagingClient
+from infrastructure.weatherapi.client import WeatherApiClient
+from tests.stub_server import StubResponse, StubServer
+
+
+class TestCreateSession:
+    def test_mounts_pooled_adapter(self):
+        session = create_session(pool_connections=3, pool_maxsize=7)
+
+        adapter = session.get_adapter("https://api.line.me")
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        assert session.get_adapter("http://localhost") is adapter
+
+    def test_reuses_connection_across_calls(self):
+        with StubServer(lambda req: StubResponse(body={"ok": True})) as server:
+            session = create_session()
+            for _ in range(5):
+                session.get(f"{server.url}/ping", timeout=5).raise_for_status()
+
+        assert server.request_count == 5
+        assert server.connection_count == 1
+
+
+class TestSharedSession:
+    def setup_method(self):
+        close_shared_session()
+
+    def teardown_method(self):
+        close_shared_session()
+
+    def test_returns_same_instance(self):
+        assert get_shared_session() is get_shared_session()
+
+    @patch.dict("os.environ", {"HTTP_POOL_MAXSIZE": "32"})
+    def test_pool_size_from_env(self):
+        adapter = get_shared_session().get_adapter("https://api.weatherapi.com")
+        assert adapter._pool_maxsize == 32
+
+    def test_close_recreates_session(self):
+        first = get_shared_session()
+        close_shared_session()
+        assert get_shared_session() is not first
+
+    def test_clients_share_default_session(self):
+        shared = get_shared_session()
+
+        assert WeatherApiClient(api_key="key").session is shared
+        assert JmaForecastClient().session is shared
+        assert JmaAreaMapper().session is shared
+        assert GsiGeocodingClient().session is shared
+        assert LineMessagingClient(channel_access_token="token").session is shared
+
+    def test_injected_session_takes_precedence(self):
+        session = requests.Session()
+        assert WeatherApiClient(api_key="key", session=session).session is session
+        assert http_session._shared_session is None
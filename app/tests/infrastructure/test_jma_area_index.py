@@ -0,0 +1,55 @@
+from infrastructure.jma.area_index import AreaEntry, AreaIndex
+from tests.infrastructure.test_jma_area_mapper import SAMPLE_AREA_DATA
+
+
+class TestAreaIndex:
+    def test_from_area_data_resolves_codes(self):
+        index = AreaIndex.from_area_data(SAMPLE_AREA_DATA)
+
+        assert len(index) == 2
+        assert index.lookup("川崎市") == AreaEntry(
+            name="川崎市", class20_code="1410100", office_code="140000", class10_code="140010"
+        )
+
+    def test_lookup_by_suffix(self):
+        index = AreaIndex.from_area_data(SAMPLE_AREA_DATA)
+
+        entry = index.lookup("東京都渋谷区")
+
+        assert entry is not None
+        assert entry.class20_code == "1310100"
+
+    def test_lookup_not_found(self):
+        index = AreaIndex.from_area_data(SAMPLE_AREA_DATA)
+
+        assert index.lookup("存在しない市") is None
+
+    def test_first_entry_in_area_order_wins(self):
+        # 従来の線形探索と同じく、class20s の出現順で最初に一致したものを採用する
+        index = AreaIndex(
+            [
+                AreaEntry(name="中央区", class20_code="1", office_code="A", class10_code="A1"),
+                AreaEntry(name="札幌市中央区", class20_code="2", office_code="B", class10_code="B1"),
+                AreaEntry(name="中央区", class20_code="3", office_code="C", class10_code="C1"),
+            ]
+        )
+
+        entry = index.lookup("札幌市中央区")
+
+        assert entry is not None
+        assert entry.class20_code == "1"
+
+    def test_unresolvable_parent(self):
+        area_data = {
+            "offices": {},
+            "class10s": {},
+            "class15s": {},
+            "class20s": {"9999999": {"name": "孤立町", "parent": "999999"}},
+        }
+        index = AreaIndex.from_area_data(area_data)
+
+        entry = index.lookup("孤立町")
+
+        assert entry is not None
+        assert entry.office_code is None
+        assert entry.class10_code is None
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -28,72 +28,92 @@ SAMPLE_AREA_DATA = {
 
 class TestJmaAreaMapper:
     def setup_method(self):
-        self.mapper = JmaAreaMapper()
+        self.session = MagicMock()
+        self.mapper = JmaAreaMapper(session=self.session)
 
-    @patch("infrastructure.jma.area_mapper.requests.get")
-    def test_find_codes_kawasaki(self, mock_get):
+    def test_find_codes_kawasaki(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = SAMPLE_AREA_DATA
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         office_code, class10_code = self.mapper.find_codes("川崎市")
 
         assert office_code == "140000"
         assert class10_code == "140010"
 
-    @patch("infrastructure.jma.area_mapper.requests.get")
-    def test_find_codes_shibuya(self, mock_get):
+    def test_find_codes_shibuya(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = SAMPLE_AREA_DATA
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         office_code, class10_code = self.mapper.find_codes("渋谷区")
 
         assert office_code == "130000"
         assert class10_code == "130010"
 
-    @patch("infrastructure.jma.area_mapper.requests.get")
-    def test_find_codes_with_prefecture_prefix(self, mock_get):
+    def test_find_codes_with_prefecture_prefix(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = SAMPLE_AREA_DATA
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         office_code, class10_code = self.mapper.find_codes("神奈川県川崎市")
 
         assert office_code == "140000"
         assert class10_code == "140010"
 
-    @patch("infrastructure.jma.area_mapper.requests.get")
-    def test_find_codes_not_found(self, mock_get):
+    def test_find_codes_not_found(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = SAMPLE_AREA_DATA
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         with pytest.raises(JMAAPIException, match="見つかりません"):
             self.mapper.find_codes("存在しない市")
 
-    @patch("infrastructure.jma.area_mapper.requests.get")
-    def test_area_data_cached(self, mock_get):
+    def test_find_class20_code(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = SAMPLE_AREA_DATA
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
+
+        assert self.mapper.find_class20_code("川崎市") == "1410100"
+        assert self.mapper.find_class20_code("神奈川県川崎市") == "1410100"
+        with pytest.raises(JMAAPIException, match="見つかりません"):
+            self.mapper.find_class20_code("存在しない市")
+
+    def test_area_data_cached(self):
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = SAMPLE_AREA_DATA
+        self.session.get.return_value = mock_response
 
         self.mapper.find_codes("川崎市")
         self.mapper.find_codes("渋谷区")
 
         # area.json は1回だけフェッチされる
-        mock_get.assert_called_once()
+        self.session.get.assert_called_once()
 
-    @patch("infrastructure.jma.area_mapper.requests.get")
-    def test_fetch_error_raises(self, mock_get):
+    def test_fetch_error_raises(self):
         import requests
 
-        mock_get.side_effect = requests.exceptions.Timeout("timeout")
+        self.session.get.side_effect = requests.exceptions.Timeout("timeout")
 
         with pytest.raises(JMAAPIException):
             self.mapper.find_codes("川崎市")
+
+    def test_unresolvable_area_raises(self):
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {
+            "offices": {},
+            "class10s": {},
+            "class15s": {},
+            "class20s": {"9999999": {"name": "孤立町", "parent": "999999"}},
+        }
+        self.session.get.return_value = mock_response
+
+        with pytest.raises(JMAAPIException, match="特定できません"):
+            self.mapper.find_codes("孤立町")
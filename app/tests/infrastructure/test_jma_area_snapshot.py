@@ -0,0 +1,172 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from infrastructure.exceptions import JMAAPIException
+from infrastructure.jma.area_index import AreaIndex
+from infrastructure.jma.area_mapper import JmaAreaMapper
+from infrastructure.jma.area_snapshot import AreaSnapshot, load_snapshot, main, save_snapshot
+from tests.infrastructure.test_jma_area_mapper import SAMPLE_AREA_DATA
+
+NOW = 1_770_000_000.0
+DAY = 24 * 60 * 60
+
+
+def _snapshot(fetched_at: float, etag: str | None = '"v1"') -> AreaSnapshot:
+    return AreaSnapshot(
+        index=AreaIndex.from_area_data(SAMPLE_AREA_DATA),
+        etag=etag,
+        last_modified="Mon, 02 Feb 2026 00:00:00 GMT",
+        fetched_at=fetched_at,
+    )
+
+
+def _response(status_code: int = 200, etag: str = '"v2"') -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.raise_for_status.return_value = None
+    response.json.return_value = SAMPLE_AREA_DATA
+    response.headers = {"ETag": etag, "Last-Modified": "Tue, 03 Feb 2026 00:00:00 GMT"}
+    return response
+
+
+class TestAreaSnapshotFile:
+    def test_save_and_load_roundtrip(self, tmp_path):
+        path = str(tmp_path / "area_snapshot.json")
+        save_snapshot(_snapshot(NOW), path)
+
+        loaded = load_snapshot(path)
+
+        assert loaded is not None
+        assert loaded.etag == '"v1"'
+        assert loaded.fetched_at == NOW
+        assert loaded.index.entries == _snapshot(NOW).index.entries
+
+    def test_load_missing_returns_none(self, tmp_path):
+        assert load_snapshot(str(tmp_path / "missing.json")) is None
+
+    def test_load_corrupt_returns_none(self, tmp_path):
+        path = tmp_path / "area_snapshot.json"
+        path.write_text("{broken", encoding="utf-8")
+
+        assert load_snapshot(str(path)) is None
+
+    def test_load_other_version_returns_none(self, tmp_path):
+        path = tmp_path / "area_snapshot.json"
+        path.write_text('{"version": 0, "entries": []}', encoding="utf-8")
+
+        assert load_snapshot(str(path)) is None
+
+    def test_is_stale(self):
+        snapshot = _snapshot(NOW)
+
+        assert snapshot.is_stale(DAY, now=NOW + DAY - 1) is False
+        assert snapshot.is_stale(DAY, now=NOW + DAY) is True
+
+
+class TestBundledSnapshotCommand:
+    """デプロイパッケージへの同梱用スナップショットの生成"""
+
+    @patch("infrastructure.jma.area_mapper.JmaAreaMapper.download_snapshot")
+    def test_writes_snapshot(self, mock_download, tmp_path):
+        mock_download.return_value = _snapshot(NOW)
+        path = tmp_path / "area_snapshot.json"
+
+        assert main(["area_snapshot", str(path)]) == 0
+
+        assert len(load_snapshot(str(path)).index) == len(_snapshot(NOW).index)
+
+    @patch("infrastructure.jma.area_mapper.JmaAreaMapper.download_snapshot")
+    def test_download_failure_is_raised(self, mock_download, tmp_path):
+        # バンドル時に失敗させ、スナップショットのないデプロイパッケージを作らせない
+        mock_download.side_effect = JMAAPIException("気象庁area.json取得エラー")
+        path = tmp_path / "area_snapshot.json"
+
+        with pytest.raises(JMAAPIException):
+            main(["area_snapshot", str(path)])
+        assert not path.exists()
+
+    @patch("infrastructure.jma.area_mapper.JmaAreaMapper.download_snapshot")
+    def test_empty_area_data_fails(self, mock_download, tmp_path):
+        mock_download.return_value = AreaSnapshot(index=AreaIndex([]))
+        path = tmp_path / "area_snapshot.json"
+
+        assert main(["area_snapshot", str(path)]) == 1
+        assert not path.exists()
+
+
+class TestJmaAreaMapperSnapshot:
+    def setup_method(self):
+        self.session = MagicMock()
+
+    def _mapper(self, tmp_path, now: float = NOW) -> JmaAreaMapper:
+        return JmaAreaMapper(
+            session=self.session,
+            snapshot_path=str(tmp_path / "tmp" / "area_snapshot.json"),
+            bundled_snapshot_path=str(tmp_path / "bundled" / "area_snapshot.json"),
+            timer=lambda: now,
+        )
+
+    def test_cold_start_without_network_uses_bundled_snapshot(self, tmp_path):
+        save_snapshot(_snapshot(NOW - 60), str(tmp_path / "bundled" / "area_snapshot.json"))
+        self.session.get.side_effect = requests.exceptions.ConnectionError("no network")
+
+        office_code, class10_code = self._mapper(tmp_path).find_codes("川崎市")
+
+        assert (office_code, class10_code) == ("140000", "140010")
+        self.session.get.assert_not_called()
+
+    def test_stale_snapshot_survives_refresh_failure(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("utils.retry.time.sleep", lambda _: None)
+        save_snapshot(_snapshot(NOW - 2 * DAY), str(tmp_path / "bundled" / "area_snapshot.json"))
+        self.session.get.side_effect = requests.exceptions.ConnectionError("no network")
+
+        assert self._mapper(tmp_path).find_codes("渋谷区") == ("130000", "130010")
+
+    def test_stale_snapshot_not_modified(self, tmp_path):
+        save_snapshot(_snapshot(NOW - 2 * DAY), str(tmp_path / "bundled" / "area_snapshot.json"))
+        self.session.get.return_value = _response(status_code=304)
+
+        self._mapper(tmp_path).find_codes("川崎市")
+
+        headers = self.session.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 02 Feb 2026 00:00:00 GMT"
+        refreshed = load_snapshot(str(tmp_path / "tmp" / "area_snapshot.json"))
+        assert refreshed is not None
+        assert refreshed.fetched_at == NOW
+        assert refreshed.etag == '"v1"'
+
+    def test_stale_snapshot_modified(self, tmp_path):
+        save_snapshot(_snapshot(NOW - 2 * DAY), str(tmp_path / "bundled" / "area_snapshot.json"))
+        self.session.get.return_value = _response(status_code=200, etag='"v2"')
+
+        self._mapper(tmp_path).find_codes("川崎市")
+
+        refreshed = load_snapshot(str(tmp_path / "tmp" / "area_snapshot.json"))
+        assert refreshed is not None
+        assert refreshed.etag == '"v2"'
+
+    def test_tmp_snapshot_preferred_when_newer(self, tmp_path):
+        save_snapshot(_snapshot(NOW - 2 * DAY), str(tmp_path / "bundled" / "area_snapshot.json"))
+        save_snapshot(_snapshot(NOW - 60), str(tmp_path / "tmp" / "area_snapshot.json"))
+
+        self._mapper(tmp_path).find_codes("川崎市")
+
+        self.session.get.assert_not_called()
+
+    def test_no_snapshot_downloads_and_saves(self, tmp_path):
+        self.session.get.return_value = _response()
+
+        self._mapper(tmp_path).find_codes("川崎市")
+
+        self.session.get.assert_called_once()
+        assert load_snapshot(str(tmp_path / "tmp" / "area_snapshot.json")) is not None
+
+    def test_no_snapshot_and_no_network_raises(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("utils.retry.time.sleep", lambda _: None)
+        self.session.get.side_effect = requests.exceptions.ConnectionError("no network")
+
+        with pytest.raises(JMAAPIException):
+            self._mapper(tmp_path).find_codes("川崎市")
@@ -1,13 +1,14 @@
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest.mock import MagicMock, patch
-from zoneinfo import ZoneInfo
 
 import pytest
 
+from domain.value_objects.weather_series import PopSeries
 from infrastructure.exceptions import JMAAPIException
-from infrastructure.jma.client import JmaForecastClient
-
-JST = ZoneInfo("Asia/Tokyo")
+from infrastructure.jma.client import JmaForecastClient, index_pops
+from utils.cache import TTLCache
 
 SAMPLE_FORECAST_RESPONSE = [
     {
@@ -41,68 +42,60 @@ SAMPLE_FORECAST_RESPONSE = [
 
 class TestJmaForecastClient:
     def setup_method(self):
-        self.client = JmaForecastClient()
+        self.session = MagicMock()
+        self.client = JmaForecastClient(session=self.session)
 
-    @patch("infrastructure.jma.client.requests.get")
-    def test_get_pops_success(self, mock_get):
+    def test_get_pops_success(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = SAMPLE_FORECAST_RESPONSE
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         result = self.client.get_pops("140000", "140010")
 
         assert len(result) == 4
-        assert result[0]["pop"] == 10
-        assert result[0]["time"] == datetime(2026, 2, 3, 0, 0, 0, tzinfo=JST)
-        assert result[1]["pop"] == 20
-        assert result[2]["pop"] == 30
-        assert result[3]["pop"] == 40
-
-    @patch("infrastructure.jma.client.requests.get")
-    def test_get_pops_different_area(self, mock_get):
+        assert list(result.pops) == [10, 20, 30, 40]
+        assert list(result.hours) == [0, 6, 12, 18]
+
+    def test_get_pops_different_area(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = SAMPLE_FORECAST_RESPONSE
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         result = self.client.get_pops("140000", "140020")
 
         assert len(result) == 4
-        assert result[0]["pop"] == 50
+        assert result.pops[0] == 50
 
-    @patch("infrastructure.jma.client.requests.get")
-    def test_get_pops_area_not_found(self, mock_get):
+    def test_get_pops_area_not_found(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = SAMPLE_FORECAST_RESPONSE
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         with pytest.raises(JMAAPIException, match="見つかりません"):
             self.client.get_pops("140000", "999999")
 
-    @patch("infrastructure.jma.client.requests.get")
-    def test_get_pops_http_error(self, mock_get):
+    def test_get_pops_http_error(self):
         import requests
 
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("404")
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         with pytest.raises(JMAAPIException):
             self.client.get_pops("140000", "140010")
 
-    @patch("infrastructure.jma.client.requests.get")
-    def test_get_pops_timeout(self, mock_get):
+    def test_get_pops_timeout(self):
         import requests
 
-        mock_get.side_effect = requests.exceptions.Timeout("timeout")
+        self.session.get.side_effect = requests.exceptions.Timeout("timeout")
 
         with pytest.raises(JMAAPIException):
             self.client.get_pops("140000", "140010")
 
-    @patch("infrastructure.jma.client.requests.get")
-    def test_get_pops_empty_pop_string_skipped(self, mock_get):
+    def test_get_pops_empty_pop_string_skipped(self):
         response = [
             {
                 "timeSeries": [
@@ -125,9 +118,90 @@ class TestJmaForecastClient:
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = response
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         result = self.client.get_pops("140000", "140010")
 
         assert len(result) == 1
-        assert result[0]["pop"] == 20
+        assert list(result) == [(6, 20)]
+
+
+class TestJmaForecastClientCache:
+    def setup_method(self):
+        self.session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = SAMPLE_FORECAST_RESPONSE
+        self.session.get.return_value = mock_response
+
+    def test_same_office_fetched_once(self):
+        client = JmaForecastClient(session=self.session)
+
+        pops_east = client.get_pops("140000", "140010")
+        pops_west = client.get_pops("140000", "140020")
+
+        self.session.get.assert_called_once()
+        assert client.fetch_count == 1
+        assert pops_east.pops[0] == 10
+        assert pops_west.pops[0] == 50
+
+    def test_time_defines_parsed_once_per_office(self):
+        client = JmaForecastClient(session=self.session)
+
+        with patch("infrastructure.jma.client.datetime", wraps=datetime) as mock_datetime:
+            client.get_pops("140000", "140010")
+            client.get_pops("140000", "140020")
+            client.get_pops("140000", "140010")
+
+        # 降水確率の timeDefines（4件）を office の取得時に1回だけ解釈する
+        assert mock_datetime.fromisoformat.call_count == 4
+
+    def test_index_pops_builds_series_per_area(self):
+        index = index_pops(SAMPLE_FORECAST_RESPONSE)
+
+        assert set(index) == {"140010", "140020"}
+        assert index["140020"] == PopSeries(array("b", [0, 6, 12, 18]), array("h", [50, 60, 70, 80]))
+        assert list(index["140010"].hours) == list(index["140020"].hours)
+
+    def test_each_office_fetched_once(self):
+        client = JmaForecastClient(session=self.session)
+
+        for _ in range(3):
+            client.get_pops("140000", "140010")
+            client.get_pops("130000", "140010")
+
+        assert client.fetch_count == 2
+        urls = [call.args[0] for call in self.session.get.call_args_list]
+        assert urls == [
+            "https://www.jma.go.jp/bosai/forecast/data/forecast/140000.json",
+            "https://www.jma.go.jp/bosai/forecast/data/forecast/130000.json",
+        ]
+
+    def test_shared_cache_survives_new_client(self):
+        cache = TTLCache(maxsize=8, ttl=600)
+        JmaForecastClient(session=self.session, cache=cache).get_pops("140000", "140010")
+
+        client = JmaForecastClient(session=self.session, cache=cache)
+        client.get_pops("140000", "140020")
+
+        assert client.fetch_count == 0
+        self.session.get.assert_called_once()
+
+    def test_refetch_after_ttl(self):
+        now = [0.0]
+        cache = TTLCache(maxsize=8, ttl=600, timer=lambda: now[0])
+        client = JmaForecastClient(session=self.session, cache=cache)
+
+        client.get_pops("140000", "140010")
+        now[0] = 601.0
+        client.get_pops("140000", "140010")
+
+        assert client.fetch_count == 2
+
+    def test_concurrent_requests_fetch_office_once(self):
+        client = JmaForecastClient(session=self.session)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: client.get_pops("140000", "140010"), range(32)))
+
+        assert client.fetch_count == 1
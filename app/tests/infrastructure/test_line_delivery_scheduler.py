@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import pytest
+
+from infrastructure.exceptions import LineRateLimitException, MessagingException
+from infrastructure.line.delivery_scheduler import DEFAULT_RATE_LIMIT_PAUSE, DeliveryScheduler
+from tests.utils.test_rate_limiter import _FakeClock
+
+
+class TestDeliveryScheduler:
+    def setup_method(self):
+        self.clock = _FakeClock()
+        self.scheduler = DeliveryScheduler(qps=10, timer=self.clock.timer, sleep=self.clock.sleep)
+        self.sent: list[tuple[float, list[str]]] = []
+
+    def _send(self, failures: dict[str, list[Exception]]):
+        """宛先の先頭ユーザーIDごとに、指定した例外を順に送出する send 関数を返す"""
+
+        def send(chunk: list[str]) -> None:
+            self.sent.append((self.clock.now, chunk))
+            errors = failures.get(chunk[0])
+            if errors:
+                raise errors.pop(0)
+
+        return send
+
+    def test_paces_requests_at_qps(self):
+        chunks = [[f"U{i}"] for i in range(20)]
+
+        failed = self.scheduler.run(chunks, self._send({}))
+
+        assert failed == []
+        assert [chunk for _, chunk in self.sent] == chunks
+        assert self.sent[-1][0] == pytest.approx(1.9)
+
+    def test_rate_limit_pauses_for_retry_after(self):
+        failures: dict[str, list[Exception]] = {"U0": [LineRateLimitException("429", retry_after=5)]}
+
+        failed = self.scheduler.run([["U0"], ["U1"]], self._send(failures))
+
+        assert failed == []
+        assert [(round(at, 3), chunk) for at, chunk in self.sent] == [(0, ["U0"]), (5.1, ["U1"]), (5.2, ["U0"])]
+        assert self.scheduler.rate_limited_count == 1
+
+    def test_rate_limit_without_retry_after_uses_default_pause(self):
+        failures: dict[str, list[Exception]] = {"U0": [LineRateLimitException("429")]}
+
+        self.scheduler.run([["U0"]], self._send(failures))
+
+        assert self.sent[-1][0] == pytest.approx(DEFAULT_RATE_LIMIT_PAUSE + 0.1)
+
+    @patch("infrastructure.line.delivery_scheduler.random.uniform", return_value=0)
+    def test_error_retry_does_not_block_other_chunks(self, mock_uniform):
+        failures: dict[str, list[Exception]] = {"U0": [MessagingException("500")]}
+
+        failed = self.scheduler.run([["U0"], ["U1"], ["U2"]], self._send(failures))
+
+        assert failed == []
+        # U0 の再送待ち（1秒）の間に U1, U2 を送信する
+        assert [(round(at, 3), chunk) for at, chunk in self.sent] == [
+            (0, ["U0"]),
+            (0.1, ["U1"]),
+            (0.2, ["U2"]),
+            (1.0, ["U0"]),
+        ]
+
+    @patch("infrastructure.line.delivery_scheduler.random.uniform", return_value=0)
+    def test_exhausted_attempts_reported_per_user(self, mock_uniform):
+        failures: dict[str, list[Exception]] = {
+            "U0": [MessagingException("500"), LineRateLimitException("429", retry_after=0), MessagingException("500")]
+        }
+
+        failed = self.scheduler.run([["U0", "U1"], ["U2"]], self._send(failures))
+
+        assert failed == ["U0", "U1"]
+        assert len(self.sent) == 4
+
+    def test_invalid_max_attempts_raises(self):
+        with pytest.raises(ValueError, match="max_attempts"):
+            DeliveryScheduler(max_attempts=0)
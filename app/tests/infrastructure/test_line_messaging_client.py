@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -8,28 +8,27 @@ from infrastructure.line.messaging_client import LineMessagingClient
 
 class TestLineMessagingClient:
     def setup_method(self):
-        self.client = LineMessagingClient(channel_access_token="test-token")
+        self.session = MagicMock()
+        self.client = LineMessagingClient(channel_access_token="test-token", session=self.session)
 
-    @patch("infrastructure.line.messaging_client.requests.post")
-    def test_reply_message_success(self, mock_post):
+    def test_reply_message_success(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        self.session.post.return_value = mock_response
 
         self.client.reply_message("reply-token", "テストメッセージ")
 
-        mock_post.assert_called_once()
-        call_kwargs = mock_post.call_args
+        self.session.post.assert_called_once()
+        call_kwargs = self.session.post.call_args
         assert call_kwargs.kwargs["json"]["replyToken"] == "reply-token"
         assert call_kwargs.kwargs["json"]["messages"][0]["text"] == "テストメッセージ"
 
-    @patch("infrastructure.line.messaging_client.requests.post")
-    def test_reply_message_http_error(self, mock_post):
+    def test_reply_message_http_error(self):
         import requests
 
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("500")
-        mock_post.return_value = mock_response
+        self.session.post.return_value = mock_response
 
         with pytest.raises(MessagingException):
             self.client.reply_message("reply-token", "テスト")
@@ -2,35 +2,173 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from infrastructure.exceptions import MessagingException
-from infrastructure.line.messaging_client import LineMessagingClient
+from infrastructure.exceptions import LineRateLimitException, MessagingException
+from infrastructure.line.delivery_scheduler import DeliveryScheduler
+from infrastructure.line.messaging_client import LineMessagingClient, make_retry_key, parse_retry_after
 
 
 class TestLineMessagingClientPushMessage:
     def setup_method(self):
-        self.client = LineMessagingClient(channel_access_token="test-token")
+        self.session = MagicMock()
+        self.client = LineMessagingClient(channel_access_token="test-token", session=self.session)
 
-    @patch("infrastructure.line.messaging_client.requests.post")
-    def test_push_message_success(self, mock_post):
+    def test_push_message_success(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        self.session.post.return_value = mock_response
 
         self.client.push_message("U1234", "テストメッセージ")
 
-        mock_post.assert_called_once()
-        call_kwargs = mock_post.call_args
+        self.session.post.assert_called_once()
+        call_kwargs = self.session.post.call_args
         assert call_kwargs.kwargs["json"]["to"] == "U1234"
         assert call_kwargs.kwargs["json"]["messages"][0]["text"] == "テストメッセージ"
         assert "push" in call_kwargs.args[0]
 
-    @patch("infrastructure.line.messaging_client.requests.post")
-    def test_push_message_http_error(self, mock_post):
+    def test_push_message_http_error(self):
         import requests
 
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("500")
-        mock_post.return_value = mock_response
+        self.session.post.return_value = mock_response
 
         with pytest.raises(MessagingException):
             self.client.push_message("U1234", "テスト")
+
+    def test_push_message_already_accepted(self):
+        response = MagicMock()
+        response.status_code = 409
+        response.headers = {}
+        self.session.post.return_value = response
+
+        self.client.push_message("U1234", "テスト", retry_key="key-1")
+
+        assert self.session.post.call_args.kwargs["headers"]["X-Line-Retry-Key"] == "key-1"
+        response.raise_for_status.assert_not_called()
+
+
+class TestLineMessagingClientMulticastMessage:
+    def setup_method(self):
+        self.session = MagicMock()
+        self.client = LineMessagingClient(channel_access_token="test-token", session=self.session)
+
+    def test_multicast_message_success(self):
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        self.session.post.return_value = mock_response
+
+        failed = self.client.multicast_message(["U1", "U2"], "テストメッセージ")
+
+        assert failed == []
+        self.session.post.assert_called_once()
+        call_kwargs = self.session.post.call_args
+        assert call_kwargs.kwargs["json"]["to"] == ["U1", "U2"]
+        assert call_kwargs.kwargs["json"]["messages"][0]["text"] == "テストメッセージ"
+        assert "multicast" in call_kwargs.args[0]
+
+    def test_multicast_message_splits_into_chunks_of_500(self):
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        self.session.post.return_value = mock_response
+        user_ids = [f"U{i}" for i in range(1201)]
+
+        failed = self.client.multicast_message(user_ids, "テスト")
+
+        assert failed == []
+        sizes = [len(call.kwargs["json"]["to"]) for call in self.session.post.call_args_list]
+        assert sizes == [500, 500, 201]
+
+    @patch("utils.retry.time.sleep")
+    def test_multicast_message_failed_chunk_reported_per_user(self, mock_sleep):
+        import requests
+
+        ok_response = MagicMock()
+        ok_response.raise_for_status.return_value = None
+        error_response = MagicMock()
+        error_response.raise_for_status.side_effect = requests.exceptions.HTTPError("500")
+
+        def post(url, headers, json, timeout):
+            return error_response if json["to"][0] == "U500" else ok_response
+
+        self.session.post.side_effect = post
+        user_ids = [f"U{i}" for i in range(1001)]
+
+        failed = self.client.multicast_message(user_ids, "テスト")
+
+        assert failed == user_ids[500:1000]
+
+    def test_send_multicast_rate_limited(self):
+        response = MagicMock()
+        response.status_code = 429
+        response.headers = {"Retry-After": "3"}
+        self.session.post.return_value = response
+
+        with pytest.raises(LineRateLimitException) as exc_info:
+            self.client.send_multicast(["U1"], "テスト")
+
+        assert exc_info.value.retry_after == 3.0
+        self.session.post.assert_called_once()
+
+    def test_multicast_message_with_scheduler(self):
+        rate_limited = MagicMock()
+        rate_limited.status_code = 429
+        rate_limited.headers = {"Retry-After": "0"}
+        ok_response = MagicMock()
+        ok_response.raise_for_status.return_value = None
+        self.session.post.side_effect = [rate_limited, ok_response, ok_response]
+        scheduler = DeliveryScheduler(qps=1000)
+        client = LineMessagingClient(channel_access_token="test-token", session=self.session, scheduler=scheduler)
+        user_ids = [f"U{i}" for i in range(501)]
+
+        failed = client.multicast_message(user_ids, "テスト")
+
+        assert failed == []
+        sizes = [len(call.kwargs["json"]["to"]) for call in self.session.post.call_args_list]
+        assert sizes == [500, 1, 500]
+        assert scheduler.rate_limited_count == 1
+
+    def test_multicast_message_retry_key_per_chunk(self):
+        ok_response = MagicMock()
+        ok_response.raise_for_status.return_value = None
+        self.session.post.return_value = ok_response
+        user_ids = [f"U{i}" for i in range(501)]
+
+        self.client.multicast_message(user_ids, "テスト", retry_key_seed="2026-02-03")
+
+        keys = [call.kwargs["headers"]["X-Line-Retry-Key"] for call in self.session.post.call_args_list]
+        assert keys == [make_retry_key("2026-02-03", user_ids[:500]), make_retry_key("2026-02-03", user_ids[500:])]
+        assert make_retry_key("2026-02-03", user_ids[:500]) != make_retry_key("2026-02-04", user_ids[:500])
+        # 宛先の並び順によらず同じキーになる
+        assert make_retry_key("2026-02-03", user_ids[499::-1]) == make_retry_key("2026-02-03", user_ids[:500])
+
+    def test_multicast_message_without_seed_has_no_retry_key(self):
+        ok_response = MagicMock()
+        ok_response.raise_for_status.return_value = None
+        self.session.post.return_value = ok_response
+
+        self.client.multicast_message(["U1"], "テスト")
+
+        assert "X-Line-Retry-Key" not in self.session.post.call_args.kwargs["headers"]
+
+    def test_multicast_message_already_accepted_chunk_is_success(self):
+        response = MagicMock()
+        response.status_code = 409
+        response.headers = {"X-Line-Accepted-Request-Id": "req-1"}
+        self.session.post.return_value = response
+
+        failed = self.client.multicast_message(["U1", "U2"], "テスト", retry_key_seed="2026-02-03")
+
+        assert failed == []
+        self.session.post.assert_called_once()
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("120") == 120.0
+
+    def test_http_date(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
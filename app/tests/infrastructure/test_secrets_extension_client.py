@@ -0,0 +1,72 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from infrastructure.exceptions import SecretsException
+from infrastructure.secretsmanager.extension_client import SecretsExtensionClient
+from infrastructure.secretsmanager.secrets_provider import SecretsProvider
+from tests.stub_server import StubRequest, StubResponse, StubServer
+
+SECRETS = {"line-channel-secret": "test-secret", "line-channel-access-token": "test-token"}
+
+
+def _extension(request: StubRequest) -> StubResponse:
+    """/secretsmanager/get のみの拡張機能"""
+    secret_id = parse_qs(urlsplit(request.path).query)["secretId"][0]
+    if request.headers.get("X-Aws-Parameters-Secrets-Token") != "session-token":
+        return StubResponse(status=403, body="forbidden")
+    if secret_id not in SECRETS:
+        return StubResponse(status=400, body="ResourceNotFoundException")
+    return StubResponse(
+        body={
+            "Name": secret_id,
+            "ARN": f"arn:aws:secretsmanager:ap-northeast-1:123456789012:secret:{secret_id}",
+            "SecretString": SECRETS[secret_id],
+        }
+    )
+
+
+class TestSecretsExtensionClient:
+    def setup_method(self):
+        self.server = StubServer(_extension).__enter__()
+        port = int(self.server.url.rsplit(":", 1)[1])
+        self.client = SecretsExtensionClient(port=port, host="127.0.0.1", token="session-token")
+
+    def teardown_method(self):
+        self.server.__exit__(None, None, None)
+
+    def test_get_secret_value(self):
+        response = self.client.get_secret_value(SecretId="line-channel-secret")
+
+        assert response["SecretString"] == "test-secret"
+        assert self.server.requests[0].path == "/secretsmanager/get?secretId=line-channel-secret"
+
+    def test_get_secret_value_error(self):
+        with pytest.raises(SecretsException, match="HTTP 400"):
+            self.client.get_secret_value(SecretId="missing")
+
+    def test_reuses_connection(self):
+        self.client.get_secret_value(SecretId="line-channel-secret")
+        self.client.get_secret_value(SecretId="line-channel-access-token")
+
+        assert self.server.connection_count == 1
+
+    def test_batch_reports_errors(self):
+        response = self.client.batch_get_secret_value(SecretIdList=["line-channel-secret", "missing"])
+
+        assert [value["Name"] for value in response["SecretValues"]] == ["line-channel-secret"]
+        assert response["Errors"][0]["SecretId"] == "missing"
+
+    def test_as_provider_client(self):
+        provider = SecretsProvider(client=self.client)
+
+        assert provider.get_many(["line-channel-secret", "line-channel-access-token"]) == SECRETS
+        with pytest.raises(SecretsException, match="missing"):
+            provider.get("missing")
+
+    def test_connection_error(self):
+        self.server.__exit__(None, None, None)
+        client = SecretsExtensionClient(port=self.client.port, host="127.0.0.1", timeout=1)
+
+        with pytest.raises(SecretsException, match="接続"):
+            client.get_secret_value(SecretId="line-channel-secret")
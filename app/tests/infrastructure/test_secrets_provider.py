@@ -0,0 +1,148 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from infrastructure.exceptions import SecretsException
+from infrastructure.secretsmanager.extension_client import SecretsExtensionClient
+from infrastructure.secretsmanager.secrets_provider import (
+    SecretsProvider,
+    get_secrets_provider,
+    reset_secrets_provider,
+)
+
+
+class _FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _secret_value(name: str, value: str) -> dict:
+    return {
+        "Name": name,
+        "ARN": f"arn:aws:secretsmanager:ap-northeast-1:123456789012:secret:{name}",
+        "SecretString": value,
+    }
+
+
+def _batch_get_secret_value(SecretIdList: list[str]) -> dict:  # noqa: N803
+    """SecretId には名前と ARN のどちらも指定できる"""
+    names = [secret_id.rsplit(":", 1)[-1] for secret_id in SecretIdList]
+    return {"SecretValues": [_secret_value(name, f"value-{name}") for name in names], "Errors": []}
+
+
+class TestSecretsProvider:
+    def setup_method(self):
+        self.client = MagicMock()
+        self.client.get_secret_value.side_effect = lambda SecretId: {"SecretString": f"value-{SecretId}"}  # noqa: N803
+        self.client.batch_get_secret_value.side_effect = _batch_get_secret_value
+        self.timer = _FakeTimer()
+        self.provider = SecretsProvider(ttl=300, min_refresh_interval=30, client=self.client, timer=self.timer)
+
+    def test_get_is_cached(self):
+        assert self.provider.get("token") == "value-token"
+        assert self.provider.get("token") == "value-token"
+
+        self.client.get_secret_value.assert_called_once_with(SecretId="token")
+        assert self.provider.fetch_count == 1
+
+    def test_get_many_fetches_missing_in_one_batch(self):
+        self.provider.get("secret")
+
+        secrets = self.provider.get_many(["secret", "token", "api-key"])
+
+        assert secrets == {"secret": "value-secret", "token": "value-token", "api-key": "value-api-key"}
+        self.client.batch_get_secret_value.assert_called_once_with(SecretIdList=["token", "api-key"])
+        assert self.provider.fetch_count == 2
+
+    def test_get_many_by_arn(self):
+        arn = _secret_value("token", "")["ARN"]
+
+        secrets = self.provider.get_many(["secret", arn])
+
+        assert secrets[arn] == "value-token"
+
+    def test_get_many_follows_next_token(self):
+        self.client.batch_get_secret_value.side_effect = [
+            {"SecretValues": [_secret_value("secret", "s")], "NextToken": "next"},
+            {"SecretValues": [_secret_value("token", "t")]},
+        ]
+
+        assert self.provider.get_many(["secret", "token"]) == {"secret": "s", "token": "t"}
+        assert self.client.batch_get_secret_value.call_args.kwargs["NextToken"] == "next"
+
+    def test_refetch_after_ttl(self):
+        self.provider.get("token")
+        self.timer.now = 301
+
+        self.provider.get("token")
+
+        assert self.client.get_secret_value.call_count == 2
+
+    def test_refresh_bypasses_cache(self):
+        self.provider.get("secret")
+        self.client.get_secret_value.side_effect = lambda SecretId: {"SecretString": "rotated"}  # noqa: N803
+
+        assert self.provider.refresh("secret") == "rotated"
+        assert self.provider.get("secret") == "rotated"
+        assert self.client.get_secret_value.call_count == 2
+
+    def test_refresh_is_rate_limited(self):
+        self.provider.refresh("secret")
+        self.provider.refresh("secret")
+        assert self.client.get_secret_value.call_count == 1
+
+        self.timer.now = 31
+        self.provider.refresh("secret")
+        assert self.client.get_secret_value.call_count == 2
+
+    def test_batch_errors_raise(self):
+        self.client.batch_get_secret_value.side_effect = None
+        self.client.batch_get_secret_value.return_value = {
+            "SecretValues": [_secret_value("secret", "s")],
+            "Errors": [{"SecretId": "token", "ErrorCode": "ResourceNotFoundException"}],
+        }
+
+        with pytest.raises(SecretsException, match="token"):
+            self.provider.get_many(["secret", "token"])
+
+    def test_client_error_raises(self):
+        self.client.get_secret_value.side_effect = ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "denied"}}, "GetSecretValue"
+        )
+
+        with pytest.raises(SecretsException):
+            self.provider.get("token")
+
+    @patch("boto3.client")
+    def test_client_created_once(self, mock_boto3_client):
+        mock_boto3_client.return_value = self.client
+        provider = SecretsProvider()
+
+        provider.get("secret")
+        provider.get("token")
+
+        mock_boto3_client.assert_called_once_with("secretsmanager")
+
+
+class TestSharedSecretsProvider:
+    def teardown_method(self):
+        reset_secrets_provider()
+
+    def test_shared_across_calls(self):
+        assert get_secrets_provider() is get_secrets_provider()
+
+    def test_reset(self):
+        provider = get_secrets_provider()
+        reset_secrets_provider()
+        assert get_secrets_provider() is not provider
+
+    @patch.dict("os.environ", {"PARAMETERS_SECRETS_EXTENSION_HTTP_PORT": "2773"})
+    def test_uses_extension_when_configured(self):
+        client = get_secrets_provider().client
+
+        assert isinstance(client, SecretsExtensionClient)
+        assert client.port == 2773
@@ -0,0 +1,98 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from domain.value_objects.region_registration import RegionRegistration
+from infrastructure.exceptions import QueueException
+from infrastructure.sqs.registration_queue import (
+    InMemoryRegistrationQueue,
+    SqsRegistrationQueue,
+    decode_registration,
+    encode_registration,
+)
+
+
+def _registration(i: int, user_id: str | None = None) -> RegionRegistration:
+    return RegionRegistration(
+        user_id=user_id or f"U{i}", city_name="渋谷区", reply_token=f"reply-{i}", event_id=f"event-{i}"
+    )
+
+
+class TestRegistrationMessage:
+    def test_round_trip(self):
+        registration = _registration(1)
+
+        assert json.loads(encode_registration(registration)) == {
+            "userId": "U1",
+            "cityName": "渋谷区",
+            "replyToken": "reply-1",
+            "eventId": "event-1",
+        }
+        assert decode_registration(encode_registration(registration)) == registration
+
+    def test_decode_invalid_body(self):
+        with pytest.raises(ValueError):
+            decode_registration('{"userId": "U1"}')
+        with pytest.raises(ValueError):
+            decode_registration("not json")
+        with pytest.raises(ValueError):
+            decode_registration('{"userId": "", "cityName": "渋谷区", "replyToken": "r"}')
+
+
+class TestSqsRegistrationQueue:
+    @patch("infrastructure.sqs.registration_queue.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_sqs = MagicMock()
+        self.mock_sqs.send_message_batch.return_value = {"Successful": []}
+        mock_boto3.client.return_value = self.mock_sqs
+        self.queue = SqsRegistrationQueue(queue_url="https://sqs.example/registrations")
+
+    def test_send_in_batches_of_10(self):
+        registrations = [_registration(i) for i in range(12)]
+
+        self.queue.send_registrations(registrations)
+
+        batches = [call.kwargs["Entries"] for call in self.mock_sqs.send_message_batch.call_args_list]
+        assert [len(entries) for entries in batches] == [10, 2]
+        assert batches[1][1] == {"Id": "1", "MessageBody": encode_registration(registrations[11])}
+
+    @patch("infrastructure.sqs.registration_queue.boto3")
+    def test_fifo_groups_by_user(self, mock_boto3):
+        mock_boto3.client.return_value = self.mock_sqs
+        queue = SqsRegistrationQueue(queue_url="https://sqs.example/registrations.fifo")
+
+        queue.send_registrations([_registration(1), RegionRegistration("U2", "新宿区", "reply-2")])
+
+        entries = self.mock_sqs.send_message_batch.call_args.kwargs["Entries"]
+        assert entries[0]["MessageGroupId"] == "U1"
+        assert entries[0]["MessageDeduplicationId"] == "event-1"
+        # webhookEventId がない場合はキューの内容ベースの重複排除に任せる
+        assert "MessageDeduplicationId" not in entries[1]
+
+    def test_resends_only_failed_entries(self):
+        self.mock_sqs.send_message_batch.side_effect = [{"Failed": [{"Id": "1"}]}, {}]
+
+        self.queue.send_registrations([_registration(i) for i in range(3)])
+
+        resent = self.mock_sqs.send_message_batch.call_args_list[1].kwargs["Entries"]
+        assert resent == [{"Id": "1", "MessageBody": encode_registration(_registration(1))}]
+
+    def test_raises_when_entries_keep_failing(self):
+        self.mock_sqs.send_message_batch.return_value = {"Failed": [{"Id": "0"}]}
+
+        with pytest.raises(QueueException, match="U0"):
+            self.queue.send_registrations([_registration(0)])
+
+
+class TestInMemoryRegistrationQueue:
+    def test_receive_in_order(self):
+        queue = InMemoryRegistrationQueue()
+        registrations = [_registration(i) for i in range(3)]
+
+        queue.send_registrations(registrations)
+
+        assert len(queue) == 3
+        assert [decode_registration(body) for body in queue.receive(max_messages=2)] == registrations[:2]
+        assert [decode_registration(body) for body in queue.receive()] == registrations[2:]
+        assert queue.receive() == []
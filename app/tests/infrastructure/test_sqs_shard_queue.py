@@ -0,0 +1,70 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from domain.value_objects.broadcast_shard import BroadcastShard
+from infrastructure.exceptions import QueueException
+from infrastructure.sqs.shard_queue import InMemoryShardQueue, SqsShardQueue, decode_shard, encode_shard
+
+
+class TestShardMessage:
+    def test_round_trip(self):
+        shard = BroadcastShard(run_id="run-1", index=2, count=8)
+
+        assert json.loads(encode_shard(shard)) == {"runId": "run-1", "index": 2, "count": 8}
+        assert decode_shard(encode_shard(shard)) == shard
+
+    def test_decode_invalid_body(self):
+        with pytest.raises(ValueError):
+            decode_shard('{"runId": "run-1"}')
+        with pytest.raises(ValueError):
+            decode_shard("not json")
+        with pytest.raises(ValueError):
+            decode_shard('{"runId": "run-1", "index": 8, "count": 8}')
+
+
+class TestSqsShardQueue:
+    @patch("infrastructure.sqs.shard_queue.boto3")
+    def setup_method(self, method, mock_boto3):
+        self.mock_sqs = MagicMock()
+        mock_boto3.client.return_value = self.mock_sqs
+        self.queue = SqsShardQueue(queue_url="https://sqs.example/shards")
+        self.shards = [BroadcastShard(run_id="run-1", index=i, count=12) for i in range(12)]
+
+    def test_send_shards_in_batches_of_10(self):
+        self.mock_sqs.send_message_batch.return_value = {"Successful": []}
+
+        self.queue.send_shards(self.shards)
+
+        batches = [call.kwargs["Entries"] for call in self.mock_sqs.send_message_batch.call_args_list]
+        assert [len(entries) for entries in batches] == [10, 2]
+        assert batches[1][0] == {"Id": "10", "MessageBody": encode_shard(self.shards[10])}
+        assert self.mock_sqs.send_message_batch.call_args.kwargs["QueueUrl"] == "https://sqs.example/shards"
+
+    def test_resends_only_failed_entries(self):
+        self.mock_sqs.send_message_batch.side_effect = [{"Failed": [{"Id": "1"}]}, {}]
+
+        self.queue.send_shards(self.shards[:3])
+
+        resent = self.mock_sqs.send_message_batch.call_args_list[1].kwargs["Entries"]
+        assert [entry["Id"] for entry in resent] == ["1"]
+
+    def test_raises_when_entries_keep_failing(self):
+        self.mock_sqs.send_message_batch.return_value = {"Failed": [{"Id": "0"}]}
+
+        with pytest.raises(QueueException):
+            self.queue.send_shards(self.shards[:1])
+
+
+class TestInMemoryShardQueue:
+    def test_fifo(self):
+        queue = InMemoryShardQueue()
+        shards = [BroadcastShard(run_id="run-1", index=i, count=2) for i in range(2)]
+
+        queue.send_shards(shards)
+
+        assert len(queue) == 2
+        assert decode_shard(queue.receive()) == shards[0]
+        assert decode_shard(queue.receive()) == shards[1]
+        assert queue.receive() is None
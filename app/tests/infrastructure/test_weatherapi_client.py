@@ -1,17 +1,20 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 
+from domain.value_objects.weather_series import TemperatureSeries
 from infrastructure.exceptions import WeatherAPIException
-from infrastructure.weatherapi.client import WeatherApiClient
+from infrastructure.weatherapi.client import HourlyTemperatureScanner, WeatherApiClient, parse_hourly_weather
 
 
 class TestWeatherApiClient:
     def setup_method(self):
-        self.client = WeatherApiClient(api_key="test-api-key")
+        self.session = MagicMock()
+        self.client = WeatherApiClient(api_key="test-api-key", session=self.session)
 
-    @patch("infrastructure.weatherapi.client.requests.get")
-    def test_get_hourly_weather_success(self, mock_get):
+    def test_get_hourly_weather_success(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = {
@@ -26,56 +29,174 @@ class TestWeatherApiClient:
                 ]
             }
         }
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         result = self.client.get_hourly_weather(35.6619, 139.7041)
 
         assert len(result) == 2
-        assert result[0]["time"] == "2026-02-03 09:00"
-        assert result[0]["temp"] == 8.5
-        assert result[1]["temp"] == 9.0
-        mock_get.assert_called_once()
-        call_kwargs = mock_get.call_args
+        assert list(result.hours) == [9, 10]
+        assert list(result.temps) == [8.5, 9.0]
+        self.session.get.assert_called_once()
+        call_kwargs = self.session.get.call_args
         assert call_kwargs.kwargs["params"]["q"] == "35.6619,139.7041"
         assert call_kwargs.kwargs["params"]["key"] == "test-api-key"
         assert call_kwargs.kwargs["params"]["days"] == 1
 
-    @patch("infrastructure.weatherapi.client.requests.get")
-    def test_get_hourly_weather_empty_forecast(self, mock_get):
+    def test_get_hourly_weather_hour_from_epoch(self):
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {
+            "forecast": {
+                "forecastday": [
+                    {
+                        "hour": [
+                            # 2026-02-03 00:00 UTC = 09:00 JST
+                            {"time": "2026-02-03 09:00", "time_epoch": 1770076800, "temp_c": 8.5},
+                            {"time": "2026-02-03 10:00", "temp_c": 9.0},
+                        ]
+                    }
+                ]
+            }
+        }
+        self.session.get.return_value = mock_response
+
+        result = self.client.get_hourly_weather(35.6619, 139.7041)
+
+        assert list(result.hours) == [9, 10]
+
+    def test_get_hourly_weather_empty_forecast(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = {"forecast": {"forecastday": []}}
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         result = self.client.get_hourly_weather(35.6619, 139.7041)
-        assert result == []
+        assert result == TemperatureSeries()
 
-    @patch("infrastructure.weatherapi.client.requests.get")
-    def test_get_hourly_weather_no_forecast_key(self, mock_get):
+    def test_get_hourly_weather_no_forecast_key(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = {}
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         result = self.client.get_hourly_weather(35.6619, 139.7041)
-        assert result == []
+        assert result == TemperatureSeries()
 
-    @patch("infrastructure.weatherapi.client.requests.get")
-    def test_get_hourly_weather_http_error(self, mock_get):
+    def test_get_hourly_weather_http_error(self):
         import requests
 
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("401")
-        mock_get.return_value = mock_response
+        self.session.get.return_value = mock_response
 
         with pytest.raises(WeatherAPIException):
             self.client.get_hourly_weather(35.6619, 139.7041)
 
-    @patch("infrastructure.weatherapi.client.requests.get")
-    def test_get_hourly_weather_timeout(self, mock_get):
+    def test_get_hourly_weather_timeout(self):
         import requests
 
-        mock_get.side_effect = requests.exceptions.Timeout("timeout")
+        self.session.get.side_effect = requests.exceptions.Timeout("timeout")
+
+        with pytest.raises(WeatherAPIException):
+            self.client.get_hourly_weather(35.6619, 139.7041)
+
+
+def _forecast_body(days: int = 1) -> bytes:
+    """current と forecastday（days 日分）を含む Forecast API のレスポンス"""
+    forecastday = [
+        {
+            "date": f"2026-02-0{3 + d}",
+            "date_epoch": 1770076800 + d * 86400,
+            "day": {"maxtemp_c": 12.0, "mintemp_c": 1.5, "condition": {"text": "Sunny", "code": 1000}},
+            "hour": [
+                {
+                    "time_epoch": 1770044400 + d * 86400 + h * 3600,
+                    "time": f"2026-02-0{3 + d} {h:02d}:00",
+                    "temp_c": round(-1.5 + h * 0.5 + d * 10, 1),
+                    "condition": {"text": "Sunny", "code": 1000},
+                    "feelslike_c": -3.0,
+                }
+                for h in range(24)
+            ],
+        }
+        for d in range(days)
+    ]
+    data = {"current": {"temp_c": 30.0, "last_updated_epoch": 1770075000}, "forecast": {"forecastday": forecastday}}
+    return json.dumps(data).encode()
+
+
+def _scan(body: bytes, chunk_size: int) -> TemperatureSeries:
+    scanner = HourlyTemperatureScanner()
+    for i in range(0, len(body), chunk_size):
+        scanner.feed(body[i : i + chunk_size])
+    return scanner.result()
+
+
+class TestHourlyTemperatureScanner:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1024, 1 << 20])
+    def test_matches_parse_hourly_weather(self, chunk_size):
+        body = _forecast_body()
+
+        result = _scan(body, chunk_size)
+
+        assert result == parse_hourly_weather(json.loads(body))
+        assert list(result.hours) == list(range(24))
+        assert result.temps[0] == -1.5
+
+    def test_reads_first_day_only(self):
+        body = _forecast_body(days=2)
+
+        assert _scan(body, 1024) == parse_hourly_weather(json.loads(body))
+
+    def test_no_forecast(self):
+        assert _scan(b'{"current": {"temp_c": 30.0}}', 1024) == TemperatureSeries()
+
+    def test_temp_without_time_epoch_raises(self):
+        body = b'{"forecast": {"forecastday": [{"hour": [{"time": "2026-02-03 09:00", "temp_c": 8.5}]}]}}'
+
+        with pytest.raises(ValueError, match="time_epoch"):
+            _scan(body, 1024)
+
+    def test_non_numeric_value_raises(self):
+        body = b'{"forecast": {"forecastday": [{"hour": [{"time_epoch": 1770076800, "temp_c": null}]}]}}'
+
+        with pytest.raises(ValueError):
+            _scan(body, 1024)
+
+
+class TestWeatherApiClientLean:
+    def setup_method(self):
+        self.session = MagicMock()
+        self.client = WeatherApiClient(api_key="test-api-key", session=self.session, lean=True)
+        self.response = MagicMock()
+        self.response.raise_for_status.return_value = None
+        self.session.get.return_value = self.response
+
+    def test_streams_minimal_response(self):
+        body = _forecast_body()
+        self.response.iter_content.return_value = [body[:100], body[100:]]
+
+        result = self.client.get_hourly_weather(35.6619, 139.7041)
+
+        assert result == parse_hourly_weather(json.loads(body))
+        call_kwargs = self.session.get.call_args.kwargs
+        assert call_kwargs["stream"] is True
+        assert "lang" not in call_kwargs["params"]
+        assert call_kwargs["params"]["days"] == 1
+        self.response.close.assert_called_once()
+
+    @patch("utils.retry.time.sleep")
+    def test_unexpected_response_raises(self, mock_sleep):
+        self.response.iter_content.return_value = [b'{"forecast": {"forecastday": [{"hour": [{"temp_c": 8.5}]}]}}']
+
+        with pytest.raises(WeatherAPIException, match="解釈"):
+            self.client.get_hourly_weather(35.6619, 139.7041)
+        assert self.response.close.call_count == 3
+
+    @patch("utils.retry.time.sleep")
+    def test_http_error(self, mock_sleep):
+        self.response.raise_for_status.side_effect = requests.exceptions.HTTPError("500")
 
         with pytest.raises(WeatherAPIException):
             self.client.get_hourly_weather(35.6619, 139.7041)
+        self.response.iter_content.assert_not_called()
@@ -0,0 +1,108 @@
+"""テスト・ベンチマーク用のローカル HTTP スタブサーバー"""
+
+import json
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    body: Any = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+
+
+Responder = Callable[[StubRequest], StubResponse]
+
+
+class StubServer:
+    """HTTP/1.1 Keep-Alive 対応のスタブサーバー
+
+    受け付けた TCP コネクション数とリクエスト数を記録する。
+
+    Usage:
+        with StubServer(lambda req: StubResponse(body={"ok": True})) as server:
+            requests.get(server.url + "/path")
+            assert server.connection_count == 1
+    """
+
+    def __init__(self, responder: Responder | None = None) -> None:
+        self.responder = responder or (lambda request: StubResponse(body={}))
+        self.requests: list[StubRequest] = []
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        # 終了（shutdown）待ちを短くするため、停止要求の確認間隔を縮める
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.01,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connection_count += 1
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = StubRequest(
+                    method=self.command,
+                    path=self.path,
+                    headers=dict(self.headers.items()),
+                    body=self.rfile.read(length) if length else b"",
+                )
+                with stub._lock:
+                    stub.requests.append(request)
+                response = stub.responder(request)
+                if isinstance(response.body, bytes):
+                    payload = response.body
+                else:
+                    payload = json.dumps(response.body, ensure_ascii=False).encode("utf-8")
+                self.send_response(response.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _handle  # noqa: N815
+            do_POST = _handle  # noqa: N815
+
+        return Handler
@@ -0,0 +1,172 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from domain.entities.user import User
+from domain.value_objects.location import Location
+from domain.value_objects.weather import Weather
+from infrastructure.exceptions import JMAAPIException, WeatherAPIException
+from usecases.async_broadcast_weather import AsyncBroadcastWeatherUseCase
+from usecases.broadcast_weather import BroadcastResult, DedupPolicy
+
+
+def _make_user(user_id: str, city_name: str, lat: float, lon: float) -> User:
+    location = Location(city_name=city_name, latitude=lat, longitude=lon)
+    return User(user_id=user_id, location=location)
+
+
+class TestAsyncBroadcastWeatherUseCase:
+    def setup_method(self):
+        self.mock_user_repo = MagicMock()
+        self.mock_weather_client = MagicMock()
+        self.mock_weather_client.get_hourly_weather = AsyncMock(return_value=[{"dt": 0, "temp": 20.0}])
+        self.mock_messaging = MagicMock()
+        self.mock_messaging.multicast_message = AsyncMock(return_value=[])
+        self.mock_calculator = MagicMock()
+        self.mock_calculator.calculate.return_value = Weather(max_temp=25.0, min_temp=18.0, pop=50)
+        self.mock_jma_client = MagicMock()
+        self.mock_jma_client.get_pops = AsyncMock(return_value=[{"time": None, "pop": 50}])
+        self.mock_jma_area_mapper = MagicMock()
+        self.mock_jma_area_mapper.load = AsyncMock()
+        self.mock_jma_area_mapper.find_codes.return_value = ("130000", "130010")
+
+    def _make_usecase(self, **kwargs) -> AsyncBroadcastWeatherUseCase:
+        return AsyncBroadcastWeatherUseCase(
+            user_repository=self.mock_user_repo,
+            weather_client=self.mock_weather_client,
+            messaging_client=self.mock_messaging,
+            weather_calculator=self.mock_calculator,
+            jma_client=self.mock_jma_client,
+            jma_area_mapper=self.mock_jma_area_mapper,
+            **kwargs,
+        )
+
+    def test_broadcast_grouped_users(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "渋谷区", 35.6619, 139.7041),
+                _make_user("U3", "新宿区", 35.6938, 139.7034),
+            ]
+        )
+
+        result = asyncio.run(self._make_usecase().execute())
+
+        assert result == BroadcastResult(success_count=3)
+        self.mock_jma_area_mapper.load.assert_awaited_once()
+        assert self.mock_weather_client.get_hourly_weather.await_count == 2
+        recipients = sorted(call.args[0] for call in self.mock_messaging.multicast_message.call_args_list)
+        assert recipients == [["U1", "U2"], ["U3"]]
+        message = self.mock_messaging.multicast_message.call_args_list[0].args[1]
+        assert "25.0" in message
+
+    def test_no_users(self):
+        self.mock_user_repo.iter_users.return_value = iter([])
+
+        result = asyncio.run(self._make_usecase().execute())
+
+        assert result == BroadcastResult()
+        self.mock_weather_client.get_hourly_weather.assert_not_called()
+        self.mock_messaging.multicast_message.assert_not_called()
+
+    def test_failures_skip_groups(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "新宿区", 35.6938, 139.7034),
+                _make_user("U3", "川崎市", 35.5309, 139.7029),
+                _make_user("U4", "横浜市", 35.4437, 139.6380),
+            ]
+        )
+
+        async def get_hourly_weather(lat, lon):
+            if lat == 35.6619:
+                raise WeatherAPIException("API error")
+            return [{"dt": 0, "temp": 20.0}]
+
+        def find_codes(city_name):
+            if city_name == "新宿区":
+                raise JMAAPIException("JMA error")
+            return ("140000", "140010")
+
+        self.mock_weather_client.get_hourly_weather.side_effect = get_hourly_weather
+        self.mock_jma_area_mapper.find_codes.side_effect = find_codes
+        self.mock_messaging.multicast_message.side_effect = lambda user_ids, message: ["U4"] if "U4" in user_ids else []
+
+        result = asyncio.run(self._make_usecase().execute())
+
+        assert result == BroadcastResult(success_count=1, failure_count=3)
+
+    def test_batches_split_by_batch_size(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [_make_user(f"U{i}", "渋谷区", 35.6619, 139.7041) for i in range(5)]
+        )
+
+        result = asyncio.run(self._make_usecase(batch_size=2).execute())
+
+        assert result == BroadcastResult(success_count=5)
+        sizes = sorted(len(call.args[0]) for call in self.mock_messaging.multicast_message.call_args_list)
+        assert sizes == [1, 2, 2]
+        self.mock_weather_client.get_hourly_weather.assert_awaited_once()
+
+    def test_grid_dedup_shares_weather_api_call(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.66191, 139.70412),
+                _make_user("U2", "渋谷区", 35.66189, 139.70408),
+            ]
+        )
+
+        asyncio.run(self._make_usecase(dedup_policy=DedupPolicy.GRID).execute())
+
+        self.mock_weather_client.get_hourly_weather.assert_awaited_once()
+        self.mock_messaging.multicast_message.assert_awaited_once()
+
+    def test_requests_run_concurrently(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [_make_user(f"U{i}", f"市{i}", 35.0 + i * 0.1, 139.0) for i in range(50)]
+        )
+        in_flight = 0
+        peak = 0
+
+        async def slow_hourly(lat, lon):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [{"dt": 0, "temp": 20.0}]
+
+        self.mock_weather_client.get_hourly_weather.side_effect = slow_hourly
+
+        result = asyncio.run(self._make_usecase(max_concurrency=10).execute())
+
+        assert result == BroadcastResult(success_count=50)
+        # 直列なら同時に実行中の取得は常に1件
+        assert 2 <= peak <= 10
+
+    def test_max_concurrency_limits_in_flight_requests(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [_make_user(f"U{i}", f"市{i}", 35.0 + i * 0.1, 139.0) for i in range(20)]
+        )
+        in_flight = 0
+        peak = 0
+
+        async def slow_hourly(lat, lon):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [{"dt": 0, "temp": 20.0}]
+
+        self.mock_weather_client.get_hourly_weather.side_effect = slow_hourly
+
+        asyncio.run(self._make_usecase(max_concurrency=3).execute())
+
+        assert peak == 3
+
+    def test_invalid_max_concurrency_raises(self):
+        with pytest.raises(ValueError, match="max_concurrency"):
+            self._make_usecase(max_concurrency=0)
@@ -1,10 +1,18 @@
-from unittest.mock import MagicMock
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from domain.entities.user import User
+from domain.services.weather_calculator import JST
+from domain.value_objects.delivery_checkpoint import DeliveryCheckpoint
 from domain.value_objects.location import Location
+from domain.value_objects.location_group import LocationGroup
 from domain.value_objects.weather import Weather
-from infrastructure.exceptions import JMAAPIException, MessagingException, WeatherAPIException
-from usecases.broadcast_weather import BroadcastWeatherUseCase
+from infrastructure.exceptions import JMAAPIException, WeatherAPIException
+from infrastructure.line.messaging_client import MULTICAST_MAX_RECIPIENTS, make_retry_key
+from usecases.broadcast_weather import BroadcastResult, BroadcastWeatherUseCase, DedupPolicy
 
 
 def _make_user(user_id: str, city_name: str, lat: float, lon: float) -> User:
@@ -12,11 +20,67 @@ def _make_user(user_id: str, city_name: str, lat: float, lon: float) -> User:
     return User(user_id=user_id, location=location)
 
 
+def _retry_keys(recipients: list[list[str]]) -> list[str]:
+    """multicast_message の宛先から、チャンクごとの X-Line-Retry-Key（配信日 2026-02-03）を求める"""
+    return [
+        make_retry_key("2026-02-03", user_ids[start : start + MULTICAST_MAX_RECIPIENTS])
+        for user_ids in recipients
+        for start in range(0, len(user_ids), MULTICAST_MAX_RECIPIENTS)
+    ]
+
+
+def _stub_dependencies() -> dict[str, MagicMock]:
+    """BroadcastWeatherUseCase の依存のスタブ（どの地点も同じ天気になり、配信はすべて成功する）"""
+    weather_client = MagicMock()
+    weather_client.get_hourly_weather.return_value = [{"dt": 0, "temp": 20.0}]
+    messaging_client = MagicMock()
+    messaging_client.multicast_message.return_value = []
+    jma_area_mapper = MagicMock()
+    jma_area_mapper.find_codes.return_value = ("130000", "130010")
+    jma_client = MagicMock()
+    jma_client.get_pops.return_value = [{"time": None, "pop": 50}]
+    weather_calculator = MagicMock()
+    weather_calculator.calculate.return_value = Weather(max_temp=25.0, min_temp=18.0, pop=50)
+    return {
+        "user_repository": MagicMock(),
+        "weather_client": weather_client,
+        "messaging_client": messaging_client,
+        "weather_calculator": weather_calculator,
+        "jma_client": jma_client,
+        "jma_area_mapper": jma_area_mapper,
+    }
+
+
+class _StubbedDependencies:
+    """_stub_dependencies() のスタブをテストごとに用意する基底クラス"""
+
+    def setup_method(self):
+        deps = _stub_dependencies()
+        self.mock_user_repo = deps["user_repository"]
+        self.mock_weather_client = deps["weather_client"]
+        self.mock_messaging = deps["messaging_client"]
+        self.mock_calculator = deps["weather_calculator"]
+        self.mock_jma_client = deps["jma_client"]
+        self.mock_jma_area_mapper = deps["jma_area_mapper"]
+
+    def _make_usecase(self, **kwargs) -> BroadcastWeatherUseCase:
+        return BroadcastWeatherUseCase(
+            user_repository=self.mock_user_repo,
+            weather_client=self.mock_weather_client,
+            messaging_client=self.mock_messaging,
+            weather_calculator=self.mock_calculator,
+            jma_client=self.mock_jma_client,
+            jma_area_mapper=self.mock_jma_area_mapper,
+            **kwargs,
+        )
+
+
 class TestBroadcastWeatherUseCase:
     def setup_method(self):
         self.mock_user_repo = MagicMock()
         self.mock_weather_client = MagicMock()
         self.mock_messaging = MagicMock()
+        self.mock_messaging.multicast_message.return_value = []
         self.mock_calculator = MagicMock()
         self.mock_jma_client = MagicMock()
         self.mock_jma_area_mapper = MagicMock()
@@ -31,7 +95,7 @@ class TestBroadcastWeatherUseCase:
 
     def test_broadcast_single_user(self):
         user = _make_user("U1234", "渋谷区", 35.6619, 139.7041)
-        self.mock_user_repo.get_all_users.return_value = [user]
+        self.mock_user_repo.iter_users.return_value = iter([user])
         self.mock_weather_client.get_hourly_weather.return_value = [{"dt": 0, "temp": 20.0}]
         self.mock_jma_area_mapper.find_codes.return_value = ("130000", "130010")
         self.mock_jma_client.get_pops.return_value = [{"time": None, "pop": 50}]
@@ -43,8 +107,9 @@ class TestBroadcastWeatherUseCase:
         self.mock_jma_area_mapper.find_codes.assert_called_once_with("渋谷区")
         self.mock_jma_client.get_pops.assert_called_once_with("130000", "130010")
         self.mock_calculator.calculate.assert_called_once()
-        self.mock_messaging.push_message.assert_called_once()
-        message = self.mock_messaging.push_message.call_args[0][1]
+        self.mock_messaging.multicast_message.assert_called_once()
+        assert self.mock_messaging.multicast_message.call_args[0][0] == ["U1234"]
+        message = self.mock_messaging.multicast_message.call_args[0][1]
         assert "渋谷区" in message
         assert "25.0" in message
         assert "18.0" in message
@@ -54,7 +119,7 @@ class TestBroadcastWeatherUseCase:
         user1 = _make_user("U1", "渋谷区", 35.6619, 139.7041)
         user2 = _make_user("U2", "渋谷区", 35.6619, 139.7041)
         user3 = _make_user("U3", "新宿区", 35.6938, 139.7034)
-        self.mock_user_repo.get_all_users.return_value = [user1, user2, user3]
+        self.mock_user_repo.iter_users.return_value = iter([user1, user2, user3])
         self.mock_weather_client.get_hourly_weather.return_value = [{"dt": 0, "temp": 20.0}]
         self.mock_jma_area_mapper.find_codes.return_value = ("130000", "130010")
         self.mock_jma_client.get_pops.return_value = [{"time": None, "pop": 50}]
@@ -63,20 +128,22 @@ class TestBroadcastWeatherUseCase:
         self.usecase.execute()
 
         assert self.mock_weather_client.get_hourly_weather.call_count == 2
-        assert self.mock_messaging.push_message.call_count == 3
+        assert self.mock_messaging.multicast_message.call_count == 2
+        recipients = [call.args[0] for call in self.mock_messaging.multicast_message.call_args_list]
+        assert recipients == [["U1", "U2"], ["U3"]]
 
     def test_no_users(self):
-        self.mock_user_repo.get_all_users.return_value = []
+        self.mock_user_repo.iter_users.return_value = iter([])
 
         self.usecase.execute()
 
         self.mock_weather_client.get_hourly_weather.assert_not_called()
-        self.mock_messaging.push_message.assert_not_called()
+        self.mock_messaging.multicast_message.assert_not_called()
 
     def test_weather_api_failure_skips_group(self):
         user1 = _make_user("U1", "渋谷区", 35.6619, 139.7041)
         user2 = _make_user("U2", "新宿区", 35.6938, 139.7034)
-        self.mock_user_repo.get_all_users.return_value = [user1, user2]
+        self.mock_user_repo.iter_users.return_value = iter([user1, user2])
 
         def side_effect(lat, lon):
             if lat == 35.6619:
@@ -90,13 +157,13 @@ class TestBroadcastWeatherUseCase:
 
         self.usecase.execute()
 
-        assert self.mock_messaging.push_message.call_count == 1
-        assert self.mock_messaging.push_message.call_args[0][0] == "U2"
+        assert self.mock_messaging.multicast_message.call_count == 1
+        assert self.mock_messaging.multicast_message.call_args[0][0] == ["U2"]
 
     def test_jma_api_failure_skips_group(self):
         user1 = _make_user("U1", "渋谷区", 35.6619, 139.7041)
         user2 = _make_user("U2", "新宿区", 35.6938, 139.7034)
-        self.mock_user_repo.get_all_users.return_value = [user1, user2]
+        self.mock_user_repo.iter_users.return_value = iter([user1, user2])
         self.mock_weather_client.get_hourly_weather.return_value = [{"dt": 0, "temp": 20.0}]
 
         def find_codes_side_effect(city_name):
@@ -110,30 +177,28 @@ class TestBroadcastWeatherUseCase:
 
         self.usecase.execute()
 
-        assert self.mock_messaging.push_message.call_count == 1
-        assert self.mock_messaging.push_message.call_args[0][0] == "U2"
+        assert self.mock_messaging.multicast_message.call_count == 1
+        assert self.mock_messaging.multicast_message.call_args[0][0] == ["U2"]
 
-    def test_push_message_failure_skips_user(self):
+    def test_multicast_failure_counts_users(self):
         user1 = _make_user("U1", "渋谷区", 35.6619, 139.7041)
         user2 = _make_user("U2", "渋谷区", 35.6619, 139.7041)
-        self.mock_user_repo.get_all_users.return_value = [user1, user2]
+        self.mock_user_repo.iter_users.return_value = iter([user1, user2])
         self.mock_weather_client.get_hourly_weather.return_value = [{"dt": 0, "temp": 20.0}]
         self.mock_jma_area_mapper.find_codes.return_value = ("130000", "130010")
         self.mock_jma_client.get_pops.return_value = [{"time": None, "pop": 50}]
         self.mock_calculator.calculate.return_value = Weather(max_temp=25.0, min_temp=18.0, pop=50)
 
-        self.mock_messaging.push_message.side_effect = [
-            MessagingException("送信失敗"),
-            None,
-        ]
+        self.mock_messaging.multicast_message.return_value = ["U1"]
 
-        self.usecase.execute()
+        result = self.usecase.execute()
 
-        assert self.mock_messaging.push_message.call_count == 2
+        self.mock_messaging.multicast_message.assert_called_once()
+        assert result == BroadcastResult(success_count=1, failure_count=1)
 
     def test_calculator_failure_skips_group(self):
         user = _make_user("U1", "渋谷区", 35.6619, 139.7041)
-        self.mock_user_repo.get_all_users.return_value = [user]
+        self.mock_user_repo.iter_users.return_value = iter([user])
         self.mock_weather_client.get_hourly_weather.return_value = []
         self.mock_jma_area_mapper.find_codes.return_value = ("130000", "130010")
         self.mock_jma_client.get_pops.return_value = [{"time": None, "pop": 50}]
@@ -141,4 +206,553 @@ class TestBroadcastWeatherUseCase:
 
         self.usecase.execute()
 
-        self.mock_messaging.push_message.assert_not_called()
+        self.mock_messaging.multicast_message.assert_not_called()
+
+    def test_execute_returns_result_counts(self):
+        user1 = _make_user("U1", "渋谷区", 35.6619, 139.7041)
+        user2 = _make_user("U2", "新宿区", 35.6938, 139.7034)
+        user3 = _make_user("U3", "新宿区", 35.6938, 139.7034)
+        self.mock_user_repo.iter_users.return_value = iter([user1, user2, user3])
+
+        def side_effect(lat, lon):
+            if lat == 35.6938:
+                raise WeatherAPIException("API error")
+            return [{"dt": 0, "temp": 20.0}]
+
+        self.mock_weather_client.get_hourly_weather.side_effect = side_effect
+        self.mock_jma_area_mapper.find_codes.return_value = ("130000", "130010")
+        self.mock_jma_client.get_pops.return_value = [{"time": None, "pop": 50}]
+        self.mock_calculator.calculate.return_value = Weather(max_temp=25.0, min_temp=18.0, pop=50)
+
+        result = self.usecase.execute()
+
+        assert result == BroadcastResult(success_count=1, failure_count=2)
+
+    def test_invalid_max_workers_raises(self):
+        with pytest.raises(ValueError, match="max_workers"):
+            BroadcastWeatherUseCase(
+                user_repository=self.mock_user_repo,
+                weather_client=self.mock_weather_client,
+                messaging_client=self.mock_messaging,
+                weather_calculator=self.mock_calculator,
+                jma_client=self.mock_jma_client,
+                jma_area_mapper=self.mock_jma_area_mapper,
+                max_workers=0,
+            )
+
+
+class _InFlightCounter:
+    """同時に実行中の呼び出しの最大数（peak）を記録する
+
+    呼び出しは2件が同時に実行中になるまで待つ（逐次実行では timeout 秒で待つのをやめる）。
+    """
+
+    def __init__(self, timeout: float = 1.0) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._overlapped = threading.Event()
+
+    def __enter__(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            if self.in_flight >= 2:
+                self._overlapped.set()
+        self._overlapped.wait(self.timeout)
+
+    def __exit__(self, *exc_info) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+class TestBroadcastWeatherUseCaseConcurrent:
+    """max_workers > 1 の並行実行モード"""
+
+    def _make_usecase(
+        self, max_workers: int, in_flight: _InFlightCounter | None = None
+    ) -> tuple[BroadcastWeatherUseCase, MagicMock]:
+        users = [
+            _make_user(f"U{i}", city, lat, lon)
+            for i, (city, lat, lon) in enumerate(
+                [
+                    ("渋谷区", 35.6619, 139.7041),
+                    ("新宿区", 35.6938, 139.7034),
+                    ("渋谷区", 35.6619, 139.7041),
+                    ("川崎市", 35.5309, 139.7029),
+                    ("横浜市", 35.4437, 139.6380),
+                    ("新宿区", 35.6938, 139.7034),
+                ]
+            )
+        ]
+        deps = _stub_dependencies()
+        deps["user_repository"].iter_users.return_value = iter(users)
+
+        def get_hourly_weather(lat, lon):
+            if in_flight is not None:
+                with in_flight:
+                    pass
+            if lat == 35.5309:
+                raise WeatherAPIException("API error")
+            return [{"time": "2026-02-03 12:00", "temp": lat - 20}]
+
+        deps["weather_client"].get_hourly_weather.side_effect = get_hourly_weather
+
+        def find_codes(city_name):
+            if city_name == "横浜市":
+                raise JMAAPIException("JMA error")
+            return ("130000", "130010")
+
+        deps["jma_area_mapper"].find_codes.side_effect = find_codes
+        deps["jma_client"].get_pops.return_value = [{"time": None, "pop": 40}]
+        deps["weather_calculator"].calculate.side_effect = lambda hourly, pops: Weather(
+            max_temp=round(hourly[0]["temp"]), min_temp=round(hourly[0]["temp"]), pop=pops[0]["pop"]
+        )
+        return BroadcastWeatherUseCase(**deps, max_workers=max_workers), deps["messaging_client"]
+
+    def test_results_identical_to_sequential(self):
+        sequential, sequential_messaging = self._make_usecase(max_workers=1)
+        concurrent, concurrent_messaging = self._make_usecase(max_workers=4)
+
+        sequential_result = sequential.execute()
+        concurrent_result = concurrent.execute()
+
+        assert concurrent_result == sequential_result
+        assert concurrent_result == BroadcastResult(success_count=4, failure_count=2)
+        assert (
+            concurrent_messaging.multicast_message.call_args_list
+            == sequential_messaging.multicast_message.call_args_list
+        )
+
+    def test_fetches_run_concurrently(self):
+        in_flight = _InFlightCounter()
+        usecase, _ = self._make_usecase(max_workers=4, in_flight=in_flight)
+
+        result = usecase.execute()
+
+        assert result == BroadcastResult(success_count=4, failure_count=2)
+        # 複数地点の天気取得が重なり、同時に実行中の数はワーカー数を超えない
+        assert 2 <= in_flight.peak <= 4
+
+
+class TestBroadcastWeatherUseCaseStreaming(_StubbedDependencies):
+    """ユーザーを逐次読み込みながら配信するモード"""
+
+    def _recipients(self) -> list[list[str]]:
+        return [call.args[0] for call in self.mock_messaging.multicast_message.call_args_list]
+
+    def test_full_batch_delivered_while_streaming(self):
+        delivered_before_end = []
+
+        def users():
+            for i in range(5):
+                yield _make_user(f"U{i}", "渋谷区", 35.6619, 139.7041)
+            delivered_before_end.extend(self._recipients())
+
+        self.mock_user_repo.iter_users.side_effect = users
+
+        result = self._make_usecase(batch_size=2).execute()
+
+        assert delivered_before_end == [["U0", "U1"], ["U2", "U3"]]
+        assert self._recipients() == [["U0", "U1"], ["U2", "U3"], ["U4"]]
+        assert result == BroadcastResult(success_count=5, failure_count=0)
+        self.mock_weather_client.get_hourly_weather.assert_called_once()
+
+    def test_pending_limit_flushes_all_groups(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "新宿区", 35.6938, 139.7034),
+                _make_user("U3", "渋谷区", 35.6619, 139.7041),
+                _make_user("U4", "新宿区", 35.6938, 139.7034),
+            ]
+        )
+
+        self._make_usecase(max_pending_users=2).execute()
+
+        assert self._recipients() == [["U1"], ["U2"], ["U3"], ["U4"]]
+
+    def test_failed_location_skips_every_batch(self):
+        self.mock_weather_client.get_hourly_weather.side_effect = WeatherAPIException("API error")
+        self.mock_user_repo.iter_users.return_value = iter(
+            [_make_user(f"U{i}", "渋谷区", 35.6619, 139.7041) for i in range(5)]
+        )
+
+        result = self._make_usecase(batch_size=2).execute()
+
+        assert result == BroadcastResult(success_count=0, failure_count=5)
+        self.mock_weather_client.get_hourly_weather.assert_called_once()
+        self.mock_messaging.multicast_message.assert_not_called()
+
+
+class TestBroadcastWeatherUseCaseLocationIndex(_StubbedDependencies):
+    """地点インデックスから地点単位で読み込むモード"""
+
+    def setup_method(self):
+        super().setup_method()
+        self.usecase = self._make_usecase(max_workers=2, use_location_index=True)
+
+    @staticmethod
+    def _group(city_name: str, lat: float, lon: float, *user_ids: str) -> LocationGroup:
+        return LocationGroup(
+            location=Location(city_name=city_name, latitude=lat, longitude=lon),
+            user_ids=user_ids,
+        )
+
+    def test_delivers_each_group_without_scanning_users(self):
+        self.mock_user_repo.iter_location_groups.return_value = iter(
+            [
+                self._group("渋谷区", 35.6619, 139.7041, "U1", "U2"),
+                self._group("新宿区", 35.6938, 139.7034, "U3"),
+                self._group("大阪市", 34.6937, 135.5023, "U4"),
+            ]
+        )
+
+        result = self.usecase.execute()
+
+        assert result == BroadcastResult(success_count=4, failure_count=0)
+        recipients = [call.args[0] for call in self.mock_messaging.multicast_message.call_args_list]
+        assert recipients == [["U1", "U2"], ["U3"], ["U4"]]
+        assert "新宿区" in self.mock_messaging.multicast_message.call_args_list[1].args[1]
+        assert self.mock_weather_client.get_hourly_weather.call_count == 3
+        self.mock_user_repo.iter_users.assert_not_called()
+
+    def test_failed_group_counts_as_failure(self):
+        self.mock_weather_client.get_hourly_weather.side_effect = [
+            WeatherAPIException("API error"),
+            [{"dt": 0, "temp": 20.0}],
+        ]
+        self.mock_user_repo.iter_location_groups.return_value = iter(
+            [
+                self._group("渋谷区", 35.6619, 139.7041, "U1", "U2"),
+                self._group("新宿区", 35.6938, 139.7034, "U3"),
+            ]
+        )
+        self.usecase.max_workers = 1
+
+        result = self.usecase.execute()
+
+        assert result == BroadcastResult(success_count=1, failure_count=2)
+
+    def test_no_groups(self):
+        self.mock_user_repo.iter_location_groups.return_value = iter([])
+
+        assert self.usecase.execute() == BroadcastResult()
+        self.mock_weather_client.get_hourly_weather.assert_not_called()
+
+
+class TestBroadcastWeatherUseCaseDedup(_StubbedDependencies):
+    """WeatherAPI 取得の集約単位"""
+
+    def _messages(self) -> dict[str, list[str]]:
+        return {call.args[1]: call.args[0] for call in self.mock_messaging.multicast_message.call_args_list}
+
+    def test_exact_policy_fetches_each_coordinate(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.66190, 139.70410),
+                _make_user("U2", "渋谷区", 35.66191, 139.70412),
+            ]
+        )
+
+        self._make_usecase().execute()
+
+        assert self.mock_weather_client.get_hourly_weather.call_count == 2
+
+    def test_grid_policy_collapses_nearby_coordinates(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.66190, 139.70410),
+                _make_user("U2", "渋谷区", 35.66191, 139.70412),
+                _make_user("U3", "新宿区", 35.6938, 139.7034),
+            ]
+        )
+
+        result = self._make_usecase(dedup_policy=DedupPolicy.GRID, grid_size=0.01).execute()
+
+        assert result == BroadcastResult(success_count=3, failure_count=0)
+        assert sorted(call.args for call in self.mock_weather_client.get_hourly_weather.call_args_list) == [
+            (35.66, 139.7),
+            (35.69, 139.7),
+        ]
+        recipients = sorted(call.args[0] for call in self.mock_messaging.multicast_message.call_args_list)
+        assert recipients == [["U1", "U2"], ["U3"]]
+
+    def test_grid_policy_keeps_city_name_per_message(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "目黒区", 35.6620, 139.7040),
+            ]
+        )
+
+        self._make_usecase(dedup_policy=DedupPolicy.GRID, grid_size=0.01).execute()
+
+        self.mock_weather_client.get_hourly_weather.assert_called_once()
+        messages = self._messages()
+        assert [recipients for message, recipients in messages.items() if "渋谷区" in message] == [["U1"]]
+        assert [recipients for message, recipients in messages.items() if "目黒区" in message] == [["U2"]]
+        assert [call.args[0] for call in self.mock_jma_area_mapper.find_codes.call_args_list] == ["渋谷区", "目黒区"]
+
+    def test_area_policy_keys_on_class20_code(self):
+        self.mock_jma_area_mapper.find_class20_code.side_effect = lambda city_name: {
+            "渋谷区": "1311300",
+            "東京都渋谷区": "1311300",
+        }[city_name]
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "東京都渋谷区", 35.6640, 139.6982),
+                _make_user("U3", "渋谷区", 35.6580, 139.7016),
+            ]
+        )
+
+        result = self._make_usecase(dedup_policy=DedupPolicy.AREA).execute()
+
+        assert result == BroadcastResult(success_count=3, failure_count=0)
+        self.mock_weather_client.get_hourly_weather.assert_called_once_with(35.6619, 139.7041)
+        assert self.mock_jma_area_mapper.find_class20_code.call_count == 2
+        assert sorted(self._messages().values()) == [["U1", "U3"], ["U2"]]
+
+    def test_area_policy_falls_back_to_coordinates(self):
+        self.mock_jma_area_mapper.find_class20_code.side_effect = JMAAPIException("見つかりません")
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "渋谷区", 35.6640, 139.6982),
+            ]
+        )
+
+        self._make_usecase(dedup_policy=DedupPolicy.AREA).execute()
+
+        assert self.mock_weather_client.get_hourly_weather.call_count == 2
+
+    def test_failed_fetch_fails_every_city_in_cell(self):
+        self.mock_weather_client.get_hourly_weather.side_effect = WeatherAPIException("API error")
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "目黒区", 35.6620, 139.7040),
+            ]
+        )
+
+        result = self._make_usecase(dedup_policy=DedupPolicy.GRID).execute()
+
+        assert result == BroadcastResult(success_count=0, failure_count=2)
+        self.mock_weather_client.get_hourly_weather.assert_called_once()
+        self.mock_jma_client.get_pops.assert_not_called()
+
+    @patch("usecases.broadcast_weather.log_info")
+    def test_reports_saved_weather_api_calls(self, mock_log_info):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.66190, 139.70410),
+                _make_user("U2", "渋谷区", 35.66191, 139.70412),
+                _make_user("U3", "渋谷区", 35.66192, 139.70414),
+            ]
+        )
+
+        self._make_usecase(dedup_policy=DedupPolicy.GRID).execute()
+
+        report = next(call for call in mock_log_info.call_args_list if call.args[1] == "天気取得の集約結果")
+        assert report.kwargs == {
+            "dedup_policy": "grid",
+            "unique_locations": 3,
+            "weather_api_calls": 1,
+            "saved_weather_api_calls": 2,
+        }
+
+
+class TestBroadcastWeatherUseCaseDeliveryLedger(_StubbedDependencies):
+    """配信台帳による再実行時の再開"""
+
+    def setup_method(self):
+        super().setup_method()
+        self.mock_ledger = MagicMock()
+        self.mock_ledger.load.return_value = DeliveryCheckpoint()
+        self.recorded: list[str] = []
+        self.mock_ledger.record_delivered.side_effect = lambda run_date, user_ids: self.recorded.extend(user_ids)
+
+    def _make_usecase(self, **kwargs) -> BroadcastWeatherUseCase:
+        return super()._make_usecase(delivery_ledger=self.mock_ledger, run_date="2026-02-03", **kwargs)
+
+    def test_records_successful_deliveries_with_retry_key(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [_make_user("U1", "渋谷区", 35.6619, 139.7041), _make_user("U2", "渋谷区", 35.6619, 139.7041)]
+        )
+        self.mock_messaging.multicast_message.return_value = ["U2"]
+
+        result = self._make_usecase().execute()
+
+        self.mock_ledger.load.assert_called_once_with("2026-02-03")
+        assert self.mock_messaging.multicast_message.call_args.kwargs["retry_key_seed"] == "2026-02-03"
+        assert self.recorded == ["U1"]
+        self.mock_ledger.flush.assert_called_once()
+        assert result == BroadcastResult(success_count=1, failure_count=1)
+
+    def test_resume_skips_delivered_users_and_their_fetches(self):
+        self.mock_ledger.load.return_value = DeliveryCheckpoint(delivered_user_ids=frozenset({"U1", "U3"}))
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "新宿区", 35.6938, 139.7034),
+                _make_user("U3", "川崎市", 35.5309, 139.7029),
+            ]
+        )
+
+        result = self._make_usecase().execute()
+
+        self.mock_weather_client.get_hourly_weather.assert_called_once_with(35.6938, 139.7034)
+        assert self.mock_messaging.multicast_message.call_args.args[0] == ["U2"]
+        assert result == BroadcastResult(success_count=1, skipped_count=2)
+
+    def test_resume_location_groups(self):
+        self.mock_ledger.load.return_value = DeliveryCheckpoint(
+            delivered_user_ids=frozenset({"U3"}),
+            completed_groups=frozenset({"35.6619#139.7041"}),
+        )
+        groups = [
+            LocationGroup(Location(city_name="渋谷区", latitude=35.6619, longitude=139.7041), ("U1", "U2")),
+            LocationGroup(Location(city_name="新宿区", latitude=35.6938, longitude=139.7034), ("U3", "U4")),
+            LocationGroup(Location(city_name="川崎市", latitude=35.5309, longitude=139.7029), ("U5",)),
+        ]
+        self.mock_user_repo.iter_location_groups.return_value = iter(groups)
+        self.mock_messaging.multicast_message.side_effect = lambda user_ids, message, retry_key_seed: (
+            ["U5"] if "U5" in user_ids else []
+        )
+
+        result = self._make_usecase(use_location_index=True).execute()
+
+        recipients = [call.args[0] for call in self.mock_messaging.multicast_message.call_args_list]
+        # U4 は配信済みの U3 と同じチャンクで受理済みのため送らない
+        assert recipients == [["U5"]]
+        assert self.mock_weather_client.get_hourly_weather.call_count == 1
+        # 全員に配信できたグループのみ完了を記録する
+        completed = [call.args[1] for call in self.mock_ledger.record_group_completed.call_args_list]
+        assert completed == ["35.6938#139.7034"]
+        assert result == BroadcastResult(failure_count=1, skipped_count=4)
+
+    def test_resume_location_groups_reuses_chunks_and_retry_keys(self):
+        # 1チャンク目の途中まで台帳に書き込んだ時点で中断した場合
+        user_ids = tuple(f"U{i:04d}" for i in reversed(range(MULTICAST_MAX_RECIPIENTS + 100)))
+        group = LocationGroup(Location(city_name="渋谷区", latitude=35.6619, longitude=139.7041), user_ids)
+        self.mock_user_repo.iter_location_groups.side_effect = lambda: iter([group])
+
+        self._make_usecase(use_location_index=True).execute()
+        first_run = [call.args[0] for call in self.mock_messaging.multicast_message.call_args_list]
+        self.mock_messaging.multicast_message.reset_mock()
+        self.mock_ledger.load.return_value = DeliveryCheckpoint(delivered_user_ids=frozenset(first_run[0][:10]))
+        self.mock_ledger.record_group_completed.reset_mock()
+
+        result = self._make_usecase(use_location_index=True).execute()
+
+        resumed = [call.args[0] for call in self.mock_messaging.multicast_message.call_args_list]
+        # 2チャンク目は前回と同じ宛先のため、X-Line-Retry-Key も前回と一致する
+        assert _retry_keys(resumed) == _retry_keys(first_run)[1:]
+        assert result == BroadcastResult(success_count=100, skipped_count=MULTICAST_MAX_RECIPIENTS)
+        self.mock_ledger.record_group_completed.assert_called_once()
+
+    def test_flushes_ledger_when_broadcast_fails(self):
+        self.mock_user_repo.iter_users.side_effect = RuntimeError("scan failed")
+
+        with pytest.raises(RuntimeError):
+            self._make_usecase().execute()
+
+        self.mock_ledger.flush.assert_called_once()
+
+    def test_ledger_flush_error_does_not_mask_broadcast_error(self):
+        self.mock_user_repo.iter_users.side_effect = RuntimeError("scan failed")
+        self.mock_ledger.flush.side_effect = ConnectionError("ledger unavailable")
+
+        with pytest.raises(RuntimeError, match="scan failed"):
+            self._make_usecase().execute()
+
+        self.mock_ledger.flush.assert_called_once()
+
+    def test_ledger_flush_error_after_successful_broadcast_is_raised(self):
+        self.mock_user_repo.iter_users.return_value = iter([_make_user("U1", "渋谷区", 35.6619, 139.7041)])
+        self.mock_ledger.flush.side_effect = ConnectionError("ledger unavailable")
+
+        with pytest.raises(ConnectionError):
+            self._make_usecase().execute()
+
+    def test_run_date_defaults_to_today_in_jst(self):
+        self.mock_user_repo.iter_users.return_value = iter([])
+        usecase = self._make_usecase()
+        usecase.run_date = None
+
+        usecase.execute()
+
+        run_date = self.mock_ledger.load.call_args.args[0]
+        assert run_date == datetime.now(JST).date().isoformat()
+
+    def test_reused_instance_uses_each_days_date(self):
+        # ウォームスタート間で同じインスタンスを使っても、配信日と途中経過は実行ごとに決める
+        self.mock_user_repo.iter_users.side_effect = lambda: iter([])
+        self.mock_ledger.load.side_effect = [
+            DeliveryCheckpoint(delivered_user_ids=frozenset({"U1"})),
+            DeliveryCheckpoint(),
+        ]
+        usecase = self._make_usecase()
+        usecase.run_date = None
+
+        with patch("usecases.broadcast_weather.today_jst", side_effect=["2026-02-03", "2026-02-04"]):
+            usecase.execute()
+            usecase.execute()
+
+        assert [call.args[0] for call in self.mock_ledger.load.call_args_list] == ["2026-02-03", "2026-02-04"]
+        assert usecase._checkpoint == DeliveryCheckpoint()
+
+
+class TestBroadcastWeatherUseCasePrecomputed(_StubbedDependencies):
+    """事前計算済みの天気を使った配信"""
+
+    def setup_method(self):
+        super().setup_method()
+        self.mock_store = MagicMock()
+        self.usecase = self._make_usecase(forecast_store=self.mock_store, run_date="2026-02-03")
+
+    def test_uses_precomputed_weather_without_fetching(self):
+        self.mock_store.load.return_value = {
+            "35.6619,139.7041#渋谷区": Weather(max_temp=30.0, min_temp=20.0, pop=10),
+        }
+        self.mock_user_repo.iter_users.return_value = iter(
+            [_make_user("U1", "渋谷区", 35.6619, 139.7041), _make_user("U2", "渋谷区", 35.6619, 139.7041)]
+        )
+
+        result = self.usecase.execute()
+
+        self.mock_store.load.assert_called_once_with("2026-02-03")
+        self.mock_weather_client.get_hourly_weather.assert_not_called()
+        self.mock_jma_client.get_pops.assert_not_called()
+        user_ids, message = self.mock_messaging.multicast_message.call_args.args
+        assert user_ids == ["U1", "U2"]
+        assert "最高気温: 30.0℃" in message
+        assert result == BroadcastResult(success_count=2)
+
+    def test_fetches_locations_missing_from_store(self):
+        self.mock_store.load.return_value = {
+            "35.6619,139.7041#渋谷区": Weather(max_temp=30.0, min_temp=20.0, pop=10),
+        }
+        self.mock_user_repo.iter_users.return_value = iter(
+            [_make_user("U1", "渋谷区", 35.6619, 139.7041), _make_user("U2", "新宿区", 35.6938, 139.7034)]
+        )
+
+        result = self.usecase.execute()
+
+        self.mock_weather_client.get_hourly_weather.assert_called_once_with(35.6938, 139.7034)
+        assert result == BroadcastResult(success_count=2)
+
+    @patch("usecases.broadcast_weather.log_info")
+    def test_reports_precomputed_forecasts(self, mock_log_info):
+        self.mock_store.load.return_value = {
+            "35.6619,139.7041#渋谷区": Weather(max_temp=30.0, min_temp=20.0, pop=10),
+        }
+        self.mock_user_repo.iter_users.return_value = iter([_make_user("U1", "渋谷区", 35.6619, 139.7041)])
+
+        self.usecase.execute()
+
+        report = next(call for call in mock_log_info.call_args_list if call.args[1] == "天気取得の集約結果")
+        assert report.kwargs["precomputed_forecasts"] == 1
+        assert report.kwargs["weather_api_calls"] == 0
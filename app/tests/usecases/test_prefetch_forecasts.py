@@ -0,0 +1,102 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from domain.entities.user import User
+from domain.value_objects.location import Location
+from domain.value_objects.location_group import LocationGroup
+from domain.value_objects.weather import Weather
+from infrastructure.exceptions import WeatherAPIException
+from usecases.broadcast_weather import DedupPolicy
+from usecases.prefetch_forecasts import PrefetchForecastsUseCase
+
+
+def _make_user(user_id: str, city_name: str, lat: float, lon: float) -> User:
+    location = Location(city_name=city_name, latitude=lat, longitude=lon)
+    return User(user_id=user_id, location=location)
+
+
+class TestPrefetchForecastsUseCase:
+    def setup_method(self):
+        self.mock_user_repo = MagicMock()
+        self.mock_weather_client = MagicMock()
+        self.mock_weather_client.get_hourly_weather.return_value = [{"dt": 0, "temp": 20.0}]
+        self.mock_jma_area_mapper = MagicMock()
+        self.mock_jma_area_mapper.find_codes.return_value = ("130000", "130010")
+        self.mock_jma_client = MagicMock()
+        self.mock_jma_client.get_pops.return_value = [{"time": None, "pop": 50}]
+        self.mock_calculator = MagicMock()
+        self.mock_calculator.calculate.return_value = Weather(max_temp=25.0, min_temp=18.0, pop=50)
+        self.mock_store = MagicMock()
+
+    def _make_usecase(self, **kwargs) -> PrefetchForecastsUseCase:
+        return PrefetchForecastsUseCase(
+            user_repository=self.mock_user_repo,
+            weather_client=self.mock_weather_client,
+            weather_calculator=self.mock_calculator,
+            jma_client=self.mock_jma_client,
+            jma_area_mapper=self.mock_jma_area_mapper,
+            forecast_store=self.mock_store,
+            run_date="2026-02-03",
+            **kwargs,
+        )
+
+    def test_saves_one_forecast_per_group(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [
+                _make_user("U1", "渋谷区", 35.6619, 139.7041),
+                _make_user("U2", "渋谷区", 35.6619, 139.7041),
+                _make_user("U3", "新宿区", 35.6938, 139.7034),
+            ]
+        )
+
+        count = self._make_usecase().execute()
+
+        assert count == 2
+        assert self.mock_weather_client.get_hourly_weather.call_count == 2
+        self.mock_store.save.assert_called_once_with(
+            "2026-02-03",
+            {
+                "35.6619,139.7041#渋谷区": Weather(max_temp=25.0, min_temp=18.0, pop=50),
+                "35.6938,139.7034#新宿区": Weather(max_temp=25.0, min_temp=18.0, pop=50),
+            },
+        )
+
+    def test_reads_locations_from_index_with_dedup_policy(self):
+        self.mock_user_repo.iter_location_groups.return_value = iter(
+            [
+                LocationGroup(Location(city_name="渋谷区", latitude=35.66190, longitude=139.70410), ("U1",)),
+                LocationGroup(Location(city_name="渋谷区", latitude=35.66191, longitude=139.70412), ("U2", "U3")),
+            ]
+        )
+
+        count = self._make_usecase(use_location_index=True, dedup_policy=DedupPolicy.GRID, max_workers=2).execute()
+
+        assert count == 1
+        self.mock_user_repo.iter_users.assert_not_called()
+        self.mock_weather_client.get_hourly_weather.assert_called_once_with(35.66, 139.7)
+        assert list(self.mock_store.save.call_args.args[1]) == ["35.66,139.7#渋谷区"]
+
+    def test_failed_locations_are_not_saved(self):
+        self.mock_user_repo.iter_users.return_value = iter(
+            [_make_user("U1", "渋谷区", 35.6619, 139.7041), _make_user("U2", "新宿区", 35.6938, 139.7034)]
+        )
+        self.mock_weather_client.get_hourly_weather.side_effect = [
+            WeatherAPIException("API error"),
+            [{"dt": 0, "temp": 20.0}],
+        ]
+
+        count = self._make_usecase().execute()
+
+        assert count == 1
+        assert list(self.mock_store.save.call_args.args[1]) == ["35.6938,139.7034#新宿区"]
+
+    def test_no_locations(self):
+        self.mock_user_repo.iter_users.return_value = iter([])
+
+        assert self._make_usecase().execute() == 0
+        self.mock_store.save.assert_not_called()
+
+    def test_invalid_max_workers(self):
+        with pytest.raises(ValueError):
+            self._make_usecase(max_workers=0)
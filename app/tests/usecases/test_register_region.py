@@ -1,7 +1,11 @@
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import MagicMock
+
+import pytest
 
 from domain.entities.user import User
 from domain.value_objects.location import Location
+from domain.value_objects.region_registration import RegionRegistration
 from infrastructure.exceptions import GeocodingAmbiguousException, GeocodingNotFoundException
 from usecases.register_region import RegisterRegionUseCase
 
@@ -81,3 +85,96 @@ class TestRegisterRegionUseCase:
         self.mock_user_repo.save.assert_not_called()
         reply_text = self.mock_messaging.reply_message.call_args[0][1]
         assert "エラーが発生しました" in reply_text
+
+    def test_save_error_replies_error(self):
+        self.mock_geocoding.get_coordinates.return_value = (35.6619, 139.7041, "渋谷区")
+        self.mock_user_repo.find_by_id.return_value = None
+        self.mock_user_repo.save.side_effect = RuntimeError("DynamoDB error")
+
+        self.usecase.execute("U1234", "渋谷区", "reply-token")
+
+        self.mock_messaging.reply_message.assert_called_once_with(
+            "reply-token", "エラーが発生しました。しばらくしてからもう一度お試しください。"
+        )
+
+
+class TestRegisterRegionUseCaseExecuteAll:
+    def setup_method(self):
+        self.mock_user_repo = MagicMock()
+        self.mock_user_repo.find_by_id.return_value = None
+        self.mock_geocoding = MagicMock()
+        self.mock_messaging = MagicMock()
+        self.saved: list[tuple[str, str]] = []
+        self.mock_user_repo.save.side_effect = lambda user: self.saved.append((user.user_id, user.location.city_name))
+
+    def _make_usecase(self, max_workers: int) -> RegisterRegionUseCase:
+        return RegisterRegionUseCase(
+            user_repository=self.mock_user_repo,
+            geocoding_client=self.mock_geocoding,
+            messaging_client=self.mock_messaging,
+            max_workers=max_workers,
+        )
+
+    def test_keeps_order_per_user(self):
+        # 先に受け付けた依頼ほど住所検索を遅くし、並行実行で順序が入れ替わらないことを確認する
+        delays = {"渋谷区": 0.03, "新宿区": 0.0, "横浜市": 0.02, "川崎市": 0.0}
+
+        def get_coordinates(city_name):
+            time.sleep(delays[city_name])
+            return 35.0, 139.0, city_name
+
+        self.mock_geocoding.get_coordinates.side_effect = get_coordinates
+        registrations = [
+            RegionRegistration("U1", "渋谷区", "r1"),
+            RegionRegistration("U2", "横浜市", "r2"),
+            RegionRegistration("U1", "新宿区", "r3"),
+            RegionRegistration("U2", "川崎市", "r4"),
+        ]
+
+        failed = self._make_usecase(max_workers=4).execute_all(registrations)
+
+        assert failed == []
+        assert [city for user, city in self.saved if user == "U1"] == ["渋谷区", "新宿区"]
+        assert [city for user, city in self.saved if user == "U2"] == ["横浜市", "川崎市"]
+
+    def test_failure_skips_later_registrations_of_same_user(self):
+        self.mock_geocoding.get_coordinates.side_effect = lambda city_name: (35.0, 139.0, city_name)
+
+        def save(user):
+            if user.location.city_name == "渋谷区":
+                raise RuntimeError("DynamoDB error")
+            self.saved.append((user.user_id, user.location.city_name))
+
+        self.mock_user_repo.save.side_effect = save
+        registrations = [
+            RegionRegistration("U1", "渋谷区", "r1"),
+            RegionRegistration("U2", "横浜市", "r2"),
+            RegionRegistration("U1", "新宿区", "r3"),
+        ]
+
+        failed = self._make_usecase(max_workers=2).execute_all(registrations)
+
+        assert failed == [0, 2]
+        assert self.saved == [("U2", "横浜市")]
+        # 失敗した依頼には返信せず、呼び出し元の再試行に任せる
+        assert [call.args[0] for call in self.mock_messaging.reply_message.call_args_list] == ["r2"]
+
+    def test_reply_failure_is_returned(self):
+        self.mock_geocoding.get_coordinates.return_value = (35.0, 139.0, "渋谷区")
+        self.mock_messaging.reply_message.side_effect = RuntimeError("LINE error")
+
+        failed = self._make_usecase(max_workers=1).execute_all([RegionRegistration("U1", "渋谷区", "r1")])
+
+        assert failed == [0]
+
+    def test_not_found_is_not_a_failure(self):
+        self.mock_geocoding.get_coordinates.side_effect = GeocodingNotFoundException("地名が見つかりません")
+
+        failed = self._make_usecase(max_workers=1).execute_all([RegionRegistration("U1", "あああ", "r1")])
+
+        assert failed == []
+        assert "見つかりませんでした" in self.mock_messaging.reply_message.call_args[0][1]
+
+    def test_invalid_max_workers(self):
+        with pytest.raises(ValueError):
+            self._make_usecase(max_workers=0)
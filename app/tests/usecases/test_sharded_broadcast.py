@@ -0,0 +1,142 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from domain.entities.user import User
+from domain.repositories.broadcast_run_repository import BroadcastRunRepository
+from domain.value_objects.broadcast_shard import BroadcastRunProgress, BroadcastShard
+from domain.value_objects.location import Location
+from domain.value_objects.weather import Weather
+from infrastructure.sqs.shard_queue import InMemoryShardQueue, decode_shard
+from usecases.broadcast_weather import BroadcastResult, BroadcastWeatherUseCase
+from usecases.sharded_broadcast import BroadcastShardUseCase, DispatchBroadcastShardsUseCase
+
+
+class _InMemoryRunRepository(BroadcastRunRepository):
+    def __init__(self) -> None:
+        self.runs: dict[str, dict] = {}
+
+    def start_run(self, run_id: str, shard_count: int) -> None:
+        self.runs[run_id] = {"shard_count": shard_count, "shards": set(), "success": 0, "failure": 0}
+
+    def record_shard_result(
+        self, run_id: str, shard_index: int, success_count: int, failure_count: int
+    ) -> BroadcastRunProgress:
+        run = self.runs[run_id]
+        if shard_index not in run["shards"]:
+            run["shards"].add(shard_index)
+            run["success"] += success_count
+            run["failure"] += failure_count
+        return BroadcastRunProgress(
+            run_id=run_id,
+            shard_count=run["shard_count"],
+            completed_shards=len(run["shards"]),
+            success_count=run["success"],
+            failure_count=run["failure"],
+        )
+
+
+class TestDispatchBroadcastShardsUseCase:
+    def test_dispatch_registers_run_then_enqueues_shards(self):
+        queue = InMemoryShardQueue()
+        run_repository = _InMemoryRunRepository()
+
+        shards = DispatchBroadcastShardsUseCase(queue, run_repository, shard_count=3).execute("run-1")
+
+        assert shards == [BroadcastShard("run-1", index, 3) for index in range(3)]
+        assert run_repository.runs["run-1"]["shard_count"] == 3
+        assert [decode_shard(queue.receive()) for _ in range(len(queue))] == shards
+        assert queue.receive() is None
+
+    def test_invalid_shard_count_raises(self):
+        with pytest.raises(ValueError, match="shard_count"):
+            DispatchBroadcastShardsUseCase(InMemoryShardQueue(), _InMemoryRunRepository(), shard_count=0)
+
+
+class TestBroadcastShardUseCase:
+    def test_records_shard_result(self):
+        broadcast = MagicMock()
+        broadcast.execute.return_value = BroadcastResult(success_count=5, failure_count=1)
+        run_repository = _InMemoryRunRepository()
+        run_repository.start_run("run-1", 2)
+        shard = BroadcastShard("run-1", 1, 2)
+        factory = MagicMock(return_value=broadcast)
+
+        progress = BroadcastShardUseCase(factory, run_repository).execute(shard)
+
+        factory.assert_called_once_with(shard)
+        assert progress == BroadcastRunProgress("run-1", 2, 1, 5, 1)
+        assert not progress.is_complete
+
+
+class TestShardedBroadcastEndToEnd:
+    """コーディネーター → プロセス内キュー → ワーカーの流れで、全ユーザーに1回ずつ配信されること"""
+
+    USERS = [
+        User(user_id=f"U{i}", location=Location(city_name=city, latitude=lat, longitude=lon))
+        for i, (city, lat, lon) in enumerate(
+            [
+                ("渋谷区", 35.6619, 139.7041),
+                ("新宿区", 35.6938, 139.7034),
+                ("渋谷区", 35.6619, 139.7041),
+                ("川崎市", 35.5309, 139.7029),
+                ("横浜市", 35.4437, 139.6380),
+                ("新宿区", 35.6938, 139.7034),
+                ("横浜市", 35.4437, 139.6380),
+            ]
+        )
+    ]
+
+    def setup_method(self):
+        self.messaging = MagicMock()
+        self.messaging.multicast_message.side_effect = lambda user_ids, message: [u for u in user_ids if u == "U3"]
+        self.weather_client = MagicMock()
+        self.weather_client.get_hourly_weather.return_value = [{"dt": 0, "temp": 20.0}]
+        self.calculator = MagicMock()
+        self.calculator.calculate.return_value = Weather(max_temp=25.0, min_temp=18.0, pop=50)
+        self.jma_client = MagicMock()
+        self.jma_client.get_pops.return_value = [{"time": None, "pop": 50}]
+        self.jma_area_mapper = MagicMock()
+        self.jma_area_mapper.find_codes.return_value = ("130000", "130010")
+
+    def _create_broadcast(self, shard: BroadcastShard) -> BroadcastWeatherUseCase:
+        # Scan セグメントの代わりに、ユーザーの並び順で shard.count 個に振り分ける
+        user_repository = MagicMock()
+        user_repository.iter_users.return_value = iter(self.USERS[shard.index :: shard.count])
+        return BroadcastWeatherUseCase(
+            user_repository=user_repository,
+            weather_client=self.weather_client,
+            messaging_client=self.messaging,
+            weather_calculator=self.calculator,
+            jma_client=self.jma_client,
+            jma_area_mapper=self.jma_area_mapper,
+        )
+
+    def test_shards_cover_all_users_and_aggregate(self):
+        queue = InMemoryShardQueue()
+        run_repository = _InMemoryRunRepository()
+        DispatchBroadcastShardsUseCase(queue, run_repository, shard_count=3).execute("run-1")
+
+        worker = BroadcastShardUseCase(self._create_broadcast, run_repository)
+        progresses = []
+        while (body := queue.receive()) is not None:
+            progresses.append(worker.execute(decode_shard(body)))
+
+        delivered = sorted(
+            user_id for call in self.messaging.multicast_message.call_args_list for user_id in call.args[0]
+        )
+        assert delivered == sorted(user.user_id for user in self.USERS)
+        assert [progress.is_complete for progress in progresses] == [False, False, True]
+        assert progresses[-1] == BroadcastRunProgress("run-1", 3, 3, success_count=6, failure_count=1)
+
+    def test_redelivered_shard_is_counted_once(self):
+        queue = InMemoryShardQueue()
+        run_repository = _InMemoryRunRepository()
+        DispatchBroadcastShardsUseCase(queue, run_repository, shard_count=2).execute("run-1")
+        worker = BroadcastShardUseCase(self._create_broadcast, run_repository)
+        first = decode_shard(queue.receive())
+
+        worker.execute(first)
+        progress = worker.execute(first)
+
+        assert progress.completed_shards == 1
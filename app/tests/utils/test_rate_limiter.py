@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from utils.rate_limiter import TokenBucket
+
+
+class _FakeClock:
+    """timer と sleep を兼ねる仮想時計（sleep すると時刻が進む）"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def timer(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def setup_method(self):
+        self.clock = _FakeClock()
+        self.bucket = TokenBucket(rate=10, timer=self.clock.timer, sleep=self.clock.sleep)
+
+    def test_paces_requests_at_rate(self):
+        for _ in range(11):
+            self.bucket.acquire()
+
+        # 初回はバケットの1トークンを使い、以降は 0.1 秒ごとに払い出す
+        assert self.clock.now == pytest.approx(1.0)
+        assert self.clock.sleeps == pytest.approx([0.1] * 10)
+
+    def test_no_wait_after_idle(self):
+        self.bucket.acquire()
+        self.clock.now += 5
+
+        assert self.bucket.acquire() == 0
+
+    def test_capacity_allows_burst(self):
+        bucket = TokenBucket(rate=10, capacity=5, timer=self.clock.timer, sleep=self.clock.sleep)
+
+        for _ in range(5):
+            assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(0.1)
+
+    def test_pause_blocks_and_discards_tokens(self):
+        bucket = TokenBucket(rate=10, capacity=5, timer=self.clock.timer, sleep=self.clock.sleep)
+
+        bucket.pause(2.0)
+
+        # 停止明けにバーストせず、レートどおりに再開する
+        assert bucket.acquire() == pytest.approx(2.1)
+        assert bucket.acquire() == pytest.approx(0.1)
+
+    def test_shorter_pause_does_not_shorten_existing_pause(self):
+        self.bucket.pause(3.0)
+        self.bucket.pause(1.0)
+
+        assert self.bucket.acquire() == pytest.approx(3.1)
+
+    def test_thread_safe_reservations(self):
+        # 時刻を止めた状態で 4 スレッドから合計 100 件を予約し、予約ごとの待機時間が重複しないことを確かめる
+        sleeps: list[float] = []
+        bucket = TokenBucket(rate=1000, timer=lambda: 0.0, sleep=sleeps.append)
+
+        def worker():
+            for _ in range(25):
+                bucket.acquire()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 最初の1件はバケットのトークンを使い、以降は 0.001 秒ずつずれた時刻を予約する
+        assert sorted(sleeps) == pytest.approx([i / 1000 for i in range(1, 100)])
+
+    def test_invalid_rate_raises(self):
+        with pytest.raises(ValueError, match="rate"):
+            TokenBucket(rate=0)
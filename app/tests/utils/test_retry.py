@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from utils.retry import async_retry, retry
+
+
+class TestRetry:
+    @patch("utils.retry.time.sleep")
+    def test_retries_until_success(self, mock_sleep):
+        func = MagicMock(side_effect=[RuntimeError("1"), RuntimeError("2"), "ok"])
+
+        assert retry(max_attempts=3, backoff=[1, 2])(func)() == "ok"
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2]
+
+    @patch("utils.retry.time.sleep")
+    def test_raises_after_max_attempts(self, mock_sleep):
+        func = MagicMock(side_effect=RuntimeError("error"))
+
+        with pytest.raises(RuntimeError):
+            retry(max_attempts=3)(func)()
+        assert func.call_count == 3
+
+    @patch("utils.retry.time.sleep")
+    def test_giveup_raises_immediately(self, mock_sleep):
+        func = MagicMock(side_effect=KeyError("deterministic"))
+
+        with pytest.raises(KeyError):
+            retry(max_attempts=3, giveup=(KeyError,))(func)()
+        func.assert_called_once()
+        mock_sleep.assert_not_called()
+
+
+class TestAsyncRetry:
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_retries_until_success(self, mock_sleep):
+        func = AsyncMock(side_effect=[RuntimeError("1"), RuntimeError("2"), "ok"])
+
+        result = asyncio.run(async_retry(max_attempts=3, backoff=[1, 2], jitter=0)(func)())
+
+        assert result == "ok"
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2]
+
+    @patch("utils.retry.random.uniform", return_value=0.25)
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_adds_jitter(self, mock_sleep, mock_uniform):
+        func = AsyncMock(side_effect=[RuntimeError("1"), "ok"])
+
+        asyncio.run(async_retry(max_attempts=2, backoff=[1], jitter=0.5)(func)())
+
+        mock_uniform.assert_called_once_with(0, 0.5)
+        mock_sleep.assert_awaited_once_with(1.25)
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_raises_after_max_attempts(self, mock_sleep):
+        func = AsyncMock(side_effect=RuntimeError("error"))
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(async_retry(max_attempts=3)(func)())
+        assert func.await_count == 3
+
+    @patch("utils.retry.asyncio.sleep", new_callable=AsyncMock)
+    def test_giveup_raises_immediately(self, mock_sleep):
+        func = AsyncMock(side_effect=KeyError("deterministic"))
+
+        with pytest.raises(KeyError):
+            asyncio.run(async_retry(max_attempts=3, giveup=(KeyError,))(func)())
+        func.assert_awaited_once()
+        mock_sleep.assert_not_called()
@@ -0,0 +1,253 @@
+import asyncio
+from itertools import islice
+
+from domain.repositories.user_repository import UserRepository
+from domain.services.weather_calculator import WeatherCalculator
+from domain.value_objects.location import Location
+from domain.value_objects.weather import Weather
+from domain.value_objects.weather_series import TemperatureSeries
+from infrastructure.exceptions import JMAAPIException, WeatherAPIException
+from infrastructure.jma.async_area_mapper import AsyncJmaAreaMapper
+from infrastructure.jma.async_client import AsyncJmaForecastClient
+from infrastructure.line.async_messaging_client import AsyncLineMessagingClient
+from infrastructure.line.messaging_client import MULTICAST_MAX_RECIPIENTS
+from infrastructure.weatherapi.async_client import AsyncWeatherApiClient
+from usecases.broadcast_weather import (
+    DEFAULT_GRID_SIZE,
+    DEFAULT_MAX_PENDING_USERS,
+    BroadcastResult,
+    DedupPolicy,
+    FetchKey,
+    FetchKeyResolver,
+    GroupKey,
+    LocationKey,
+    format_message,
+)
+from utils.logger import get_logger, log_error, log_info
+
+logger = get_logger(__name__)
+
+# 同時に実行する外部API呼び出し（天気取得・配信）の上限
+DEFAULT_MAX_CONCURRENCY = 1000
+
+# リポジトリからスレッドで一度に読み込むユーザー数
+USER_READ_CHUNK = 1000
+
+
+class AsyncBroadcastWeatherUseCase:
+    """天気配信ユースケース（非同期版）
+
+    BroadcastWeatherUseCase と同じ手順・集計で配信するが、天気取得とメッセージ配信を
+    1つのイベントループ上で max_concurrency 件まで並行実行する。
+    同期 API のリポジトリは USER_READ_CHUNK 件ずつスレッドで読み込み、
+    その間もイベントループ上の取得・配信は進行する。
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        weather_client: AsyncWeatherApiClient,
+        messaging_client: AsyncLineMessagingClient,
+        weather_calculator: WeatherCalculator,
+        jma_client: AsyncJmaForecastClient,
+        jma_area_mapper: AsyncJmaAreaMapper,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        batch_size: int = MULTICAST_MAX_RECIPIENTS,
+        max_pending_users: int = DEFAULT_MAX_PENDING_USERS,
+        dedup_policy: DedupPolicy = DedupPolicy.EXACT,
+        grid_size: float = DEFAULT_GRID_SIZE,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency は1以上である必要があります")
+        self.user_repository = user_repository
+        self.weather_client = weather_client
+        self.messaging_client = messaging_client
+        self.weather_calculator = weather_calculator
+        self.jma_client = jma_client
+        self.jma_area_mapper = jma_area_mapper
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.max_pending_users = max_pending_users
+        self.dedup_policy = dedup_policy
+        self._fetch_keys = FetchKeyResolver(dedup_policy, grid_size, jma_area_mapper)
+
+    async def execute(self) -> BroadcastResult:
+        """全ユーザーに天気情報を配信"""
+        log_info(logger, "天気配信処理を開始")
+
+        await self.jma_area_mapper.load()
+        run = _AsyncBroadcastRun(self)
+        pending: dict[GroupKey, list[str]] = {}
+        pending_count = 0
+        total_users = 0
+
+        users = self.user_repository.iter_users()
+        while chunk := await asyncio.to_thread(lambda: list(islice(users, USER_READ_CHUNK))):
+            for user in chunk:
+                total_users += 1
+                key = run.submit(user.location)
+                batch = pending.setdefault(key, [])
+                batch.append(user.user_id)
+                pending_count += 1
+
+                if len(batch) >= self.batch_size:
+                    await run.deliver(key, batch)
+                    pending_count -= len(batch)
+                    pending[key] = []
+                elif pending_count >= self.max_pending_users:
+                    await run.flush(pending)
+                    pending_count = 0
+
+        if total_users == 0:
+            log_info(logger, "配信対象ユーザーなし")
+            return BroadcastResult()
+
+        log_info(
+            logger,
+            "ユーザー取得完了",
+            total_users=total_users,
+            unique_locations=len(run.locations),
+            max_concurrency=self.max_concurrency,
+        )
+
+        await run.flush(pending)
+        result = await run.wait()
+
+        log_info(
+            logger,
+            "天気取得の集約結果",
+            dedup_policy=str(self.dedup_policy),
+            unique_locations=len(run.locations),
+            weather_api_calls=len(run.hourly),
+            saved_weather_api_calls=len(run.locations) - len(run.hourly),
+        )
+        log_info(
+            logger,
+            "天気配信処理を完了",
+            success_count=result.success_count,
+            failure_count=result.failure_count,
+        )
+        return result
+
+    async def _fetch_hourly(
+        self, lat: float, lon: float, city_name: str, semaphore: asyncio.Semaphore
+    ) -> TemperatureSeries | None:
+        """1取得単位分の時間別天気（気温: WeatherAPI）を取得。失敗時はログを出力して None を返す"""
+        try:
+            async with semaphore:
+                return await self.weather_client.get_hourly_weather(lat, lon)
+        except WeatherAPIException as e:
+            log_error(logger, "天気情報取得失敗", error=str(e), lat=lat, lon=lon, city_name=city_name)
+            return None
+
+    async def _fetch_weather(
+        self, hourly: asyncio.Task[TemperatureSeries | None], location: Location, semaphore: asyncio.Semaphore
+    ) -> Weather | None:
+        """1市区町村分の実質天気を取得。失敗時はログを出力して None を返す"""
+        city_name = location.city_name
+        hourly_data = await hourly
+        if hourly_data is None:
+            return None
+
+        # 降水確率取得（JMA）
+        try:
+            office_code, class10_code = self.jma_area_mapper.find_codes(city_name)
+            async with semaphore:
+                jma_pops = await self.jma_client.get_pops(office_code, class10_code)
+        except JMAAPIException as e:
+            log_error(logger, "気象庁API取得失敗", error=str(e), city_name=city_name)
+            return None
+
+        # 実質天気算出
+        try:
+            return self.weather_calculator.calculate(hourly_data, jma_pops)
+        except ValueError as e:
+            log_error(
+                logger,
+                "実質天気算出失敗",
+                error=str(e),
+                lat=location.latitude,
+                lon=location.longitude,
+                city_name=city_name,
+            )
+            return None
+
+    async def _deliver(
+        self,
+        city_name: str,
+        weather: asyncio.Task[Weather | None],
+        user_ids: list[str],
+        semaphore: asyncio.Semaphore,
+    ) -> BroadcastResult:
+        """1グループ分のユーザーにメッセージを配信"""
+        resolved = await weather
+        if resolved is None:
+            log_error(logger, "天気情報なしのため配信スキップ", city_name=city_name, skipped_users=len(user_ids))
+            return BroadcastResult(failure_count=len(user_ids))
+
+        async with semaphore:
+            failed_user_ids = await self.messaging_client.multicast_message(
+                user_ids, format_message(city_name, resolved)
+            )
+        for user_id in failed_user_ids:
+            log_error(logger, "メッセージ配信失敗", user_id=user_id)
+        return BroadcastResult(
+            success_count=len(user_ids) - len(failed_user_ids),
+            failure_count=len(failed_user_ids),
+        )
+
+
+class _AsyncBroadcastRun:
+    """1回の非同期配信における取得・配信タスクの状態"""
+
+    def __init__(self, usecase: AsyncBroadcastWeatherUseCase) -> None:
+        self._usecase = usecase
+        self._semaphore = asyncio.Semaphore(usecase.max_concurrency)
+        self._deliveries: set[asyncio.Task[BroadcastResult]] = set()
+        self._result = BroadcastResult()
+        self.locations: set[LocationKey] = set()
+        self.hourly: dict[FetchKey, asyncio.Task[TemperatureSeries | None]] = {}
+        self.weathers: dict[GroupKey, asyncio.Task[Weather | None]] = {}
+
+    def submit(self, location: Location) -> GroupKey:
+        """地点の天気取得タスクを（未開始なら）開始し、配信グループのキーを返す"""
+        self.locations.add((location.latitude, location.longitude))
+        fetch_key = self._usecase._fetch_keys(location)
+        key = (fetch_key, location.city_name)
+        if key in self.weathers:
+            return key
+
+        hourly = self.hourly.get(fetch_key)
+        if hourly is None:
+            lat, lon = FetchKeyResolver.coordinates(fetch_key, location)
+            hourly = asyncio.create_task(self._usecase._fetch_hourly(lat, lon, location.city_name, self._semaphore))
+            self.hourly[fetch_key] = hourly
+        self.weathers[key] = asyncio.create_task(self._usecase._fetch_weather(hourly, location, self._semaphore))
+        return key
+
+    async def deliver(self, key: GroupKey, user_ids: list[str]) -> None:
+        """配信タスクを開始（実行中の配信が上限に達している場合は完了を待つ）"""
+        while len(self._deliveries) >= self._usecase.max_concurrency:
+            done, self._deliveries = await asyncio.wait(self._deliveries, return_when=asyncio.FIRST_COMPLETED)
+            self._collect(done)
+        task = asyncio.create_task(self._usecase._deliver(key[1], self.weathers[key], user_ids, self._semaphore))
+        self._deliveries.add(task)
+
+    async def flush(self, pending: dict[GroupKey, list[str]]) -> None:
+        """配信待ちの全グループの配信タスクを開始"""
+        for key, batch in pending.items():
+            if batch:
+                await self.deliver(key, batch)
+                pending[key] = []
+
+    async def wait(self) -> BroadcastResult:
+        """全配信の完了を待って集計結果を返す"""
+        if self._deliveries:
+            done, _ = await asyncio.wait(self._deliveries)
+            self._collect(done)
+            self._deliveries = set()
+        return self._result
+
+    def _collect(self, done: set[asyncio.Task[BroadcastResult]]) -> None:
+        for task in done:
+            self._result += task.result()
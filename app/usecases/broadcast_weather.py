@@ -1,11 +1,23 @@
-from collections import defaultdict
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
 
+from domain.repositories.delivery_ledger import DeliveryLedger
+from domain.repositories.forecast_store import ForecastStore
 from domain.repositories.user_repository import UserRepository
-from domain.services.weather_calculator import WeatherCalculator
-from infrastructure.exceptions import JMAAPIException, MessagingException, WeatherAPIException
+from domain.services.weather_calculator import JST, WeatherCalculator
+from domain.value_objects.delivery_checkpoint import DeliveryCheckpoint
+from domain.value_objects.location import Location
+from domain.value_objects.location_group import LocationGroup
+from domain.value_objects.weather import Weather
+from domain.value_objects.weather_series import TemperatureSeries
+from infrastructure.exceptions import JMAAPIException, WeatherAPIException
 from infrastructure.jma.area_mapper import JmaAreaMapper
 from infrastructure.jma.client import JmaForecastClient
-from infrastructure.line.messaging_client import LineMessagingClient
+from infrastructure.line.messaging_client import MULTICAST_MAX_RECIPIENTS, LineMessagingClient
 from infrastructure.weatherapi.client import WeatherApiClient
 from utils.logger import get_logger, log_error, log_info
 
@@ -18,9 +30,186 @@ MESSAGE_TEMPLATE = """おはよう U・x・U
 最低気温: {min_temp}℃
 降水確率: {pop}%"""
 
+# 配信待ちとして保持するユーザーID数の上限。超えた時点で保持中の全グループを配信する
+DEFAULT_MAX_PENDING_USERS = 50_000
+
+# grid 集約時の格子の大きさ（度）。約1km四方
+DEFAULT_GRID_SIZE = 0.01
+
+LocationKey = tuple[float, float]
+# WeatherAPI の取得単位（緯度経度または class20 コード）
+FetchKey = tuple[float, float] | str
+# 配信メッセージの単位（取得単位内でも市区町村名ごとにメッセージを分ける）
+GroupKey = tuple[FetchKey, str]
+
+
+class DedupPolicy(StrEnum):
+    """WeatherAPI の天気取得をまとめる単位"""
+
+    EXACT = "exact"  # 緯度経度の完全一致
+    GRID = "grid"  # grid_size 度の格子
+    AREA = "area"  # 気象庁の class20 区域（市区町村）
+
+
+@dataclass(frozen=True)
+class BroadcastResult:
+    """天気配信の結果"""
+
+    success_count: int = 0
+    failure_count: int = 0
+    # 配信台帳で配信済みと判定し、再送しなかったユーザー数
+    skipped_count: int = 0
+
+    def __add__(self, other: "BroadcastResult") -> "BroadcastResult":
+        return BroadcastResult(
+            success_count=self.success_count + other.success_count,
+            failure_count=self.failure_count + other.failure_count,
+            skipped_count=self.skipped_count + other.skipped_count,
+        )
+
+
+def format_message(city_name: str, weather: Weather) -> str:
+    """配信メッセージを組み立てる"""
+    return MESSAGE_TEMPLATE.format(
+        city_name=city_name,
+        max_temp=weather.max_temp,
+        min_temp=weather.min_temp,
+        pop=weather.pop,
+    )
+
+
+class FetchKeyResolver:
+    """dedup_policy に従って地点の WeatherAPI 取得単位を決める"""
+
+    def __init__(self, dedup_policy: DedupPolicy, grid_size: float, jma_area_mapper: JmaAreaMapper) -> None:
+        self.dedup_policy = dedup_policy
+        self.grid_size = grid_size
+        self.jma_area_mapper = jma_area_mapper
+        self._class20_codes: dict[str, str | None] = {}
+
+    def __call__(self, location: Location) -> FetchKey:
+        if self.dedup_policy is DedupPolicy.GRID:
+            return (_snap(location.latitude, self.grid_size), _snap(location.longitude, self.grid_size))
+        if self.dedup_policy is DedupPolicy.AREA:
+            class20_code = self._class20_code(location.city_name)
+            if class20_code is not None:
+                return class20_code
+        return (location.latitude, location.longitude)
+
+    def _class20_code(self, city_name: str) -> str | None:
+        """市区町村名の class20 コード（特定できない場合は None で緯度経度単位に戻す）"""
+        if city_name not in self._class20_codes:
+            try:
+                self._class20_codes[city_name] = self.jma_area_mapper.find_class20_code(city_name)
+            except JMAAPIException:
+                self._class20_codes[city_name] = None
+        return self._class20_codes[city_name]
+
+    @staticmethod
+    def coordinates(fetch_key: FetchKey, location: Location) -> LocationKey:
+        """取得単位で WeatherAPI に問い合わせる緯度経度（区域単位の場合は最初の地点）"""
+        if isinstance(fetch_key, tuple):
+            return fetch_key
+        return (location.latitude, location.longitude)
+
+
+class WeatherFetcher:
+    """地点ごとの実質天気を取得する（気温: WeatherAPI、降水確率: 気象庁API）
+
+    配信（BroadcastWeatherUseCase）と事前計算（PrefetchForecastsUseCase）で共有する。
+    """
+
+    def __init__(
+        self,
+        weather_client: WeatherApiClient,
+        weather_calculator: WeatherCalculator,
+        jma_client: JmaForecastClient,
+        jma_area_mapper: JmaAreaMapper,
+        dedup_policy: DedupPolicy = DedupPolicy.EXACT,
+        grid_size: float = DEFAULT_GRID_SIZE,
+    ) -> None:
+        self.weather_client = weather_client
+        self.weather_calculator = weather_calculator
+        self.jma_client = jma_client
+        self.jma_area_mapper = jma_area_mapper
+        self.fetch_keys = FetchKeyResolver(dedup_policy, grid_size, jma_area_mapper)
+
+    def fetch_hourly(self, lat: float, lon: float, city_name: str) -> TemperatureSeries | None:
+        """1取得単位分の時間別天気（気温: WeatherAPI）を取得。失敗時はログを出力して None を返す"""
+        try:
+            return self.weather_client.get_hourly_weather(lat, lon)
+        except WeatherAPIException as e:
+            log_error(
+                logger,
+                "天気情報取得失敗",
+                error=str(e),
+                lat=lat,
+                lon=lon,
+                city_name=city_name,
+            )
+            return None
+
+    def fetch_weather(self, hourly: Future[TemperatureSeries | None], location: Location) -> Weather | None:
+        """1市区町村分の実質天気を取得。失敗時はログを出力して None を返す"""
+        city_name = location.city_name
+        hourly_data = hourly.result()
+        if hourly_data is None:
+            return None
+
+        # 降水確率取得（JMA）
+        try:
+            office_code, class10_code = self.jma_area_mapper.find_codes(city_name)
+            jma_pops = self.jma_client.get_pops(office_code, class10_code)
+        except JMAAPIException as e:
+            log_error(
+                logger,
+                "気象庁API取得失敗",
+                error=str(e),
+                city_name=city_name,
+            )
+            return None
+
+        # 実質天気算出
+        try:
+            return self.weather_calculator.calculate(hourly_data, jma_pops)
+        except ValueError as e:
+            log_error(
+                logger,
+                "実質天気算出失敗",
+                error=str(e),
+                lat=location.latitude,
+                lon=location.longitude,
+                city_name=city_name,
+            )
+            return None
+
 
 class BroadcastWeatherUseCase:
-    """天気配信ユースケース"""
+    """天気配信ユースケース
+
+    ユーザーはリポジトリから逐次読み込み、緯度経度ごとに配信待ちとして保持する。
+    地点を初めて読み込んだ時点で天気取得（WeatherAPI・気象庁API）を開始し、
+    配信待ちが batch_size（Multicast の宛先上限）に達した地点から順に配信する。
+    メモリ上に保持するのは地点ごとの天気と配信待ちユーザーIDのみで、
+    ユーザー数に比例して増えない（max_pending_users を超えた場合は保持分を配信する）。
+
+    use_location_index が True の場合は、リポジトリの地点インデックスから
+    地点ごとにまとめられたユーザーIDを読み込むため、Python 側でのグルーピングを行わない。
+
+    WeatherAPI の取得は dedup_policy の単位（緯度経度・格子・class20 区域）で1回にまとめ、
+    降水確率の取得とメッセージは市区町村名ごとに行う。
+
+    delivery_ledger を指定すると、配信日（run_date、省略時は当日の JST 日付）ごとに
+    配信済みユーザーと完了した地点グループを記録する。同じ日に再実行された場合は
+    それらを読み飛ばして再開し（天気取得も行わない）、Multicast には配信日と宛先から生成した
+    X-Line-Retry-Key を付ける。地点インデックスを使う場合はチャンクの宛先が再実行でも同じになるため、
+    台帳への書き込み前に中断した分も LINE 側で重複しない。ユーザーを Scan で読み込む場合は
+    チャンクの宛先が読み込み順（並列 Scan ではスレッドの実行順）で変わるため、再実行時の重複防止は
+    台帳に記録済みの分のみとなる（X-Line-Retry-Key は同じ実行内の再送のみを重複させない）。
+
+    forecast_store を指定すると、PrefetchForecastsUseCase が配信日の前に計算した
+    実質天気を読み込んで配信する（事前計算がない地点のみその場で取得する）。
+    """
 
     def __init__(
         self,
@@ -30,113 +219,329 @@ class BroadcastWeatherUseCase:
         weather_calculator: WeatherCalculator,
         jma_client: JmaForecastClient,
         jma_area_mapper: JmaAreaMapper,
+        max_workers: int = 1,
+        batch_size: int = MULTICAST_MAX_RECIPIENTS,
+        max_pending_users: int = DEFAULT_MAX_PENDING_USERS,
+        use_location_index: bool = False,
+        dedup_policy: DedupPolicy = DedupPolicy.EXACT,
+        grid_size: float = DEFAULT_GRID_SIZE,
+        delivery_ledger: DeliveryLedger | None = None,
+        run_date: str | None = None,
+        forecast_store: ForecastStore | None = None,
     ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers は1以上である必要があります")
         self.user_repository = user_repository
         self.weather_client = weather_client
         self.messaging_client = messaging_client
         self.weather_calculator = weather_calculator
         self.jma_client = jma_client
         self.jma_area_mapper = jma_area_mapper
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.max_pending_users = max_pending_users
+        self.use_location_index = use_location_index
+        self.dedup_policy = dedup_policy
+        self.grid_size = grid_size
+        self.delivery_ledger = delivery_ledger
+        self.run_date = run_date
+        self.forecast_store = forecast_store
+        self._fetcher = WeatherFetcher(
+            weather_client, weather_calculator, jma_client, jma_area_mapper, dedup_policy, grid_size
+        )
+        # 実行ごとの状態（同じインスタンスをウォームスタート間で再利用するため、execute で初期化する）
+        self._run_date: str | None = run_date
+        self._checkpoint = DeliveryCheckpoint()
+        self._forecasts: dict[str, Weather] = {}
+
+    def execute(self) -> BroadcastResult:
+        """全ユーザーに天気情報を配信
 
-    def execute(self) -> None:
-        """全ユーザーに天気情報を配信"""
+        max_workers が2以上の場合、地点ごとの天気取得をスレッドプールで並行実行する。
+        配信順序と成功・失敗の集計は逐次実行と同一。
+        """
         log_info(logger, "天気配信処理を開始")
+        self._run_date = self.run_date
+        if self._run_date is None and (self.delivery_ledger is not None or self.forecast_store is not None):
+            self._run_date = today_jst()
+        self._checkpoint = DeliveryCheckpoint()
+        self._forecasts = {}
+        self._load_checkpoint()
+        self._load_forecasts()
 
-        users = self.user_repository.get_all_users()
-        if not users:
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                fetches = WeatherFetches(self._fetcher, executor, self._forecasts)
+                if self.use_location_index:
+                    result, total_users = self._broadcast_location_groups(fetches)
+                else:
+                    result, total_users = self._broadcast_users(fetches)
+        except Exception:
+            # 配信済みの分は記録を試みるが、書き込みの失敗で元の例外を隠さない
+            self._flush_ledger_after_error()
+            raise
+        if self.delivery_ledger is not None:
+            self.delivery_ledger.flush()
+
+        if total_users == 0:
             log_info(logger, "配信対象ユーザーなし")
+            return result
+
+        report = {
+            "dedup_policy": str(self.dedup_policy),
+            "unique_locations": len(fetches.locations),
+            "weather_api_calls": len(fetches.hourly),
+            "saved_weather_api_calls": len(fetches.locations) - len(fetches.hourly),
+        }
+        if self.forecast_store is not None:
+            report["precomputed_forecasts"] = fetches.precomputed_hits
+        log_info(logger, "天気取得の集約結果", **report)
+
+        log_info(
+            logger,
+            "天気配信処理を完了",
+            success_count=result.success_count,
+            failure_count=result.failure_count,
+            skipped_count=result.skipped_count,
+        )
+        return result
+
+    def _flush_ledger_after_error(self) -> None:
+        """配信の失敗後に台帳へ書き込む（書き込みの失敗はログのみ）"""
+        if self.delivery_ledger is None:
             return
+        try:
+            self.delivery_ledger.flush()
+        except Exception as e:
+            log_error(logger, "配信台帳の書き込み失敗", run_date=self._run_date, error=str(e))
 
-        # 緯度経度でグルーピング
-        groups: dict[tuple[float, float], list] = defaultdict(list)
-        for user in users:
-            key = (user.location.latitude, user.location.longitude)
-            groups[key].append(user)
+    def _load_checkpoint(self) -> None:
+        """配信台帳から当日の途中経過を読み込む"""
+        if self.delivery_ledger is None or self._run_date is None:
+            return
+        self._checkpoint = self.delivery_ledger.load(self._run_date)
+        if self._checkpoint.delivered_user_ids or self._checkpoint.completed_groups:
+            log_info(
+                logger,
+                "配信台帳から再開",
+                run_date=self._run_date,
+                delivered_users=len(self._checkpoint.delivered_user_ids),
+                completed_groups=len(self._checkpoint.completed_groups),
+            )
+
+    def _load_forecasts(self) -> None:
+        """事前計算された当日の実質天気を読み込む"""
+        if self.forecast_store is None or self._run_date is None:
+            return
+        self._forecasts = self.forecast_store.load(self._run_date)
+        log_info(logger, "事前計算済みの天気を読み込み", run_date=self._run_date, forecasts=len(self._forecasts))
+
+    def _broadcast_users(self, fetches: "WeatherFetches") -> tuple[BroadcastResult, int]:
+        """ユーザーを逐次読み込み、取得単位と市区町村名でグルーピングしながら配信"""
+        result = BroadcastResult()
+        total_users = 0
+        pending: dict[GroupKey, list[str]] = {}
+        pending_count = 0
+
+        for user in self.user_repository.iter_users():
+            total_users += 1
+            if user.user_id in self._checkpoint.delivered_user_ids:
+                result += BroadcastResult(skipped_count=1)
+                continue
+            key = fetches.submit(user.location)
+            batch = pending.setdefault(key, [])
+            batch.append(user.user_id)
+            pending_count += 1
+
+            if len(batch) >= self.batch_size:
+                result += self._deliver(key[1], fetches.weathers[key].result(), batch)
+                pending_count -= len(batch)
+                pending[key] = []
+            elif pending_count >= self.max_pending_users:
+                result += self._flush(pending, fetches)
+                pending_count = 0
+
+        if total_users == 0:
+            return result, total_users
 
         log_info(
             logger,
             "ユーザー取得完了",
-            total_users=len(users),
-            unique_locations=len(groups),
+            total_users=total_users,
+            unique_locations=len(fetches.locations),
+            max_workers=self.max_workers,
         )
 
-        success_count = 0
-        failure_count = 0
+        result += self._flush(pending, fetches)
+        return result, total_users
 
-        for (lat, lon), group_users in groups.items():
-            city_name = group_users[0].location.city_name
+    def _broadcast_location_groups(self, fetches: "WeatherFetches") -> tuple[BroadcastResult, int]:
+        """地点インデックスから地点単位で読み込んで配信
 
-            # 天気情報取得（気温: OWM）
-            try:
-                hourly_data = self.weather_client.get_hourly_weather(lat, lon)
-            except WeatherAPIException as e:
-                log_error(
-                    logger,
-                    "天気情報取得失敗",
-                    error=str(e),
-                    lat=lat,
-                    lon=lon,
-                    city_name=city_name,
-                    skipped_users=len(group_users),
-                )
-                failure_count += len(group_users)
-                continue
+        天気取得は max_workers 件先行して開始し、読み込んだ順に配信する。
+        """
+        result = BroadcastResult()
+        total_users = 0
+        unique_locations = 0
+        in_flight: deque[tuple[LocationGroup, Future[Weather | None]]] = deque()
 
-            # 降水確率取得（JMA）
-            try:
-                office_code, class10_code = self.jma_area_mapper.find_codes(city_name)
-                jma_pops = self.jma_client.get_pops(office_code, class10_code)
-            except JMAAPIException as e:
-                log_error(
-                    logger,
-                    "気象庁API取得失敗",
-                    error=str(e),
-                    city_name=city_name,
-                    skipped_users=len(group_users),
-                )
-                failure_count += len(group_users)
+        for group in self.user_repository.iter_location_groups():
+            total_users += len(group.user_ids)
+            unique_locations += 1
+            if _group_key(group) in self._checkpoint.completed_groups:
+                result += BroadcastResult(skipped_count=len(group.user_ids))
                 continue
-
-            # 実質天気算出
-            try:
-                weather = self.weather_calculator.calculate(hourly_data, jma_pops)
-            except ValueError as e:
-                log_error(
-                    logger,
-                    "実質天気算出失敗",
-                    error=str(e),
-                    lat=lat,
-                    lon=lon,
-                    city_name=city_name,
-                    skipped_users=len(group_users),
+            # Multicast のチャンク（X-Line-Retry-Key の単位）が再実行でも同じになるよう、ユーザーIDの順に並べる
+            group = LocationGroup(location=group.location, user_ids=tuple(sorted(group.user_ids)))
+            delivered = self._checkpoint.delivered_user_ids
+            if delivered:
+                # チャンクは全員まとめて受理されるため、配信済みのユーザーを含むチャンクは読み飛ばす。
+                # 残りは前回の実行と同じチャンクのまま送るため、台帳への書き込み前に中断したチャンクも
+                # 同じ X-Line-Retry-Key となり LINE 側で重複しない
+                remaining = tuple(
+                    user_id
+                    for chunk in _multicast_chunks(group.user_ids)
+                    if delivered.isdisjoint(chunk)
+                    for user_id in chunk
                 )
-                failure_count += len(group_users)
-                continue
+                result += BroadcastResult(skipped_count=len(group.user_ids) - len(remaining))
+                if not remaining:
+                    self._record_group_completed(group)
+                    continue
+                group = LocationGroup(location=group.location, user_ids=remaining)
+            key = fetches.submit(group.location)
+            in_flight.append((group, fetches.weathers[key]))
+            if len(in_flight) > self.max_workers:
+                result += self._deliver_group(*in_flight.popleft())
 
-            # メッセージ配信
-            message = MESSAGE_TEMPLATE.format(
-                city_name=city_name,
-                max_temp=weather.max_temp,
-                min_temp=weather.min_temp,
-                pop=weather.pop,
+        while in_flight:
+            result += self._deliver_group(*in_flight.popleft())
+
+        if total_users:
+            log_info(
+                logger,
+                "ユーザー取得完了",
+                total_users=total_users,
+                unique_locations=unique_locations,
+                max_workers=self.max_workers,
             )
+        return result, total_users
 
-            for user in group_users:
-                try:
-                    self.messaging_client.push_message(user.user_id, message)
-                    success_count += 1
-                except MessagingException as e:
-                    log_error(
-                        logger,
-                        "メッセージ配信失敗",
-                        error=str(e),
-                        user_id=user.user_id,
-                    )
-                    failure_count += 1
+    def _deliver_group(self, group: LocationGroup, weather: Future[Weather | None]) -> BroadcastResult:
+        """1地点分のグループを配信（全員に配信できた場合は完了を台帳に記録）"""
+        result = self._deliver(group.location.city_name, weather.result(), list(group.user_ids))
+        if result.failure_count == 0:
+            self._record_group_completed(group)
+        return result
 
-        log_info(
-            logger,
-            "天気配信処理を完了",
-            success_count=success_count,
-            failure_count=failure_count,
+    def _record_group_completed(self, group: LocationGroup) -> None:
+        if self.delivery_ledger is not None and self._run_date is not None:
+            self.delivery_ledger.record_group_completed(self._run_date, _group_key(group))
+
+    def _flush(self, pending: dict[GroupKey, list[str]], fetches: "WeatherFetches") -> BroadcastResult:
+        """配信待ちの全グループを配信"""
+        result = BroadcastResult()
+        for key, batch in pending.items():
+            if batch:
+                result += self._deliver(key[1], fetches.weathers[key].result(), batch)
+                pending[key] = []
+        return result
+
+    def _deliver(self, city_name: str, weather: Weather | None, user_ids: list[str]) -> BroadcastResult:
+        """1地点分のユーザーにメッセージを配信"""
+        if weather is None:
+            log_error(logger, "天気情報なしのため配信スキップ", city_name=city_name, skipped_users=len(user_ids))
+            return BroadcastResult(failure_count=len(user_ids))
+
+        # メッセージ配信
+        message = format_message(city_name, weather)
+        if self.delivery_ledger is None or self._run_date is None:
+            failed_user_ids = self.messaging_client.multicast_message(user_ids, message)
+        else:
+            failed_user_ids = self.messaging_client.multicast_message(user_ids, message, retry_key_seed=self._run_date)
+            failed = set(failed_user_ids)
+            self.delivery_ledger.record_delivered(self._run_date, (u for u in user_ids if u not in failed))
+        for user_id in failed_user_ids:
+            log_error(logger, "メッセージ配信失敗", user_id=user_id)
+        return BroadcastResult(
+            success_count=len(user_ids) - len(failed_user_ids),
+            failure_count=len(failed_user_ids),
         )
+
+
+class WeatherFetches:
+    """1回の実行における天気取得の集約状態
+
+    WeatherAPI は取得単位ごとに1回だけ呼び出し、実質天気は（取得単位, 市区町村名）ごとに算出する。
+    precomputed に事前計算済みの実質天気があるグループは取得を行わない。
+    """
+
+    def __init__(
+        self,
+        fetcher: WeatherFetcher,
+        executor: ThreadPoolExecutor,
+        precomputed: Mapping[str, Weather] | None = None,
+    ) -> None:
+        self._fetcher = fetcher
+        self._executor = executor
+        self._precomputed = precomputed or {}
+        self.locations: set[LocationKey] = set()
+        self.hourly: dict[FetchKey, Future[TemperatureSeries | None]] = {}
+        self.weathers: dict[GroupKey, Future[Weather | None]] = {}
+        self.precomputed_hits = 0
+
+    def submit(self, location: Location) -> GroupKey:
+        """地点の天気取得を（未開始なら）開始し、配信グループのキーを返す"""
+        self.locations.add((location.latitude, location.longitude))
+        fetch_key = self._fetcher.fetch_keys(location)
+        key = (fetch_key, location.city_name)
+        if key in self.weathers:
+            return key
+
+        weather = self._precomputed.get(forecast_key(key))
+        if weather is not None:
+            future: Future[Weather | None] = Future()
+            future.set_result(weather)
+            self.weathers[key] = future
+            self.precomputed_hits += 1
+            return key
+
+        hourly = self.hourly.get(fetch_key)
+        if hourly is None:
+            lat, lon = FetchKeyResolver.coordinates(fetch_key, location)
+            hourly = self._executor.submit(self._fetcher.fetch_hourly, lat, lon, location.city_name)
+            self.hourly[fetch_key] = hourly
+        # 依存する WeatherAPI 取得は先に投入済みのため、待ち合わせでワーカーが枯渇することはない
+        self.weathers[key] = self._executor.submit(self._fetcher.fetch_weather, hourly, location)
+        return key
+
+
+def forecast_key(key: GroupKey) -> str:
+    """事前計算した実質天気の保存キー（取得単位と市区町村名）"""
+    fetch_key, city_name = key
+    if isinstance(fetch_key, tuple):
+        return f"{fetch_key[0]},{fetch_key[1]}#{city_name}"
+    return f"{fetch_key}#{city_name}"
+
+
+def today_jst() -> str:
+    """当日の JST 日付（配信日）"""
+    return datetime.now(JST).date().isoformat()
+
+
+def _group_key(group: LocationGroup) -> str:
+    """配信台帳に記録する地点グループのキー（緯度経度）"""
+    return f"{group.location.latitude}#{group.location.longitude}"
+
+
+def _multicast_chunks(user_ids: tuple[str, ...]) -> list[tuple[str, ...]]:
+    """LineMessagingClient.multicast_message と同じ単位（MULTICAST_MAX_RECIPIENTS 件ごと）の分割"""
+    return [
+        user_ids[start : start + MULTICAST_MAX_RECIPIENTS]
+        for start in range(0, len(user_ids), MULTICAST_MAX_RECIPIENTS)
+    ]
+
+
+def _snap(value: float, grid_size: float) -> float:
+    """最寄りの格子点に丸める"""
+    return round(round(value / grid_size) * grid_size, 6)
@@ -0,0 +1,96 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from domain.repositories.forecast_store import ForecastStore
+from domain.repositories.user_repository import UserRepository
+from domain.services.weather_calculator import WeatherCalculator
+from domain.value_objects.location import Location
+from domain.value_objects.weather import Weather
+from infrastructure.jma.area_mapper import JmaAreaMapper
+from infrastructure.jma.client import JmaForecastClient
+from infrastructure.weatherapi.client import WeatherApiClient
+from usecases.broadcast_weather import (
+    DEFAULT_GRID_SIZE,
+    DedupPolicy,
+    WeatherFetcher,
+    WeatherFetches,
+    forecast_key,
+    today_jst,
+)
+from utils.logger import get_logger, log_info
+
+logger = get_logger(__name__)
+
+
+class PrefetchForecastsUseCase:
+    """配信前に実質天気を事前計算するユースケース
+
+    配信対象の全地点について BroadcastWeatherUseCase と同じ単位（dedup_policy）で
+    実質天気を算出し、配信日ごとに forecast_store へ保存する。
+    配信時は保存済みの天気を読み込むだけになり、天気の取得を待たずに配信できる。
+    取得に失敗した地点は保存しない（配信時にその場で取得する）。
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        weather_client: WeatherApiClient,
+        weather_calculator: WeatherCalculator,
+        jma_client: JmaForecastClient,
+        jma_area_mapper: JmaAreaMapper,
+        forecast_store: ForecastStore,
+        max_workers: int = 1,
+        use_location_index: bool = False,
+        dedup_policy: DedupPolicy = DedupPolicy.EXACT,
+        grid_size: float = DEFAULT_GRID_SIZE,
+        run_date: str | None = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers は1以上である必要があります")
+        self.user_repository = user_repository
+        self.forecast_store = forecast_store
+        self.max_workers = max_workers
+        self.use_location_index = use_location_index
+        self.dedup_policy = dedup_policy
+        self.run_date = run_date
+        self._fetcher = WeatherFetcher(
+            weather_client, weather_calculator, jma_client, jma_area_mapper, dedup_policy, grid_size
+        )
+
+    def execute(self) -> int:
+        """全地点の実質天気を算出して保存し、保存した件数を返す"""
+        run_date = self.run_date or today_jst()
+        log_info(logger, "天気の事前計算を開始", run_date=run_date)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            fetches = WeatherFetches(self._fetcher, executor)
+            for location in self._iter_locations():
+                fetches.submit(location)
+            forecasts: dict[str, Weather] = {}
+            for key, weather in fetches.weathers.items():
+                result = weather.result()
+                if result is not None:
+                    forecasts[forecast_key(key)] = result
+
+        if forecasts:
+            self.forecast_store.save(run_date, forecasts)
+        log_info(
+            logger,
+            "天気の事前計算を完了",
+            run_date=run_date,
+            dedup_policy=str(self.dedup_policy),
+            unique_locations=len(fetches.locations),
+            weather_api_calls=len(fetches.hourly),
+            forecasts=len(forecasts),
+            failed_forecasts=len(fetches.weathers) - len(forecasts),
+        )
+        return len(forecasts)
+
+    def _iter_locations(self) -> Iterator[Location]:
+        """配信対象の地点を読み込む（地点インデックスがあれば地点単位で読み込む）"""
+        if self.use_location_index:
+            for group in self.user_repository.iter_location_groups():
+                yield group.location
+        else:
+            for user in self.user_repository.iter_users():
+                yield user.location
@@ -1,6 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from domain.entities.user import User
 from domain.repositories.user_repository import UserRepository
 from domain.value_objects.location import Location
+from domain.value_objects.region_registration import RegionRegistration
 from infrastructure.exceptions import GeocodingAmbiguousException, GeocodingNotFoundException
 from infrastructure.gsi.geocoding_client import GsiGeocodingClient
 from infrastructure.line.messaging_client import LineMessagingClient
@@ -10,20 +13,82 @@ logger = get_logger(__name__)
 
 
 class RegisterRegionUseCase:
-    """地域設定ユースケース"""
+    """地域設定ユースケース
+
+    execute_all で複数の依頼を処理する場合、異なるユーザーの依頼は max_workers 個のスレッドで
+    並行実行する（遅い住所検索の後ろで、他のユーザーの返信トークンを期限切れにさせない）。
+    同じユーザーの依頼は受け付けた順に1件ずつ実行する。
+    """
 
     def __init__(
         self,
         user_repository: UserRepository,
         geocoding_client: GsiGeocodingClient,
         messaging_client: LineMessagingClient,
+        max_workers: int = 1,
     ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers は1以上である必要があります")
         self.user_repository = user_repository
         self.geocoding_client = geocoding_client
         self.messaging_client = messaging_client
+        self.max_workers = max_workers
+
+    def execute_all(self, registrations: list[RegionRegistration]) -> list[int]:
+        """複数の地域設定を実行し、失敗した依頼の位置（registrations の添字）を返す
+
+        住所検索・DynamoDB・LINE の障害などで失敗した依頼は、エラーを返信せずに失敗として返す
+        （呼び出し元で再試行するか、reply_error で返信する）。失敗した依頼より後の同じユーザーの依頼は、
+        順序を保つため実行せずに失敗として返す。
+        """
+        by_user: dict[str, list[int]] = {}
+        for index, registration in enumerate(registrations):
+            by_user.setdefault(registration.user_id, []).append(index)
+
+        def execute_user(indexes: list[int]) -> list[int]:
+            for position, index in enumerate(indexes):
+                registration = registrations[index]
+                try:
+                    self._register(registration.user_id, registration.city_name, registration.reply_token)
+                except Exception as e:
+                    log_error(logger, "地域設定の依頼の処理失敗", user_id=registration.user_id, error=str(e))
+                    return indexes[position:]
+            return []
+
+        max_workers = min(self.max_workers, len(by_user))
+        if max_workers <= 1:
+            failed = [index for indexes in by_user.values() for index in execute_user(indexes)]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                failed = [index for indexes in executor.map(execute_user, by_user.values()) for index in indexes]
+        return sorted(failed)
 
     def execute(self, user_id: str, city_name: str, reply_token: str) -> None:
-        """地域設定を実行"""
+        """地域設定を実行（失敗した場合はエラーを返信する）"""
+        try:
+            self._register(user_id, city_name, reply_token)
+        except Exception as e:
+            log_error(
+                logger,
+                "地域設定エラー",
+                user_id=user_id,
+                city_name=city_name,
+                error=str(e),
+            )
+            self.reply_error(user_id, reply_token)
+
+    def reply_error(self, user_id: str, reply_token: str) -> None:
+        """地域設定に失敗したことを返信（返信の失敗はログのみ）"""
+        try:
+            self.messaging_client.reply_message(
+                reply_token,
+                "エラーが発生しました。しばらくしてからもう一度お試しください。",
+            )
+        except Exception:
+            log_error(logger, "エラーメッセージ返信失敗", user_id=user_id)
+
+    def _register(self, user_id: str, city_name: str, reply_token: str) -> None:
+        """地域設定を実行（地名が見つからない・候補が複数の場合は返信し、それ以外の例外は送出する）"""
         log_info(logger, "地域設定開始", user_id=user_id, city_name=city_name)
 
         try:
@@ -81,19 +146,3 @@ class RegisterRegionUseCase:
                 "正しい市区町村名を入力してください。\n"
                 "例: 渋谷区、新宿区、横浜市",
             )
-
-        except Exception as e:
-            log_error(
-                logger,
-                "地域設定エラー",
-                user_id=user_id,
-                city_name=city_name,
-                error=str(e),
-            )
-            try:
-                self.messaging_client.reply_message(
-                    reply_token,
-                    "エラーが発生しました。しばらくしてからもう一度お試しください。",
-                )
-            except Exception:
-                log_error(logger, "エラーメッセージ返信失敗", user_id=user_id)
@@ -0,0 +1,85 @@
+from collections.abc import Callable
+
+from domain.repositories.broadcast_run_repository import BroadcastRunRepository
+from domain.repositories.shard_queue import ShardQueue
+from domain.value_objects.broadcast_shard import BroadcastRunProgress, BroadcastShard
+from usecases.broadcast_weather import BroadcastWeatherUseCase
+from utils.logger import get_logger, log_info
+
+logger = get_logger(__name__)
+
+
+class DispatchBroadcastShardsUseCase:
+    """分散配信のコーディネーター
+
+    1回の配信を shard_count 個のシャードに分けてキューへ投入する。
+    各シャードはワーカー（BroadcastShardUseCase）が別々の Lambda で配信する。
+    """
+
+    def __init__(
+        self,
+        shard_queue: ShardQueue,
+        run_repository: BroadcastRunRepository,
+        shard_count: int,
+    ) -> None:
+        if shard_count < 1:
+            raise ValueError("shard_count は1以上である必要があります")
+        self.shard_queue = shard_queue
+        self.run_repository = run_repository
+        self.shard_count = shard_count
+
+    def execute(self, run_id: str) -> list[BroadcastShard]:
+        """配信の実行を登録し、全シャードをキューへ投入"""
+        shards = [
+            BroadcastShard(run_id=run_id, index=index, count=self.shard_count) for index in range(self.shard_count)
+        ]
+        # 集計先を先に作成してから投入する（ワーカーの結果の加算先が必ず存在する）
+        self.run_repository.start_run(run_id, self.shard_count)
+        self.shard_queue.send_shards(shards)
+        log_info(logger, "配信シャードを投入", run_id=run_id, shard_count=self.shard_count)
+        return shards
+
+
+class BroadcastShardUseCase:
+    """分散配信のワーカー
+
+    シャード内のユーザーだけを読み込む BroadcastWeatherUseCase で配信し、
+    結果を配信全体の集計に加算する。最後のシャードの完了時に全体の結果をログに出力する。
+    """
+
+    def __init__(
+        self,
+        broadcast_factory: Callable[[BroadcastShard], BroadcastWeatherUseCase],
+        run_repository: BroadcastRunRepository,
+    ) -> None:
+        self.broadcast_factory = broadcast_factory
+        self.run_repository = run_repository
+
+    def execute(self, shard: BroadcastShard) -> BroadcastRunProgress:
+        """1シャード分を配信し、加算後の配信全体の集計を返す"""
+        log_info(logger, "シャード配信を開始", run_id=shard.run_id, shard_index=shard.index, shard_count=shard.count)
+        result = self.broadcast_factory(shard).execute()
+
+        progress = self.run_repository.record_shard_result(
+            shard.run_id, shard.index, result.success_count, result.failure_count
+        )
+        log_info(
+            logger,
+            "シャード配信を完了",
+            run_id=shard.run_id,
+            shard_index=shard.index,
+            success_count=result.success_count,
+            failure_count=result.failure_count,
+            completed_shards=progress.completed_shards,
+            shard_count=progress.shard_count,
+        )
+        if progress.is_complete:
+            log_info(
+                logger,
+                "分散配信の集計結果",
+                run_id=shard.run_id,
+                shard_count=progress.shard_count,
+                success_count=progress.success_count,
+                failure_count=progress.failure_count,
+            )
+        return progress
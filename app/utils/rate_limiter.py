@@ -0,0 +1,63 @@
+import threading
+import time
+from collections.abc import Callable
+
+
+class TokenBucket:
+    """一定レートでトークンを補充するスレッドセーフなトークンバケット
+
+    acquire() はトークンを1つ予約し、使用可能になるまで待機する。
+    予約はロック内で行い待機はロック外で行うため、複数スレッドから呼んでも
+    全体として rate 件/秒を超えない。
+
+    Args:
+        rate: 1秒あたりに補充するトークン数
+        capacity: 貯められるトークンの上限（バースト許容量）
+        timer: 現在時刻を返す関数（テスト用に差し替え可能）
+        sleep: 待機関数（テスト用に差し替え可能）
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        timer: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate は0より大きい必要があります")
+        if capacity < 1:
+            raise ValueError("capacity は1以上である必要があります")
+        self.rate = rate
+        self.capacity = capacity
+        self._timer = timer
+        self._sleep = sleep
+        self._tokens = capacity
+        # トークン補充の基準時刻。pause() 中は未来の時刻になる
+        self._updated = timer()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """トークンを1つ取得（不足している場合は補充されるまで待機）
+
+        Returns:
+            待機した秒数
+        """
+        with self._lock:
+            now = self._timer()
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            wait = (self._updated - now) + max(0.0, -self._tokens) / self.rate
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """現在から seconds 秒間はトークンを払い出さない（貯まっていた分も破棄）"""
+        with self._lock:
+            resume_at = self._timer() + seconds
+            if resume_at > self._updated:
+                self._updated = resume_at
+                self._tokens = min(self._tokens, 0.0)
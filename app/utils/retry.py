@@ -1,15 +1,23 @@
+import asyncio
 import logging
+import random
 import time
+from collections.abc import Awaitable, Callable
 from functools import wraps
-from typing import Any, Callable
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
 
 def retry(
-    max_attempts: int = 3, backoff: list[int] | None = None
+    max_attempts: int = 3,
+    backoff: list[int] | None = None,
+    giveup: tuple[type[Exception], ...] = (),
 ) -> Callable[..., Any]:
-    """リトライデコレーター（指数バックオフ）"""
+    """リトライデコレーター（指数バックオフ）
+
+    giveup に指定した例外は結果が変わらないものとしてリトライせずに送出する。
+    """
     if backoff is None:
         backoff = [1, 2, 4]
 
@@ -19,15 +27,50 @@ def retry(
             for attempt in range(max_attempts):
                 try:
                     return func(*args, **kwargs)
+                except giveup:
+                    raise
                 except Exception as e:
                     if attempt == max_attempts - 1:
                         raise
                     sleep_time = backoff[min(attempt, len(backoff) - 1)]
-                    logger.warning(
-                        "Retry %d/%d after %ds: %s", attempt + 1, max_attempts, sleep_time, e
-                    )
+                    logger.warning("Retry %d/%d after %ds: %s", attempt + 1, max_attempts, sleep_time, e)
                     time.sleep(sleep_time)
 
         return wrapper
 
     return decorator
+
+
+def async_retry(
+    max_attempts: int = 3,
+    backoff: list[int] | None = None,
+    giveup: tuple[type[Exception], ...] = (),
+    jitter: float = 0.5,
+) -> Callable[..., Any]:
+    """非同期関数用のリトライデコレーター（指数バックオフ + ジッター）
+
+    待機は asyncio.sleep のためイベントループを止めない。待機時間は backoff の値に
+    最大 jitter 倍のランダムな時間を加え、同時に失敗したリクエストの再送をばらけさせる。
+    """
+    if backoff is None:
+        backoff = [1, 2, 4]
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except giveup:
+                    raise
+                except Exception as e:
+                    if attempt == max_attempts - 1:
+                        raise
+                    base = backoff[min(attempt, len(backoff) - 1)]
+                    sleep_time = base + random.uniform(0, base * jitter)
+                    logger.warning("Retry %d/%d after %.2fs: %s", attempt + 1, max_attempts, sleep_time, e)
+                    await asyncio.sleep(sleep_time)
+
+        return wrapper
+
+    return decorator
@@ -4,9 +4,12 @@ import * as apigateway from "aws-cdk-lib/aws-apigateway";
 import * as dynamodb from "aws-cdk-lib/aws-dynamodb";
 import * as events from "aws-cdk-lib/aws-events";
 import * as targets from "aws-cdk-lib/aws-events-targets";
+import * as iam from "aws-cdk-lib/aws-iam";
 import * as lambda from "aws-cdk-lib/aws-lambda";
+import * as lambdaEventSources from "aws-cdk-lib/aws-lambda-event-sources";
 import * as logs from "aws-cdk-lib/aws-logs";
 import * as secretsmanager from "aws-cdk-lib/aws-secretsmanager";
+import * as sqs from "aws-cdk-lib/aws-sqs";
 import type { Construct } from "constructs";
 
 export class WeatherBroadcastStack extends cdk.Stack {
@@ -27,6 +30,136 @@ export class WeatherBroadcastStack extends cdk.Stack {
 			removalPolicy: cdk.RemovalPolicy.DESTROY,
 		});
 
+		// 地点（緯度経度）ごとにユーザーを引くためのインデックス
+		usersTable.addGlobalSecondaryIndex({
+			indexName: "LocationIndex",
+			partitionKey: {
+				name: "locationKey",
+				type: dynamodb.AttributeType.STRING,
+			},
+			sortKey: {
+				name: "userId",
+				type: dynamodb.AttributeType.STRING,
+			},
+			projectionType: dynamodb.ProjectionType.KEYS_ONLY,
+		});
+
+		// =============================================
+		// DynamoDB Locations Table
+		// =============================================
+		const locationsTable = new dynamodb.Table(this, "LocationsTable", {
+			tableName: "WeatherBroadcast-Locations",
+			partitionKey: {
+				name: "locationKey",
+				type: dynamodb.AttributeType.STRING,
+			},
+			billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+			removalPolicy: cdk.RemovalPolicy.DESTROY,
+		});
+
+		// =============================================
+		// DynamoDB Geocoding Cache Table
+		// =============================================
+		const geocodingCacheTable = new dynamodb.Table(this, "GeocodingCacheTable", {
+			tableName: "WeatherBroadcast-GeocodingCache",
+			partitionKey: {
+				name: "query",
+				type: dynamodb.AttributeType.STRING,
+			},
+			billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+			timeToLiveAttribute: "expiresAt",
+			removalPolicy: cdk.RemovalPolicy.DESTROY,
+		});
+
+		// =============================================
+		// DynamoDB Broadcast Runs Table（分散配信のシャード結果の集計）
+		// =============================================
+		const broadcastRunsTable = new dynamodb.Table(this, "BroadcastRunsTable", {
+			tableName: "WeatherBroadcast-BroadcastRuns",
+			partitionKey: {
+				name: "runId",
+				type: dynamodb.AttributeType.STRING,
+			},
+			billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+			timeToLiveAttribute: "expiresAt",
+			removalPolicy: cdk.RemovalPolicy.DESTROY,
+		});
+
+		// =============================================
+		// DynamoDB Delivery Ledger Table（配信済みユーザーの記録。再実行時の再開に使う）
+		// =============================================
+		const deliveryLedgerTable = new dynamodb.Table(this, "DeliveryLedgerTable", {
+			tableName: "WeatherBroadcast-DeliveryLedger",
+			partitionKey: {
+				name: "runDate",
+				type: dynamodb.AttributeType.STRING,
+			},
+			sortKey: {
+				name: "entryKey",
+				type: dynamodb.AttributeType.STRING,
+			},
+			billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+			timeToLiveAttribute: "expiresAt",
+			removalPolicy: cdk.RemovalPolicy.DESTROY,
+		});
+
+		// =============================================
+		// DynamoDB Forecasts Table（配信前に事前計算した実質天気）
+		// =============================================
+		const forecastsTable = new dynamodb.Table(this, "ForecastsTable", {
+			tableName: "WeatherBroadcast-Forecasts",
+			partitionKey: {
+				name: "runDate",
+				type: dynamodb.AttributeType.STRING,
+			},
+			sortKey: {
+				name: "forecastKey",
+				type: dynamodb.AttributeType.STRING,
+			},
+			billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+			timeToLiveAttribute: "expiresAt",
+			removalPolicy: cdk.RemovalPolicy.DESTROY,
+		});
+
+		// =============================================
+		// SQS Broadcast Shard Queue
+		// =============================================
+		const broadcastShardDeadLetterQueue = new sqs.Queue(this, "BroadcastShardDeadLetterQueue", {
+			queueName: "weather-broadcast-shard-dlq",
+			retentionPeriod: cdk.Duration.days(14),
+		});
+
+		const broadcastShardQueue = new sqs.Queue(this, "BroadcastShardQueue", {
+			queueName: "weather-broadcast-shard-queue",
+			// ワーカーのタイムアウト（300秒）の6倍
+			visibilityTimeout: cdk.Duration.seconds(1800),
+			// 配信台帳で配信済みのユーザーを除外して再開できるため、失敗したシャードは再試行する
+			deadLetterQueue: {
+				queue: broadcastShardDeadLetterQueue,
+				maxReceiveCount: 3,
+			},
+		});
+
+		const registrationDeadLetterQueue = new sqs.Queue(this, "RegistrationDeadLetterQueue", {
+			queueName: "weather-broadcast-registration-dlq.fifo",
+			fifo: true,
+			retentionPeriod: cdk.Duration.days(14),
+		});
+
+		// Webhook が受け付けた地域設定の依頼。userId をメッセージグループとして同じユーザーの順序を保ち、
+		// webhookEventId を重複排除IDとして LINE から再送されたイベントを二重に処理しない
+		const registrationQueue = new sqs.Queue(this, "RegistrationQueue", {
+			queueName: "weather-broadcast-registration-queue.fifo",
+			fifo: true,
+			contentBasedDeduplication: true,
+			// ワーカーのタイムアウト（60秒）の6倍
+			visibilityTimeout: cdk.Duration.seconds(360),
+			deadLetterQueue: {
+				queue: registrationDeadLetterQueue,
+				maxReceiveCount: 3,
+			},
+		});
+
 		// =============================================
 		// Secrets Manager
 		// =============================================
@@ -74,7 +207,7 @@ export class WeatherBroadcastStack extends cdk.Stack {
 					command: [
 						"bash",
 						"-c",
-						"pip install -r requirements.txt -t /asset-output && rsync -au --exclude '.venv' --exclude '__pycache__' --exclude 'tests' --exclude '.devcontainer' --exclude '*.pyc' --exclude 'pyproject.toml' --exclude 'uv.lock' --exclude 'Dockerfile' --exclude 'requirements.txt' . /asset-output",
+						"pip install -r requirements.txt -t /asset-output && rsync -au --exclude '.venv' --exclude '__pycache__' --exclude 'tests' --exclude '.devcontainer' --exclude '*.pyc' --exclude 'pyproject.toml' --exclude 'uv.lock' --exclude 'Dockerfile' --exclude 'requirements.txt' . /asset-output && cd /asset-output && python -m infrastructure.jma.area_snapshot infrastructure/jma/data/area_snapshot.json",
 					],
 				},
 				exclude: [
@@ -102,14 +235,81 @@ export class WeatherBroadcastStack extends cdk.Stack {
 				TABLE_NAME: usersTable.tableName,
 				LINE_CHANNEL_SECRET_NAME: lineChannelSecret.secretName,
 				LINE_CHANNEL_ACCESS_TOKEN_NAME: lineChannelAccessToken.secretName,
+				GEOCODING_CACHE_TABLE_NAME: geocodingCacheTable.tableName,
+				LOCATIONS_TABLE_NAME: locationsTable.tableName,
+				// 地域設定はキュー経由でワーカーが行い、Webhook は署名検証と投入のみで応答する
+				WEBHOOK_EVENT_QUEUE_URL: registrationQueue.queueUrl,
 			},
+			// 署名検証に使うシークレットを boto3 を読み込まずに取得する（コールドスタートの短縮）。
+			// 拡張機能の HTTP ポートは環境変数 PARAMETERS_SECRETS_EXTENSION_HTTP_PORT で Lambda に渡る
+			paramsAndSecrets: lambda.ParamsAndSecretsLayerVersion.fromVersion(
+				lambda.ParamsAndSecretsVersions.V1_0_103,
+				{ httpPort: 2773 },
+			),
 			logGroup: webhookLogGroup,
 		});
 
 		// Webhook Lambda permissions
 		usersTable.grantReadWriteData(webhookHandler);
+		locationsTable.grantReadWriteData(webhookHandler);
+		geocodingCacheTable.grantReadWriteData(webhookHandler);
 		lineChannelSecret.grantRead(webhookHandler);
 		lineChannelAccessToken.grantRead(webhookHandler);
+		// チャネルシークレットとアクセストークンを BatchGetSecretValue でまとめて取得する
+		// （リソースを指定できないアクションのため "*"。値の取得には各シークレットの grantRead が必要）
+		const batchGetSecretsPolicy = new iam.PolicyStatement({
+			actions: ["secretsmanager:BatchGetSecretValue"],
+			resources: ["*"],
+		});
+		webhookHandler.addToRolePolicy(batchGetSecretsPolicy);
+		registrationQueue.grantSendMessages(webhookHandler);
+
+		// =============================================
+		// Lambda - Registration Worker Handler
+		// =============================================
+		const registrationWorkerLogGroup = new logs.LogGroup(
+			this,
+			"RegistrationWorkerHandlerLogGroup",
+			{
+				logGroupName: "/aws/lambda/weather-broadcast-registration-worker-handler",
+				retention: logs.RetentionDays.ONE_MONTH,
+				removalPolicy: cdk.RemovalPolicy.DESTROY,
+			},
+		);
+
+		const registrationWorkerHandler = new lambda.Function(
+			this,
+			"RegistrationWorkerHandler",
+			{
+				functionName: "weather-broadcast-registration-worker-handler",
+				runtime: lambda.Runtime.PYTHON_3_12,
+				handler: "handlers.webhook.registration_worker_handler",
+				code: appCode,
+				timeout: cdk.Duration.seconds(60),
+				memorySize: 256,
+				architecture: lambda.Architecture.X86_64,
+				environment: {
+					TABLE_NAME: usersTable.tableName,
+					LINE_CHANNEL_ACCESS_TOKEN_NAME: lineChannelAccessToken.secretName,
+					GEOCODING_CACHE_TABLE_NAME: geocodingCacheTable.tableName,
+					LOCATIONS_TABLE_NAME: locationsTable.tableName,
+				},
+				logGroup: registrationWorkerLogGroup,
+			},
+		);
+
+		registrationWorkerHandler.addEventSource(
+			new lambdaEventSources.SqsEventSource(registrationQueue, {
+				batchSize: 10,
+				reportBatchItemFailures: true,
+			}),
+		);
+
+		// Registration Worker Lambda permissions
+		usersTable.grantReadWriteData(registrationWorkerHandler);
+		locationsTable.grantReadWriteData(registrationWorkerHandler);
+		geocodingCacheTable.grantReadWriteData(registrationWorkerHandler);
+		lineChannelAccessToken.grantRead(registrationWorkerHandler);
 		// =============================================
 		// Lambda - Broadcast Handler
 		// =============================================
@@ -131,6 +331,46 @@ export class WeatherBroadcastStack extends cdk.Stack {
 				runtime: lambda.Runtime.PYTHON_3_12,
 				handler: "handlers.broadcast.handler",
 				code: appCode,
+				timeout: cdk.Duration.seconds(60),
+				memorySize: 256,
+				architecture: lambda.Architecture.X86_64,
+				environment: {
+					BROADCAST_SHARD_QUEUE_URL: broadcastShardQueue.queueUrl,
+					BROADCAST_RUNS_TABLE_NAME: broadcastRunsTable.tableName,
+					BROADCAST_SHARD_COUNT: "8",
+				},
+				logGroup: broadcastLogGroup,
+			},
+		);
+
+		// Broadcast (coordinator) Lambda permissions
+		broadcastShardQueue.grantSendMessages(broadcastHandler);
+		broadcastRunsTable.grantWriteData(broadcastHandler);
+
+		// =============================================
+		// Lambda - Broadcast Worker Handler
+		// =============================================
+		const broadcastWorkerLogGroup = new logs.LogGroup(
+			this,
+			"BroadcastWorkerHandlerLogGroup",
+			{
+				logGroupName: "/aws/lambda/weather-broadcast-weather-broadcast-worker-handler",
+				retention: logs.RetentionDays.ONE_MONTH,
+				removalPolicy: cdk.RemovalPolicy.DESTROY,
+			},
+		);
+
+		// 同時実行数。LINE のレート上限（200 req/s）をワーカー間で分け合う
+		const broadcastWorkerConcurrency = 4;
+
+		const broadcastWorkerHandler = new lambda.Function(
+			this,
+			"WeatherBroadcastWorkerHandler",
+			{
+				functionName: "weather-broadcast-weather-broadcast-worker-handler",
+				runtime: lambda.Runtime.PYTHON_3_12,
+				handler: "handlers.broadcast.worker_handler",
+				code: appCode,
 				timeout: cdk.Duration.seconds(300),
 				memorySize: 512,
 				architecture: lambda.Architecture.X86_64,
@@ -138,15 +378,74 @@ export class WeatherBroadcastStack extends cdk.Stack {
 					TABLE_NAME: usersTable.tableName,
 					LINE_CHANNEL_ACCESS_TOKEN_NAME: lineChannelAccessToken.secretName,
 					WEATHERAPI_API_KEY_NAME: weatherApiKey.secretName,
+					WEATHERAPI_LEAN_FETCH: "true",
+					BROADCAST_MAX_WORKERS: "8",
+					USERS_SCAN_SEGMENTS: "4",
+					BROADCAST_DEDUP_POLICY: "grid",
+					BROADCAST_GRID_SIZE: "0.01",
+					LOCATIONS_TABLE_NAME: locationsTable.tableName,
+					BROADCAST_RUNS_TABLE_NAME: broadcastRunsTable.tableName,
+					DELIVERY_LEDGER_TABLE_NAME: deliveryLedgerTable.tableName,
+					FORECAST_TABLE_NAME: forecastsTable.tableName,
+					LINE_MULTICAST_QPS: String(180 / broadcastWorkerConcurrency),
 				},
-				logGroup: broadcastLogGroup,
+				logGroup: broadcastWorkerLogGroup,
 			},
 		);
 
-		// Broadcast Lambda permissions
-		usersTable.grantReadData(broadcastHandler);
-		lineChannelAccessToken.grantRead(broadcastHandler);
-		weatherApiKey.grantRead(broadcastHandler);
+		broadcastWorkerHandler.addEventSource(
+			new lambdaEventSources.SqsEventSource(broadcastShardQueue, {
+				batchSize: 1,
+				maxConcurrency: broadcastWorkerConcurrency,
+				reportBatchItemFailures: true,
+			}),
+		);
+
+		// Broadcast Worker Lambda permissions
+		usersTable.grantReadData(broadcastWorkerHandler);
+		locationsTable.grantReadData(broadcastWorkerHandler);
+		broadcastRunsTable.grantReadWriteData(broadcastWorkerHandler);
+		deliveryLedgerTable.grantReadWriteData(broadcastWorkerHandler);
+		forecastsTable.grantReadData(broadcastWorkerHandler);
+		lineChannelAccessToken.grantRead(broadcastWorkerHandler);
+		weatherApiKey.grantRead(broadcastWorkerHandler);
+		broadcastWorkerHandler.addToRolePolicy(batchGetSecretsPolicy);
+
+		// =============================================
+		// Lambda - Forecast Prefetch Handler
+		// =============================================
+		const prefetchLogGroup = new logs.LogGroup(this, "PrefetchHandlerLogGroup", {
+			logGroupName: "/aws/lambda/weather-broadcast-forecast-prefetch-handler",
+			retention: logs.RetentionDays.ONE_MONTH,
+			removalPolicy: cdk.RemovalPolicy.DESTROY,
+		});
+
+		const prefetchHandler = new lambda.Function(this, "ForecastPrefetchHandler", {
+			functionName: "weather-broadcast-forecast-prefetch-handler",
+			runtime: lambda.Runtime.PYTHON_3_12,
+			handler: "handlers.broadcast.prefetch_handler",
+			code: appCode,
+			timeout: cdk.Duration.seconds(900),
+			memorySize: 512,
+			architecture: lambda.Architecture.X86_64,
+			environment: {
+				TABLE_NAME: usersTable.tableName,
+				WEATHERAPI_API_KEY_NAME: weatherApiKey.secretName,
+				WEATHERAPI_LEAN_FETCH: "true",
+				BROADCAST_MAX_WORKERS: "16",
+				BROADCAST_DEDUP_POLICY: "grid",
+				BROADCAST_GRID_SIZE: "0.01",
+				LOCATIONS_TABLE_NAME: locationsTable.tableName,
+				FORECAST_TABLE_NAME: forecastsTable.tableName,
+			},
+			logGroup: prefetchLogGroup,
+		});
+
+		// Prefetch Lambda permissions
+		usersTable.grantReadData(prefetchHandler);
+		locationsTable.grantReadData(prefetchHandler);
+		forecastsTable.grantWriteData(prefetchHandler);
+		weatherApiKey.grantRead(prefetchHandler);
 
 		// =============================================
 		// API Gateway
@@ -178,6 +477,15 @@ export class WeatherBroadcastStack extends cdk.Stack {
 			targets: [new targets.LambdaFunction(broadcastHandler)],
 		});
 
+		// 配信の30分前に天気を事前計算し、9:00 の配信では計算済みの天気を読み込むだけにする
+		new events.Rule(this, "ForecastPrefetchSchedule", {
+			ruleName: "weather-broadcast-prefetch-schedule",
+			description: "Prefetch forecasts at 8:30 JST daily",
+			schedule: events.Schedule.expression("cron(30 23 * * ? *)"),
+			enabled: true,
+			targets: [new targets.LambdaFunction(prefetchHandler)],
+		});
+
 		// =============================================
 		// Stack Outputs
 		// =============================================